@@ -0,0 +1,298 @@
+"""
+api/handlers.py
+견적 API 엔드포인트 처리 함수
+
+요청 파라미터(dict) → 응답(dict) 순수 함수.
+워커 풀(스레드/프로세스)에서 실행되므로 모듈 최상위 함수로 둔다.
+"""
+
+import math
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from core.catalog_stats import get_catalog_stats
+from core.comparison import compare_all
+from core.deal_search import search_deals
+from core.quote import quote_for_capital
+from core.quote_cube import cube_quote
+from core.scenario_grid import build_scenario_grid
+from core.validator import validate_lease_input
+from data import residual_rates, vehicle_master
+
+
+def _require(params: Dict, key: str):
+    value = params.get(key)
+    if value is None or value == "":
+        raise ValueError(f"필수 파라미터가 없습니다: {key}")
+    return value
+
+
+def _as_int(params: Dict, key: str, default: Optional[int] = None) -> int:
+    value = params.get(key, default)
+    if value is None:
+        raise ValueError(f"필수 파라미터가 없습니다: {key}")
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{key}는 정수여야 합니다: {value}")
+
+
+def _as_float(params: Dict, key: str, default: Optional[float] = None) -> Optional[float]:
+    value = params.get(key, default)
+    if value is None:
+        return None
+    try:
+        number = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"{key}는 숫자여야 합니다: {value}")
+    if not math.isfinite(number):
+        raise ValueError(f"{key}는 유한한 숫자여야 합니다: {value}")
+    return number
+
+
+def _check_capitals(capital_ids: Optional[List[str]]) -> None:
+    """데이터 파일이 없는 캐피탈 ID 거부"""
+    if not capital_ids:
+        return
+    available = residual_rates.get_available_capitals()
+    unknown = [c for c in capital_ids if c not in available]
+    if unknown:
+        raise ValueError(f"알 수 없는 캐피탈입니다: {', '.join(unknown)}")
+
+
+def _require_capital(params: Dict) -> str:
+    capital_id = _require(params, 'capital_id')
+    _check_capitals([capital_id])
+    return capital_id
+
+
+def _find_vehicle(params: Dict, capital_id: Optional[str]) -> Dict:
+    """vehicle_id 또는 brand/model/trim 으로 차량 조회"""
+    if params.get('vehicle_id'):
+        vehicle = vehicle_master.get_vehicle(params['vehicle_id'], capital_id=capital_id)
+        return {**vehicle, 'id': params['vehicle_id']}
+
+    brand = _require(params, 'brand')
+    model = _require(params, 'model')
+    trim = _require(params, 'trim')
+    vehicle = vehicle_master.find_vehicle_by_name(brand, model, trim, capital_id=capital_id)
+    if vehicle is None:
+        raise ValueError(f"차량을 찾을 수 없습니다: {brand} {model} {trim}")
+    return vehicle
+
+
+def _vehicle_price(params: Dict, vehicle: Dict) -> float:
+    """요청 차량가 (없으면 차량 정보의 가격). 가격 정보가 없는 차량은 계산 전에 ValueError"""
+    vehicle_price = _as_float(params, 'vehicle_price') or vehicle.get('price')
+    if not vehicle_price:
+        raise ValueError(f"차량 가격 정보가 없습니다: {vehicle.get('id') or vehicle.get('trim')} (vehicle_price 를 지정하세요)")
+    return vehicle_price
+
+
+def _validate(vehicle_price: float, down_payment_percent: float,
+              contract_months: Optional[int] = None, annual_mileage: Optional[int] = None) -> None:
+    """handle_quote 와 같은 입력 검증 (선납 비율 → 선납금)"""
+    validate_lease_input(
+        vehicle_price=vehicle_price,
+        contract_months=contract_months,
+        down_payment=vehicle_price * down_payment_percent / 100,
+        annual_mileage=annual_mileage
+    )
+
+
+def _as_list(params: Dict, key: str, cast=str) -> Optional[List]:
+    """쉼표 구분 문자열 또는 리스트 → 리스트 (없으면 None)"""
+    value = params.get(key)
+    if value is None or value == "":
+        return None
+    if isinstance(value, str):
+        value = [v for v in value.split(",") if v]
+    try:
+        return [cast(v) for v in value]
+    except (TypeError, ValueError):
+        raise ValueError(f"{key} 값이 올바르지 않습니다: {value}")
+
+
+def _to_json_array(values: np.ndarray) -> List:
+    """NaN → None 으로 바꾼 중첩 리스트"""
+    return [
+        _to_json_array(v) if isinstance(v, np.ndarray) else (None if math.isnan(v) else float(v))
+        for v in values
+    ]
+
+
+def handle_quote(params: Dict) -> Dict:
+    """
+    단일 캐피탈 견적
+
+    Args:
+        params: capital_id, vehicle_id 또는 brand/model/trim,
+                contract_months, annual_mileage,
+                down_payment_percent (기본 0), vehicle_price (기본 차량가),
+                source ('live'면 큐브를 거치지 않음)
+
+    Returns:
+        Dict: {'capital_id', 'vehicle_id', 'vehicle_price', 'contract_months',
+               'annual_mileage', 'source' ('cube' | 'live'), 'monthly_payment',
+               'grade_option', 'residual_rate', 'details'}
+        큐브 응답의 details는 공통 요약 (월 납입료, 선납금, 총 납부액, 잔존가치, 금리)
+    """
+    capital_id = _require_capital(params)
+    vehicle = _find_vehicle(params, capital_id)
+    contract_months = _as_int(params, 'contract_months')
+    annual_mileage = _as_int(params, 'annual_mileage')
+    down_payment_percent = _as_float(params, 'down_payment_percent', 0.0)
+    vehicle_price = _vehicle_price(params, vehicle)
+    _validate(vehicle_price, down_payment_percent, contract_months, annual_mileage)
+
+    # 표준 입력은 사전 계산 큐브에서 조회 (source=live 면 항상 실시간 계산)
+    quote = None
+    if params.get('source') != 'live':
+        quote = cube_quote(capital_id, vehicle, vehicle_price, contract_months,
+                           annual_mileage, down_payment_percent)
+    source = 'cube' if quote is not None else 'live'
+    if quote is None:
+        quote = quote_for_capital(
+            capital_id=capital_id,
+            vehicle=vehicle,
+            vehicle_price=vehicle_price,
+            contract_months=contract_months,
+            annual_mileage=annual_mileage,
+            down_payment_percent=down_payment_percent
+        )
+
+    return {
+        'capital_id': capital_id,
+        'vehicle_id': vehicle['id'],
+        'vehicle_price': vehicle_price,
+        'contract_months': contract_months,
+        'annual_mileage': annual_mileage,
+        'source': source,
+        **quote
+    }
+
+
+def handle_compare(params: Dict) -> Dict:
+    """
+    전체 캐피탈 비교 (워커 안에서 순차 실행)
+
+    Args:
+        params: vehicle_id 또는 brand/model/trim, contract_months,
+                annual_mileage, down_payment_percent, vehicle_price,
+                capital_ids (선택)
+
+    Returns:
+        Dict: {'vehicle': {...}, 'results': compare_all 결과}
+    """
+    vehicle = _find_vehicle(params, None)
+    contract_months = _as_int(params, 'contract_months')
+    annual_mileage = _as_int(params, 'annual_mileage')
+
+    down_payment_percent = _as_float(params, 'down_payment_percent', 0.0)
+
+    capital_ids = _as_list(params, 'capital_ids')
+    _check_capitals(capital_ids)
+
+    # compare_all 과 같은 공통 차량가 (지정하지 않으면 master_carinfo)
+    vehicle_price = _as_float(params, 'vehicle_price') or vehicle_master.get_price_from_master(
+        brand=vehicle['brand'], model=vehicle['model'], grade=vehicle['trim']
+    )
+    if not vehicle_price:
+        raise ValueError(f"master_carinfo에서 차량 가격을 찾을 수 없습니다: "
+                         f"{vehicle['brand']} {vehicle['model']} {vehicle['trim']} (vehicle_price 를 지정하세요)")
+    _validate(vehicle_price, down_payment_percent, contract_months, annual_mileage)
+
+    results = compare_all(
+        vehicle={'brand': vehicle['brand'], 'model': vehicle['model'], 'trim': vehicle['trim']},
+        contract_months=contract_months,
+        annual_mileage=annual_mileage,
+        down_payment_percent=down_payment_percent,
+        vehicle_price=vehicle_price,
+        capital_ids=capital_ids,
+        executor=None
+    )
+
+    return {
+        'vehicle': {
+            'brand': vehicle['brand'],
+            'model': vehicle['model'],
+            'trim': vehicle['trim'],
+        },
+        'results': results
+    }
+
+
+def handle_grid(params: Dict) -> Dict:
+    """
+    기간 × 주행거리 × 잔가옵션 시나리오 그리드
+
+    Args:
+        params: capital_id, vehicle_id, down_payment_percent (기본 0), vehicle_price (기본 차량가)
+
+    Returns:
+        Dict: 축 정보 + (T, M, G) 중첩 리스트 (데이터 없는 셀은 null,
+              applied_grade_option = 셀에 실제 적용된 잔가 옵션)
+    """
+    capital_id = _require_capital(params)
+    vehicle = _find_vehicle(params, capital_id)
+    down_payment_percent = _as_float(params, 'down_payment_percent', 0.0)
+    vehicle_price = _vehicle_price(params, vehicle)
+    _validate(vehicle_price, down_payment_percent)
+
+    grid = build_scenario_grid(
+        capital_id, vehicle['id'],
+        vehicle=vehicle,
+        vehicle_price=vehicle_price,
+        down_payment=vehicle_price * down_payment_percent / 100
+    )
+
+    return {
+        'capital_id': capital_id,
+        'vehicle_id': vehicle['id'],
+        'vehicle_price': grid['vehicle_price'],
+        'down_payment': grid['down_payment'],
+        'terms': grid['terms'],
+        'mileages': grid['mileages'],
+        'grade_options': grid['grade_options'],
+        'annual_rate': grid['annual_rate'].tolist(),
+        'residual_rate': _to_json_array(grid['residual_rate']),
+        'applied_grade_option': grid['applied_grade_option'].tolist(),
+        'monthly_payment': _to_json_array(grid['monthly_payment']),
+        'total_payment': _to_json_array(grid['total_payment']),
+        'total_interest': _to_json_array(grid['total_interest']),
+    }
+
+
+def handle_stats(params: Dict) -> Dict:
+    """카탈로그 통계 (데이터 버전당 1회 집계된 값)"""
+    return get_catalog_stats()
+
+
+def handle_deals(params: Dict) -> Dict:
+    """
+    예산 내 최적 조건 검색 (전체 카탈로그)
+
+    Args:
+        params: max_monthly_payment, top_k (기본 20), capital_ids, terms,
+                mileages, brands, max_vehicle_price, down_payment_percent,
+                sort_by ('vehicle_price' | 'monthly_payment')
+
+    Returns:
+        Dict: search_deals 결과 {'results', 'stats'}
+    """
+    _require(params, 'max_monthly_payment')
+    capital_ids = _as_list(params, 'capital_ids')
+    _check_capitals(capital_ids)
+
+    return search_deals(
+        max_monthly_payment=_as_float(params, 'max_monthly_payment'),
+        top_k=_as_int(params, 'top_k', 20),
+        capital_ids=capital_ids,
+        terms=_as_list(params, 'terms', int),
+        mileages=_as_list(params, 'mileages', int),
+        brands=_as_list(params, 'brands'),
+        max_vehicle_price=_as_float(params, 'max_vehicle_price'),
+        down_payment_percent=_as_float(params, 'down_payment_percent', 0.0),
+        sort_by=params.get('sort_by') or 'vehicle_price'
+    )
@@ -0,0 +1,417 @@
+"""
+api/server.py
+로컬 HTTP 견적 서비스 (asyncio, 외부 의존성 없음)
+
+- GET  /health                  상태/처리 통계
+- GET|POST /quote               단일 캐피탈 견적
+- GET|POST /compare             전체 캐피탈 비교
+- GET|POST /grid                기간 × 주행거리 시나리오 그리드
+- GET|POST /deals               예산 내 최적 조건 검색 (전체 카탈로그)
+- GET|POST /stats               카탈로그 통계 (캐피탈/브랜드별 차량 수, 잔존율 커버리지)
+
+파라미터는 쿼리스트링 또는 JSON 본문(객체)으로 받는다 (둘 다 있으면 본문 우선).
+이벤트 루프는 입출력만 담당하고, 계산은 워커 풀(스레드/프로세스)에서 실행한다.
+견적 1건은 1ms 미만이라 기본은 스레드 풀 (프로세스 풀은 직렬화 비용이 더 큼).
+데이터는 서버 시작 시(프로세스 워커는 초기화 시) 한 번 적재되어 메모리에 유지된다.
+
+실행:
+    python -m api.server --port 8765 --workers 4
+    python -m api.server --executor process   # 프로세스 워커 (데이터는 워커별 1회 적재)
+    python -m api.server --executor process --cache-disk /tmp/quote_cache.db   # 워커 간 견적 캐시 공유
+    python -m api.server --executor process --shared-plane   # 컴파일 배열을 공유 메모리로 (워커는 복사 없이 매핑)
+    python -m api.server --executor process --shared-plane --plane-refresh 60   # 데이터 변경 확인 간격 (0 = 확인 안 함)
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import threading
+import time
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Optional, Tuple
+from urllib.parse import parse_qsl, urlsplit
+
+import numpy as np
+
+from api.handlers import handle_compare, handle_deals, handle_grid, handle_quote, handle_stats
+from core.quote_cube import load_quote_cube
+from core.quote_cache import configure_quote_cache, get_quote_cache, DEFAULT_MAX_ENTRIES, DEFAULT_TTL
+from core.shared_plane_publisher import PlanePublisher
+from data import shared_plane
+from data.warmup import warm_all
+from core.validator import ValidationError
+
+ROUTES: Dict[str, Callable[[Dict], Dict]] = {
+    '/quote': handle_quote,
+    '/compare': handle_compare,
+    '/grid': handle_grid,
+    '/deals': handle_deals,
+    '/stats': handle_stats,
+}
+
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 1024 * 1024
+
+_REASONS = {
+    200: "OK",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    500: "Internal Server Error",
+}
+
+
+class HttpError(Exception):
+    """HTTP 상태 코드가 있는 요청 오류"""
+
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+def _json_default(value):
+    """numpy 스칼라/배열 직렬화"""
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"직렬화할 수 없는 타입: {type(value).__name__}")
+
+
+def encode_json(payload: Dict) -> bytes:
+    """JSON 응답 본문 (NaN/Infinity 는 JSON 이 아니므로 ValueError)"""
+    return json.dumps(payload, ensure_ascii=False, allow_nan=False, default=_json_default).encode("utf-8")
+
+
+def _init_shared_worker(plane_name: str) -> None:
+    """데이터 평면 모드 프로세스 워커 초기화 (차량/잔존율은 평면, 평면에 없는 데이터는 처음 조회 시 적재)"""
+    shared_plane.enable(plane_name)
+
+
+def _worker_ready() -> bool:
+    return True
+
+
+class QuoteServer:
+    """asyncio 기반 HTTP/1.1 견적 서버 (keep-alive 지원)"""
+
+    def __init__(
+        self,
+        host: str = "127.0.0.1",
+        port: int = 8765,
+        executor: str = "thread",
+        workers: Optional[int] = None,
+        shared: bool = False,
+        plane_refresh: float = 30.0
+    ):
+        """
+        Args:
+            host: 바인드 주소
+            port: 포트 (0이면 임의 포트)
+            executor: 계산 워커 종류 ("thread" 또는 "process")
+            workers: 워커 수 (None이면 CPU 수)
+            shared: 서버 프로세스가 컴파일 배열을 공유 메모리 데이터 평면에 게시하고
+                    프로세스 워커는 잔존율 등을 미리 적재하지 않고 평면을 매핑 (process 전용)
+            plane_refresh: 평면 모드에서 데이터 파일 변경을 확인해 새 버전을 게시하는 간격 (초, 0이면 확인 안 함)
+        """
+        if executor not in ("process", "thread"):
+            raise ValueError(f"지원하지 않는 executor 종류입니다: {executor}")
+        if shared and executor != "process":
+            raise ValueError("공유 메모리 데이터 평면은 프로세스 워커에서만 사용합니다")
+
+        self.host = host
+        self.port = port
+        self.executor_kind = executor
+        self.workers = workers or os.cpu_count() or 1
+        self.shared = shared
+        self.plane_refresh = plane_refresh
+
+        self._publisher: Optional[PlanePublisher] = None
+        self._publisher_lock = threading.Lock()  # 갱신(워커 스레드)과 종료가 겹치지 않도록
+        self._refresh_task: Optional[asyncio.Task] = None
+        self._executor: Optional[Executor] = None
+        self._server: Optional[asyncio.base_events.Server] = None
+        self._started_at = time.time()
+        self._stats_lock = threading.Lock()
+        self._requests: Dict[str, int] = {}
+        self._errors: Dict[str, int] = {}
+
+    # ---- 생명주기 ----
+
+    async def start(self) -> None:
+        """데이터 적재 + 워커 풀 생성 + 리스닝 시작"""
+        warm_all()
+        load_quote_cube()  # 스레드 워커가 공유 (프로세스 워커는 첫 조회 시 로드)
+
+        if self.executor_kind == "process":
+            initializer, initargs = warm_all, ()
+            if self.shared:
+                self._publisher = PlanePublisher(f"{shared_plane.DEFAULT_PLANE_NAME}_{os.getpid()}")
+                self._publisher.publish()
+                initializer, initargs = _init_shared_worker, (self._publisher.name,)
+                if self.plane_refresh > 0:
+                    self._refresh_task = asyncio.create_task(self._refresh_plane())
+            self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=initializer, initargs=initargs)
+            # 워커를 미리 띄워 첫 요청 지연 제거
+            loop = asyncio.get_running_loop()
+            await asyncio.gather(*[
+                loop.run_in_executor(self._executor, _worker_ready) for _ in range(self.workers)
+            ])
+        else:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.workers, thread_name_prefix="quote-api"
+            )
+
+        self._server = await asyncio.start_server(
+            self._handle_connection, self.host, self.port, limit=MAX_HEADER_BYTES
+        )
+        self.port = self._server.sockets[0].getsockname()[1]
+        self._started_at = time.time()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
+        if self._refresh_task is not None:
+            self._refresh_task.cancel()
+            self._refresh_task = None
+        if self._publisher is not None:
+            with self._publisher_lock:
+                self._publisher.close()
+                self._publisher = None
+
+    async def _refresh_plane(self) -> None:
+        """데이터 파일이 바뀌면 평면 새 버전 게시 (워커는 다음 조회에서 옮겨 감)"""
+        loop = asyncio.get_running_loop()
+        while True:
+            await asyncio.sleep(self.plane_refresh)
+            try:
+                await loop.run_in_executor(None, self._refresh_publisher)
+            except Exception as e:  # 갱신 실패 시 이전 버전을 계속 게시
+                print(f"데이터 평면 갱신 실패: {e}")
+
+    def _refresh_publisher(self) -> None:
+        with self._publisher_lock:
+            if self._publisher is not None and self._publisher.refresh():
+                info = self._publisher.info
+                print(f"데이터 평면 갱신: {info['segment']} (데이터 버전 {info['data_version']})")
+
+    async def serve_forever(self) -> None:
+        await self.start()
+        print(f"견적 API 서버 시작: http://{self.host}:{self.port} "
+              f"({self.executor_kind} × {self.workers})")
+        try:
+            await self._server.serve_forever()
+        finally:
+            await self.close()
+
+    # ---- 요청 처리 ----
+
+    def _record(self, path: str, ok: bool) -> None:
+        with self._stats_lock:
+            self._requests[path] = self._requests.get(path, 0) + 1
+            if not ok:
+                self._errors[path] = self._errors.get(path, 0) + 1
+
+    def health(self) -> Dict:
+        with self._stats_lock:
+            requests = dict(self._requests)
+            errors = dict(self._errors)
+        cube = load_quote_cube()
+        return {
+            'status': 'ok',
+            'uptime_seconds': round(time.time() - self._started_at, 3),
+            'executor': self.executor_kind,
+            'workers': self.workers,
+            'requests': requests,
+            'errors': errors,
+            'quote_cache': get_quote_cache().stats(),
+            'quote_cube': cube.info() if cube is not None else None,
+            'shared_plane': self._publisher.info if self._publisher is not None else None,
+        }
+
+    async def dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, Dict]:
+        """
+        요청 1건 처리
+
+        Returns:
+            Tuple[int, Dict]: (상태 코드, 응답 본문)
+        """
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+
+        if path == "/health":
+            if method != "GET":
+                raise HttpError(405, f"허용되지 않는 메서드입니다: {method}")
+            return 200, self.health()
+
+        handler = ROUTES.get(path)
+        if handler is None:
+            raise HttpError(404, f"알 수 없는 경로입니다: {path}")
+        if method not in ("GET", "POST"):
+            raise HttpError(405, f"허용되지 않는 메서드입니다: {method}")
+
+        params: Dict = dict(parse_qsl(url.query))
+        if body:
+            try:
+                payload = json.loads(body.decode("utf-8"))
+            except (UnicodeDecodeError, json.JSONDecodeError) as e:
+                raise HttpError(400, f"JSON 본문을 해석할 수 없습니다: {e}")
+            if not isinstance(payload, dict):
+                raise HttpError(400, "JSON 본문은 객체여야 합니다")
+            params.update(payload)
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await loop.run_in_executor(self._executor, handler, params)
+        except (ValueError, ValidationError) as e:
+            raise HttpError(400, str(e))
+        except FileNotFoundError as e:
+            raise HttpError(404, str(e))
+        return 200, result
+
+    async def _read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict, bytes]]:
+        """요청 1건 읽기 (연결 종료 시 None)"""
+        try:
+            head = await reader.readuntil(b"\r\n\r\n")
+        except asyncio.IncompleteReadError:
+            return None
+        except asyncio.LimitOverrunError:
+            raise HttpError(413, "요청 헤더가 너무 큽니다")
+
+        lines = head.decode("latin-1").split("\r\n")
+        try:
+            method, target, version = lines[0].split(" ", 2)
+        except ValueError:
+            raise HttpError(400, "잘못된 요청 라인입니다")
+
+        headers = {}
+        for line in lines[1:]:
+            if ":" in line:
+                name, value = line.split(":", 1)
+                headers[name.strip().lower()] = value.strip()
+        headers[':version'] = version
+
+        try:
+            length = int(headers.get("content-length", "0") or 0)
+        except ValueError:
+            raise HttpError(400, "잘못된 Content-Length 입니다")
+        if length > MAX_BODY_BYTES:
+            raise HttpError(413, "요청 본문이 너무 큽니다")
+        body = await reader.readexactly(length) if length else b""
+
+        return method.upper(), target, headers, body
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                keep_alive = False
+                path = "?"
+                try:
+                    request = await self._read_request(reader)
+                    if request is None:
+                        break
+                    method, target, headers, body = request
+                    path = urlsplit(target).path
+                    keep_alive = (
+                        headers[':version'] == "HTTP/1.1"
+                        and headers.get("connection", "").lower() != "close"
+                    )
+                    status, payload = await self.dispatch(method, target, body)
+                except HttpError as e:
+                    status, payload = e.status, {'error': str(e)}
+                except Exception as e:
+                    status, payload = 500, {'error': f"서버 오류: {e}"}
+
+                try:
+                    data = encode_json(payload)
+                except ValueError as e:
+                    status, data = 500, encode_json({'error': f"응답을 직렬화할 수 없습니다: {e}"})
+
+                self._record(path, status == 200)
+                writer.write(
+                    f"HTTP/1.1 {status} {_REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json; charset=utf-8\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n"
+                    f"\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+
+                if not keep_alive:
+                    break
+        except (ConnectionResetError, BrokenPipeError):
+            pass
+        finally:
+            writer.close()
+
+
+class BackgroundServer:
+    """
+    별도 스레드의 이벤트 루프에서 QuoteServer 실행 (테스트/벤치마크용)
+
+    with BackgroundServer(executor="thread") as server:
+        url = server.url
+    """
+
+    def __init__(self, **kwargs):
+        kwargs.setdefault("port", 0)
+        self.server = QuoteServer(**kwargs)
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.server.host}:{self.server.port}"
+
+    def start(self) -> "BackgroundServer":
+        self._thread.start()
+        asyncio.run_coroutine_threadsafe(self.server.start(), self._loop).result()
+        return self
+
+    def stop(self) -> None:
+        asyncio.run_coroutine_threadsafe(self.server.close(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+        self._loop.close()
+
+    def __enter__(self) -> "BackgroundServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="로컬 HTTP 견적 서비스")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--cache-size", type=int, default=DEFAULT_MAX_ENTRIES, help="견적 캐시 최대 항목 수")
+    parser.add_argument("--cache-ttl", type=float, default=DEFAULT_TTL, help="견적 캐시 유효 시간 (초)")
+    parser.add_argument("--cache-disk", default=None, help="워커 간 공유 sqlite 캐시 파일 (선택)")
+    parser.add_argument("--shared-plane", action="store_true",
+                        help="컴파일 배열을 공유 메모리에 게시하고 프로세스 워커가 매핑 (--executor process)")
+    parser.add_argument("--plane-refresh", type=float, default=30.0,
+                        help="--shared-plane 에서 데이터 변경 확인 간격 (초, 0이면 확인 안 함)")
+    args = parser.parse_args()
+
+    configure_quote_cache(max_entries=args.cache_size, ttl=args.cache_ttl, disk_path=args.cache_disk)
+
+    server = QuoteServer(args.host, args.port, args.executor, args.workers,
+                         shared=args.shared_plane, plane_refresh=args.plane_refresh)
+    try:
+        asyncio.run(server.serve_forever())
+    except KeyboardInterrupt:
+        print("\n서버 종료")
+
+
+if __name__ == "__main__":
+    main()
@@ -3,11 +3,26 @@ app.py
 Streamlit 기반 운용리스 계산기 UI
 """
 
+import json
+import time
+
+import pandas as pd
 import streamlit as st
-from core.calculator import calculate_operating_lease, calculate_auto_tax
-from core.mg_calculator import MGLeaseCalculator
-from data import vehicle_master, residual_rates, interest_rates
+from data import vehicle_master, residual_rates
 from core.validator import validate_lease_input, ValidationError
+from core.catalog_stats import get_capital_stats, get_catalog_summary
+from core.comparison import compare_all
+from core.quote_cache import get_quote_cache
+from core.quote_pipeline import build_quote_flow
+from core.registry import display_name, get_capital
+from core.scenario_grid import build_scenario_grid
+from data.warmup import warm_all
+from utils import tracing
+from utils.cache_stats import CacheStats
+from utils.dataflow import Dataflow
+
+# 이번 스크립트 실행(rerun) 시작 시각
+_RUN_STARTED = time.perf_counter()
 
 # 페이지 설정
 st.set_page_config(
@@ -17,6 +32,14 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
+# 구간 계측 (사이드바 "🔍 구간 계측"에서 켜면 이번 실행 전체를 기록)
+_stale_trace = st.session_state.pop("run_trace", None)
+if _stale_trace is not None:
+    # 예외로 끝난 이전 실행의 trace 정리
+    _stale_trace.finish()
+if st.session_state.get("trace_enabled", False):
+    st.session_state["run_trace"] = tracing.trace("rerun", log=True).start()
+
 # 스타일
 st.markdown("""
 <style>
@@ -33,6 +56,197 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
+# ========================================
+# 캐시 레이어
+# ========================================
+# - 공유 데이터/계산기 인스턴스: st.cache_resource (프로세스당 1개, 복사 없음)
+# - 목록/가격/견적 결과: st.cache_data (정규화된 입력 키, 크기 제한 + TTL)
+
+QUOTE_CACHE_TTL = 60 * 60  # 견적 결과 1시간
+QUOTE_CACHE_MAX_ENTRIES = 1_000
+LIST_CACHE_MAX_ENTRIES = 500
+
+
+@st.cache_resource
+def _get_cache_stats() -> CacheStats:
+    """프로세스 공유 캐시 통계"""
+    return CacheStats()
+
+
+@st.cache_resource(show_spinner="데이터 로드 중...")
+def _warm_data() -> bool:
+    """공유 데이터 구조 워밍업 (프로세스당 1회, 캐피탈별 데이터는 선택될 때 적재)"""
+    warm_all(capital_ids=[])
+    return True
+
+
+def _cache_call(name: str, cached_fn, *args):
+    """캐시 함수 호출 + 호출 수 기록 (캐시 끄기 선택 시 원본 실행)"""
+    _get_cache_stats().record_call(name)
+    use_cache = st.session_state.get("use_cache", True)
+    with tracing.span(f"app.{name}", cached=use_cache):
+        if use_cache:
+            return cached_fn(*args)
+        return cached_fn.__wrapped__(*args)
+
+
+@st.cache_data(max_entries=LIST_CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_brands(capital_id):
+    _get_cache_stats().record_miss("brands")
+    return vehicle_master.get_brands(capital_id=capital_id)
+
+
+@st.cache_data(max_entries=LIST_CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_models(brand, capital_id):
+    _get_cache_stats().record_miss("models")
+    return vehicle_master.get_models_by_brand(brand, capital_id=capital_id)
+
+
+@st.cache_data(max_entries=LIST_CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_trims(brand, model, capital_id):
+    _get_cache_stats().record_miss("trims")
+    return vehicle_master.get_trims_by_brand_model(brand, model, capital_id=capital_id)
+
+
+@st.cache_data(max_entries=LIST_CACHE_MAX_ENTRIES, show_spinner=False)
+def _cached_master_price(brand, model, grade):
+    _get_cache_stats().record_miss("master_price")
+    return vehicle_master.get_price_from_master(brand=brand, model=model, grade=grade)
+
+
+@st.cache_data(max_entries=QUOTE_CACHE_MAX_ENTRIES, ttl=QUOTE_CACHE_TTL, show_spinner=False)
+def _cached_compare(brand, model, trim, contract_months, annual_mileage,
+                    down_payment_percent, vehicle_price, capital_ids, use_cache):
+    _get_cache_stats().record_miss("compare")
+    return compare_all(
+        vehicle={'brand': brand, 'model': model, 'trim': trim},
+        contract_months=contract_months,
+        annual_mileage=annual_mileage,
+        down_payment_percent=down_payment_percent,
+        vehicle_price=vehicle_price,
+        capital_ids=list(capital_ids),
+        use_cache=use_cache
+    )
+
+
+@st.cache_data(max_entries=QUOTE_CACHE_MAX_ENTRIES, ttl=QUOTE_CACHE_TTL, show_spinner=False)
+def _cached_scenario_grid(capital_id, vehicle_id, down_payment):
+    """기간 × 주행거리 × 잔가옵션 전체 매트릭스 (한 번에 계산)"""
+    _get_cache_stats().record_miss("scenario_grid")
+    return build_scenario_grid(capital_id, vehicle_id, down_payment=down_payment)
+
+
+def _quote_flow() -> Dataflow:
+    """세션별 견적 데이터플로 (위젯이 바뀌면 의존 노드만 재실행)"""
+    if "quote_flow" not in st.session_state:
+        st.session_state["quote_flow"] = build_quote_flow(
+            grid_builder=lambda capital_id, vehicle_id, down_payment: _cache_call(
+                "scenario_grid", _cached_scenario_grid, capital_id, vehicle_id, down_payment
+            )
+        )
+    return st.session_state["quote_flow"]
+
+
+def _run_flow(targets, **inputs):
+    """데이터플로 실행 + 이번 실행에서 재계산된 노드 기록 (캐시 끄면 매번 전체 재계산)"""
+    flow = _quote_flow()
+    if not st.session_state.get("use_cache", True):
+        flow.invalidate()
+    values = flow.run(targets, **inputs)
+    st.session_state.setdefault("flow_executed", []).extend(flow.last_executed)
+    return values
+
+
+def _finish_run() -> None:
+    """이번 실행 시간 기록 + 사이드바에 캐시 통계/구간 계측 표시"""
+    stats = _get_cache_stats()
+    label = "cached" if st.session_state.get("use_cache", True) else "uncached"
+    stats.record_rerun(time.perf_counter() - _RUN_STARTED, label)
+    run_trace = st.session_state.pop("run_trace", None)
+    if run_trace is not None:
+        run_trace.attrs['cache'] = label
+        run_trace.finish()
+
+    with st.sidebar.expander("⚙️ 캐시 통계"):
+        st.checkbox("캐시 사용", value=True, key="use_cache",
+                    help="끄면 캐시 없이 계산합니다 (전후 지연시간 비교용)")
+
+        snapshot = stats.snapshot()
+        cache_rows = [
+            {
+                "캐시": name,
+                "호출": s['calls'],
+                "적중": s['hits'],
+                "적중률": f"{s['hit_rate']:.0%}"
+            }
+            for name, s in snapshot['caches'].items()
+        ]
+        if cache_rows:
+            st.table(cache_rows)
+
+        for run_label, r in snapshot['reruns'].items():
+            st.caption(
+                f"재실행 ({run_label}, {r['count']}회): "
+                f"최근 {r['last'] * 1000:.0f}ms · p50 {r['p50'] * 1000:.0f}ms · p95 {r['p95'] * 1000:.0f}ms"
+            )
+
+        executed = st.session_state.pop("flow_executed", None)
+        if executed is not None:
+            flow_stats = _quote_flow().stats()
+            reused = sum(s['hits'] for s in flow_stats.values())
+            st.caption(f"견적 데이터플로: 이번 실행 재계산 {', '.join(executed) or '없음'} · 누적 재사용 {reused:,}회")
+
+        qc = get_quote_cache().stats()
+        st.caption(
+            f"공유 견적 캐시: {qc['entries']:,}/{qc['max_entries']:,}개 · "
+            f"적중률 {qc['hit_rate']:.0%} (적중 {qc['hits']:,} / 미스 {qc['misses']:,} / 제거 {qc['evictions']:,})"
+        )
+
+    _render_trace_panel(run_trace)
+
+
+def _render_trace_panel(run_trace) -> None:
+    """사이드바 구간 계측 패널 (구간별 시간 표, 카운터, JSON 로그, Chrome trace 내려받기)"""
+    with st.sidebar.expander("🔍 구간 계측"):
+        st.checkbox("구간 계측", value=False, key="trace_enabled",
+                    help="켜면 다음 실행부터 구간별 시간을 기록합니다 (꺼져 있으면 계측 비용 없음)")
+        if run_trace is None:
+            return
+
+        summary = run_trace.summary()
+        st.caption(f"이번 실행 {run_trace.duration_ms:.1f}ms · "
+                   f"기타 (렌더링 등) {summary[run_trace.name]['self_ms']:.1f}ms")
+        st.table([
+            {
+                "구간": name,
+                "호출": s['count'],
+                "전체(ms)": f"{s['total_ms']:.2f}",
+                "자체(ms)": f"{s['self_ms']:.2f}",
+                "최대(ms)": f"{s['max_ms']:.2f}"
+            }
+            for name, s in summary.items() if name != run_trace.name
+        ])
+        if run_trace.counters:
+            st.caption(" · ".join(f"{name} {value:,}" for name, value in run_trace.counters.items()))
+
+        st.download_button(
+            "Chrome trace 내려받기",
+            data=json.dumps(run_trace.to_chrome_trace(), ensure_ascii=False),
+            file_name=f"trace_{int(run_trace.started_at)}.json",
+            mime="application/json",
+            help="chrome://tracing 또는 https://ui.perfetto.dev 에서 엽니다"
+        )
+        st.code(run_trace.to_log_line(), language="json")
+
+
+def _stop() -> None:
+    """실행 시간 기록 후 스크립트 중단 (st.stop 대체)"""
+    _finish_run()
+    st.stop()
+
+
+_warm_data()
+
 # 제목
 st.title("🚗 운용리스 계산기 v2")
 st.markdown("---")
@@ -47,14 +261,10 @@ with st.sidebar:
 
     if not available_capitals:
         st.error("❌ 캐피탈 데이터가 없습니다!")
-        st.stop()
+        _stop()
 
-    capital_display = {
-        "meritz_capital": "메리츠캐피탈",
-        "nh_capital": "NH농협캐피탈",
-        "mg_capital": "MG새마을금고",
-        "compare": "🔍 비교 (모든 캐피탈)"
-    }
+    capital_display = {capital_id: display_name(capital_id) for capital_id in available_capitals}
+    capital_display["compare"] = "🔍 비교 (모든 캐피탈)"
 
     # 비교 옵션 추가
     capital_options = available_capitals + ["compare"]
@@ -71,39 +281,14 @@ with st.sidebar:
         # 비교 모드: 잔가 옵션 숨김
         grade_option = None  # 비교 시 각 캐피탈별 최적 옵션 사용
         st.info("💡 비교 모드: 각 캐피탈별 최적 잔가 옵션으로 계산됩니다")
-    elif selected_capital == "mg_capital":
-        # MG Capital: SNK 옵션만
-        grade_options = ['snk_premium', 'snk_normal']
-        grade_option_display = {
-            'snk_premium': 'SNK 고잔가 (+8%)',
-            'snk_normal': 'SNK 일반잔가'
-        }
-        default_index = 0  # 고잔가 기본
-
-        grade_option = st.selectbox(
-            "잔가 옵션",
-            options=grade_options,
-            index=default_index,
-            format_func=lambda x: grade_option_display.get(x, x),
-            key="grade_option"
-        )
     else:
-        # Meritz Capital: APS/West/VGS 옵션
-        grade_options = ['aps_premium', 'aps_normal', 'west_premium', 'west_normal', 'vgs_premium', 'vgs_normal']
-        grade_option_display = {
-            'aps_premium': 'APS 고잔가 (최대)',
-            'aps_normal': 'APS 일반잔가',
-            'west_premium': 'West 고잔가',
-            'west_normal': 'West 일반잔가',
-            'vgs_premium': 'VGS 고잔가',
-            'vgs_normal': 'VGS 일반잔가'
-        }
-        default_index = 0
+        # 캐피탈 선언(core.registry)의 잔가 옵션 (첫 항목이 기본, 예: MG는 SNK, 메리츠는 APS/West/VGS)
+        grade_option_display = get_capital(selected_capital).grade_options
 
         grade_option = st.selectbox(
             "잔가 옵션",
-            options=grade_options,
-            index=default_index,
+            options=list(grade_option_display),
+            index=0,
             format_func=lambda x: grade_option_display.get(x, x),
             key="grade_option"
         )
@@ -115,7 +300,7 @@ with st.sidebar:
     vehicle_capital_id = None if selected_capital == "compare" else selected_capital
 
     # 1-1. 브랜드 선택 (capital별)
-    brands = vehicle_master.get_brands(capital_id=vehicle_capital_id)
+    brands = _cache_call("brands", _cached_brands, vehicle_capital_id)
     selected_brand = st.selectbox(
         "브랜드",
         options=brands,
@@ -123,11 +308,11 @@ with st.sidebar:
     )
 
     # 1-2. 기본 모델 선택 (capital별)
-    models = vehicle_master.get_models_by_brand(selected_brand, capital_id=vehicle_capital_id)
+    models = _cache_call("models", _cached_models, selected_brand, vehicle_capital_id)
 
     if not models:
         st.warning(f"⚠ {selected_brand}의 모델이 없습니다")
-        st.stop()
+        _stop()
 
     selected_model = st.selectbox(
         "기본 모델",
@@ -136,11 +321,11 @@ with st.sidebar:
     )
 
     # 1-3. 세부 트림 선택 (capital별)
-    trims = vehicle_master.get_trims_by_brand_model(selected_brand, selected_model, capital_id=vehicle_capital_id)
+    trims = _cache_call("trims", _cached_trims, selected_brand, selected_model, vehicle_capital_id)
 
     if not trims:
         st.warning(f"⚠ {selected_brand} {selected_model}의 트림이 없습니다")
-        st.stop()
+        _stop()
 
     # 트림 선택 (가격 정보 포함)
     trim_options = {
@@ -155,7 +340,8 @@ with st.sidebar:
     )
 
     selected_vehicle_id = trim_options[selected_trim_display]
-    vehicle = vehicle_master.get_vehicle(selected_vehicle_id, capital_id=vehicle_capital_id)
+    vehicle = _run_flow(["vehicle"], vehicle_id=selected_vehicle_id,
+                        vehicle_capital_id=vehicle_capital_id)["vehicle"]
 
     st.info(f"💰 선택한 차량: {vehicle['display_name']}")
     if vehicle['price']:
@@ -163,7 +349,7 @@ with st.sidebar:
     else:
         st.caption(f"   차량가: 가격 미정")
         st.error("❌ 이 차량은 가격 정보가 없어 계산할 수 없습니다")
-        st.stop()
+        _stop()
 
     # 2. 계약 조건
     st.subheader("2️⃣ 계약 조건")
@@ -220,190 +406,37 @@ if calculate_button:
             st.caption("💡 모든 캐피탈에 대해 master_carinfo.xlsx의 신뢰할 수 있는 차량 가격을 사용합니다")
             st.markdown("---")
 
-            comparison_results = []
-
             # master_carinfo에서 신뢰할 수 있는 차량 가격 조회
-            master_price = vehicle_master.get_price_from_master(
-                brand=vehicle['brand'],
-                model=vehicle['model'],
-                grade=vehicle['trim']
+            master_price = _cache_call(
+                "master_price", _cached_master_price,
+                vehicle['brand'], vehicle['model'], vehicle['trim']
             )
 
             if not master_price:
                 st.error(f"❌ master_carinfo에서 차량 가격을 찾을 수 없습니다: {vehicle['brand']} {vehicle['model']} {vehicle['trim']}")
                 st.info("💡 비교 모드는 master_carinfo.xlsx에 등록된 차량만 지원합니다.")
-                st.stop()
+                _stop()
 
             st.markdown(f"**차량 가격:** {master_price:,}원 (master_carinfo 기준)")
             st.markdown("---")
 
-            # 모든 캐피탈에 대해 계산 (동일한 master_price 사용)
-            for cap_id in available_capitals:
-                try:
-                    # 캐피탈별 차량 찾기 (잔존율 조회용)
-                    cap_vehicle = vehicle_master.find_vehicle_by_name(
-                        brand=vehicle['brand'],
-                        model=vehicle['model'],
-                        trim=vehicle['trim'],
-                        capital_id=cap_id
-                    )
-
-                    if not cap_vehicle:
-                        # 해당 캐피탈에 차량 없음
-                        raise ValueError(f"{vehicle['brand']} {vehicle['model']} {vehicle['trim']} 차량을 찾을 수 없습니다")
-
-                    cap_vehicle_id = cap_vehicle['id']
-
-                    # 가격은 master_carinfo의 신뢰할 수 있는 가격 사용
-                    vehicle_price_for_calc = master_price
-
-                    # 캐피탈별 최적 잔가 옵션 선택
-                    if cap_id == "mg_capital":
-                        optimal_grade = 'snk_premium'  # MG는 고잔가 우선
-                    else:
-                        # 메리츠/NH는 APS 고잔가 우선
-                        optimal_grade = 'aps_premium'
-
-                    # 잔존율 조회
-                    try:
-                        residual_rate = residual_rates.get_residual_rate(
-                            cap_id, cap_vehicle_id,
-                            contract_months, annual_mileage,
-                            grade_option=optimal_grade
-                        )
-                    except ValueError:
-                        # 고잔가 실패 시 일반잔가 시도
-                        if cap_id == "mg_capital":
-                            optimal_grade = 'snk_normal'
-                        else:
-                            optimal_grade = 'west_normal'
-
-                        try:
-                            residual_rate = residual_rates.get_residual_rate(
-                                cap_id, cap_vehicle_id,
-                                contract_months, annual_mileage,
-                                grade_option=optimal_grade
-                            )
-                        except ValueError:
-                            # 잔존율 없으면 건너뛰기
-                            continue
-
-                    # 금리 조회 (master_price 사용)
-                    annual_rate = interest_rates.get_interest_rate(
-                        capital_id=cap_id,
-                        vehicle_price=vehicle_price_for_calc,
-                        brand=cap_vehicle['brand'],
-                        is_import=cap_vehicle['is_import'],
-                        is_ev=(cap_vehicle['engine_cc'] == 0),
-                        contract_months=contract_months
-                    )
-
-                    # 선납금 계산 (master_price 기준)
-                    cap_down_payment = vehicle_price_for_calc * (down_payment_percent / 100)
-
-                    # 캐피탈별 계산 (master_price 사용)
-                    if cap_id == "mg_capital":
-                        # MG Capital: PMT 방식
-                        mg_calc = MGLeaseCalculator()
-                        mg_acq_cost = mg_calc._calculate_acquisition_cost(
-                            vehicle_price=vehicle_price_for_calc,
-                            region="서울",
-                            is_ev=(cap_vehicle['engine_cc'] == 0),
-                            is_hybrid=False,
-                            company_lease=False
-                        )
-                        down_payment_rate = cap_down_payment / mg_acq_cost['total'] if cap_down_payment > 0 else 0.0
-
-                        mg_result = mg_calc.calculate(
-                            vehicle_price=vehicle_price_for_calc,
-                            residual_rate=residual_rate,
-                            contract_months=contract_months,
-                            annual_mileage=annual_mileage,
-                            annual_interest_rate=annual_rate,
-                            down_payment_rate=down_payment_rate,
-                            region="서울",
-                            is_ev=(cap_vehicle['engine_cc'] == 0),
-                            is_hybrid=False
-                        )
-                        monthly_payment = mg_result['monthly_payment']
-                        calc_details = mg_result  # 상세 정보 저장
-                    else:
-                        # Meritz/NH Capital: 정액법 방식
-                        annual_car_tax = calculate_auto_tax(
-                            engine_cc=cap_vehicle['engine_cc'],
-                            is_commercial=False
-                        )
-
-                        taxable_base = vehicle_price_for_calc / 1.1
-                        acquisition_tax = taxable_base * 0.07
-                        registration_fee = 100_000
-                        acquisition_cost_total = vehicle_price_for_calc + acquisition_tax + registration_fee
-
-                        result = calculate_operating_lease(
-                            vehicle_price=vehicle_price_for_calc,
-                            contract_months=contract_months,
-                            down_payment=cap_down_payment,
-                            residual_rate=residual_rate,
-                            annual_rate=annual_rate,
-                            acquisition_tax_rate=0.0,
-                            registration_fee=registration_fee,
-                            annual_car_tax=annual_car_tax,
-                            method='simple',
-                            acquisition_cost=acquisition_cost_total
-                        )
-                        monthly_payment = result['monthly_total']
-
-                        # 상세 정보 구조 통일 (MG와 비슷한 형식으로)
-                        calc_details = {
-                            'monthly_payment': result['monthly_total'],
-                            'down_payment': cap_down_payment,
-                            'total_payment': cap_down_payment + (result['monthly_total'] * contract_months),
-                            'residual_value': int(vehicle_price_for_calc * residual_rate),
-                            'acquisition_cost': acquisition_cost_total,
-                            'breakdown': {
-                                'vehicle_price': vehicle_price_for_calc,
-                                'acquisition_tax': int(acquisition_tax),
-                                'registration_fee': registration_fee,
-                                'residual_rate': residual_rate,
-                                'annual_interest_rate': annual_rate,
-                                'contract_months': contract_months,
-                                'annual_mileage': annual_mileage,
-                                'monthly_depreciation': result.get('monthly_depreciation', 0),
-                                'monthly_interest': result.get('monthly_interest', 0),
-                                'monthly_car_tax': result.get('monthly_car_tax', 0),
-                            }
-                        }
-
-                    # 결과 저장
-                    comparison_results.append({
-                        'capital': capital_display.get(cap_id, cap_id),
-                        'capital_id': cap_id,
-                        'monthly_payment': monthly_payment,
-                        'grade_option': optimal_grade,
-                        'residual_rate': residual_rate,
-                        'details': calc_details  # 계산 상세 정보
-                    })
-
-                except Exception as e:
-                    # 계산 실패 시 에러 정보 저장
-                    comparison_results.append({
-                        'capital': capital_display.get(cap_id, cap_id),
-                        'capital_id': cap_id,
-                        'monthly_payment': None,
-                        'error': str(e),
-                        'grade_option': None,
-                        'residual_rate': None
-                    })
-                    continue
-
-            # 결과 정렬 (월 납입료 낮은 순, None은 맨 뒤로)
-            comparison_results.sort(key=lambda x: (x['monthly_payment'] is None, x['monthly_payment'] or float('inf')))
+            # 모든 캐피탈에 대해 병렬 계산 (동일한 master_price 사용)
+            comparison_results = _cache_call(
+                "compare", _cached_compare,
+                vehicle['brand'], vehicle['model'], vehicle['trim'],
+                contract_months, annual_mileage,
+                int(down_payment_percent), int(master_price),
+                tuple(sorted(available_capitals)),
+                st.session_state.get("use_cache", True)
+            )
+            for item in comparison_results:
+                item['capital'] = capital_display.get(item['capital_id'], item['capital_id'])
 
             # 결과 표시
             if not comparison_results:
                 st.error("❌ 선택한 차량에 대해 계산 가능한 캐피탈이 없습니다.")
                 st.info("💡 다른 차량이나 계약 조건을 선택해주세요.")
-                st.stop()
+                _stop()
 
             # 성공한 계산 개수
             success_count = sum(1 for item in comparison_results if item['monthly_payment'] is not None)
@@ -501,7 +534,7 @@ if calculate_button:
 
                 st.markdown("---")
 
-            st.stop()
+            _stop()
 
         # 단일 캐피탈 모드
         try:
@@ -518,109 +551,42 @@ if calculate_button:
                 for warning in validation['warnings']:
                     st.warning(f"⚠ {warning}")
 
+            flow_inputs = dict(
+                capital_id=selected_capital,
+                vehicle_id=selected_vehicle_id,
+                vehicle_capital_id=vehicle_capital_id,
+                grade_option=grade_option,
+                contract_months=contract_months,
+                annual_mileage=annual_mileage,
+                down_payment_percent=down_payment_percent
+            )
+
             # 잔존율 조회
             try:
-                residual_rate = residual_rates.get_residual_rate(
-                    selected_capital, selected_vehicle_id,
-                    contract_months, annual_mileage,
-                    grade_option=grade_option
-                )
+                residual_rate = _run_flow(["residual"], **flow_inputs)["residual"]
             except ValueError as e:
                 st.error(f"❌ 잔존율 데이터 없음: {e}")
                 st.info("💡 다른 계약 기간이나 주행거리를 선택해주세요")
-                st.stop()
-
-            # 금리 조회
-            annual_rate = interest_rates.get_interest_rate(
-                capital_id=selected_capital,
-                vehicle_price=vehicle['price'],
-                brand=vehicle['brand'],
-                is_import=vehicle['is_import'],
-                is_ev=(vehicle['engine_cc'] == 0),
-                contract_months=contract_months
-            )
+                _stop()
 
-            # 자동차세 계산
-            annual_car_tax = calculate_auto_tax(
-                engine_cc=vehicle['engine_cc'],
-                is_commercial=False  # 개인
-            )
+            # 금리 → 취득원가 → 월 납입료 (캐피탈별 계산 방식은 core.quote_pipeline)
+            flow_values = _run_flow(["rate", "acquisition", "payment"], **flow_inputs)
+            annual_rate = flow_values["rate"]
+            result = flow_values["payment"]
 
-            # 캐피탈별 계산 방식 선택
-            if selected_capital == "mg_capital":
-                # MG Capital: PMT 방식
-                mg_calc = MGLeaseCalculator()
-
-                # 취득원가 먼저 계산 (down_payment_rate 계산용)
-                mg_acq_cost = mg_calc._calculate_acquisition_cost(
-                    vehicle_price=vehicle['price'],
-                    region="서울",
-                    is_ev=(vehicle['engine_cc'] == 0),
-                    is_hybrid=False,
-                    company_lease=False
-                )
-                down_payment_rate = down_payment / mg_acq_cost['total'] if down_payment > 0 else 0.0
-
-                mg_result = mg_calc.calculate(
-                    vehicle_price=vehicle['price'],
-                    residual_rate=residual_rate,
-                    contract_months=contract_months,
-                    annual_mileage=annual_mileage,
-                    annual_interest_rate=annual_rate,
-                    down_payment_rate=down_payment_rate,
-                    region="서울",
-                    is_ev=(vehicle['engine_cc'] == 0),
-                    is_hybrid=False
-                )
-
-                # MG 결과를 Meritz 형식으로 변환
-                result = {
-                    'monthly_total': mg_result['monthly_payment'],
-                    'monthly_depreciation': (mg_result['financed_amount'] - mg_result['residual_value']) // contract_months,
-                    'monthly_finance': mg_result['monthly_payment'] - ((mg_result['financed_amount'] - mg_result['residual_value']) // contract_months),
-                    'monthly_tax': 0,
-                    'monthly_registration': 0,
-                    'monthly_car_tax': mg_result['monthly_car_tax'],
-                    'total_payment': mg_result['total_payment'],
-                    'total_interest': mg_result['total_payment'] - mg_result['down_payment'] - mg_result['financed_amount'] + mg_result['residual_value'],
-                    'residual_value': mg_result['residual_value'],
-                    'effective_vehicle_cost': mg_result['net_vehicle_cost']
-                }
-
-                # MG는 취득원가 계산이 다름 (VAT 제외 방식)
-                taxable_base = vehicle['price'] / 1.1
-                acquisition_tax = mg_result['breakdown']['acquisition_tax']
-                registration_fee = 0  # MG는 0원
-                acquisition_cost_total = mg_result['acquisition_cost']
-
-            else:
-                # Meritz Capital: 정액법 방식
-                # 과세표준 방식 (메리츠 엑셀과 동일)
-                taxable_base = vehicle['price'] / 1.1  # VAT 제외
-                acquisition_tax_rate = 0.07  # 개인 7%
-                acquisition_tax = taxable_base * acquisition_tax_rate
-                registration_fee = 100_000  # 등록비
-                acquisition_cost_total = vehicle['price'] + acquisition_tax + registration_fee
-
-                result = calculate_operating_lease(
-                    vehicle_price=vehicle['price'],
-                    contract_months=contract_months,
-                    down_payment=down_payment,
-                    residual_rate=residual_rate,
-                    annual_rate=annual_rate,
-                    acquisition_tax_rate=0.0,  # 취득세는 이미 취득원가에 포함됨
-                    registration_fee=registration_fee,
-                    annual_car_tax=annual_car_tax,
-                    method='simple',
-                    acquisition_cost=acquisition_cost_total  # 하이브리드 방식
-                )
+            acquisition = flow_values["acquisition"]
+            annual_car_tax = acquisition['annual_car_tax']
+            taxable_base = acquisition['taxable_base']
+            acquisition_tax = acquisition['acquisition_tax']
+            registration_fee = acquisition['registration_fee']
+            acquisition_cost_total = acquisition['total']
 
         except ValidationError as e:
             st.error(f"❌ 입력 오류: {str(e)}")
-            st.stop()
+            _stop()
         except Exception as e:
             st.error(f"❌ 계산 오류: {str(e)}")
-            st.stop()
+            _stop()
 
     # ========================================
     # 견적서 스타일 결과 표시
@@ -788,46 +754,19 @@ if calculate_button:
     # 5-1. 기간별 비교
     st.markdown("**📊 기간별 비교** (주행거리: {:,}km/년)".format(annual_mileage))
 
-    period_comparison = []
-    for period in [24, 36, 48, 60]:
-        try:
-            temp_rate = residual_rates.get_residual_rate(
-                selected_capital, selected_vehicle_id, period, annual_mileage,
-                grade_option=grade_option
-            )
-            temp_annual_rate = interest_rates.get_interest_rate(
-                capital_id=selected_capital,
-                vehicle_price=vehicle['price'],
-                brand=vehicle['brand'],
-                is_import=vehicle['is_import'],
-                is_ev=(vehicle['engine_cc'] == 0),
-                contract_months=period
-            )
-            temp_result = calculate_operating_lease(
-                vehicle_price=vehicle['price'],
-                contract_months=period,
-                down_payment=down_payment,
-                residual_rate=temp_rate,
-                annual_rate=temp_annual_rate,
-                acquisition_tax_rate=0.0,  # 취득세는 이미 취득원가에 포함됨
-                registration_fee=100_000,
-                annual_car_tax=annual_car_tax,
-                method='simple',
-                acquisition_cost=acquisition_cost_total
-            )
+    tables = _run_flow(["scenario_grid", "grid_option", "period_rows", "mileage_rows"], **flow_inputs)
+    grid, grid_option = tables["scenario_grid"], tables["grid_option"]
 
-            # 현재 선택된 기간 표시
-            period_mark = " ⭐" if period == contract_months else ""
-
-            period_comparison.append({
-                "계약기간": f"{period}개월{period_mark}",
-                "잔존율": f"{temp_rate:.1%}",
-                "월 리스료": f"{temp_result['monthly_total']:,}원",
-                "총 납부액": f"{temp_result['total_payment']:,}원",
-                "총 이자": f"{temp_result['total_interest']:,}원"
-            })
-        except:
-            pass
+    period_comparison = [
+        {
+            "계약기간": f"{row['contract_months']}개월" + (" ⭐" if row['contract_months'] == contract_months else ""),
+            "잔존율": f"{row['residual_rate']:.1%}" + (f" ({row['grade_option']})" if row['grade_option'] != grid_option else ""),
+            "월 리스료": f"{row['monthly_payment']:,.0f}원",
+            "총 납부액": f"{row['total_payment']:,.0f}원",
+            "총 이자": f"{row['total_interest']:,.0f}원"
+        }
+        for row in tables["period_rows"]
+    ]
 
     if period_comparison:
         st.table(period_comparison)
@@ -837,42 +776,34 @@ if calculate_button:
     # 5-2. 주행거리별 비교
     st.markdown("**🚗 주행거리별 비교** (계약기간: {}개월)".format(contract_months))
 
-    mileage_comparison = []
-    for mileage in [10000, 15000, 20000, 30000]:
-        try:
-            temp_rate = residual_rates.get_residual_rate(
-                selected_capital, selected_vehicle_id, contract_months, mileage,
-                grade_option=grade_option
-            )
-            temp_result = calculate_operating_lease(
-                vehicle_price=vehicle['price'],
-                contract_months=contract_months,
-                down_payment=down_payment,
-                residual_rate=temp_rate,
-                annual_rate=annual_rate,
-                acquisition_tax_rate=0.0,  # 취득세는 이미 취득원가에 포함됨
-                registration_fee=100_000,
-                annual_car_tax=annual_car_tax,
-                method='simple',
-                acquisition_cost=acquisition_cost_total
-            )
-
-            # 현재 선택된 주행거리 표시
-            mileage_mark = " ⭐" if mileage == annual_mileage else ""
-
-            mileage_comparison.append({
-                "연간주행거리": f"{mileage:,}km{mileage_mark}",
-                "잔존율": f"{temp_rate:.1%}",
-                "월 리스료": f"{temp_result['monthly_total']:,}원",
-                "총 납부액": f"{temp_result['total_payment']:,}원",
-                "총 이자": f"{temp_result['total_interest']:,}원"
-            })
-        except:
-            pass
+    mileage_comparison = [
+        {
+            "연간주행거리": f"{row['annual_mileage']:,}km" + (" ⭐" if row['annual_mileage'] == annual_mileage else ""),
+            "잔존율": f"{row['residual_rate']:.1%}" + (f" ({row['grade_option']})" if row['grade_option'] != grid_option else ""),
+            "월 리스료": f"{row['monthly_payment']:,.0f}원",
+            "총 납부액": f"{row['total_payment']:,.0f}원",
+            "총 이자": f"{row['total_interest']:,.0f}원"
+        }
+        for row in tables["mileage_rows"]
+    ]
 
     if mileage_comparison:
         st.table(mileage_comparison)
 
+    # 5-3. 전체 매트릭스 (추가 계산 없이 그리드에서 바로 표시)
+    if grid_option:
+        with st.expander("🗺️ 전체 조건 매트릭스 (월 리스료)"):
+            g = grid['grade_options'].index(grid_option)
+            matrix = pd.DataFrame(
+                grid['monthly_payment'][:, :, g],
+                index=[f"{t}개월" for t in grid['terms']],
+                columns=[f"{m:,}km" for m in grid['mileages']]
+            )
+            filled = int((grid['available'][:, :, g] & (grid['applied_grade_option'][:, :, g] != grid_option)).sum())
+            st.caption(f"잔가 옵션: {grid_option} · 데이터 없는 조건은 빈칸"
+                       + (f" · {filled}개 조건은 다른 잔가 옵션의 잔존율 적용" if filled else ""))
+            st.dataframe(matrix.style.format("{:,.0f}원", na_rep=""), use_container_width=True)
+
     # 참고사항
     st.markdown("---")
     st.info(f"""
@@ -893,29 +824,50 @@ else:
     st.markdown("---")
     st.subheader("📊 데이터 현황")
 
+    catalog_stats = get_catalog_summary()  # 데이터 버전당 1회 집계 (캐피탈별 데이터는 적재하지 않음)
+    totals = catalog_stats['totals']
+
     col1, col2, col3 = st.columns(3)
 
     with col1:
-        vehicle_count = len(vehicle_master.get_all_vehicle_ids())
-        st.metric("등록된 차량 수", f"{vehicle_count:,}대")
+        st.metric("등록된 차량 수", f"{totals['vehicles']:,}대")
 
     with col2:
-        capital_count = len(residual_rates.get_available_capitals())
-        st.metric("등록된 캐피탈 수", f"{capital_count}개")
+        st.metric("등록된 캐피탈 수", f"{totals['capitals']}개")
 
     with col3:
-        brand_count = len(vehicle_master.get_brands())
-        st.metric("등록된 브랜드 수", f"{brand_count}개")
+        st.metric("등록된 브랜드 수", f"{totals['brands']}개")
+
+    # 캐피탈별 잔존율 커버리지 (선택한 캐피탈만 집계, 나머지는 파일 갱신 시각만)
+    capital_rows = []
+    for capital_id, files in catalog_stats['capitals'].items():
+        row = {"캐피탈": capital_display.get(capital_id, capital_id),
+               "차량 수": "-", "잔존율 보유": "-", "가격 범위": "-",
+               "잔존율 갱신": files['updated_at']['residual_rates'] or "-"}
+        if capital_id == selected_capital:
+            stats = get_capital_stats(capital_id)
+            coverage = stats['residual_coverage']
+            row.update({
+                "차량 수": f"{stats['vehicles']:,}대",
+                "잔존율 보유": f"{coverage['vehicles']:,}대 ({coverage['ratio']:.0%})",
+                "가격 범위": (f"{stats['price']['min'] / 10000:,.0f}~{stats['price']['max'] / 10000:,.0f}만원"
+                           if stats['price']['min'] else "-"),
+            })
+        capital_rows.append(row)
+    if capital_rows:
+        st.table(capital_rows)
+        st.caption("차량 수/잔존율 커버리지는 사이드바에서 선택한 캐피탈만 표시합니다")
 
     # 브랜드별 통계
     st.markdown("---")
     st.subheader("🏢 브랜드별 차량 수")
 
-    brands = vehicle_master.get_brands()
-    brand_stats = []
-    for brand in brands[:10]:  # 상위 10개
-        count = len(vehicle_master.get_vehicle_list(brand=brand))
-        brand_stats.append({"브랜드": brand, "차량 수": f"{count}대"})
+    brand_stats = [
+        {"브랜드": brand, "차량 수": f"{stats['vehicles']}대"}
+        for brand, stats in list(catalog_stats['brands'].items())[:10]  # 상위 10개
+    ]
 
     if brand_stats:
         st.table(brand_stats)
+
+_finish_run()
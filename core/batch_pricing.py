@@ -0,0 +1,236 @@
+"""
+core/batch_pricing.py
+배열 기반(벡터화) 리스료 계산 엔진
+
+calculate_operating_lease / MGLeaseCalculator.calculate 와 같은 순서로
+같은 부동소수점 연산을 수행하므로, 원 단위까지 스칼라 계산과 동일한 결과를 낸다.
+(시나리오 그리드, 예산 검색 등 대량 계산용)
+"""
+
+from typing import Dict
+
+import numpy as np
+import numpy_financial as npf
+
+
+def round_half_even(values, ndigits: int = -3) -> np.ndarray:
+    """
+    파이썬 round(x, ndigits)와 동일한 반올림 (배열)
+
+    np.round는 x / 10**k 에서 오차가 생겨 경계값이 달라질 수 있으므로,
+    몫을 구한 뒤 정확한 나머지로 보정하여 round()와 같은 은행원 반올림을 적용한다.
+
+    Args:
+        values: 입력 배열
+        ndigits: 자릿수 (음수만 지원, 예: -3 = 천원 단위)
+    """
+    if ndigits >= 0:
+        raise ValueError("ndigits는 음수만 지원합니다")
+
+    x = np.asarray(values, dtype=np.float64)
+    unit = 10.0 ** (-ndigits)
+    half = unit / 2
+
+    q = np.rint(x / unit)
+    remainder = x - q * unit  # 근접한 두 값의 차 → 정확한 값
+
+    q = np.where(remainder > half, q + 1, q)
+    q = np.where(remainder < -half, q - 1, q)
+    odd = np.mod(q, 2) != 0
+    q = np.where((remainder == half) & odd, q + 1, q)
+    q = np.where((remainder == -half) & odd, q - 1, q)
+
+    return q * unit
+
+
+def batch_operating_lease(
+    vehicle_price,
+    contract_months,
+    down_payment,
+    residual_rate,
+    annual_rate,
+    acquisition_tax_rate=0.0,
+    registration_fee=200_000,
+    annual_car_tax=0.0,
+    method: str = 'simple',
+    acquisition_cost=None
+) -> Dict[str, np.ndarray]:
+    """
+    calculate_operating_lease 의 배열 버전 (인자는 브로드캐스트 가능)
+
+    Args:
+        acquisition_cost: 취득원가 배열 (None 또는 0/NaN 원소는 미제공으로 처리)
+
+    Returns:
+        Dict[str, np.ndarray]: calculate_operating_lease 와 같은 키
+    """
+    vehicle_price = np.asarray(vehicle_price, dtype=np.float64)
+    n = np.asarray(contract_months, dtype=np.float64)
+    down_payment = np.asarray(down_payment, dtype=np.float64)
+    residual_rate = np.asarray(residual_rate, dtype=np.float64)
+    annual_rate = np.asarray(annual_rate, dtype=np.float64)
+
+    # 하이브리드 방식 (금융은 취득원가, 잔존가치는 차량가 기준)
+    if acquisition_cost is None:
+        has_acq = np.zeros(np.broadcast(vehicle_price, down_payment).shape, dtype=bool)
+        acq = np.zeros_like(has_acq, dtype=np.float64)
+    else:
+        acq = np.asarray(acquisition_cost, dtype=np.float64)
+        has_acq = (acq != 0) & ~np.isnan(acq)
+
+    financed_hybrid = acq - down_payment
+    financed_plain = vehicle_price - down_payment
+    financed = np.where(has_acq, financed_hybrid, financed_plain)
+    residual_value = np.where(has_acq, vehicle_price * residual_rate, financed_plain * residual_rate)
+
+    depreciation = financed - residual_value
+    r = annual_rate / 12
+
+    if method == 'annuity':
+        safe_r = np.where(r == 0, 1.0, r)
+        annuity = depreciation * (safe_r / (1 - (1 + safe_r) ** -n))
+        monthly_depreciation_payment = np.where(r == 0, depreciation / n, annuity)
+        monthly_rv_interest = residual_value * r
+        monthly_base = monthly_depreciation_payment + monthly_rv_interest
+        monthly_finance = monthly_base - (depreciation / n)
+    else:
+        monthly_depreciation = depreciation / n
+        average_balance = (financed + residual_value) / 2
+        monthly_finance = average_balance * r
+        monthly_base = monthly_depreciation + monthly_finance
+
+    monthly_tax = (vehicle_price * acquisition_tax_rate) / n
+    monthly_registration = np.asarray(registration_fee, dtype=np.float64) / n
+    monthly_car_tax = np.asarray(annual_car_tax, dtype=np.float64) / 12
+
+    monthly_total = monthly_base + monthly_tax + monthly_registration + monthly_car_tax
+
+    total_payment = monthly_total * n + down_payment
+    total_interest = monthly_finance * n
+
+    shape = monthly_total.shape
+    return {
+        'monthly_total': round_half_even(monthly_total),
+        'monthly_base': round_half_even(monthly_base),
+        'monthly_depreciation': round_half_even(depreciation / n),
+        'monthly_finance': round_half_even(monthly_finance),
+        'monthly_tax': round_half_even(np.broadcast_to(monthly_tax, shape)),
+        'monthly_registration': round_half_even(np.broadcast_to(monthly_registration, shape)),
+        'monthly_car_tax': round_half_even(np.broadcast_to(monthly_car_tax, shape)),
+        'applied_rate': np.broadcast_to(annual_rate, shape),
+        'residual_value': round_half_even(residual_value),
+        'residual_rate': np.broadcast_to(residual_rate, shape),
+        'total_payment': round_half_even(total_payment),
+        'total_interest': round_half_even(total_interest),
+        'effective_vehicle_cost': round_half_even(total_payment - residual_value),
+    }
+
+
+def batch_auto_tax(engine_cc, is_commercial=True) -> np.ndarray:
+    """calculate_auto_tax 의 배열 버전 (배기량 구간별 같은 식, 영업용 50% 감면)"""
+    cc = np.asarray(engine_cc, dtype=np.float64)
+    base_tax = np.select(
+        [cc == 0, cc <= 1000, cc <= 1600, cc <= 2000],
+        [
+            np.full_like(cc, 100_000),
+            cc * 80,
+            80_000 + (cc - 1000) * 140 / 600,
+            164_000 + (cc - 1600) * 200 / 400,
+        ],
+        default=364_000 + (cc - 2000) * 220 / 1000
+    )
+    return np.where(np.asarray(is_commercial, dtype=bool), base_tax * 0.5, base_tax)
+
+
+def _floor_to(values: np.ndarray, unit: int) -> np.ndarray:
+    """int(x // unit * unit) 와 동일 (양수 기준 내림)"""
+    return np.trunc(np.floor_divide(values, unit) * unit)
+
+
+def batch_mg_acquisition_tax(vehicle_price, is_ev=False, is_hybrid=False) -> np.ndarray:
+    """MGLeaseCalculator._calculate_acquisition_tax 의 배열 버전"""
+    vehicle_price = np.asarray(vehicle_price, dtype=np.float64)
+    is_ev = np.asarray(is_ev, dtype=bool)
+    is_hybrid = np.asarray(is_hybrid, dtype=bool)
+
+    price_excl_vat = vehicle_price / 1.1
+
+    general_tax = _floor_to(price_excl_vat * 0.07, 10)
+    hybrid_tax = _floor_to(price_excl_vat * 0.05, 10)
+
+    discount = np.minimum(_floor_to(price_excl_vat * 0.04, 10), 1400000)
+    ev_tax = np.maximum(general_tax - discount, 0)
+
+    return np.where(is_ev, ev_tax, np.where(is_hybrid, hybrid_tax, general_tax))
+
+
+def batch_mg_lease(
+    vehicle_price,
+    residual_rate,
+    contract_months,
+    annual_interest_rate,
+    down_payment_rate=0.0,
+    is_ev=False,
+    is_hybrid=False
+) -> Dict[str, np.ndarray]:
+    """
+    MGLeaseCalculator.calculate 의 배열 버전 (인자는 브로드캐스트 가능)
+
+    Returns:
+        Dict[str, np.ndarray]: monthly_payment, down_payment, total_payment,
+            residual_value, net_vehicle_cost, acquisition_cost, financed_amount,
+            monthly_car_tax, annual_car_tax, acquisition_tax
+    """
+    vehicle_price = np.asarray(vehicle_price, dtype=np.float64)
+    residual_rate = np.asarray(residual_rate, dtype=np.float64)
+    n = np.asarray(contract_months, dtype=np.float64)
+    annual_interest_rate = np.asarray(annual_interest_rate, dtype=np.float64)
+    down_payment_rate = np.asarray(down_payment_rate, dtype=np.float64)
+    is_ev = np.asarray(is_ev, dtype=bool)
+
+    # 1. 취득원가 (공채/등록비 0원)
+    acquisition_tax = batch_mg_acquisition_tax(vehicle_price, is_ev, is_hybrid)
+    acquisition_cost = vehicle_price + acquisition_tax
+
+    # 2~4. 선납금, 금융 대상, 잔존가치 (int() = 0 방향 절사)
+    down_payment = np.trunc(acquisition_cost * down_payment_rate)
+    financed_amount = acquisition_cost - down_payment
+    residual_value = np.trunc(vehicle_price * residual_rate)
+
+    # 5. PMT (백원 단위 내림)
+    monthly_payment = -npf.pmt(
+        rate=annual_interest_rate / 12,
+        nper=n,
+        pv=financed_amount,
+        fv=-residual_value
+    )
+    monthly_payment = np.floor_divide(np.trunc(monthly_payment), 100) * 100
+
+    # 6~7. 총 납부액, 실차량비용
+    total_payment = down_payment + (monthly_payment * n)
+    net_vehicle_cost = total_payment - residual_value
+
+    # 8. 자동차세
+    annual_car_tax = np.where(is_ev, 130000.0, np.trunc(vehicle_price * 0.0132))
+    monthly_car_tax = np.trunc(annual_car_tax / 12)
+
+    shape = np.broadcast(monthly_payment, annual_car_tax).shape
+    return {
+        'monthly_payment': np.broadcast_to(monthly_payment, shape),
+        'down_payment': np.broadcast_to(down_payment, shape),
+        'total_payment': np.broadcast_to(total_payment, shape),
+        'residual_value': np.broadcast_to(residual_value, shape),
+        'net_vehicle_cost': np.broadcast_to(net_vehicle_cost, shape),
+        'acquisition_cost': np.broadcast_to(acquisition_cost, shape),
+        'financed_amount': np.broadcast_to(financed_amount, shape),
+        'monthly_car_tax': np.broadcast_to(monthly_car_tax, shape),
+        'annual_car_tax': np.broadcast_to(annual_car_tax, shape),
+        'acquisition_tax': np.broadcast_to(acquisition_tax, shape),
+    }
+
+
+def batch_mg_down_payment_rate(down_payment, acquisition_cost) -> np.ndarray:
+    """앱과 동일: 선납금 / 취득원가 (선납금 0이면 0.0)"""
+    down_payment = np.asarray(down_payment, dtype=np.float64)
+    acquisition_cost = np.asarray(acquisition_cost, dtype=np.float64)
+    return np.where(down_payment > 0, down_payment / acquisition_cost, 0.0)
@@ -0,0 +1,480 @@
+"""
+core/batch_quote.py
+대량 견적 배치 엔진 (CSV/Parquet 스트리밍)
+
+입력을 청크 단위로 읽어 프로세스 풀에서 계산하고, 입력 순서대로 결과를 바로 쓴다.
+동시에 처리 중인 청크 수를 제한하므로 파일 크기와 무관하게 메모리가 일정하다.
+청크를 쓸 때마다 체크포인트를 남겨 중단된 작업을 이어서 실행할 수 있다.
+
+단계별 시간:
+    read    - 입력 파싱 (메인 프로세스)
+    resolve - 차량 매칭 + 잔존율 + 금리, 큐브 조회 (워커 합계)
+    price   - 캐피탈별 계산 엔진 (워커 합계)
+    write   - 결과 기록 + 체크포인트 (메인 프로세스)
+"""
+
+import csv
+import json
+import os
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from core.quote import calculate_capital_quote, resolve_residual_rate
+from core.quote_cube import cube_quote
+from data import vehicle_master, interest_rates
+from data.warmup import warm_all
+
+RESULT_COLUMNS = [
+    'monthly_payment', 'total_payment', 'residual_rate',
+    'grade_option', 'annual_rate', 'error'
+]
+STAGES = ['read', 'resolve', 'price', 'write']
+DEFAULT_CHUNK_SIZE = 1000
+
+# 워커 프로세스별 차량 매칭 메모 (캐피탈, 차량 키) → 차량 정보
+_VEHICLE_LOOKUP: Dict[Tuple, Dict] = {}
+
+
+# ========================================
+# 행 단위 계산 (워커)
+# ========================================
+
+def _field(row: Dict, key: str):
+    """빈 문자열/NaN은 None"""
+    value = row.get(key)
+    if value is None or value == "" or (isinstance(value, float) and value != value):
+        return None
+    return value
+
+
+def _resolve_vehicle(capital_id: str, row: Dict) -> Dict:
+    """vehicle_id 또는 brand/model/trim 으로 캐피탈별 차량 조회"""
+    vehicle_id = _field(row, 'vehicle_id')
+    if vehicle_id is not None:
+        key = (capital_id, str(vehicle_id))
+    else:
+        key = (capital_id, _field(row, 'brand'), _field(row, 'model'), _field(row, 'trim'))
+
+    vehicle = _VEHICLE_LOOKUP.get(key)
+    if vehicle is not None:
+        return vehicle
+
+    if vehicle_id is not None:
+        vehicle = {**vehicle_master.get_vehicle(str(vehicle_id), capital_id=capital_id), 'id': str(vehicle_id)}
+    else:
+        if None in key[1:]:
+            raise ValueError("vehicle_id 또는 brand/model/trim 이 필요합니다")
+        vehicle = vehicle_master.find_vehicle_by_name(*key[1:], capital_id=capital_id)
+        if vehicle is None:
+            raise ValueError(f"차량을 찾을 수 없습니다: {' '.join(key[1:])}")
+
+    _VEHICLE_LOOKUP[key] = vehicle
+    return vehicle
+
+
+def quote_row(row: Dict, default_capital: Optional[str], timings: Dict[str, float]) -> Dict:
+    """
+    입력 행 1개 견적
+
+    Args:
+        row: capital_id, vehicle_id 또는 brand/model/trim, contract_months,
+             annual_mileage, down_payment_percent(선택), vehicle_price(선택)
+        default_capital: 행에 capital_id가 없을 때 사용할 캐피탈
+        timings: 단계별 누적 시간 (resolve/price 에 더함)
+
+    Returns:
+        Dict: RESULT_COLUMNS 값
+
+    Raises:
+        ValueError: 입력 누락/차량 또는 잔존율 데이터 없음
+    """
+    started = time.perf_counter()
+
+    capital_id = _field(row, 'capital_id') or default_capital
+    if not capital_id:
+        raise ValueError("capital_id가 없습니다")
+
+    try:
+        contract_months = int(float(row['contract_months']))
+        annual_mileage = int(float(row['annual_mileage']))
+    except (KeyError, TypeError, ValueError):
+        raise ValueError("contract_months/annual_mileage 가 올바르지 않습니다")
+
+    down_payment_percent = float(_field(row, 'down_payment_percent') or 0.0)
+
+    vehicle = _resolve_vehicle(capital_id, row)
+    vehicle_price = float(_field(row, 'vehicle_price') or vehicle['price'])
+
+    # 표준 견적은 사전 계산 큐브에서 조회
+    quote = cube_quote(capital_id, vehicle, vehicle_price, contract_months,
+                       annual_mileage, down_payment_percent)
+    if quote is not None:
+        timings['resolve'] += time.perf_counter() - started
+        return {
+            'monthly_payment': quote['monthly_payment'],
+            'total_payment': quote['details']['total_payment'],
+            'residual_rate': quote['residual_rate'],
+            'grade_option': quote['grade_option'],
+            'annual_rate': quote['details']['annual_interest_rate'],
+            'error': None,
+        }
+
+    residual_rate, grade_option = resolve_residual_rate(
+        capital_id, vehicle['id'], contract_months, annual_mileage
+    )
+    annual_rate = interest_rates.get_interest_rate(
+        capital_id=capital_id,
+        vehicle_price=vehicle_price,
+        brand=vehicle['brand'],
+        is_import=vehicle['is_import'],
+        is_ev=(vehicle['engine_cc'] == 0),
+        contract_months=contract_months
+    )
+
+    resolved = time.perf_counter()
+    timings['resolve'] += resolved - started
+
+    details = calculate_capital_quote(
+        capital_id=capital_id,
+        vehicle=vehicle,
+        vehicle_price=vehicle_price,
+        contract_months=contract_months,
+        annual_mileage=annual_mileage,
+        residual_rate=residual_rate,
+        annual_rate=annual_rate,
+        down_payment=vehicle_price * down_payment_percent / 100
+    )
+
+    timings['price'] += time.perf_counter() - resolved
+
+    return {
+        'monthly_payment': details['monthly_payment'],
+        'total_payment': details['total_payment'],
+        'residual_rate': residual_rate,
+        'grade_option': grade_option,
+        'annual_rate': annual_rate,
+        'error': None,
+    }
+
+
+def price_chunk(rows: List[Dict], default_capital: Optional[str] = None) -> Tuple[List[Dict], Dict[str, float]]:
+    """
+    청크 1개 계산 (실패한 행은 error 컬럼에 사유 기록)
+
+    Returns:
+        Tuple[List[Dict], Dict[str, float]]: (입력 + 결과 컬럼 행 목록, 단계별 시간)
+    """
+    timings = {'resolve': 0.0, 'price': 0.0}
+    results = []
+
+    for row in rows:
+        try:
+            result = quote_row(row, default_capital, timings)
+        except Exception as e:
+            result = {column: None for column in RESULT_COLUMNS}
+            result['error'] = str(e) or type(e).__name__
+        results.append({**row, **result})
+
+    return results, timings
+
+
+# ========================================
+# 입력 읽기
+# ========================================
+
+def _is_parquet(path: Path) -> bool:
+    return path.suffix.lower() in (".parquet", ".pq") or path.is_dir()
+
+
+def iter_rows(input_path: Path) -> Iterator[Dict]:
+    """입력 행 스트리밍 (CSV 또는 Parquet)"""
+    if _is_parquet(input_path):
+        try:
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError("Parquet 입력은 pyarrow가 필요합니다: pip install pyarrow")
+
+        parquet_file = pq.ParquetFile(input_path)
+        for batch in parquet_file.iter_batches(batch_size=DEFAULT_CHUNK_SIZE):
+            yield from batch.to_pylist()
+        return
+
+    with open(input_path, 'r', encoding='utf-8-sig', newline='') as f:
+        yield from csv.DictReader(f)
+
+
+def iter_chunks(input_path: Path, chunk_size: int, skip_rows: int = 0) -> Iterator[List[Dict]]:
+    """chunk_size 행씩 묶어서 반환 (skip_rows 만큼 건너뛰고 시작)"""
+    rows = islice(iter_rows(input_path), skip_rows, None)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+
+# ========================================
+# 결과 쓰기 + 체크포인트
+# ========================================
+
+class CsvResultWriter:
+    """CSV 결과 파일 (이어쓰기 시 체크포인트 위치로 잘라낸 뒤 추가)"""
+
+    def __init__(self, path: Path, resume_bytes: Optional[int] = None):
+        self.path = path
+        self._fieldnames: Optional[List[str]] = None
+
+        if resume_bytes is not None:
+            with open(path, 'r+b') as f:
+                f.truncate(resume_bytes)
+            with open(path, 'r', encoding='utf-8', newline='') as f:
+                self._fieldnames = next(csv.reader(f), None)
+            self._file = open(path, 'a', encoding='utf-8', newline='')
+        else:
+            self._file = open(path, 'w', encoding='utf-8', newline='')
+
+        self._writer = None
+        if self._fieldnames:
+            self._writer = csv.DictWriter(self._file, fieldnames=self._fieldnames, extrasaction='ignore')
+
+    def write(self, rows: List[Dict]) -> None:
+        if self._writer is None:
+            fieldnames = [key for key in rows[0] if key not in RESULT_COLUMNS] + RESULT_COLUMNS
+            self._writer = csv.DictWriter(self._file, fieldnames=fieldnames, extrasaction='ignore')
+            self._writer.writeheader()
+        self._writer.writerows(rows)
+        self._file.flush()
+        os.fsync(self._file.fileno())
+
+    def position(self) -> int:
+        return self._file.tell()
+
+    def close(self) -> None:
+        self._file.close()
+
+
+class ParquetResultWriter:
+    """Parquet 결과 (디렉터리에 청크별 part 파일, pandas/pyarrow 로 한 번에 읽기 가능)"""
+
+    def __init__(self, path: Path, resume_chunks: int = 0):
+        import pyarrow as pa
+
+        self._pa = pa
+        self.path = path
+        self.path.mkdir(parents=True, exist_ok=True)
+        self._next_part = resume_chunks
+        self._schema = None
+
+        # 체크포인트 이후에 남은 part 파일 정리
+        for part in self.path.glob("part-*.parquet"):
+            if int(part.stem.split("-")[1]) >= resume_chunks:
+                part.unlink()
+
+    def write(self, rows: List[Dict]) -> None:
+        import pyarrow.parquet as pq
+        pa = self._pa
+
+        if self._schema is None:
+            inferred = pa.Table.from_pylist([{k: v for k, v in rows[0].items() if k not in RESULT_COLUMNS}]).schema
+            fields = [pa.field(f.name, pa.string() if pa.types.is_null(f.type) else f.type) for f in inferred]
+            fields += [
+                pa.field('monthly_payment', pa.float64()),
+                pa.field('total_payment', pa.float64()),
+                pa.field('residual_rate', pa.float64()),
+                pa.field('grade_option', pa.string()),
+                pa.field('annual_rate', pa.float64()),
+                pa.field('error', pa.string()),
+            ]
+            self._schema = pa.schema(fields)
+
+        table = pa.Table.from_pylist(rows, schema=self._schema)
+        final = self.path / f"part-{self._next_part:05d}.parquet"
+        tmp = final.with_suffix(".tmp")
+        pq.write_table(table, tmp)
+        os.replace(tmp, final)
+        self._next_part += 1
+
+    def position(self) -> int:
+        return self._next_part
+
+    def close(self) -> None:
+        pass
+
+
+def checkpoint_path(output_path: Path) -> Path:
+    return output_path.parent / (output_path.name + ".ckpt.json")
+
+
+def _write_checkpoint(path: Path, state: Dict) -> None:
+    """원자적 기록 (tmp → rename)"""
+    tmp = path.with_suffix(".tmp")
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp, path)
+
+
+def _load_checkpoint(path: Path, input_path: Path, chunk_size: int) -> Optional[Dict]:
+    """
+    이어쓰기용 체크포인트 로드
+
+    Raises:
+        ValueError: 입력 파일 또는 청크 크기가 체크포인트와 다른 경우
+    """
+    if not path.exists():
+        return None
+
+    with open(path, 'r', encoding='utf-8') as f:
+        state = json.load(f)
+
+    if state['input'] != str(input_path.resolve()) or state['input_size'] != _input_size(input_path):
+        raise ValueError(f"체크포인트의 입력 파일이 다릅니다: {state['input']}")
+    if state['chunk_size'] != chunk_size:
+        raise ValueError(f"체크포인트의 청크 크기({state['chunk_size']})와 다릅니다")
+    return state
+
+
+def _input_size(input_path: Path) -> int:
+    if input_path.is_dir():
+        return sum(p.stat().st_size for p in input_path.rglob("*") if p.is_file())
+    return input_path.stat().st_size
+
+
+# ========================================
+# 파이프라인
+# ========================================
+
+def run_batch(
+    input_path,
+    output_path,
+    default_capital: Optional[str] = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    workers: Optional[int] = None,
+    resume: bool = False,
+    max_chunks: Optional[int] = None,
+    progress=None
+) -> Dict:
+    """
+    배치 견적 실행
+
+    Args:
+        input_path: 입력 CSV 또는 Parquet 파일
+        output_path: 결과 경로 (.csv 파일 또는 .parquet 디렉터리)
+        default_capital: 행에 capital_id가 없을 때 사용할 캐피탈
+        chunk_size: 청크당 행 수
+        workers: 워커 프로세스 수 (1이면 메인 프로세스에서 순차 실행)
+        resume: 체크포인트가 있으면 이어서 실행
+        max_chunks: 이번 실행에서 처리할 최대 청크 수 (None이면 전체)
+        progress: 청크 완료 시 호출할 함수 (rows_done 인자)
+
+    Returns:
+        Dict: {'rows', 'errors', 'chunks', 'skipped_rows', 'elapsed', 'completed',
+               'stages': {stage: {'seconds', 'rows_per_sec'}}}
+    """
+    input_path = Path(input_path)
+    output_path = Path(output_path)
+    if not input_path.exists():
+        raise FileNotFoundError(f"입력 파일이 없습니다: {input_path}")
+
+    workers = workers or os.cpu_count() or 1
+    ckpt_path = checkpoint_path(output_path)
+    state = _load_checkpoint(ckpt_path, input_path, chunk_size) if resume else None
+
+    skip_rows = state['rows_done'] if state else 0
+    chunks_done = state['chunks_done'] if state else 0
+    errors_before = state['errors'] if state else 0
+
+    if _is_parquet(output_path):
+        writer = ParquetResultWriter(output_path, resume_chunks=chunks_done)
+    else:
+        writer = CsvResultWriter(output_path, resume_bytes=state['output_bytes'] if state else None)
+
+    stage_seconds = {stage: 0.0 for stage in STAGES}
+    rows_done = skip_rows
+    errors = errors_before
+    chunks_this_run = 0
+    completed = False
+    started = time.perf_counter()
+
+    def write_result(results: List[Dict], timings: Dict[str, float]) -> None:
+        nonlocal rows_done, errors, chunks_done, chunks_this_run
+        stage_seconds['resolve'] += timings['resolve']
+        stage_seconds['price'] += timings['price']
+
+        t = time.perf_counter()
+        writer.write(results)
+        rows_done += len(results)
+        errors += sum(1 for r in results if r['error'])
+        chunks_done += 1
+        chunks_this_run += 1
+        _write_checkpoint(ckpt_path, {
+            'input': str(input_path.resolve()),
+            'input_size': _input_size(input_path),
+            'chunk_size': chunk_size,
+            'chunks_done': chunks_done,
+            'rows_done': rows_done,
+            'errors': errors,
+            'output_bytes': writer.position(),
+        })
+        stage_seconds['write'] += time.perf_counter() - t
+
+        if progress is not None:
+            progress(rows_done)
+
+    chunks = iter_chunks(input_path, chunk_size, skip_rows)
+    if max_chunks is not None:
+        chunks = islice(chunks, max_chunks)
+
+    def next_chunk() -> Optional[List[Dict]]:
+        t = time.perf_counter()
+        chunk = next(chunks, None)
+        stage_seconds['read'] += time.perf_counter() - t
+        return chunk
+
+    try:
+        if workers <= 1:
+            while (chunk := next_chunk()) is not None:
+                write_result(*price_chunk(chunk, default_capital))
+        else:
+            # 동시 처리 청크 수 제한 → 메모리 상한 = (workers × 2) 청크
+            max_in_flight = workers * 2
+            with ProcessPoolExecutor(max_workers=workers, initializer=warm_all) as pool:
+                in_flight = deque()
+                exhausted = False
+                while in_flight or not exhausted:
+                    while not exhausted and len(in_flight) < max_in_flight:
+                        chunk = next_chunk()
+                        if chunk is None:
+                            exhausted = True
+                        else:
+                            in_flight.append(pool.submit(price_chunk, chunk, default_capital))
+                    if in_flight:
+                        write_result(*in_flight.popleft().result())
+        completed = max_chunks is None or next(iter_chunks(input_path, chunk_size, rows_done), None) is None
+    finally:
+        writer.close()
+
+    if completed:
+        ckpt_path.unlink(missing_ok=True)
+
+    elapsed = time.perf_counter() - started
+    rows = rows_done - skip_rows
+
+    return {
+        'rows': rows,
+        'errors': errors - errors_before,
+        'chunks': chunks_this_run,
+        'skipped_rows': skip_rows,
+        'elapsed': elapsed,
+        'completed': completed,
+        'stages': {
+            stage: {
+                'seconds': seconds,
+                'rows_per_sec': rows / seconds if seconds else 0.0,
+            }
+            for stage, seconds in stage_seconds.items()
+        },
+    }
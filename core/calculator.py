@@ -5,7 +5,10 @@ core/calculator.py
 
 from typing import Dict, Optional
 
+from utils.tracing import traced
 
+
+@traced("calculator.calculate_operating_lease")
 def calculate_operating_lease(
     vehicle_price: float,
     contract_months: int,
@@ -232,6 +235,7 @@ def calculate_total_acquisition_cost(
     }
 
 
+@traced("calculator.calculate_irr")
 def calculate_irr(
     vehicle_price: float,
     contract_months: int,
@@ -0,0 +1,7 @@
+"""
+core/capitals/
+캐피탈별 계산기 플러그인
+
+core/registry.py 의 CapitalSpec.plugin 이 가리키는 모듈. 처음 견적할 때 import 된다.
+모듈마다 acquisition, lease_payment, calculate_quote 를 제공한다.
+"""
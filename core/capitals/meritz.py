@@ -0,0 +1,69 @@
+"""
+core/capitals/meritz.py
+메리츠 방식 계산기 (정액법, 과세표준 기준 취득세 + 등록비)
+
+NH 등 선언만 있고 전용 모듈이 없는 캐피탈도 이 방식을 쓴다.
+"""
+
+from typing import Dict
+
+from core.calculator import calculate_operating_lease, calculate_auto_tax
+from core.quote import ACQUISITION_TAX_RATE, REGISTRATION_FEE
+
+
+def acquisition(vehicle: Dict, price: float) -> Dict:
+    """취득원가 (과세표준, 취득세, 등록비, 합계) + 연 자동차세"""
+    taxable_base = price / 1.1  # VAT 제외
+    acquisition_tax = taxable_base * ACQUISITION_TAX_RATE
+    return {
+        'taxable_base': taxable_base,
+        'acquisition_tax': acquisition_tax,
+        'registration_fee': REGISTRATION_FEE,
+        'total': price + acquisition_tax + REGISTRATION_FEE,
+        'annual_car_tax': calculate_auto_tax(engine_cc=vehicle['engine_cc'], is_commercial=False),
+    }
+
+
+def lease_payment(vehicle: Dict, price: float, residual: float, rate: float, acquisition: Dict,
+                  down_payment: float, contract_months: int, annual_mileage: int) -> Dict:
+    """월 납입료 상세 (calculate_operating_lease 결과 형식)"""
+    return calculate_operating_lease(
+        vehicle_price=price,
+        contract_months=contract_months,
+        down_payment=down_payment,
+        residual_rate=residual,
+        annual_rate=rate,
+        acquisition_tax_rate=0.0,  # 취득세는 이미 취득원가에 포함됨
+        registration_fee=acquisition['registration_fee'],
+        annual_car_tax=acquisition['annual_car_tax'],
+        method='simple',
+        acquisition_cost=acquisition['total']  # 하이브리드 방식
+    )
+
+
+def calculate_quote(vehicle: Dict, vehicle_price: float, contract_months: int, annual_mileage: int,
+                    residual_rate: float, annual_rate: float, down_payment: float) -> Dict:
+    """견적 상세 (MG 결과와 같은 구조로 통일)"""
+    cost = acquisition(vehicle, vehicle_price)
+    result = lease_payment(vehicle, vehicle_price, residual_rate, annual_rate, cost,
+                           down_payment, contract_months, annual_mileage)
+
+    return {
+        'monthly_payment': result['monthly_total'],
+        'down_payment': down_payment,
+        'total_payment': down_payment + (result['monthly_total'] * contract_months),
+        'residual_value': int(vehicle_price * residual_rate),
+        'acquisition_cost': cost['total'],
+        'breakdown': {
+            'vehicle_price': vehicle_price,
+            'acquisition_tax': int(cost['acquisition_tax']),
+            'registration_fee': cost['registration_fee'],
+            'residual_rate': residual_rate,
+            'annual_interest_rate': annual_rate,
+            'contract_months': contract_months,
+            'annual_mileage': annual_mileage,
+            'monthly_depreciation': result.get('monthly_depreciation', 0),
+            'monthly_interest': result.get('monthly_interest', 0),
+            'monthly_car_tax': result.get('monthly_car_tax', 0),
+        }
+    }
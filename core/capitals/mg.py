@@ -0,0 +1,75 @@
+"""
+core/capitals/mg.py
+MG새마을금고 방식 계산기 (PMT 연금 방식, 10원 단위 절사 취득원가, 등록비 0원)
+"""
+
+from typing import Dict
+
+from core.calculator import calculate_auto_tax
+from core.mg_calculator import MGLeaseCalculator
+
+_CALCULATOR = MGLeaseCalculator()
+
+
+def _mg_calculate(vehicle: Dict, price: float, residual: float, rate: float, acquisition_total: float,
+                  down_payment: float, contract_months: int, annual_mileage: int) -> Dict:
+    down_payment_rate = down_payment / acquisition_total if down_payment > 0 else 0.0
+    return _CALCULATOR.calculate(
+        vehicle_price=price,
+        residual_rate=residual,
+        contract_months=contract_months,
+        annual_mileage=annual_mileage,
+        annual_interest_rate=rate,
+        down_payment_rate=down_payment_rate,
+        region="서울",
+        is_ev=(vehicle['engine_cc'] == 0),
+        is_hybrid=False
+    )
+
+
+def acquisition(vehicle: Dict, price: float) -> Dict:
+    """취득원가 (과세표준, 취득세, 등록비, 합계) + 연 자동차세"""
+    mg_acq_cost = _CALCULATOR._calculate_acquisition_cost(
+        vehicle_price=price,
+        region="서울",
+        is_ev=(vehicle['engine_cc'] == 0),
+        is_hybrid=False,
+        company_lease=False
+    )
+    return {
+        'taxable_base': price / 1.1,
+        'acquisition_tax': mg_acq_cost['acquisition_tax'],
+        'registration_fee': 0,
+        'total': mg_acq_cost['total'],
+        'annual_car_tax': calculate_auto_tax(engine_cc=vehicle['engine_cc'], is_commercial=False),
+    }
+
+
+def lease_payment(vehicle: Dict, price: float, residual: float, rate: float, acquisition: Dict,
+                  down_payment: float, contract_months: int, annual_mileage: int) -> Dict:
+    """월 납입료 상세 (MG 결과를 calculate_operating_lease 형식으로 변환)"""
+    mg_result = _mg_calculate(vehicle, price, residual, rate, acquisition['total'],
+                              down_payment, contract_months, annual_mileage)
+
+    monthly_depreciation = (mg_result['financed_amount'] - mg_result['residual_value']) // contract_months
+    return {
+        'monthly_total': mg_result['monthly_payment'],
+        'monthly_depreciation': monthly_depreciation,
+        'monthly_finance': mg_result['monthly_payment'] - monthly_depreciation,
+        'monthly_tax': 0,
+        'monthly_registration': 0,
+        'monthly_car_tax': mg_result['monthly_car_tax'],
+        'total_payment': mg_result['total_payment'],
+        'total_interest': (mg_result['total_payment'] - mg_result['down_payment']
+                           - mg_result['financed_amount'] + mg_result['residual_value']),
+        'residual_value': mg_result['residual_value'],
+        'effective_vehicle_cost': mg_result['net_vehicle_cost']
+    }
+
+
+def calculate_quote(vehicle: Dict, vehicle_price: float, contract_months: int, annual_mileage: int,
+                    residual_rate: float, annual_rate: float, down_payment: float) -> Dict:
+    """견적 상세 (MGLeaseCalculator.calculate 결과)"""
+    cost = acquisition(vehicle, vehicle_price)
+    return _mg_calculate(vehicle, vehicle_price, residual_rate, annual_rate, cost['total'],
+                         down_payment, contract_months, annual_mileage)
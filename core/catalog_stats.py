@@ -0,0 +1,195 @@
+"""
+core/catalog_stats.py
+카탈로그 통계 (데이터 버전당 1회 계산)
+
+시작 화면/모니터링이 매번 전체 차량을 훑고 정렬하지 않도록,
+캐피탈별·브랜드별 차량 수, 가격 범위, 잔존율 커버리지, 데이터 갱신 시각을
+한 번 집계해 두고 이후에는 그대로 반환한다.
+요약(공용 차량 마스터 + 파일 정보)과 캐피탈별 통계는 따로 캐시하므로,
+요약만 쓰는 화면은 캐피탈별 잔존율/차량 마스터를 적재하지 않는다.
+"""
+
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional, Tuple
+
+from core.quote_cache import data_version
+from data import vehicle_master, residual_rates, shared_plane
+from data.artifact_format import resolve
+from utils.single_flight import SingleFlightCache
+
+_DATA_DIR = Path(__file__).parent.parent / "data"
+
+# 키 = (데이터 버전, "stats") / (데이터 버전, "summary") / (데이터 버전, "capital", 캐피탈 ID)
+_STATS_CACHE = SingleFlightCache("catalog_stats")
+shared_plane.on_data_change(_STATS_CACHE.clear)
+
+
+def _get_or_build(key: Tuple, loader: Callable[[], Dict]) -> Dict:
+    """현재 데이터 버전의 통계 (새 버전을 처음 집계할 때 이전 버전 항목은 버림)"""
+    version = data_version()
+    key = (version,) + key
+    if key not in _STATS_CACHE:
+        for stale in [k for k in _STATS_CACHE if k[0] != version]:
+            _STATS_CACHE.clear(stale)
+    return _STATS_CACHE.get_or_load(key, loader)
+
+
+def _modified_at(path: Path) -> Optional[str]:
+    """파일 수정 시각 (ISO 형식, 파일이 없으면 None)"""
+    if not path.exists():
+        return None
+    return datetime.fromtimestamp(path.stat().st_mtime).isoformat(timespec="seconds")
+
+
+def _price_range(prices: List[float]) -> Dict:
+    prices = sorted(prices)
+    if not prices:
+        return {'min': None, 'max': None, 'median': None}
+    middle = len(prices) // 2
+    median = prices[middle] if len(prices) % 2 else (prices[middle - 1] + prices[middle]) / 2
+    return {'min': prices[0], 'max': prices[-1], 'median': median}
+
+
+def _brand_stats(vehicles: Dict) -> Dict[str, Dict]:
+    """브랜드별 차량 수/가격 범위 (브랜드명 순)"""
+    by_brand: Dict[str, List[Dict]] = {}
+    for vehicle in vehicles.values():
+        by_brand.setdefault(vehicle['brand'], []).append(vehicle)
+
+    return {
+        brand: {
+            'vehicles': len(items),
+            'is_import': any(v.get('is_import') for v in items),
+            'price': _price_range([v['price'] for v in items if v.get('price')]),
+        }
+        for brand, items in sorted(by_brand.items())
+    }
+
+
+def _capital_stats(capital_id: str) -> Dict:
+    """캐피탈 1곳의 차량/잔존율 커버리지"""
+    vehicles = vehicle_master._load_vehicles(capital_id)
+    residual_data = residual_rates._load_residual_rates(capital_id)
+
+    terms, mileages, grade_options = set(), set(), {}
+    with_residuals, cells = 0, 0
+    for vehicle_id in vehicles:
+        tables = residual_data.get(vehicle_id) or {}
+        vehicle_cells = 0
+        for grade_option, table in tables.items():
+            for months, by_mileage in (table or {}).items():
+                terms.add(int(months))
+                for mileage, rate in (by_mileage or {}).items():
+                    mileages.add(int(mileage))
+                    if rate is not None:
+                        vehicle_cells += 1
+                        grade_options[grade_option] = grade_options.get(grade_option, 0) + 1
+        if vehicle_cells:
+            with_residuals += 1
+            cells += vehicle_cells
+
+    return {
+        'vehicles': len(vehicles),
+        'priced_vehicles': sum(1 for v in vehicles.values() if v.get('price')),
+        'brands': len({v['brand'] for v in vehicles.values()}),
+        'price': _price_range([v['price'] for v in vehicles.values() if v.get('price')]),
+        'residual_coverage': {
+            'vehicles': with_residuals,
+            'ratio': with_residuals / len(vehicles) if vehicles else 0.0,
+            'cells': cells,
+            'terms': sorted(terms),
+            'mileages': sorted(mileages),
+            'grade_options': dict(sorted(grade_options.items())),
+        },
+        'updated_at': _updated_at(capital_id),
+    }
+
+
+def _updated_at(capital_id: str) -> Dict:
+    """캐피탈 데이터 파일 수정 시각 (파일을 읽지 않음)"""
+    residual_file = _DATA_DIR / "residual_rates" / f"{capital_id}.npz"
+    return {
+        'vehicle_master': _modified_at(resolve(vehicle_master.vehicle_master_path(capital_id))),
+        'residual_rates': _modified_at(resolve(residual_file)),
+    }
+
+
+def _build_summary() -> Dict:
+    start = time.perf_counter()
+    vehicles = vehicle_master._load_vehicles()
+    capitals = sorted(residual_rates.get_available_capitals())
+    brands = _brand_stats(vehicles)
+
+    return {
+        'data_version': data_version(),
+        'computed_at': datetime.now().isoformat(timespec="seconds"),
+        'totals': {
+            'vehicles': len(vehicles),
+            'capitals': len(capitals),
+            'brands': len(brands),
+        },
+        'capitals': {capital_id: {'updated_at': _updated_at(capital_id)} for capital_id in capitals},
+        'brands': brands,
+        'build_ms': (time.perf_counter() - start) * 1000,
+    }
+
+
+def _build_stats() -> Dict:
+    start = time.perf_counter()
+    summary = get_catalog_summary()
+
+    return {
+        **summary,
+        'computed_at': datetime.now().isoformat(timespec="seconds"),
+        'capitals': {capital_id: get_capital_stats(capital_id) for capital_id in summary['capitals']},
+        'build_ms': (time.perf_counter() - start) * 1000,
+    }
+
+
+def get_catalog_summary() -> Dict:
+    """
+    카탈로그 요약 (기본 차량 마스터 + 파일 정보만, 캐피탈별 데이터는 적재하지 않음)
+
+    반환 값은 모든 호출자가 공유하므로 수정하지 않는다.
+
+    Returns:
+        Dict: {
+            'data_version', 'computed_at', 'build_ms',
+            'totals': {'vehicles', 'capitals', 'brands'},
+            'capitals': {capital_id: {'updated_at'}},
+            'brands': {brand: {'vehicles', 'is_import', 'price'}}
+        }
+    """
+    return _get_or_build(("summary",), _build_summary)
+
+
+def get_capital_stats(capital_id: str) -> Dict:
+    """
+    캐피탈 1곳의 차량/잔존율 커버리지 (현재 데이터 버전 기준, 캐피탈당 1회 집계)
+
+    그 캐피탈의 차량 마스터와 잔존율을 적재한다.
+
+    Returns:
+        Dict: {'vehicles', 'priced_vehicles', 'brands', 'price', 'residual_coverage', 'updated_at'}
+    """
+    return _get_or_build(("capital", capital_id), lambda: _capital_stats(capital_id))
+
+
+def get_catalog_stats() -> Dict:
+    """
+    카탈로그 통계 (현재 데이터 버전 기준, 최초 1회만 집계)
+
+    반환 값은 모든 호출자가 공유하므로 수정하지 않는다.
+
+    Returns:
+        Dict: {
+            'data_version', 'computed_at', 'build_ms',
+            'totals': {'vehicles', 'capitals', 'brands'},
+            'capitals': {capital_id: {'vehicles', 'priced_vehicles', 'brands',
+                                      'price', 'residual_coverage', 'updated_at'}},
+            'brands': {brand: {'vehicles', 'is_import', 'price'}}  (기본 차량 마스터, 브랜드명 순)
+        }
+    """
+    return _get_or_build(("stats",), _build_stats)
@@ -0,0 +1,229 @@
+"""
+core/comparison.py
+다중 캐피탈 비교 엔진
+
+캐피탈별 견적(차량 매칭 → 잔존율 → 금리 → 계산)을 스레드/프로세스 풀에
+병렬로 분배하고, 캐피탈별 타임아웃과 부분 결과를 지원한다.
+"""
+
+import threading
+from concurrent.futures import (
+    Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor, wait
+)
+from typing import Dict, List, Optional
+
+from core.quote import quote_for_capital
+from core.quote_cache import get_quote_cache, make_quote_key
+from data import vehicle_master, residual_rates
+from utils import tracing
+from utils.tracing import span, traced
+
+# 캐피탈별 기본 타임아웃 (초)
+DEFAULT_TIMEOUT = 10.0
+
+# 공유 풀 (최초 사용 시 생성)
+_EXECUTORS: Dict[str, Executor] = {}
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def _get_executor(kind: str, max_workers: Optional[int] = None) -> Executor:
+    """공유 스레드/프로세스 풀 조회 (lazy 생성)"""
+    if kind not in ("thread", "process"):
+        raise ValueError(f"지원하지 않는 executor 종류입니다: {kind}")
+
+    with _EXECUTOR_LOCK:
+        executor = _EXECUTORS.get(kind)
+        if executor is None:
+            if kind == "thread":
+                executor = ThreadPoolExecutor(
+                    max_workers=max_workers, thread_name_prefix="compare"
+                )
+            else:
+                executor = ProcessPoolExecutor(max_workers=max_workers)
+            _EXECUTORS[kind] = executor
+        return executor
+
+
+def shutdown_executors(wait_for: bool = True) -> None:
+    """공유 풀 종료 (테스트/서버 종료 시)"""
+    with _EXECUTOR_LOCK:
+        executors = list(_EXECUTORS.values())
+        _EXECUTORS.clear()
+
+    for executor in executors:
+        executor.shutdown(wait=wait_for)
+
+
+def compare_capital(
+    capital_id: str,
+    vehicle: Dict,
+    vehicle_price: float,
+    contract_months: int,
+    annual_mileage: int,
+    down_payment_percent: float = 0.0,
+    use_cache: bool = True
+) -> Dict:
+    """
+    캐피탈 1곳의 비교 결과 (실패 시 에러 항목 반환)
+
+    Args:
+        capital_id: 캐피탈 ID
+        vehicle: 선택 차량 정보 (brand, model, trim)
+        vehicle_price: 모든 캐피탈에 공통 적용할 차량가 (master_carinfo 기준)
+        contract_months: 계약 기간
+        annual_mileage: 연간 주행거리
+        down_payment_percent: 차량가 대비 선납금 비율 (0~100)
+        use_cache: 공유 견적 캐시 사용 여부
+
+    Returns:
+        Dict: {'capital_id', 'monthly_payment', 'grade_option',
+               'residual_rate', 'details'} 또는 'error' 포함 항목
+    """
+    with span("compare.capital", capital_id=capital_id) as current:
+        try:
+            # 캐피탈별 차량 찾기 (잔존율 조회용)
+            cap_vehicle = vehicle_master.find_vehicle_by_name(
+                brand=vehicle['brand'],
+                model=vehicle['model'],
+                trim=vehicle['trim'],
+                capital_id=capital_id
+            )
+
+            if not cap_vehicle:
+                raise ValueError(
+                    f"{vehicle['brand']} {vehicle['model']} {vehicle['trim']} 차량을 찾을 수 없습니다"
+                )
+
+            quote = quote_for_capital(
+                capital_id=capital_id,
+                vehicle=cap_vehicle,
+                vehicle_price=vehicle_price,
+                contract_months=contract_months,
+                annual_mileage=annual_mileage,
+                down_payment_percent=down_payment_percent,
+                use_cache=use_cache
+            )
+            return {'capital_id': capital_id, **quote}
+
+        except Exception as e:
+            current.set(error=type(e).__name__)
+            return _error_entry(capital_id, str(e))
+
+
+def _error_entry(capital_id: str, message: str) -> Dict:
+    return {
+        'capital_id': capital_id,
+        'monthly_payment': None,
+        'error': message,
+        'grade_option': None,
+        'residual_rate': None
+    }
+
+
+@traced("compare.compare_all")
+def compare_all(
+    vehicle: Dict,
+    contract_months: int,
+    annual_mileage: int,
+    down_payment_percent: float = 0.0,
+    vehicle_price: Optional[float] = None,
+    capital_ids: Optional[List[str]] = None,
+    executor: Optional[str] = "thread",
+    max_workers: Optional[int] = None,
+    timeout: Optional[float] = DEFAULT_TIMEOUT,
+    use_cache: bool = True
+) -> List[Dict]:
+    """
+    모든 캐피탈 병렬 비교
+
+    같은 조건의 비교 결과는 공유 견적 캐시에서 반환한다.
+    (시간 초과/워커 오류가 섞인 결과는 캐시하지 않음)
+
+    Args:
+        vehicle: 선택 차량 정보 (brand, model, trim)
+        contract_months: 계약 기간
+        annual_mileage: 연간 주행거리
+        down_payment_percent: 차량가 대비 선납금 비율 (0~100)
+        vehicle_price: 공통 차량가 (None이면 master_carinfo에서 조회)
+        capital_ids: 비교할 캐피탈 목록 (None이면 잔존율 데이터가 있는 전체)
+        executor: "thread", "process", 또는 None (호출 스레드에서 순차 실행)
+        max_workers: 공유 풀 최초 생성 시 워커 수
+        timeout: 캐피탈별 타임아웃 (초). 초과한 캐피탈은 에러 항목으로 반환
+        use_cache: False면 캐시를 거치지 않고 계산
+
+    Returns:
+        List[Dict]: 월 납입료 낮은 순 정렬 (실패/타임아웃 항목은 맨 뒤)
+
+    Raises:
+        ValueError: master_carinfo에서 차량 가격을 찾을 수 없는 경우
+    """
+    if capital_ids is None:
+        capital_ids = residual_rates.get_available_capitals()
+
+    # 캐시 확인을 가격 조회보다 먼저 (적중 시 master_carinfo 매칭 생략)
+    cache_key = None
+    if use_cache:
+        cache_key = make_quote_key(
+            capital_id=",".join(capital_ids),
+            vehicle_id="|".join(vehicle[k] for k in ('brand', 'model', 'trim')),
+            vehicle_price=vehicle_price or 0,  # 0 = master_carinfo 가격
+            contract_months=contract_months,
+            annual_mileage=annual_mileage,
+            down_payment_percent=down_payment_percent,
+            kind="compare"
+        )
+        cached = get_quote_cache().get(cache_key)
+        if cached is not None:
+            return cached
+
+    if vehicle_price is None:
+        vehicle_price = vehicle_master.get_price_from_master(
+            brand=vehicle['brand'],
+            model=vehicle['model'],
+            grade=vehicle['trim']
+        )
+        if not vehicle_price:
+            raise ValueError(
+                f"master_carinfo에서 차량 가격을 찾을 수 없습니다: "
+                f"{vehicle['brand']} {vehicle['model']} {vehicle['trim']}"
+            )
+
+    # 프로세스 풀로 보낼 수 있도록 필요한 필드만 전달
+    vehicle_key = {k: vehicle[k] for k in ('brand', 'model', 'trim')}
+    args = (vehicle_key, vehicle_price, contract_months, annual_mileage, down_payment_percent, use_cache)
+
+    transient = False
+    if executor is None:
+        results = [compare_capital(cap_id, *args) for cap_id in capital_ids]
+    else:
+        pool = _get_executor(executor, max_workers)
+        # 스레드 풀 작업은 현재 구간 아래에 기록 (프로세스 풀은 피클 가능한 원래 함수 그대로)
+        task = tracing.wrap(compare_capital) if executor == "thread" else compare_capital
+        futures: Dict[str, Future] = {
+            cap_id: pool.submit(task, cap_id, *args)
+            for cap_id in capital_ids
+        }
+
+        # 모든 캐피탈이 동시에 출발하므로 공통 마감 시간 = 캐피탈별 타임아웃
+        wait(futures.values(), timeout=timeout)
+
+        results = []
+        for cap_id, future in futures.items():
+            if not future.done():
+                future.cancel()
+                results.append(_error_entry(cap_id, f"시간 초과 ({timeout}초)"))
+                transient = True
+                continue
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # 프로세스 풀 워커 비정상 종료 등
+                results.append(_error_entry(cap_id, str(e)))
+                transient = True
+
+    # 결과 정렬 (월 납입료 낮은 순, None은 맨 뒤로)
+    results.sort(key=lambda x: (x['monthly_payment'] is None, x['monthly_payment'] or float('inf')))
+
+    if cache_key is not None and not transient:
+        get_quote_cache().put(cache_key, results)
+    return results
@@ -0,0 +1,363 @@
+"""
+core/deal_search.py
+예산 내 최적 조건 검색 (전체 카탈로그 × 전체 캐피탈)
+
+"월 70만원 이하로 가능한 차 전부" 같은 질의를 처리한다.
+
+1. 캐피탈별 카탈로그(차량가, 금리, 잔존율 텐서)를 데이터 버전당 한 번만 배열로 컴파일
+2. 월 납입료의 단조성(차량가↑ → 납입료↑, 잔존가치↑ → 납입료↓)으로
+   (차량, 기간) 단위 하한을 구해 예산을 넘는 후보를 계산 전에 제외
+3. 남은 셀만 배열 계산 엔진(core.batch_pricing)으로 정확히 계산하여 순위화
+"""
+
+import time
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from core.batch_pricing import (
+    batch_auto_tax,
+    batch_operating_lease,
+    batch_mg_lease,
+    batch_mg_acquisition_tax,
+    batch_mg_down_payment_rate,
+)
+from core.quote import ACQUISITION_TAX_RATE, REGISTRATION_FEE
+from core.quote_cache import data_version
+from core.registry import uses_pmt
+from data import vehicle_master, residual_rates, interest_rates, shared_plane
+from utils.single_flight import SingleFlightCache
+
+# 캐피탈별 컴파일된 카탈로그 (키 = (capital_id, 데이터 버전))
+_CATALOG_CACHE = SingleFlightCache("deal_catalog")
+shared_plane.on_data_change(_CATALOG_CACHE.clear)
+
+# 하한 비교 여유분: 최종 납입료는 천원 반올림(메리츠) / 백원 내림(MG) 되므로
+# 반올림 전 하한이 예산을 이만큼 넘을 때만 제외한다.
+ROUNDING_SLACK = 1000
+
+SORT_KEYS = ('vehicle_price', 'monthly_payment')
+
+
+def _build_catalog(capital_id: str) -> Dict:
+    """캐피탈 1곳의 차량/금리/잔존율을 배열로 컴파일"""
+    vehicles = vehicle_master._load_vehicles(capital_id)
+    residual_data = residual_rates._load_residual_rates(capital_id)
+
+    vehicle_ids = [
+        vid for vid, vehicle in vehicles.items()
+        if vehicle.get('price') and residual_data.get(vid)
+    ]
+
+    terms, mileages, grade_options = set(), set(), set()
+    for vid in vehicle_ids:
+        for grade_option, table in residual_data[vid].items():
+            if not table:
+                continue
+            grade_options.add(grade_option)
+            for months, by_mileage in table.items():
+                terms.add(int(months))
+                mileages.update(int(m) for m in (by_mileage or {}))
+
+    terms, mileages, grade_options = sorted(terms), sorted(mileages), sorted(grade_options)
+    term_index = {str(t): i for i, t in enumerate(terms)}
+    mileage_index = {str(m): i for i, m in enumerate(mileages)}
+
+    residual = np.full((len(vehicle_ids), len(terms), len(mileages), len(grade_options)), np.nan)
+    for v, vid in enumerate(vehicle_ids):
+        for g, grade_option in enumerate(grade_options):
+            for months, by_mileage in (residual_data[vid].get(grade_option) or {}).items():
+                t = term_index[months]
+                for mileage, rate in (by_mileage or {}).items():
+                    if rate is not None:
+                        residual[v, t, mileage_index[mileage], g] = rate
+
+    # 차량별 잔가 옵션 순서 (원본 데이터 순서, 빈 옵션 제외) + 첫 번째 옵션 (get_residual_rate 폴백)
+    grade_index = {g: i for i, g in enumerate(grade_options)}
+    grade_rank = np.full((len(vehicle_ids), len(grade_options)), -1, dtype=np.int16)
+    first_grade = np.full(len(vehicle_ids), -1, dtype=np.int16)
+    for v, vid in enumerate(vehicle_ids):
+        tables = residual_data[vid]
+        for rank, grade_option in enumerate(option for option, table in tables.items() if table):
+            grade_rank[v, grade_index[grade_option]] = rank
+        first = next(iter(tables))
+        if tables[first]:
+            first_grade[v] = grade_index[first]
+
+    prices = np.array([vehicles[vid]['price'] for vid in vehicle_ids], dtype=np.float64)
+    engine_cc = [vehicles[vid]['engine_cc'] for vid in vehicle_ids]
+
+    # 금리는 차량가/브랜드/수입 여부/전기차/기간에만 의존
+    annual_rate = np.array([
+        [
+            interest_rates.get_interest_rate(
+                capital_id=capital_id,
+                vehicle_price=vehicles[vid]['price'],
+                brand=vehicles[vid]['brand'],
+                is_import=vehicles[vid]['is_import'],
+                is_ev=(vehicles[vid]['engine_cc'] == 0),
+                contract_months=term
+            )
+            for term in terms
+        ]
+        for vid in vehicle_ids
+    ]).reshape(len(vehicle_ids), len(terms))
+
+    return {
+        'capital_id': capital_id,
+        'vehicle_ids': vehicle_ids,
+        'brands': np.array([vehicles[vid]['brand'].upper() for vid in vehicle_ids], dtype=object),
+        'prices': prices,
+        'is_ev': np.array([cc == 0 for cc in engine_cc], dtype=bool),
+        'annual_car_tax': batch_auto_tax(engine_cc, is_commercial=False),
+        'terms': terms,
+        'mileages': mileages,
+        'grade_options': grade_options,
+        'annual_rate': annual_rate,
+        'residual_rate': residual,
+        'grade_rank': grade_rank,
+        'first_grade': first_grade,
+    }
+
+
+def compile_catalog(capital_id: str) -> Dict:
+    """
+    캐피탈별 검색용 카탈로그 (데이터 버전당 1회 컴파일)
+
+    Returns:
+        Dict: {'capital_id', 'vehicle_ids', 'brands', 'prices', 'is_ev',
+               'annual_car_tax': (V,), 'terms', 'mileages', 'grade_options',
+               'annual_rate': (V, T), 'residual_rate': (V, T, M, G) NaN = 데이터 없음,
+               'grade_rank': (V, G) 차량별 잔가 옵션 순서 -1 = 없음,
+               'first_grade': (V,) 원본 데이터의 첫 번째 옵션 위치 -1 = 비어 있음}
+    """
+    plane = shared_plane.get_plane()  # 데이터 평면 모드: 게시자가 컴파일한 배열을 복사 없이 사용
+    if plane is not None:
+        catalog = plane.catalog(capital_id)
+        if catalog is not None:
+            return catalog
+
+    return _CATALOG_CACHE.get_or_load(
+        (capital_id, data_version()), lambda: _build_catalog(capital_id)
+    )
+
+
+def _axis_index(values: List[int], wanted: Optional[List[int]]) -> np.ndarray:
+    if wanted is None:
+        return np.arange(len(values))
+    wanted = {int(w) for w in wanted}
+    return np.array([i for i, v in enumerate(values) if v in wanted], dtype=np.intp)
+
+
+def _search_capital(
+    catalog: Dict,
+    budget: float,
+    down_payment_percent: float,
+    terms: Optional[List[int]],
+    mileages: Optional[List[int]],
+    brands: Optional[List[str]],
+    max_vehicle_price: Optional[float],
+    prune: bool
+) -> Dict:
+    """캐피탈 1곳에서 예산 이하 셀 전부 (1차원 배열 묶음) + 통계"""
+    is_mg = uses_pmt(catalog['capital_id'])
+    prices = catalog['prices']
+
+    vehicle_mask = np.ones(len(prices), dtype=bool)
+    if brands:
+        vehicle_mask &= np.isin(catalog['brands'], [b.upper() for b in brands])
+    if max_vehicle_price is not None:
+        vehicle_mask &= prices <= max_vehicle_price
+
+    v_idx = np.flatnonzero(vehicle_mask)
+    t_idx = _axis_index(catalog['terms'], terms)
+    m_idx = _axis_index(catalog['mileages'], mileages)
+
+    residual = catalog['residual_rate'][np.ix_(v_idx, t_idx, m_idx)]
+    available = ~np.isnan(residual)
+    price = prices[v_idx]
+    term_values = np.array(catalog['terms'], dtype=np.float64)[t_idx]
+    down_payment = price * (down_payment_percent / 100)
+
+    # 차량별 금융 대상 금액 (core.quote 와 같은 취득원가)
+    if is_mg:
+        acquisition_cost = price + batch_mg_acquisition_tax(price, catalog['is_ev'][v_idx], False)
+        down_payment_rate = batch_mg_down_payment_rate(down_payment, acquisition_cost)
+        financed = acquisition_cost - np.trunc(acquisition_cost * down_payment_rate)
+        fixed_monthly = np.zeros((len(v_idx), len(t_idx)))
+    else:
+        acquisition_cost = price + (price / 1.1) * ACQUISITION_TAX_RATE + REGISTRATION_FEE
+        financed = acquisition_cost - down_payment
+        fixed_monthly = (REGISTRATION_FEE / term_values[None, :]
+                         + catalog['annual_car_tax'][v_idx, None] / 12)
+
+    cells_total = int(available.sum())
+
+    if prune and cells_total:
+        # 하한: 이자 ≥ 0 이므로 월 납입료 ≥ (금융 대상 - 최대 잔존가치) / 기간 + 고정 비용.
+        # 잔존가치가 클수록 납입료가 작아지므로 (차량, 기간)별 최대 잔존율로 하한을 구한다.
+        best_residual = np.where(available, residual, -np.inf).max(axis=(2, 3))
+        lower_bound = ((financed[:, None] - price[:, None] * best_residual) / term_values[None, :]
+                       + fixed_monthly)
+        keep = lower_bound <= budget + ROUNDING_SLACK
+        available &= keep[:, :, None, None]
+
+    vi, ti, mi, gi = np.nonzero(available)
+    cell_residual = residual[vi, ti, mi, gi]
+    cell_price = price[vi]
+    cell_terms = term_values[ti]
+    cell_rate = catalog['annual_rate'][v_idx[vi], t_idx[ti]]
+
+    with np.errstate(invalid='ignore'):
+        if is_mg:
+            monthly_payment = batch_mg_lease(
+                vehicle_price=cell_price,
+                residual_rate=cell_residual,
+                contract_months=cell_terms,
+                annual_interest_rate=cell_rate,
+                down_payment_rate=down_payment_rate[vi],
+                is_ev=catalog['is_ev'][v_idx[vi]],
+                is_hybrid=False
+            )['monthly_payment']
+        else:
+            monthly_payment = batch_operating_lease(
+                vehicle_price=cell_price,
+                contract_months=cell_terms,
+                down_payment=down_payment[vi],
+                residual_rate=cell_residual,
+                annual_rate=cell_rate,
+                acquisition_tax_rate=0.0,
+                registration_fee=REGISTRATION_FEE,
+                annual_car_tax=catalog['annual_car_tax'][v_idx[vi]],
+                method='simple',
+                acquisition_cost=acquisition_cost[vi]
+            )['monthly_total']
+
+    within = np.asarray(monthly_payment) <= budget
+
+    return {
+        'vehicle': v_idx[vi][within],
+        'term': t_idx[ti][within],
+        'mileage': m_idx[mi][within],
+        'grade': gi[within],
+        'residual_rate': cell_residual[within],
+        'annual_rate': cell_rate[within],
+        'vehicle_price': cell_price[within],
+        'down_payment': down_payment[vi][within],
+        'monthly_payment': np.asarray(monthly_payment)[within],
+        'cells_total': cells_total,
+        'cells_priced': len(vi),
+    }
+
+
+def search_deals(
+    max_monthly_payment: float,
+    top_k: int = 20,
+    capital_ids: Optional[List[str]] = None,
+    terms: Optional[List[int]] = None,
+    mileages: Optional[List[int]] = None,
+    brands: Optional[List[str]] = None,
+    max_vehicle_price: Optional[float] = None,
+    down_payment_percent: float = 0.0,
+    sort_by: str = 'vehicle_price',
+    one_per_vehicle: bool = True,
+    prune: bool = True
+) -> Dict:
+    """
+    예산 이하 월 납입료로 가능한 조건 상위 k개 검색
+
+    Args:
+        max_monthly_payment: 월 납입료 상한 (원)
+        top_k: 반환할 최대 건수
+        capital_ids: 검색할 캐피탈 (None이면 잔존율 데이터가 있는 전체)
+        terms: 계약 기간 필터 (None이면 전체)
+        mileages: 연간 주행거리 필터 (None이면 전체)
+        brands: 브랜드 필터 (대소문자 무시)
+        max_vehicle_price: 차량가 상한
+        down_payment_percent: 차량가 대비 선납금 비율 (0~100)
+        sort_by: 'vehicle_price' (예산 안에서 비싼 차 우선) 또는
+                 'monthly_payment' (납입료 낮은 순)
+        one_per_vehicle: True면 캐피탈·차량별로 납입료가 가장 낮은 조건 1건만
+        prune: False면 하한 가지치기 없이 전체 셀 계산 (검증/벤치마크용)
+
+    Returns:
+        Dict: {
+            'results': [{'capital_id', 'vehicle_id', 'brand', 'model', 'trim',
+                         'display_name', 'vehicle_price', 'down_payment',
+                         'contract_months', 'annual_mileage', 'grade_option',
+                         'residual_rate', 'annual_rate', 'monthly_payment'}, ...],
+            'stats': {'matches', 'cells_total', 'cells_priced', 'elapsed_ms'}
+        }
+
+    Raises:
+        ValueError: 정렬 기준이 잘못된 경우
+    """
+    if sort_by not in SORT_KEYS:
+        raise ValueError(f"지원하지 않는 정렬 기준입니다: {sort_by} (가능: {', '.join(SORT_KEYS)})")
+
+    start = time.perf_counter()
+    if capital_ids is None:
+        capital_ids = sorted(residual_rates.get_available_capitals())
+
+    catalogs = [compile_catalog(capital_id) for capital_id in capital_ids]
+    found = [
+        _search_capital(catalog, max_monthly_payment, down_payment_percent,
+                        terms, mileages, brands, max_vehicle_price, prune)
+        for catalog in catalogs
+    ]
+
+    capital = np.concatenate([np.full(len(f['vehicle']), c, dtype=np.intp) for c, f in enumerate(found)])
+    columns = {
+        name: np.concatenate([f[name] for f in found])
+        for name in ('vehicle', 'term', 'mileage', 'grade', 'residual_rate', 'annual_rate',
+                     'vehicle_price', 'down_payment', 'monthly_payment')
+    }
+    payment = columns['monthly_payment']
+    matches = len(payment)
+
+    candidates = np.arange(matches)
+    if one_per_vehicle and matches:
+        # 캐피탈·차량별 최저 납입료 1건 (동률이면 잔존율 높은 조건)
+        vehicle_key = capital * (max(len(c['vehicle_ids']) for c in catalogs) + 1) + columns['vehicle']
+        order = np.lexsort((-columns['residual_rate'], payment, vehicle_key))
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = vehicle_key[order][1:] != vehicle_key[order][:-1]
+        candidates = order[first]
+
+    if sort_by == 'vehicle_price':
+        ranking = np.lexsort((payment[candidates], -columns['vehicle_price'][candidates]))
+    else:
+        ranking = np.lexsort((-columns['vehicle_price'][candidates], payment[candidates]))
+    selected = candidates[ranking[:max(top_k, 0)]]
+
+    results = []
+    for i in selected:
+        catalog = catalogs[capital[i]]
+        vehicle_id = catalog['vehicle_ids'][columns['vehicle'][i]]
+        vehicle = vehicle_master._load_vehicles(catalog['capital_id'])[vehicle_id]
+        results.append({
+            'capital_id': catalog['capital_id'],
+            'vehicle_id': vehicle_id,
+            'brand': vehicle['brand'],
+            'model': vehicle['model'],
+            'trim': vehicle['trim'],
+            'display_name': vehicle.get('display_name'),
+            'vehicle_price': float(columns['vehicle_price'][i]),
+            'down_payment': float(columns['down_payment'][i]),
+            'contract_months': catalog['terms'][columns['term'][i]],
+            'annual_mileage': catalog['mileages'][columns['mileage'][i]],
+            'grade_option': catalog['grade_options'][columns['grade'][i]],
+            'residual_rate': float(columns['residual_rate'][i]),
+            'annual_rate': float(columns['annual_rate'][i]),
+            'monthly_payment': float(payment[i]),
+        })
+
+    return {
+        'results': results,
+        'stats': {
+            'matches': matches,
+            'cells_total': sum(f['cells_total'] for f in found),
+            'cells_priced': sum(f['cells_priced'] for f in found),
+            'elapsed_ms': (time.perf_counter() - start) * 1000,
+        }
+    }
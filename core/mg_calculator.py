@@ -11,10 +11,13 @@ MG캐피탈 전용 리스료 계산기
 import numpy_financial as npf
 from typing import Dict, Optional
 
+from utils.tracing import traced
+
 
 class MGLeaseCalculator:
     """MG캐피탈 방식 리스료 계산기"""
 
+    @traced("mg_calculator.calculate")
     def calculate(
         self,
         vehicle_price: int,
@@ -0,0 +1,194 @@
+"""
+core/quote.py
+캐피탈별 단일 견적 계산 (잔존율 조회 → 금리 → 계산기 호출)
+
+app.py 비교 모드에 인라인으로 있던 로직을 UI 밖으로 분리한 것
+"""
+
+from typing import Dict, List, Optional, Tuple
+
+from core.quote_cache import get_quote_cache, make_quote_key
+from core.registry import get_capital, get_plugin
+from data import residual_rates, interest_rates
+from utils.tracing import span, traced
+
+# 메리츠 방식 취득원가 상수 (개인 등록 기준)
+ACQUISITION_TAX_RATE = 0.07
+REGISTRATION_FEE = 100_000
+
+
+def get_preferred_grade_options(capital_id: str) -> List[str]:
+    """캐피탈별 잔가 옵션 우선순위 (core.registry 선언의 fallback_grade_options)"""
+    return get_capital(capital_id).fallback_grade_options
+
+
+@traced("quote.resolve_residual_rate")
+def resolve_residual_rate(
+    capital_id: str,
+    vehicle_id: str,
+    contract_months: int,
+    annual_mileage: int,
+    grade_options: Optional[List[str]] = None
+) -> Tuple[float, str]:
+    """
+    우선순위대로 잔가 옵션을 시도하여 잔존율 조회
+
+    Args:
+        capital_id: 캐피탈 ID
+        vehicle_id: 캐피탈별 차량 ID
+        contract_months: 계약 기간
+        annual_mileage: 연간 주행거리
+        grade_options: 시도할 잔가 옵션 (None이면 캐피탈 기본 우선순위)
+
+    Returns:
+        Tuple[float, str]: (잔존율, 적용된 잔가 옵션)
+
+    Raises:
+        ValueError: 모든 옵션에 잔존율 데이터가 없는 경우
+    """
+    options = grade_options or get_preferred_grade_options(capital_id)
+
+    last_error = None
+    for grade_option in options:
+        try:
+            rate = residual_rates.get_residual_rate(
+                capital_id, vehicle_id,
+                contract_months, annual_mileage,
+                grade_option=grade_option
+            )
+            return rate, grade_option
+        except ValueError as e:
+            last_error = e
+
+    raise ValueError(f"잔존율 데이터 없음: {capital_id}/{vehicle_id}") from last_error
+
+
+@traced("quote.calculate_capital_quote")
+def calculate_capital_quote(
+    capital_id: str,
+    vehicle: Dict,
+    vehicle_price: float,
+    contract_months: int,
+    annual_mileage: int,
+    residual_rate: float,
+    annual_rate: float,
+    down_payment: float = 0.0
+) -> Dict:
+    """
+    캐피탈별 계산 방식으로 월 납입료 계산 (core.registry 의 캐피탈 플러그인)
+
+    Args:
+        capital_id: 캐피탈 ID
+        vehicle: 캐피탈별 차량 정보 (engine_cc 사용)
+        vehicle_price: 계산에 사용할 차량가
+        contract_months: 계약 기간
+        annual_mileage: 연간 주행거리
+        residual_rate: 잔존율 (0~1)
+        annual_rate: 연 금리 (0~1)
+        down_payment: 선납금 (원)
+
+    Returns:
+        Dict: 통일된 계산 상세 (monthly_payment, down_payment, total_payment,
+              residual_value, acquisition_cost, breakdown 등)
+    """
+    return get_plugin(capital_id).calculate_quote(
+        vehicle, vehicle_price, contract_months, annual_mileage,
+        residual_rate, annual_rate, down_payment
+    )
+
+
+@traced("quote.quote_for_capital")
+def quote_for_capital(
+    capital_id: str,
+    vehicle: Dict,
+    vehicle_price: float,
+    contract_months: int,
+    annual_mileage: int,
+    down_payment_percent: float = 0.0,
+    grade_options: Optional[List[str]] = None,
+    use_cache: bool = True
+) -> Dict:
+    """
+    캐피탈 1곳의 견적 (잔존율 → 금리 → 계산)
+
+    같은 조건(정규화 키 + 데이터 버전)의 견적은 공유 견적 캐시에서 반환한다.
+
+    Args:
+        capital_id: 캐피탈 ID
+        vehicle: 캐피탈별 차량 정보 (id, brand, is_import, engine_cc)
+        vehicle_price: 계산에 사용할 차량가
+        contract_months: 계약 기간
+        annual_mileage: 연간 주행거리
+        down_payment_percent: 차량가 대비 선납금 비율 (0~100)
+        grade_options: 시도할 잔가 옵션 (None이면 캐피탈 기본 우선순위)
+        use_cache: False면 캐시를 거치지 않고 계산
+
+    Returns:
+        Dict: {'monthly_payment', 'grade_option', 'residual_rate', 'details'}
+
+    Raises:
+        ValueError: 잔존율 데이터가 없는 경우 (실패는 캐시하지 않음)
+    """
+    args = (capital_id, vehicle, vehicle_price, contract_months, annual_mileage,
+            down_payment_percent, grade_options)
+    if not use_cache:
+        return _compute_quote(*args)
+
+    key = make_quote_key(
+        capital_id=capital_id,
+        vehicle_id=vehicle['id'],
+        vehicle_price=vehicle_price,
+        contract_months=contract_months,
+        annual_mileage=annual_mileage,
+        grade_options=grade_options or get_preferred_grade_options(capital_id),
+        down_payment_percent=down_payment_percent,
+        flags=["ev"] if vehicle['engine_cc'] == 0 else None
+    )
+    return get_quote_cache().get_or_compute(key, lambda: _compute_quote(*args))
+
+
+def _compute_quote(
+    capital_id: str,
+    vehicle: Dict,
+    vehicle_price: float,
+    contract_months: int,
+    annual_mileage: int,
+    down_payment_percent: float,
+    grade_options: Optional[List[str]]
+) -> Dict:
+    """quote_for_capital 계산 본체 (캐시 미사용)"""
+    residual_rate, grade_option = resolve_residual_rate(
+        capital_id, vehicle['id'],
+        contract_months, annual_mileage,
+        grade_options=grade_options
+    )
+
+    with span("quote.interest_rate"):
+        annual_rate = interest_rates.get_interest_rate(
+            capital_id=capital_id,
+            vehicle_price=vehicle_price,
+            brand=vehicle['brand'],
+            is_import=vehicle['is_import'],
+            is_ev=(vehicle['engine_cc'] == 0),
+            contract_months=contract_months
+        )
+
+    down_payment = vehicle_price * (down_payment_percent / 100)
+
+    details = calculate_capital_quote(
+        capital_id=capital_id,
+        vehicle=vehicle,
+        vehicle_price=vehicle_price,
+        contract_months=contract_months,
+        annual_mileage=annual_mileage,
+        residual_rate=residual_rate,
+        annual_rate=annual_rate,
+        down_payment=down_payment
+    )
+
+    return {
+        'monthly_payment': details['monthly_payment'],
+        'grade_option': grade_option,
+        'residual_rate': residual_rate,
+        'details': details
+    }
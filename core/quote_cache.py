@@ -0,0 +1,407 @@
+"""
+core/quote_cache.py
+정규화된 견적 키 + 공유 LRU/TTL 견적 캐시
+
+- QuoteKey: 캐피탈, 차량, 기간, 주행거리, 잔가옵션, 선납금, 지역, 플래그, 데이터 버전을
+  정규화해 담은 해시 가능한 키 (같은 견적 = 같은 키)
+- QuoteCache: 메모리 LRU + TTL, 선택적 sqlite 디스크 계층 (워커 프로세스 간 공유)
+- 데이터 버전: 차량/잔존율/금리 원본 파일의 지문. 데이터가 바뀌면 키가 달라져 이전 결과는 자연히 무효화
+
+환경 변수 (공유 캐시 기본 설정):
+    QUOTE_CACHE_MAX_ENTRIES  메모리 최대 항목 수 (기본 4096)
+    QUOTE_CACHE_TTL          유효 시간 초 (기본 3600)
+    QUOTE_CACHE_DISK         sqlite 파일 경로 (없으면 메모리만)
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from pathlib import Path
+from typing import Callable, Dict, Iterable, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from data import shared_plane
+from utils.tracing import count
+
+DEFAULT_MAX_ENTRIES = 4096
+DEFAULT_TTL = 60 * 60
+DEFAULT_REGION = "서울"
+
+_DATA_DIR = Path(__file__).parent.parent / "data"
+
+# 데이터 버전 (프로세스당 1회 계산 - 로더도 프로세스당 1회 적재하므로 일치)
+_DATA_VERSION: Optional[str] = None
+_DATA_VERSION_LOCK = threading.Lock()
+
+
+def _data_files() -> Iterable[Path]:
+    """견적 결과에 영향을 주는 원본 파일"""
+    yield _DATA_DIR / "vehicle_master.npz"
+    yield _DATA_DIR / "vehicle_master.json"
+    yield _DATA_DIR / "mg_vehicle_master.npz"
+    yield _DATA_DIR / "mg_vehicle_master.json"
+    yield _DATA_DIR / "master_carinfo.json"
+    yield _DATA_DIR / "interest_rates.py"
+    yield _DATA_DIR / "tax_policies.py"
+    yield from sorted((_DATA_DIR / "residual_rates").glob("*.npz"))
+    yield from sorted((_DATA_DIR / "residual_rates").glob("*.json"))
+
+
+def data_version() -> str:
+    """
+    데이터 버전 지문 (파일명 + 크기 + 수정 시각의 해시, 12자리)
+
+    Returns:
+        str: 예) "3f9a0c1b7d2e"
+    """
+    global _DATA_VERSION
+    if _DATA_VERSION is None:
+        with _DATA_VERSION_LOCK:
+            if _DATA_VERSION is None:
+                h = hashlib.sha256()
+                for path in _data_files():
+                    if path.exists():
+                        stat = path.stat()
+                        h.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns};".encode())
+                _DATA_VERSION = h.hexdigest()[:12]
+    return _DATA_VERSION
+
+
+def refresh_data_version() -> str:
+    """데이터 파일 교체 후 지문 재계산"""
+    global _DATA_VERSION
+    with _DATA_VERSION_LOCK:
+        _DATA_VERSION = None
+    return data_version()
+
+
+# 데이터 평면 워커도 같은 지문으로 게시 버전을 비교 (data 레이어는 core 를 import 하지 않음)
+shared_plane.set_data_version(data_version, refresh_data_version)
+
+
+class QuoteKey(NamedTuple):
+    """정규화된 견적 키 (make_quote_key 로 생성)"""
+    kind: str
+    capital_id: str
+    vehicle_id: str
+    vehicle_price: int
+    contract_months: int
+    annual_mileage: int
+    grade_options: Tuple[str, ...]
+    down_payment_percent: float
+    region: str
+    flags: Tuple[str, ...]
+    data_version: str
+
+    def digest(self) -> str:
+        """프로세스 간 공유용 고정 문자열 키 (sha256)"""
+        return hashlib.sha256(json.dumps(list(self), ensure_ascii=False).encode("utf-8")).hexdigest()
+
+
+def make_quote_key(
+    capital_id: str,
+    vehicle_id: str,
+    vehicle_price: float,
+    contract_months: int,
+    annual_mileage: int,
+    grade_options: Optional[Iterable[str]] = None,
+    down_payment_percent: float = 0.0,
+    region: str = DEFAULT_REGION,
+    flags: Optional[Iterable[str]] = None,
+    kind: str = "quote"
+) -> QuoteKey:
+    """
+    견적 키 정규화
+
+    - 금액은 원 단위 정수, 비율은 소수 4자리
+    - 잔가옵션은 지정 순서 유지 (우선순위 의미), 플래그는 정렬·중복 제거
+    - 데이터 버전 자동 포함
+
+    Args:
+        capital_id: 캐피탈 ID (compare 는 쉼표로 연결한 캐피탈 목록)
+        vehicle_id: 차량 ID (compare 는 "브랜드|모델|트림")
+        vehicle_price: 차량가
+        contract_months: 계약 기간
+        annual_mileage: 연간 주행거리
+        grade_options: 잔가옵션 우선순위 (None이면 캐피탈 기본)
+        down_payment_percent: 선납금 비율 (0~100)
+        region: 등록 지역
+        flags: 계산 플래그 (예: "ev", "hybrid", "company_lease")
+        kind: "quote" 또는 "compare"
+    """
+    return QuoteKey(
+        kind=kind,
+        capital_id=str(capital_id),
+        vehicle_id=str(vehicle_id),
+        vehicle_price=int(round(float(vehicle_price))),
+        contract_months=int(contract_months),
+        annual_mileage=int(annual_mileage),
+        grade_options=tuple(grade_options) if grade_options else (),
+        down_payment_percent=round(float(down_payment_percent), 4),
+        region=region,
+        flags=tuple(sorted(set(flags))) if flags else (),
+        data_version=data_version(),
+    )
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    raise TypeError(f"직렬화할 수 없는 타입: {type(value).__name__}")
+
+
+_MISSING = object()
+
+
+class QuoteCache:
+    """
+    메모리 LRU + TTL 견적 캐시 (스레드 안전), 선택적 sqlite 디스크 계층
+
+    메모리 미스 시 디스크를 확인하고, 디스크 적중 값은 메모리로 올린다.
+    메모리에는 pickle 바이트로 보관하고 조회마다 새 객체로 복원하므로
+    호출자가 반환 값을 수정해도 캐시에 영향이 없다. (deepcopy 보다 5배 빠름)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = DEFAULT_MAX_ENTRIES,
+        ttl: float = DEFAULT_TTL,
+        disk_path: Optional[str] = None,
+        max_disk_entries: int = 100_000
+    ):
+        """
+        Args:
+            max_entries: 메모리 최대 항목 수 (초과 시 가장 오래 안 쓴 항목 제거)
+            ttl: 유효 시간 (초)
+            disk_path: sqlite 파일 경로 (None이면 메모리만)
+            max_disk_entries: 디스크 최대 항목 수 (정리 시 만료 임박 순 삭제)
+        """
+        if max_entries <= 0:
+            raise ValueError("max_entries는 1 이상이어야 합니다")
+
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.disk_path = disk_path
+        self.max_disk_entries = max_disk_entries
+
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[QuoteKey, Tuple[float, bytes]]" = OrderedDict()
+        self._counters = {
+            'hits': 0, 'misses': 0, 'evictions': 0, 'expirations': 0,
+            'disk_hits': 0, 'disk_writes': 0,
+        }
+
+        self._disk_lock = threading.Lock()
+        self._disk: Optional[sqlite3.Connection] = None
+        self._disk_pid: Optional[int] = None
+        self._disk_puts = 0
+
+    # ---- 디스크 계층 ----
+
+    def _connection(self) -> Optional[sqlite3.Connection]:
+        """프로세스별 sqlite 연결 (fork 이후 재연결)"""
+        if self.disk_path is None:
+            return None
+        if self._disk is None or self._disk_pid != os.getpid():
+            conn = sqlite3.connect(self.disk_path, timeout=5.0, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS quotes ("
+                "key TEXT PRIMARY KEY, value TEXT NOT NULL, expires REAL NOT NULL)"
+            )
+            conn.commit()
+            self._disk, self._disk_pid = conn, os.getpid()
+        return self._disk
+
+    def _disk_get(self, key: QuoteKey, now: float):
+        if self.disk_path is None:
+            return _MISSING
+        with self._disk_lock:
+            conn = self._connection()
+            if conn is None:
+                return _MISSING
+            row = conn.execute(
+                "SELECT value, expires FROM quotes WHERE key = ?", (key.digest(),)
+            ).fetchone()
+        if row is None or row[1] <= now:
+            return _MISSING
+        return json.loads(row[0]), row[1]
+
+    def _disk_put(self, key: QuoteKey, value, expires: float) -> None:
+        if self.disk_path is None:
+            return
+        payload = json.dumps(value, ensure_ascii=False, default=_json_default)
+        with self._disk_lock:
+            conn = self._connection()
+            if conn is None:
+                return
+            conn.execute(
+                "INSERT OR REPLACE INTO quotes (key, value, expires) VALUES (?, ?, ?)",
+                (key.digest(), payload, expires)
+            )
+            self._disk_puts += 1
+            if self._disk_puts % 256 == 0:
+                self._purge_disk(conn)
+            conn.commit()
+        with self._lock:
+            self._counters['disk_writes'] += 1
+
+    def _purge_disk(self, conn: sqlite3.Connection) -> None:
+        """만료 항목 삭제 + 최대 항목 수 유지"""
+        conn.execute("DELETE FROM quotes WHERE expires <= ?", (time.time(),))
+        conn.execute(
+            "DELETE FROM quotes WHERE key IN ("
+            "SELECT key FROM quotes ORDER BY expires DESC LIMIT -1 OFFSET ?)",
+            (self.max_disk_entries,)
+        )
+
+    # ---- 조회/저장 ----
+
+    def get(self, key: QuoteKey, default=None):
+        """캐시 조회 (없거나 만료되면 default)"""
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, value = entry
+                if expires > now:
+                    self._entries.move_to_end(key)
+                    self._counters['hits'] += 1
+                    count("quote_cache.hits")
+                    return pickle.loads(value)
+                del self._entries[key]
+                self._counters['expirations'] += 1
+
+        found = self._disk_get(key, now)
+        if found is _MISSING:
+            with self._lock:
+                self._counters['misses'] += 1
+            count("quote_cache.misses")
+            return default
+
+        value, expires = found
+        count("quote_cache.disk_hits")
+        with self._lock:
+            self._counters['hits'] += 1
+            self._counters['disk_hits'] += 1
+            self._store(key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), expires)
+        return value
+
+    def _store(self, key: QuoteKey, value: bytes, expires: float) -> None:
+        """메모리 저장 + LRU 제거 (락 보유 상태에서 호출)"""
+        self._entries[key] = (expires, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._counters['evictions'] += 1
+
+    def put(self, key: QuoteKey, value) -> None:
+        expires = time.time() + self.ttl
+        with self._lock:
+            self._store(key, pickle.dumps(value, pickle.HIGHEST_PROTOCOL), expires)
+        self._disk_put(key, value, expires)
+
+    def get_or_compute(self, key: QuoteKey, compute: Callable[[], object]):
+        """
+        조회 후 없으면 계산하여 저장
+
+        compute 가 예외를 던지면 저장하지 않고 그대로 전파한다.
+        """
+        value = self.get(key, _MISSING)
+        if value is not _MISSING:
+            return value
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+        with self._disk_lock:
+            conn = self._connection()
+            if conn is not None:
+                conn.execute("DELETE FROM quotes")
+                conn.commit()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            for name in self._counters:
+                self._counters[name] = 0
+
+    def stats(self) -> Dict:
+        """
+        캐시 통계
+
+        Returns:
+            Dict: {'entries', 'max_entries', 'ttl', 'disk', 'hits', 'misses',
+                   'evictions', 'expirations', 'disk_hits', 'disk_writes', 'hit_rate'}
+        """
+        with self._lock:
+            counters = dict(self._counters)
+            entries = len(self._entries)
+        lookups = counters['hits'] + counters['misses']
+        return {
+            'entries': entries,
+            'max_entries': self.max_entries,
+            'ttl': self.ttl,
+            'disk': self.disk_path,
+            **counters,
+            'hit_rate': counters['hits'] / lookups if lookups else 0.0,
+        }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# ========================================
+# 공유 인스턴스
+# ========================================
+
+_QUOTE_CACHE: Optional[QuoteCache] = None
+_QUOTE_CACHE_LOCK = threading.Lock()
+
+
+def get_quote_cache() -> QuoteCache:
+    """프로세스 공유 견적 캐시 (환경 변수 설정으로 최초 생성)"""
+    global _QUOTE_CACHE
+    if _QUOTE_CACHE is None:
+        with _QUOTE_CACHE_LOCK:
+            if _QUOTE_CACHE is None:
+                _QUOTE_CACHE = QuoteCache(
+                    max_entries=int(os.environ.get("QUOTE_CACHE_MAX_ENTRIES", DEFAULT_MAX_ENTRIES)),
+                    ttl=float(os.environ.get("QUOTE_CACHE_TTL", DEFAULT_TTL)),
+                    disk_path=os.environ.get("QUOTE_CACHE_DISK") or None,
+                )
+    return _QUOTE_CACHE
+
+
+def configure_quote_cache(
+    max_entries: int = DEFAULT_MAX_ENTRIES,
+    ttl: float = DEFAULT_TTL,
+    disk_path: Optional[str] = None
+) -> QuoteCache:
+    """
+    공유 견적 캐시 교체 (서버/CLI 시작 시)
+
+    프로세스 워커도 같은 설정을 쓰도록 환경 변수에도 기록한다.
+    """
+    global _QUOTE_CACHE
+    os.environ["QUOTE_CACHE_MAX_ENTRIES"] = str(max_entries)
+    os.environ["QUOTE_CACHE_TTL"] = str(ttl)
+    if disk_path:
+        os.environ["QUOTE_CACHE_DISK"] = str(disk_path)
+    else:
+        os.environ.pop("QUOTE_CACHE_DISK", None)
+
+    with _QUOTE_CACHE_LOCK:
+        _QUOTE_CACHE = QuoteCache(max_entries=max_entries, ttl=ttl, disk_path=disk_path)
+    return _QUOTE_CACHE
@@ -0,0 +1,352 @@
+"""
+core/quote_cube.py
+표준 견적 전체 사전 계산 큐브 (.npz 컬럼 저장 + 배열 조회)
+
+표준 견적 = 캐피탈 차량가, 기본 잔가 옵션 우선순위, 선납금 0~50% (5% 단위).
+입력 공간이 유한하므로 빌드 작업(tools/build_quote_cube.py)이 모든 조합을 미리 계산해
+차량/기간/주행거리/선납 비율의 순번(ordinal)으로 색인된 배열로 저장한다.
+서비스는 순번 조회만 하고, 표준이 아닌 입력(차량가 변경, 임의 선납 비율 등)이나
+데이터 버전이 다른 큐브는 None을 반환하여 실시간 계산으로 넘긴다.
+"""
+
+import json
+import os
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+
+from core.calculator import calculate_auto_tax
+from core.batch_pricing import (
+    batch_operating_lease,
+    batch_mg_lease,
+    batch_mg_acquisition_tax,
+    batch_mg_down_payment_rate,
+)
+from core.quote import ACQUISITION_TAX_RATE, REGISTRATION_FEE, resolve_residual_rate
+from core.quote_cache import data_version
+from core.registry import uses_pmt
+from data import vehicle_master, residual_rates, interest_rates
+from utils.single_flight import SingleFlightCache
+
+CUBE_FORMAT_VERSION = 1
+DEFAULT_CUBE_PATH = Path(__file__).parent.parent / "data" / "quote_cube.npz"
+DEFAULT_DOWN_PAYMENT_PERCENTS: List[int] = list(range(0, 55, 5))  # 앱 슬라이더와 동일
+
+# 로드된 큐브 (키 = 파일 경로 문자열)
+_CUBE_CACHE = SingleFlightCache("quote_cube")
+
+
+def get_cube_path() -> Path:
+    """큐브 파일 경로 (환경변수 QUOTE_CUBE_PATH 우선)"""
+    return Path(os.environ.get("QUOTE_CUBE_PATH") or DEFAULT_CUBE_PATH)
+
+
+# ========================================
+# 빌드
+# ========================================
+
+def _collect_axes(residual_data: Dict, vehicle_ids: List[str]):
+    terms, mileages = set(), set()
+    for vid in vehicle_ids:
+        for table in residual_data[vid].values():
+            for months, by_mileage in (table or {}).items():
+                terms.add(int(months))
+                mileages.update(int(m) for m in (by_mileage or {}))
+    return sorted(terms), sorted(mileages)
+
+
+def build_capital_cube(capital_id: str, down_payment_percents: List[int]) -> Dict[str, np.ndarray]:
+    """
+    캐피탈 1곳의 표준 견적 전체 계산
+
+    잔존율/잔가 옵션은 quote_for_capital 과 같은 resolve_residual_rate 로 셀마다 결정하고,
+    계산은 스칼라 계산기와 원 단위까지 같은 배열 엔진으로 한 번에 수행한다.
+
+    Returns:
+        Dict[str, np.ndarray]: vehicle_ids, terms, mileages, down_payment_percents,
+            grade_options, vehicle_price (V,), annual_rate (V, T),
+            grade_index (V, T, M) -1 = 데이터 없음, residual_rate (V, T, M),
+            residual_value (V, T, M), down_payment (V, D),
+            monthly_payment / total_payment (V, T, M, D) NaN = 데이터 없음,
+            integer_amounts () 스칼라 계산기가 금액을 int로 반환하는 캐피탈 (MG)
+    """
+    vehicles = vehicle_master._load_vehicles(capital_id)
+    residual_data = residual_rates._load_residual_rates(capital_id)
+    vehicle_ids = [vid for vid, v in vehicles.items() if v.get('price') and residual_data.get(vid)]
+    terms, mileages = _collect_axes(residual_data, vehicle_ids)
+
+    V, T, M = len(vehicle_ids), len(terms), len(mileages)
+    grade_options: List[str] = []
+    grade_index = np.full((V, T, M), -1, dtype=np.int8)
+    residual = np.full((V, T, M), np.nan)
+    annual_rate = np.zeros((V, T))
+
+    for v, vid in enumerate(vehicle_ids):
+        vehicle = vehicles[vid]
+        for t, term in enumerate(terms):
+            annual_rate[v, t] = interest_rates.get_interest_rate(
+                capital_id=capital_id,
+                vehicle_price=vehicle['price'],
+                brand=vehicle['brand'],
+                is_import=vehicle['is_import'],
+                is_ev=(vehicle['engine_cc'] == 0),
+                contract_months=term
+            )
+            for m, mileage in enumerate(mileages):
+                try:
+                    rate, grade_option = resolve_residual_rate(capital_id, vid, term, mileage)
+                except (ValueError, TypeError):
+                    continue
+                if rate is None:
+                    continue
+                if grade_option not in grade_options:
+                    grade_options.append(grade_option)
+                grade_index[v, t, m] = grade_options.index(grade_option)
+                residual[v, t, m] = rate
+
+    price = np.array([vehicles[vid]['price'] for vid in vehicle_ids], dtype=np.float64)
+    is_ev = np.array([vehicles[vid]['engine_cc'] == 0 for vid in vehicle_ids], dtype=bool)
+    percents = np.array(down_payment_percents, dtype=np.float64)
+
+    # 축: (V, T, M, D)
+    p = price[:, None, None, None]
+    n = np.array(terms, dtype=np.float64)[None, :, None, None]
+    r = residual[:, :, :, None]
+    rate = annual_rate[:, :, None, None]
+    down = price[:, None] * (percents[None, :] / 100)
+
+    with np.errstate(invalid='ignore'):
+        if uses_pmt(capital_id):
+            acquisition_cost = price + batch_mg_acquisition_tax(price, is_ev, False)
+            down_payment_rate = batch_mg_down_payment_rate(down, acquisition_cost[:, None])
+            result = batch_mg_lease(
+                vehicle_price=p,
+                residual_rate=r,
+                contract_months=n,
+                annual_interest_rate=rate,
+                down_payment_rate=down_payment_rate[:, None, None, :],
+                is_ev=is_ev[:, None, None, None],
+                is_hybrid=False
+            )
+            monthly_payment = result['monthly_payment']
+            down = np.trunc(acquisition_cost[:, None] * down_payment_rate)
+        else:
+            annual_car_tax = np.array([
+                calculate_auto_tax(engine_cc=vehicles[vid]['engine_cc'], is_commercial=False)
+                for vid in vehicle_ids
+            ], dtype=np.float64)
+            acquisition_cost = price + (price / 1.1) * ACQUISITION_TAX_RATE + REGISTRATION_FEE
+            monthly_payment = batch_operating_lease(
+                vehicle_price=p,
+                contract_months=n,
+                down_payment=down[:, None, None, :],
+                residual_rate=r,
+                annual_rate=rate,
+                acquisition_tax_rate=0.0,
+                registration_fee=REGISTRATION_FEE,
+                annual_car_tax=annual_car_tax[:, None, None, None],
+                method='simple',
+                acquisition_cost=acquisition_cost[:, None, None, None]
+            )['monthly_total']
+
+    monthly_payment = np.where(np.isnan(r), np.nan, monthly_payment)
+
+    return {
+        'vehicle_ids': np.array(vehicle_ids),
+        'terms': np.array(terms, dtype=np.int64),
+        'mileages': np.array(mileages, dtype=np.int64),
+        'down_payment_percents': percents,
+        'grade_options': np.array(grade_options),
+        'vehicle_price': price,
+        'annual_rate': annual_rate,
+        'grade_index': grade_index,
+        'residual_rate': residual,
+        'residual_value': np.trunc(price[:, None, None] * residual),
+        'down_payment': down,
+        'monthly_payment': monthly_payment,
+        'total_payment': down[:, None, None, :] + monthly_payment * n,
+        'integer_amounts': np.array(uses_pmt(capital_id)),
+    }
+
+
+def build_quote_cube(
+    output_path: Optional[Path] = None,
+    capital_ids: Optional[List[str]] = None,
+    down_payment_percents: Optional[List[int]] = None
+) -> Dict:
+    """
+    전체 캐피탈 큐브 빌드 → .npz 저장 (임시 파일에 쓴 뒤 교체)
+
+    Returns:
+        Dict: {'path', 'data_version', 'capitals': {capital_id: 셀 수}, 'bytes', 'elapsed'}
+    """
+    start = time.perf_counter()
+    output_path = Path(output_path or get_cube_path())
+    capital_ids = sorted(capital_ids or residual_rates.get_available_capitals())
+    down_payment_percents = list(down_payment_percents or DEFAULT_DOWN_PAYMENT_PERCENTS)
+
+    arrays: Dict[str, np.ndarray] = {}
+    cells = {}
+    for capital_id in capital_ids:
+        cube = build_capital_cube(capital_id, down_payment_percents)
+        cells[capital_id] = int((~np.isnan(cube['monthly_payment'])).sum())
+        for name, values in cube.items():
+            arrays[f"{capital_id}/{name}"] = values
+
+    meta = {
+        'format_version': CUBE_FORMAT_VERSION,
+        'data_version': data_version(),
+        'built_at': datetime.now().isoformat(timespec="seconds"),
+        'capitals': capital_ids,
+    }
+    arrays['meta'] = np.array(json.dumps(meta))
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp_path = output_path.with_name(output_path.name + ".tmp.npz")
+    np.savez_compressed(tmp_path, **arrays)
+    os.replace(tmp_path, output_path)
+
+    return {
+        'path': str(output_path),
+        'data_version': meta['data_version'],
+        'capitals': cells,
+        'bytes': output_path.stat().st_size,
+        'elapsed': time.perf_counter() - start,
+    }
+
+
+# ========================================
+# 서비스 (배열 조회)
+# ========================================
+
+class QuoteCube:
+    """로드된 큐브 (순번 색인 dict + 캐피탈별 배열)"""
+
+    def __init__(self, path: Path):
+        with np.load(path, allow_pickle=False) as npz:
+            self.meta = json.loads(str(npz['meta']))
+            self.capitals: Dict[str, Dict] = {}
+            for capital_id in self.meta['capitals']:
+                arrays = {name: npz[f"{capital_id}/{name}"]
+                          for name in ('vehicle_ids', 'terms', 'mileages', 'down_payment_percents',
+                                       'grade_options', 'vehicle_price', 'annual_rate', 'grade_index',
+                                       'residual_rate', 'residual_value', 'down_payment',
+                                       'monthly_payment', 'total_payment', 'integer_amounts')}
+                arrays['vehicle_index'] = {vid: i for i, vid in enumerate(arrays['vehicle_ids'].tolist())}
+                arrays['term_index'] = {int(t): i for i, t in enumerate(arrays['terms'])}
+                arrays['mileage_index'] = {int(m): i for i, m in enumerate(arrays['mileages'])}
+                arrays['down_index'] = {round(float(d), 6): i for i, d in enumerate(arrays['down_payment_percents'])}
+                arrays['grade_options'] = arrays['grade_options'].tolist()
+                arrays['amount_type'] = int if bool(arrays.pop('integer_amounts')) else float
+                self.capitals[capital_id] = arrays
+        self.path = str(path)
+
+    @property
+    def is_current(self) -> bool:
+        """현재 데이터 버전으로 빌드된 큐브인지"""
+        return (self.meta.get('format_version') == CUBE_FORMAT_VERSION
+                and self.meta.get('data_version') == data_version())
+
+    def lookup(
+        self,
+        capital_id: str,
+        vehicle_id: str,
+        contract_months: int,
+        annual_mileage: int,
+        down_payment_percent: float = 0.0
+    ) -> Optional[Dict]:
+        """
+        표준 견적 조회 (큐브에 없으면 None)
+
+        Returns:
+            Optional[Dict]: quote_for_capital 과 같은 최상위 키
+                {'monthly_payment', 'grade_option', 'residual_rate', 'details'}
+                (details는 공통 요약: monthly_payment, down_payment, total_payment,
+                 residual_value, annual_interest_rate)
+        """
+        cube = self.capitals.get(capital_id)
+        if cube is None:
+            return None
+
+        v = cube['vehicle_index'].get(vehicle_id)
+        t = cube['term_index'].get(contract_months)
+        m = cube['mileage_index'].get(annual_mileage)
+        d = cube['down_index'].get(round(float(down_payment_percent), 6))
+        if v is None or t is None or m is None or d is None:
+            return None
+
+        # .item() 은 numpy 스칼라를 거치지 않고 파이썬 값을 바로 반환
+        g = cube['grade_index'].item(v, t, m)
+        if g < 0:
+            return None
+
+        # 금액 타입도 실시간 계산 결과와 같게 (MG: int, 메리츠: float)
+        amount = cube['amount_type']
+        monthly_payment = amount(cube['monthly_payment'].item(v, t, m, d))
+        return {
+            'monthly_payment': monthly_payment,
+            'grade_option': cube['grade_options'][g],
+            'residual_rate': cube['residual_rate'].item(v, t, m),
+            'details': {
+                'monthly_payment': monthly_payment,
+                'down_payment': amount(cube['down_payment'].item(v, d)),
+                'total_payment': amount(cube['total_payment'].item(v, t, m, d)),
+                'residual_value': int(cube['residual_value'].item(v, t, m)),
+                'annual_interest_rate': cube['annual_rate'].item(v, t),
+            },
+        }
+
+    def vehicle_price(self, capital_id: str, vehicle_id: str) -> Optional[float]:
+        """큐브가 계산에 사용한 차량가 (표준 여부 판단용)"""
+        cube = self.capitals.get(capital_id)
+        v = cube['vehicle_index'].get(vehicle_id) if cube else None
+        return None if v is None else cube['vehicle_price'].item(v)
+
+    def info(self) -> Dict:
+        return {**self.meta, 'path': self.path, 'current': self.is_current}
+
+
+def load_quote_cube(path: Optional[Path] = None) -> Optional[QuoteCube]:
+    """
+    큐브 로드 (경로당 1회). 파일이 없거나 데이터 버전이 다르면 None
+
+    Returns:
+        Optional[QuoteCube]: 사용 가능한 큐브
+    """
+    key = str(path) if path else (os.environ.get("QUOTE_CUBE_PATH") or str(DEFAULT_CUBE_PATH))
+    cube = _CUBE_CACHE.get(key)  # 조회마다 파일 stat/경로 파싱을 하지 않도록 먼저 확인
+    if cube is None:
+        if not os.path.exists(key):
+            return None
+        cube = _CUBE_CACHE.get_or_load(key, lambda: QuoteCube(Path(key)))
+    return cube if cube.is_current else None
+
+
+def reload_quote_cube(path: Optional[Path] = None) -> Optional[QuoteCube]:
+    """큐브 파일 교체 후 다시 로드"""
+    _CUBE_CACHE.clear(str(Path(path or get_cube_path())))
+    return load_quote_cube(path)
+
+
+def cube_quote(
+    capital_id: str,
+    vehicle: Dict,
+    vehicle_price: float,
+    contract_months: int,
+    annual_mileage: int,
+    down_payment_percent: float = 0.0
+) -> Optional[Dict]:
+    """
+    표준 입력이면 큐브 조회 결과, 아니면 None (호출자가 실시간 계산)
+
+    Args:
+        vehicle: 캐피탈별 차량 정보 (id 필요)
+        vehicle_price: 요청 차량가 (큐브 차량가와 다르면 비표준)
+    """
+    cube = load_quote_cube()
+    if cube is None or cube.vehicle_price(capital_id, vehicle['id']) != vehicle_price:
+        return None
+    return cube.lookup(capital_id, vehicle['id'], contract_months, annual_mileage, down_payment_percent)
@@ -0,0 +1,110 @@
+"""
+core/quote_pipeline.py
+단일 캐피탈 견적 파이프라인 (데이터플로 그래프)
+
+차량 → 차량가 → 잔존율 → 금리 → 취득원가 → 월 납입료 → 조건별 비교표
+
+app.py 단일 캐피탈 모드에 인라인으로 있던 계산을 노드로 나눈 것.
+세션마다 그래프 1개를 두면 위젯 하나가 바뀔 때 그 값에 의존하는 노드만 다시 실행된다.
+(예: 선납금 변경 → 선납금/월 납입료/시나리오 그리드만 재계산)
+"""
+
+from typing import Callable, Dict, List, Optional
+
+from core.registry import get_plugin
+from core.scenario_grid import build_scenario_grid, resolve_grid_grade_option, slice_grid
+from data import vehicle_master, residual_rates, interest_rates
+from utils.dataflow import Dataflow
+
+
+def _vehicle(vehicle_id: str, vehicle_capital_id: Optional[str]) -> Dict:
+    return vehicle_master.get_vehicle(vehicle_id, capital_id=vehicle_capital_id)
+
+
+def _residual(capital_id: str, vehicle_id: str, contract_months: int,
+              annual_mileage: int, grade_option: str) -> float:
+    return residual_rates.get_residual_rate(
+        capital_id, vehicle_id,
+        contract_months, annual_mileage,
+        grade_option=grade_option
+    )
+
+
+def _rate(vehicle: Dict, price: float, capital_id: str, contract_months: int) -> float:
+    return interest_rates.get_interest_rate(
+        capital_id=capital_id,
+        vehicle_price=price,
+        brand=vehicle['brand'],
+        is_import=vehicle['is_import'],
+        is_ev=(vehicle['engine_cc'] == 0),
+        contract_months=contract_months
+    )
+
+
+def _acquisition(vehicle: Dict, price: float, capital_id: str) -> Dict:
+    """취득원가 (과세표준, 취득세, 등록비, 합계) + 연 자동차세 (캐피탈 플러그인)"""
+    return get_plugin(capital_id).acquisition(vehicle, price)
+
+
+def _down_payment(price: float, down_payment_percent: float) -> float:
+    return price * (down_payment_percent / 100)
+
+
+def _payment(vehicle: Dict, price: float, residual: float, rate: float, acquisition: Dict,
+             down_payment: float, capital_id: str, contract_months: int, annual_mileage: int) -> Dict:
+    """월 납입료 상세 (calculate_operating_lease 결과 형식, 캐피탈 플러그인)"""
+    return get_plugin(capital_id).lease_payment(
+        vehicle, price, residual, rate, acquisition, down_payment, contract_months, annual_mileage
+    )
+
+
+def _grid_option(scenario_grid: Dict, grade_option: Optional[str]) -> Optional[str]:
+    return resolve_grid_grade_option(scenario_grid, grade_option)
+
+
+def _period_rows(scenario_grid: Dict, grid_option: Optional[str], annual_mileage: int) -> List[Dict]:
+    if not grid_option:
+        return []
+    return slice_grid(scenario_grid, grid_option, annual_mileage=annual_mileage)
+
+
+def _mileage_rows(scenario_grid: Dict, grid_option: Optional[str], contract_months: int) -> List[Dict]:
+    if not grid_option:
+        return []
+    return slice_grid(scenario_grid, grid_option, contract_months=contract_months)
+
+
+def build_quote_flow(grid_builder: Optional[Callable[[str, str, float], Dict]] = None) -> Dataflow:
+    """
+    단일 캐피탈 견적 그래프 생성
+
+    Args:
+        grid_builder: (capital_id, vehicle_id, down_payment) → 시나리오 그리드
+                      (None이면 build_scenario_grid, 앱은 프로세스 공유 캐시 함수를 넘김)
+
+    Returns:
+        Dataflow: 노드 vehicle, price, residual, rate, acquisition, down_payment,
+                  payment, scenario_grid, grid_option, period_rows, mileage_rows
+    """
+    if grid_builder is None:
+        def grid_builder(capital_id, vehicle_id, down_payment):
+            return build_scenario_grid(capital_id, vehicle_id, down_payment=down_payment)
+
+    flow = Dataflow("quote")
+    flow.add("vehicle", _vehicle, inputs=("vehicle_id", "vehicle_capital_id"))
+    flow.add("price", lambda vehicle: vehicle['price'], deps=("vehicle",))
+    flow.add("residual", _residual,
+             inputs=("capital_id", "vehicle_id", "contract_months", "annual_mileage", "grade_option"))
+    flow.add("rate", _rate, deps=("vehicle", "price"), inputs=("capital_id", "contract_months"))
+    flow.add("acquisition", _acquisition, deps=("vehicle", "price"), inputs=("capital_id",))
+    flow.add("down_payment", _down_payment, deps=("price",), inputs=("down_payment_percent",))
+    flow.add("payment", _payment,
+             deps=("vehicle", "price", "residual", "rate", "acquisition", "down_payment"),
+             inputs=("capital_id", "contract_months", "annual_mileage"))
+    flow.add("scenario_grid",
+             lambda down_payment, capital_id, vehicle_id: grid_builder(capital_id, vehicle_id, float(down_payment)),
+             deps=("down_payment",), inputs=("capital_id", "vehicle_id"))
+    flow.add("grid_option", _grid_option, deps=("scenario_grid",), inputs=("grade_option",))
+    flow.add("period_rows", _period_rows, deps=("scenario_grid", "grid_option"), inputs=("annual_mileage",))
+    flow.add("mileage_rows", _mileage_rows, deps=("scenario_grid", "grid_option"), inputs=("contract_months",))
+    return flow
@@ -0,0 +1,166 @@
+"""
+core/registry.py
+캐피탈 플러그인 레지스트리
+
+캐피탈마다 계산기 모듈, 데이터 파일, 잔가 옵션, 대체(fallback) 정책을 CapitalSpec 한 줄로 선언한다.
+선언은 문자열만 담아 가볍고, 계산기 모듈(core/capitals/*)은 처음 견적할 때 import 하며
+데이터(차량 마스터, 잔존율)도 로더가 처음 조회할 때 적재한다.
+시작 시간과 메모리는 설치된 캐피탈 수가 아니라 실제로 쓴 캐피탈 수에 비례한다.
+
+새 캐피탈 추가:
+    1. 기존 계산 방식이 아니면 core/capitals/{name}.py 에 acquisition, lease_payment, calculate_quote 구현
+    2. CAPITALS 에 CapitalSpec 추가 (데이터 파일은 excel_reverse_engineering/extract_all.py 로 생성)
+"""
+
+import importlib
+from types import ModuleType
+from typing import Dict, List, NamedTuple
+
+from data import interest_rates, vehicle_master
+from utils.single_flight import SingleFlightCache
+
+# 배열 엔진(시나리오 그리드, 예산 검색, 견적 큐브)이 쓰는 계산 방식
+PRICING_SIMPLE = "simple"  # 정액법 (메리츠 방식)
+PRICING_PMT = "pmt"        # PMT 연금 방식 (MG 방식, 원 단위 절사)
+
+_PLUGIN_CACHE = SingleFlightCache("capital_plugins")
+
+
+class CapitalSpec(NamedTuple):
+    """캐피탈 선언"""
+    capital_id: str
+    display_name: str
+    plugin: str                        # 계산기 모듈 (처음 쓸 때 import)
+    pricing: str                       # PRICING_SIMPLE | PRICING_PMT
+    vehicle_master: str                # data/ 아래 차량 마스터 파일 이름 (확장자 제외)
+    grade_options: Dict[str, str]      # 잔가 옵션 → 표시 이름 (화면 순서, 첫 항목이 기본)
+    fallback_grade_options: List[str]  # 견적 시 시도 순서 (앞 옵션에 잔존율이 없으면 다음)
+    rate_table: str                    # data.interest_rates.INTEREST_RATES 키
+
+
+_MERITZ_GRADE_OPTIONS = {
+    'aps_premium': 'APS 고잔가 (최대)',
+    'aps_normal': 'APS 일반잔가',
+    'west_premium': 'West 고잔가',
+    'west_normal': 'West 일반잔가',
+    'vgs_premium': 'VGS 고잔가',
+    'vgs_normal': 'VGS 일반잔가',
+}
+
+CAPITALS: Dict[str, CapitalSpec] = {
+    spec.capital_id: spec for spec in [
+        CapitalSpec(
+            capital_id="meritz_capital",
+            display_name="메리츠캐피탈",
+            plugin="core.capitals.meritz",
+            pricing=PRICING_SIMPLE,
+            vehicle_master="vehicle_master",
+            grade_options=_MERITZ_GRADE_OPTIONS,
+            fallback_grade_options=['aps_premium', 'west_normal'],
+            rate_table="meritz_capital",
+        ),
+        CapitalSpec(
+            capital_id="nh_capital",
+            display_name="NH농협캐피탈",
+            plugin="core.capitals.meritz",
+            pricing=PRICING_SIMPLE,
+            vehicle_master="vehicle_master",
+            grade_options=_MERITZ_GRADE_OPTIONS,
+            fallback_grade_options=['aps_premium', 'west_normal'],
+            rate_table="nh_capital",
+        ),
+        CapitalSpec(
+            capital_id="mg_capital",
+            display_name="MG새마을금고",
+            plugin="core.capitals.mg",
+            pricing=PRICING_PMT,
+            vehicle_master="mg_vehicle_master",
+            grade_options={'snk_premium': 'SNK 고잔가 (+8%)', 'snk_normal': 'SNK 일반잔가'},
+            fallback_grade_options=['snk_premium', 'snk_normal'],
+            rate_table="mg_capital",
+        ),
+    ]
+}
+
+# 선언이 없는 캐피탈(잔존율 파일만 추가된 경우)은 메리츠 방식으로 계산
+DEFAULT_SPEC = CAPITALS["meritz_capital"]
+
+
+def _bind_data_files(spec: CapitalSpec) -> None:
+    """데이터 로더에 캐피탈의 차량 마스터/금리표 이름 전달 (data 레이어는 core 를 import 하지 않음)"""
+    vehicle_master.VEHICLE_MASTER_FILES[spec.capital_id] = spec.vehicle_master
+    interest_rates.RATE_TABLES[spec.capital_id] = spec.rate_table
+
+
+for _spec in CAPITALS.values():
+    _bind_data_files(_spec)
+
+
+def get_capital(capital_id: str) -> CapitalSpec:
+    """
+    캐피탈 선언 조회
+
+    Args:
+        capital_id: 캐피탈 ID
+
+    Returns:
+        CapitalSpec: 등록된 선언 (없으면 DEFAULT_SPEC 에 ID/금리표를 바꾸고,
+                     차량 마스터는 데이터 레이어의 ID 접두사 규칙을 따른 선언)
+    """
+    spec = CAPITALS.get(capital_id)
+    if spec is None:
+        return DEFAULT_SPEC._replace(
+            capital_id=capital_id, display_name=capital_id, rate_table=capital_id,
+            vehicle_master=vehicle_master.vehicle_master_name(capital_id)
+        )
+    return spec
+
+
+def register_capital(spec: CapitalSpec) -> None:
+    """
+    캐피탈 선언 등록 (같은 ID는 교체)
+
+    Raises:
+        ValueError: 알 수 없는 계산 방식, 잔가 옵션 없음
+    """
+    if spec.pricing not in (PRICING_SIMPLE, PRICING_PMT):
+        raise ValueError(f"알 수 없는 계산 방식입니다: {spec.pricing}")
+    if not spec.fallback_grade_options:
+        raise ValueError(f"잔가 옵션 시도 순서가 없습니다: {spec.capital_id}")
+    CAPITALS[spec.capital_id] = spec
+    _bind_data_files(spec)
+
+
+def installed_capitals() -> List[str]:
+    """등록된 캐피탈 ID (데이터 파일 유무와 무관)"""
+    return list(CAPITALS)
+
+
+def display_name(capital_id: str) -> str:
+    """화면 표시 이름 (등록되지 않은 캐피탈은 ID 그대로)"""
+    return get_capital(capital_id).display_name
+
+
+def uses_pmt(capital_id: str) -> bool:
+    """PMT 방식(원 단위 절사) 계산 여부"""
+    return get_capital(capital_id).pricing == PRICING_PMT
+
+
+def get_plugin(capital_id: str) -> ModuleType:
+    """
+    캐피탈 계산기 모듈 (처음 호출 시 import, 이후 캐시)
+
+    모듈은 다음 함수를 제공한다:
+        acquisition(vehicle, price) → 취득원가 Dict
+        lease_payment(vehicle, price, residual, rate, acquisition, down_payment,
+                      contract_months, annual_mileage) → calculate_operating_lease 형식 Dict
+        calculate_quote(vehicle, vehicle_price, contract_months, annual_mileage,
+                        residual_rate, annual_rate, down_payment) → 견적 상세 Dict
+    """
+    module_name = get_capital(capital_id).plugin
+    return _PLUGIN_CACHE.get_or_load(module_name, lambda: importlib.import_module(module_name))
+
+
+def loaded_plugins() -> List[str]:
+    """지금까지 import 된 계산기 모듈"""
+    return sorted(_PLUGIN_CACHE.snapshot())
@@ -0,0 +1,262 @@
+"""
+core/scenario_grid.py
+계약기간 × 주행거리 × 잔가옵션 시나리오 그리드
+
+셀마다 잔존율/금리/계산기를 따로 호출하는 대신, 잔존율 텐서를 한 번 만들고
+배열 계산 엔진(core.batch_pricing)으로 전체 매트릭스를 한 번에 계산한다.
+UI는 임의의 단면(기간별/주행거리별)이나 히트맵을 추가 계산 없이 표시할 수 있다.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from core.calculator import calculate_auto_tax
+from core.batch_pricing import (
+    batch_operating_lease,
+    batch_mg_lease,
+    batch_mg_acquisition_tax,
+    batch_mg_down_payment_rate,
+)
+from core.quote import ACQUISITION_TAX_RATE, REGISTRATION_FEE, get_preferred_grade_options
+from core.registry import uses_pmt
+from data import vehicle_master, residual_rates, interest_rates, shared_plane
+
+DEFAULT_TERMS: List[int] = [24, 36, 48, 60]
+DEFAULT_MILEAGES: List[int] = [10000, 15000, 20000, 30000]
+
+
+def _rate_lookup(capital_id: str, vehicle_id: str) -> Tuple[Callable[[str, int, int], Optional[float]], Optional[str]]:
+    """차량 1대의 (잔가 옵션, 기간, 주행거리) → 잔존율 조회 함수 + 원본 데이터의 첫 번째 옵션"""
+    plane = shared_plane.get_plane()  # 데이터 평면 모드: 원본 잔존율을 적재하지 않고 공유 배열에서
+    if plane is not None and plane.has_vehicle(capital_id, vehicle_id):
+        def lookup(option: str, term: int, mileage: int) -> Optional[float]:
+            return plane.residual_rate(capital_id, vehicle_id, term, mileage, option)
+        return lookup, plane.first_grade_option(capital_id, vehicle_id)
+
+    vehicle_data = residual_rates._load_residual_rates(capital_id).get(vehicle_id) or {}
+
+    def lookup(option: str, term: int, mileage: int) -> Optional[float]:
+        return ((vehicle_data.get(option) or {}).get(str(term)) or {}).get(str(mileage))
+    return lookup, next(iter(vehicle_data), None)
+
+
+def build_residual_tensor(
+    capital_id: str,
+    vehicle_id: str,
+    terms: List[int],
+    mileages: List[int],
+    grade_options: List[str]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    잔존율 텐서 (기간 × 주행거리 × 잔가옵션), 데이터 없는 셀은 NaN
+
+    단건 견적(get_residual_rate → resolve_residual_rate)과 같은 셀 단위 폴백을 적용한다:
+    요청 옵션에 값이 없으면 차량의 첫 번째 옵션, 그다음 캐피탈 우선순위
+    (get_preferred_grade_options) 순서로 값이 있는 옵션을 쓴다.
+
+    Returns:
+        Tuple[np.ndarray, np.ndarray]: (잔존율 (T, M, G), 셀마다 실제 적용된 잔가 옵션 (T, M, G), 없으면 None)
+    """
+    tensor = np.full((len(terms), len(mileages), len(grade_options)), np.nan)
+    applied = np.full(tensor.shape, None, dtype=object)
+    lookup, first_option = _rate_lookup(capital_id, vehicle_id)
+    fallback = [first_option] if first_option else []
+    fallback += list(get_preferred_grade_options(capital_id))
+
+    for g, grade_option in enumerate(grade_options):
+        chain = list(dict.fromkeys([grade_option] + fallback))
+        for t, term in enumerate(terms):
+            for m, mileage in enumerate(mileages):
+                for option in chain:
+                    rate = lookup(option, term, mileage)
+                    if rate is not None:
+                        tensor[t, m, g] = rate
+                        applied[t, m, g] = option
+                        break
+
+    return tensor, applied
+
+
+def build_scenario_grid(
+    capital_id: str,
+    vehicle_id: str,
+    vehicle: Optional[Dict] = None,
+    vehicle_price: Optional[float] = None,
+    down_payment: float = 0.0,
+    terms: Optional[List[int]] = None,
+    mileages: Optional[List[int]] = None,
+    grade_options: Optional[List[str]] = None
+) -> Dict:
+    """
+    차량 1대 × 캐피탈 1곳의 전체 시나리오 매트릭스 계산
+
+    Args:
+        capital_id: 캐피탈 ID
+        vehicle_id: 캐피탈별 차량 ID
+        vehicle: 차량 정보 (None이면 vehicle_master에서 조회)
+        vehicle_price: 계산에 사용할 차량가 (None이면 차량 정보의 가격)
+        down_payment: 선납금 (원)
+        terms: 계약 기간 목록 (기본 24/36/48/60)
+        mileages: 연간 주행거리 목록 (기본 1만/1.5만/2만/3만)
+        grade_options: 잔가 옵션 목록 (None이면 차량에 있는 옵션 전체)
+
+    Returns:
+        Dict: {
+            'capital_id', 'vehicle_id', 'vehicle_price', 'down_payment',
+            'terms', 'mileages', 'grade_options',
+            'annual_rate': (T,) 기간별 금리,
+            'residual_rate', 'monthly_payment', 'total_payment',
+            'total_interest': (T, M, G) 배열 (데이터 없는 셀은 NaN),
+            'applied_grade_option': (T, M, G) 셀마다 실제 적용된 잔가 옵션
+                                    (요청 옵션에 값이 없어 다른 옵션으로 채운 셀 포함, 없으면 None),
+            'available': (T, M, G) bool 배열
+        }
+
+    Raises:
+        ValueError: 차량 또는 가격 정보가 없는 경우
+    """
+    if vehicle is None:
+        vehicle = vehicle_master.get_vehicle(vehicle_id, capital_id=capital_id)
+
+    if vehicle_price is None:
+        vehicle_price = vehicle.get('price')
+    if not vehicle_price:
+        raise ValueError(f"차량 {vehicle_id}의 가격 정보가 없습니다")
+
+    terms = list(terms or DEFAULT_TERMS)
+    mileages = list(mileages or DEFAULT_MILEAGES)
+    if grade_options is None:
+        grade_options = residual_rates.get_grade_options(capital_id, vehicle_id)
+    grade_options = list(grade_options)
+
+    residual, applied = build_residual_tensor(capital_id, vehicle_id, terms, mileages, grade_options)
+    is_ev = vehicle['engine_cc'] == 0
+
+    # 기간별 금리 (48개월 이상 우대 등 기간에만 의존)
+    annual_rate = np.array([
+        interest_rates.get_interest_rate(
+            capital_id=capital_id,
+            vehicle_price=vehicle_price,
+            brand=vehicle['brand'],
+            is_import=vehicle['is_import'],
+            is_ev=is_ev,
+            contract_months=term
+        )
+        for term in terms
+    ])
+
+    term_axis = np.array(terms, dtype=np.float64)[:, None, None]
+    rate_axis = annual_rate[:, None, None]
+
+    with np.errstate(invalid='ignore'):
+        if uses_pmt(capital_id):
+            # MG Capital: PMT 방식
+            acquisition_cost = vehicle_price + batch_mg_acquisition_tax(vehicle_price, is_ev, False)
+            down_payment_rate = batch_mg_down_payment_rate(down_payment, acquisition_cost)
+            result = batch_mg_lease(
+                vehicle_price=vehicle_price,
+                residual_rate=residual,
+                contract_months=term_axis,
+                annual_interest_rate=rate_axis,
+                down_payment_rate=down_payment_rate,
+                is_ev=is_ev,
+                is_hybrid=False
+            )
+            monthly_payment = result['monthly_payment']
+            total_payment = result['total_payment']
+            total_interest = (
+                result['total_payment'] - result['down_payment']
+                - result['financed_amount'] + result['residual_value']
+            )
+        else:
+            # Meritz/NH Capital: 정액법 방식 (core.quote 와 같은 취득원가)
+            taxable_base = vehicle_price / 1.1
+            acquisition_tax = taxable_base * ACQUISITION_TAX_RATE
+            acquisition_cost = vehicle_price + acquisition_tax + REGISTRATION_FEE
+            annual_car_tax = calculate_auto_tax(engine_cc=vehicle['engine_cc'], is_commercial=False)
+
+            result = batch_operating_lease(
+                vehicle_price=vehicle_price,
+                contract_months=term_axis,
+                down_payment=down_payment,
+                residual_rate=residual,
+                annual_rate=rate_axis,
+                acquisition_tax_rate=0.0,
+                registration_fee=REGISTRATION_FEE,
+                annual_car_tax=annual_car_tax,
+                method='simple',
+                acquisition_cost=acquisition_cost
+            )
+            monthly_payment = result['monthly_total']
+            total_payment = result['total_payment']
+            total_interest = result['total_interest']
+
+    return {
+        'capital_id': capital_id,
+        'vehicle_id': vehicle_id,
+        'vehicle_price': vehicle_price,
+        'down_payment': down_payment,
+        'terms': terms,
+        'mileages': mileages,
+        'grade_options': grade_options,
+        'annual_rate': annual_rate,
+        'residual_rate': residual,
+        'monthly_payment': np.asarray(monthly_payment),
+        'total_payment': np.asarray(total_payment),
+        'total_interest': np.asarray(total_interest),
+        'applied_grade_option': applied,
+        'available': ~np.isnan(residual),
+    }
+
+
+def resolve_grid_grade_option(grid: Dict, grade_option: Optional[str]) -> Optional[str]:
+    """요청한 잔가 옵션이 그리드에 없으면 첫 번째 옵션 (get_residual_rate 폴백과 동일)"""
+    if grade_option in grid['grade_options']:
+        return grade_option
+    return grid['grade_options'][0] if grid['grade_options'] else None
+
+
+def slice_grid(
+    grid: Dict,
+    grade_option: str,
+    contract_months: Optional[int] = None,
+    annual_mileage: Optional[int] = None
+) -> List[Dict]:
+    """
+    그리드 단면 조회 (데이터 있는 셀만)
+
+    Args:
+        grid: build_scenario_grid 결과
+        grade_option: 잔가 옵션
+        contract_months: 지정하면 해당 기간만 (주행거리별 비교)
+        annual_mileage: 지정하면 해당 주행거리만 (기간별 비교)
+
+    Returns:
+        List[Dict]: [{'contract_months', 'annual_mileage', 'residual_rate', 'grade_option',
+                      'annual_rate', 'monthly_payment', 'total_payment',
+                      'total_interest'}, ...]  (grade_option = 셀에 실제 적용된 잔가 옵션)
+    """
+    g = grid['grade_options'].index(grade_option)
+    rows = []
+
+    for t, term in enumerate(grid['terms']):
+        if contract_months is not None and term != contract_months:
+            continue
+        for m, mileage in enumerate(grid['mileages']):
+            if annual_mileage is not None and mileage != annual_mileage:
+                continue
+            if not grid['available'][t, m, g]:
+                continue
+            rows.append({
+                'contract_months': term,
+                'annual_mileage': mileage,
+                'residual_rate': float(grid['residual_rate'][t, m, g]),
+                'grade_option': grid['applied_grade_option'][t, m, g],
+                'annual_rate': float(grid['annual_rate'][t]),
+                'monthly_payment': float(grid['monthly_payment'][t, m, g]),
+                'total_payment': float(grid['total_payment'][t, m, g]),
+                'total_interest': float(grid['total_interest'][t, m, g]),
+            })
+
+    return rows
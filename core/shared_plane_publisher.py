@@ -0,0 +1,163 @@
+"""
+core/shared_plane_publisher.py
+공유 메모리 데이터 평면 게시자
+
+적재 프로세스(API 서버 또는 별도 게시 프로세스)에서 캐피탈별 카탈로그(core.deal_search)를 컴파일해
+data.shared_plane 형식의 세그먼트로 게시하고, 데이터 파일이 바뀌면 새 버전으로 교체한다.
+워커 쪽 매핑/조회는 data.shared_plane 이 담당한다.
+
+사용법:
+    python -m core.shared_plane_publisher publish --interval 30   # 게시 + 데이터 변경 시 갱신 (종료: Ctrl+C)
+    python -m core.shared_plane_publisher info                     # 현재 게시된 버전/크기
+"""
+
+import argparse
+import json
+import signal
+import sys
+import time
+from multiprocessing import shared_memory
+from typing import Any, Dict, List, Optional
+
+from core.deal_search import _build_catalog
+from core.quote_cache import data_version, refresh_data_version
+from data import residual_rates, shared_plane, vehicle_master
+
+
+def build_groups(capital_ids: Optional[List[str]] = None) -> Dict[str, Dict[str, Any]]:
+    """
+    게시할 그룹 (캐피탈별 컴파일 카탈로그 + 기본/캐피탈별 차량 마스터 컬럼)
+
+    Args:
+        capital_ids: 게시할 캐피탈 (None이면 잔존율 데이터가 있는 전체)
+    """
+    capital_ids = capital_ids or residual_rates.get_available_capitals()
+    groups = {shared_plane.catalog_group(capital_id): _build_catalog(capital_id) for capital_id in capital_ids}
+    for capital_id in [None] + list(capital_ids):
+        name = shared_plane.vehicle_group(vehicle_master.vehicle_master_name(capital_id))
+        if name not in groups:
+            groups[name] = shared_plane.vehicle_columns(vehicle_master._load_vehicles(capital_id))
+    return groups
+
+
+class PlanePublisher:
+    """
+    데이터 평면 게시자 (적재 프로세스에 1개)
+
+    with PlanePublisher("lease_plane") as publisher:
+        publisher.publish()
+        ...
+        publisher.refresh()   # 데이터 파일이 바뀌었으면 새 버전 게시
+    """
+
+    def __init__(self, name: str = shared_plane.DEFAULT_PLANE_NAME):
+        """
+        Raises:
+            ValueError: 같은 이름의 평면이 이미 게시 중
+        """
+        self._control: Optional[shared_memory.SharedMemory] = shared_plane.create_control(name)
+        self.name = name
+        self._segment: Optional[shared_memory.SharedMemory] = None
+        self._sequence = 0
+        self.info: Optional[Dict] = None
+
+    def publish(self, groups: Optional[Dict[str, Dict[str, Any]]] = None) -> Dict:
+        """
+        새 버전 게시 (새 세그먼트 기록 → 제어 세그먼트 교체 → 이전 세그먼트 unlink)
+
+        Args:
+            groups: 게시할 그룹 (None이면 build_groups())
+
+        Returns:
+            Dict: {'segment', 'version', 'data_version', 'bytes', 'groups', 'elapsed'}
+        """
+        started = time.perf_counter()
+        groups = build_groups() if groups is None else groups
+
+        self._sequence += 1
+        segment_name = f"{self.name}_{self._sequence}"
+        version = data_version()
+        segment, size = shared_plane.write_segment(segment_name, groups, self._sequence, version)
+        shared_plane.write_control(self._control, segment_name)
+
+        previous, self._segment = self._segment, segment
+        if previous is not None:
+            previous.close()
+            previous.unlink()  # 이미 매핑한 워커는 계속 읽을 수 있음
+
+        self.info = {
+            'segment': segment_name,
+            'version': self._sequence,
+            'data_version': version,
+            'bytes': size,
+            'groups': sorted(groups),
+            'elapsed': round(time.perf_counter() - started, 3),
+        }
+        return self.info
+
+    def refresh(self) -> bool:
+        """데이터 파일이 바뀌었으면 적재된 데이터를 버리고 새 버전 게시 (게시했으면 True)"""
+        previous = self.info['data_version'] if self.info else None
+        if refresh_data_version() == previous:
+            return False
+        shared_plane.notify_data_change()
+        self.publish()
+        return True
+
+    def close(self) -> None:
+        """현재 세그먼트와 제어 세그먼트 unlink (워커는 다음 조회부터 자체 로더)"""
+        if self._control is not None:
+            shared_plane.write_control(self._control, None)
+            self._control.close()
+            self._control.unlink()
+            self._control = None
+        if self._segment is not None:
+            self._segment.close()
+            self._segment.unlink()
+            self._segment = None
+
+    def __enter__(self) -> "PlanePublisher":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="워커 프로세스 간 공유 메모리 데이터 평면")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    publish = sub.add_parser("publish", help="게시 후 데이터 변경을 감시하며 유지")
+    publish.add_argument("--name", default=shared_plane.DEFAULT_PLANE_NAME)
+    publish.add_argument("--interval", type=float, default=30.0, help="데이터 변경 확인 간격 (초)")
+
+    info = sub.add_parser("info", help="현재 게시된 평면 정보")
+    info.add_argument("--name", default=shared_plane.DEFAULT_PLANE_NAME)
+    args = parser.parse_args()
+
+    if args.command == "info":
+        shared_plane.enable(args.name)
+        view = shared_plane.get_plane()
+        if view is None:
+            print(f"게시된 평면이 없거나 데이터 버전이 다릅니다: {args.name}")
+            sys.exit(1)
+        print(json.dumps(view.info(), ensure_ascii=False, indent=2))
+        return
+
+    # 서비스 관리자의 종료(SIGTERM)도 Ctrl+C 처럼 세그먼트를 정리하고 끝냄
+    signal.signal(signal.SIGTERM, lambda *_: sys.exit(0))
+    with PlanePublisher(args.name) as publisher:
+        result = publisher.publish()
+        print(f"게시: {result['segment']} ({result['bytes']:,} bytes, {len(result['groups'])}개 그룹, "
+              f"{result['elapsed']:.2f}초) - 워커는 {shared_plane.PLANE_ENV}={args.name}")
+        try:
+            while True:
+                time.sleep(args.interval)
+                if publisher.refresh():
+                    print(f"갱신: {publisher.info['segment']} (데이터 버전 {publisher.info['data_version']})")
+        except KeyboardInterrupt:
+            print("\n게시 종료")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,7 +13,7 @@ class ValidationError(Exception):
 
 def validate_lease_input(
     vehicle_price: float,
-    contract_months: int,
+    contract_months: Optional[int],
     down_payment: float = 0,
     residual_rate: Optional[float] = None,
     annual_mileage: Optional[int] = None
@@ -23,7 +23,7 @@ def validate_lease_input(
 
     Args:
         vehicle_price: 차량 가격
-        contract_months: 계약 기간
+        contract_months: 계약 기간 (None이면 검증 생략 - 기간 전체를 계산하는 그리드)
         down_payment: 선납금
         residual_rate: 잔존율
         annual_mileage: 연간 주행거리
@@ -47,7 +47,7 @@ def validate_lease_input(
 
     # 계약 기간 검증
     valid_periods = [24, 36, 48, 60]
-    if contract_months not in valid_periods:
+    if contract_months is not None and contract_months not in valid_periods:
         errors.append(f"계약 기간은 {valid_periods} 중 하나여야 합니다")
 
     # 선납금 검증
@@ -133,7 +133,7 @@ def validate_comparison_inputs(
     Args:
         vehicle_ids: 차량 ID 목록
         capital_ids: 캐피탈 ID 목록
-        contract_months: 계약 기간
+        contract_months: 계약 기간 (None이면 검증 생략 - 기간 전체를 계산하는 그리드)
         annual_mileage: 연간 주행거리
 
     Returns:
@@ -171,7 +171,7 @@ def check_data_availability(
     Args:
         capital_id: 캐피탈 ID
         vehicle_id: 차량 ID
-        contract_months: 계약 기간
+        contract_months: 계약 기간 (None이면 검증 생략 - 기간 전체를 계산하는 그리드)
         annual_mileage: 연간 주행거리
 
     Returns:
@@ -0,0 +1,380 @@
+"""
+data/artifact_format.py
+추출 산출물(차량 마스터, 잔존율) 압축 아티팩트 형식
+
+JSON 은 "10000", "west_premium" 같은 키 문자열이 차량마다 반복되어 크다.
+아티팩트는 같은 데이터를 다음과 같이 .npz 하나에 담는다.
+- header: 형식 이름, 스키마 버전, 종류, 레코드/값 개수, 체크섬 (sha256)
+- tables: 레코드 ID, 키 사전(모든 키 문자열 1회), 구조 사전, 값 사전 (JSON)
+- record_shape: 레코드별 구조 번호 (숫자 배열)
+- leaf_value: 레코드 값들을 순서대로 나열한 값 사전 번호 (숫자 배열)
+
+구조 = 레코드의 중첩 키 배치 (예: 옵션 → 기간 → 주행거리). 대부분 차량이 같은 구조를 공유하므로
+키 문자열은 구조 사전에 한 번만 남는다. 읽으면 JSON 을 읽은 것과 같은 dict 가 나온다
+(키 순서, int/float/bool/None 구분 포함). 같은 데이터는 같은 바이트로 기록된다.
+
+JSON 은 사람이 읽기 위한 내보내기로만 쓴다. 로더는 아티팩트(.npz)를 먼저 읽고,
+아티팩트가 없을 때만 같은 이름의 JSON 을 읽는다.
+
+사용법:
+    python data/artifact_format.py info data/residual_rates/meritz_capital.npz
+    python data/artifact_format.py export data/residual_rates/meritz_capital.npz      # → .json
+    python data/artifact_format.py convert data/residual_rates/meritz_capital.json    # → .npz
+"""
+
+import argparse
+import hashlib
+import io
+import json
+import os
+import sys
+import zipfile
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+
+ARTIFACT_FORMAT = "lease-artifact"
+ARTIFACT_SCHEMA_VERSION = 1
+ARTIFACT_SUFFIX = ".npz"
+
+KIND_VEHICLE_MASTER = "vehicle_master"
+KIND_RESIDUAL_RATES = "residual_rates"
+ARTIFACT_KINDS = (KIND_VEHICLE_MASTER, KIND_RESIDUAL_RATES)
+
+# zip 항목 시각 고정 (같은 데이터 → 같은 바이트)
+_ZIP_DATE_TIME = (1980, 1, 1, 0, 0, 0)
+
+PathLike = Union[str, Path]
+
+
+def artifact_path(path: PathLike) -> Path:
+    """JSON 경로 → 같은 이름의 아티팩트 경로"""
+    return Path(path).with_suffix(ARTIFACT_SUFFIX)
+
+
+def json_path(path: PathLike) -> Path:
+    """아티팩트 경로 → 같은 이름의 JSON 내보내기 경로"""
+    return Path(path).with_suffix(".json")
+
+
+def resolve(path: PathLike) -> Path:
+    """로더가 실제로 읽을 파일 (아티팩트가 있으면 아티팩트, 없으면 JSON)"""
+    artifact = artifact_path(path)
+    return artifact if artifact.exists() else json_path(path)
+
+
+# ============================================================
+# 인코딩 / 디코딩
+# ============================================================
+
+def _smallest_uint(values: List[int]) -> np.ndarray:
+    top = max(values, default=0)
+    for dtype in (np.uint8, np.uint16, np.uint32):
+        if top <= np.iinfo(dtype).max:
+            return np.array(values, dtype=dtype)
+    return np.array(values, dtype=np.uint64)
+
+
+def encode(data: Dict[str, Any]) -> Tuple[Dict, np.ndarray, np.ndarray]:
+    """
+    레코드 dict → (tables, record_shape, leaf_value)
+
+    키는 JSON 과 같이 문자열로 저장한다 (int 키 → str).
+
+    Args:
+        data: {레코드 ID: 중첩 dict 또는 JSON 스칼라}
+
+    Returns:
+        Tuple[Dict, np.ndarray, np.ndarray]: (사전 테이블, 레코드별 구조 번호, 값 번호)
+    """
+    keys: List[str] = []
+    key_index: Dict[str, int] = {}
+    shapes: List[tuple] = []
+    shape_index: Dict[tuple, int] = {}
+    values: List[Any] = []
+    value_index: Dict[Tuple[str, Any], int] = {}
+    record_shape: List[int] = []
+    leaf_value: List[int] = []
+
+    def intern_key(key: Any) -> int:
+        key = key if isinstance(key, str) else str(key)
+        idx = key_index.get(key)
+        if idx is None:
+            idx = key_index[key] = len(keys)
+            keys.append(key)
+        return idx
+
+    def walk(node: Any) -> Optional[tuple]:
+        if isinstance(node, dict):
+            return tuple((intern_key(key), walk(child)) for key, child in node.items())
+        # 1 / 1.0 / True 가 같은 값으로 합쳐지지 않도록 형식까지 키로 사용
+        token = (type(node).__name__, node)
+        idx = value_index.get(token)
+        if idx is None:
+            idx = value_index[token] = len(values)
+            values.append(node)
+        leaf_value.append(idx)
+        return None
+
+    for node in data.values():
+        shape = walk(node)
+        idx = shape_index.get(shape)
+        if idx is None:
+            idx = shape_index[shape] = len(shapes)
+            shapes.append(shape)
+        record_shape.append(idx)
+
+    def to_list(shape: Optional[tuple]) -> Optional[list]:
+        return None if shape is None else [[key, to_list(child)] for key, child in shape]
+
+    tables = {
+        'record_ids': list(data.keys()),
+        'keys': keys,
+        'shapes': [to_list(shape) for shape in shapes],
+        'values': values,
+    }
+    return tables, _smallest_uint(record_shape), _smallest_uint(leaf_value)
+
+
+def _builder(shape: Optional[list], keys: List[str]) -> Optional[Callable[[Iterator], Any]]:
+    """구조 → 값 반복자에서 dict 를 만드는 함수 (값 하나면 None)"""
+    if shape is None:
+        return None
+    if all(child is None for _, child in shape):
+        names = tuple(keys[key] for key, _ in shape)
+        count = len(names)
+        return lambda leaves: dict(zip(names, islice(leaves, count)))
+    items = [(keys[key], _builder(child, keys)) for key, child in shape]
+    return lambda leaves: {name: next(leaves) if build is None else build(leaves) for name, build in items}
+
+
+def decode(tables: Dict, record_shape: np.ndarray, leaf_value: np.ndarray) -> Dict[str, Any]:
+    """encode() 의 역 (레코드 순서, 키 순서 유지)"""
+    values = tables['values']
+    leaves = iter([values[idx] for idx in leaf_value.tolist()])
+    builders = [_builder(shape, tables['keys']) for shape in tables['shapes']]
+
+    data = {}
+    for record_id, shape_idx in zip(tables['record_ids'], record_shape.tolist()):
+        build = builders[shape_idx]
+        data[record_id] = next(leaves) if build is None else build(leaves)
+    return data
+
+
+def _checksum(tables_bytes: bytes, record_shape: np.ndarray, leaf_value: np.ndarray) -> str:
+    h = hashlib.sha256(tables_bytes)
+    for array in (record_shape, leaf_value):
+        h.update(array.dtype.str.encode())
+        h.update(array.tobytes())
+    return "sha256:" + h.hexdigest()
+
+
+def _json_bytes(value: Any) -> np.ndarray:
+    return np.frombuffer(json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8'),
+                         dtype=np.uint8)
+
+
+# ============================================================
+# 파일 입출력
+# ============================================================
+
+def write_artifact(path: PathLike, data: Dict[str, Any], kind: str) -> int:
+    """
+    아티팩트 원자적 기록 (같은 디렉토리 임시 파일 → rename)
+
+    Args:
+        path: 저장 경로 (.npz)
+        data: {레코드 ID: 값}
+        kind: ARTIFACT_KINDS 중 하나
+
+    Returns:
+        int: 기록한 바이트 수
+
+    Raises:
+        ValueError: 알 수 없는 종류
+    """
+    if kind not in ARTIFACT_KINDS:
+        raise ValueError(f"알 수 없는 아티팩트 종류: {kind}")
+
+    tables, record_shape, leaf_value = encode(data)
+    tables_array = _json_bytes(tables)
+    header = {
+        'format': ARTIFACT_FORMAT,
+        'schema_version': ARTIFACT_SCHEMA_VERSION,
+        'kind': kind,
+        'records': len(record_shape),
+        'leaves': len(leaf_value),
+        'shapes': len(tables['shapes']),
+        'checksum': _checksum(tables_array.tobytes(), record_shape, leaf_value),
+    }
+    arrays = {'header': _json_bytes(header), 'tables': tables_array,
+              'record_shape': record_shape, 'leaf_value': leaf_value}
+
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        # np.savez 와 같은 .npy 묶음이지만 zip 항목 시각을 고정
+        with zipfile.ZipFile(tmp, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+            for name, array in arrays.items():
+                buffer = io.BytesIO()
+                np.lib.format.write_array(buffer, array, allow_pickle=False)
+                info = zipfile.ZipInfo(f"{name}.npy", date_time=_ZIP_DATE_TIME)
+                info.compress_type = zipfile.ZIP_DEFLATED
+                zf.writestr(info, buffer.getvalue())
+        size = tmp.stat().st_size
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return size
+
+
+def _open(path: PathLike) -> Tuple[Dict, bytes, np.ndarray, np.ndarray]:
+    """헤더 검증 후 (header, tables 바이트, record_shape, leaf_value)"""
+    path = Path(path)
+    if not path.exists():
+        raise FileNotFoundError(f"아티팩트 파일이 없습니다: {path}")
+    try:
+        with np.load(path, allow_pickle=False) as npz:
+            header = json.loads(npz['header'].tobytes().decode('utf-8'))
+            tables_bytes = npz['tables'].tobytes()
+            record_shape, leaf_value = npz['record_shape'], npz['leaf_value']
+    except (OSError, KeyError, ValueError, zipfile.BadZipFile) as e:
+        raise ValueError(f"아티팩트 형식이 아닙니다: {path} ({e})")
+
+    if header.get('format') != ARTIFACT_FORMAT:
+        raise ValueError(f"아티팩트 형식이 아닙니다: {path}")
+    if header.get('schema_version') != ARTIFACT_SCHEMA_VERSION:
+        raise ValueError(f"지원하지 않는 아티팩트 스키마 버전: {header.get('schema_version')} "
+                         f"(현재 {ARTIFACT_SCHEMA_VERSION}): {path}")
+    return header, tables_bytes, record_shape, leaf_value
+
+
+def read_header(path: PathLike) -> Dict:
+    """아티팩트 헤더 (형식/스키마 버전 검증)"""
+    return _open(path)[0]
+
+
+def read_encoded(path: PathLike, kind: Optional[str] = None) -> Tuple[Dict, np.ndarray, np.ndarray]:
+    """
+    아티팩트를 dict 로 풀지 않고 읽기 (체크섬 검증)
+
+    Args:
+        path: 아티팩트 경로 (.npz)
+        kind: 기대하는 종류 (None이면 검사 안 함)
+
+    Returns:
+        Tuple[Dict, np.ndarray, np.ndarray]: (사전 테이블, 레코드별 구조 번호, 값 번호) - decode() 입력
+
+    Raises:
+        FileNotFoundError: 파일 없음
+        ValueError: 형식/스키마 버전/종류 불일치, 체크섬 불일치 (파일 손상)
+    """
+    header, tables_bytes, record_shape, leaf_value = _open(path)
+    if kind is not None and header['kind'] != kind:
+        raise ValueError(f"아티팩트 종류 불일치: {header['kind']} (기대 {kind}): {path}")
+    if _checksum(tables_bytes, record_shape, leaf_value) != header['checksum']:
+        raise ValueError(f"아티팩트 체크섬 불일치 (파일 손상): {path}")
+    return json.loads(tables_bytes.decode('utf-8')), record_shape, leaf_value
+
+
+def read_artifact(path: PathLike, kind: Optional[str] = None) -> Dict[str, Any]:
+    """
+    아티팩트 읽기 (체크섬 검증)
+
+    Args:
+        path: 아티팩트 경로 (.npz)
+        kind: 기대하는 종류 (None이면 검사 안 함)
+
+    Returns:
+        Dict: JSON 을 읽은 것과 같은 dict
+
+    Raises:
+        FileNotFoundError: 파일 없음
+        ValueError: 형식/스키마 버전/종류 불일치, 체크섬 불일치 (파일 손상)
+    """
+    return decode(*read_encoded(path, kind))
+
+
+def load_data(path: PathLike, kind: Optional[str] = None) -> Dict[str, Any]:
+    """
+    로더용 읽기: 아티팩트가 있으면 아티팩트, 없으면 같은 이름의 JSON
+
+    Args:
+        path: 데이터 경로 (확장자는 .json/.npz 어느 쪽이든)
+        kind: 기대하는 아티팩트 종류
+
+    Raises:
+        FileNotFoundError: 둘 다 없음
+    """
+    source = resolve(path)
+    if source.suffix == ARTIFACT_SUFFIX:
+        return read_artifact(source, kind)
+    if not source.exists():
+        raise FileNotFoundError(f"데이터 파일이 없습니다: {artifact_path(path)} (또는 {source.name})")
+    with open(source, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def export_json(data: Dict[str, Any], path: PathLike) -> int:
+    """사람이 읽는 JSON 내보내기 (들여쓰기 2, 원자적 기록). 기록한 바이트 수 반환"""
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        size = tmp.stat().st_size
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return size
+
+
+def guess_kind(path: PathLike) -> str:
+    """경로로 종류 추정 (residual_rates/ 아래면 잔존율, 아니면 차량 마스터)"""
+    return KIND_RESIDUAL_RATES if Path(path).parent.name == "residual_rates" else KIND_VEHICLE_MASTER
+
+
+def main():
+    parser = argparse.ArgumentParser(description="추출 산출물 아티팩트 도구")
+    sub = parser.add_subparsers(dest="command", required=True)
+    info = sub.add_parser("info", help="헤더/크기 출력")
+    info.add_argument("path")
+    export = sub.add_parser("export", help="아티팩트 → JSON")
+    export.add_argument("path")
+    export.add_argument("output", nargs="?", default=None, help="JSON 경로 (기본: 같은 이름 .json)")
+    convert = sub.add_parser("convert", help="JSON → 아티팩트")
+    convert.add_argument("path")
+    convert.add_argument("--kind", choices=ARTIFACT_KINDS, default=None, help="종류 (기본: 경로로 추정)")
+    args = parser.parse_args()
+
+    try:
+        if args.command == "info":
+            header = read_header(args.path)
+            read_artifact(args.path)
+            for key, value in header.items():
+                print(f"{key:<16}{value}")
+            print(f"{'bytes':<16}{Path(args.path).stat().st_size:,}")
+        elif args.command == "export":
+            output = Path(args.output) if args.output else json_path(args.path)
+            size = export_json(read_artifact(args.path), output)
+            print(f"✓ 내보내기: {output} ({size:,} bytes)")
+        else:
+            with open(args.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            output = artifact_path(args.path)
+            size = write_artifact(output, data, args.kind or guess_kind(args.path))
+            source_size = Path(args.path).stat().st_size
+            print(f"✓ 변환: {output} ({source_size:,} → {size:,} bytes, {len(data)}건)")
+    except (FileNotFoundError, ValueError) as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -90,6 +90,15 @@ INTEREST_RATES = {
 }
 
 
+# 캐피탈 ID → INTEREST_RATES 키 (다른 캐피탈의 금리표를 쓰는 경우, core.registry 가 선언을 등록할 때 채움)
+RATE_TABLES: Dict[str, str] = {}
+
+
+def _rate_table(capital_id: str) -> Optional[Dict]:
+    """캐피탈이 쓰는 금리표 (없으면 None)"""
+    return INTEREST_RATES.get(RATE_TABLES.get(capital_id, capital_id))
+
+
 def get_interest_rate(
     capital_id: str,
     vehicle_price: float,
@@ -114,11 +123,10 @@ def get_interest_rate(
     Returns:
         float: 최종 적용 금리 (연율, 0~1)
     """
-    if capital_id not in INTEREST_RATES:
+    capital_data = _rate_table(capital_id)
+    if capital_data is None:
         raise ValueError(f"캐피탈 {capital_id}의 금리 데이터가 없습니다")
 
-    capital_data = INTEREST_RATES[capital_id]
-
     # 1. 브랜드별 특별 금리 확인 (최우선)
     if brand and brand in capital_data.get("brand_rates", {}):
         base_rate = capital_data["brand_rates"][brand]
@@ -170,11 +178,10 @@ def get_base_rate(capital_id: str, vehicle_price: float) -> float:
     Returns:
         float: 기본 금리
     """
-    if capital_id not in INTEREST_RATES:
+    capital_data = _rate_table(capital_id)
+    if capital_data is None:
         raise ValueError(f"캐피탈 {capital_id}의 금리 데이터가 없습니다")
 
-    capital_data = INTEREST_RATES[capital_id]
-
     for tier in capital_data["price_tiers"]:
         if vehicle_price <= tier["max_price"]:
             return tier["rate"]
@@ -193,10 +200,10 @@ def get_brand_rate(capital_id: str, brand: str) -> Optional[float]:
     Returns:
         Optional[float]: 특별 금리 (없으면 None)
     """
-    if capital_id not in INTEREST_RATES:
+    capital_data = _rate_table(capital_id)
+    if capital_data is None:
         return None
 
-    capital_data = INTEREST_RATES[capital_id]
     return capital_data.get("brand_rates", {}).get(brand)
 
 
@@ -215,7 +222,8 @@ def get_rate_adjustments(capital_id: str) -> Dict:
     Returns:
         Dict: 금리 조정 정책
     """
-    if capital_id not in INTEREST_RATES:
+    capital_data = _rate_table(capital_id)
+    if capital_data is None:
         raise ValueError(f"캐피탈 {capital_id}의 금리 데이터가 없습니다")
 
-    return INTEREST_RATES[capital_id]["adjustments"]
+    return capital_data["adjustments"]
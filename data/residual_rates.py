@@ -1,14 +1,19 @@
 """
 data/residual_rates.py
-잔존율 데이터 로더 (JSON 기반)
+잔존율 데이터 로더 (아티팩트 우선, 없으면 JSON)
 """
 
-import json
 from pathlib import Path
 from typing import Dict, Optional, List
 
-# 캐피탈별 잔존율 캐시
-_RESIDUAL_CACHE: Dict[str, Dict] = {}
+from data import shared_plane
+from data.artifact_format import ARTIFACT_SUFFIX, KIND_RESIDUAL_RATES, load_data
+from utils.single_flight import SingleFlightCache
+from utils.tracing import span
+
+# 캐피탈별 잔존율 캐시 (키당 1회 로드 후 락 없이 읽기)
+_RESIDUAL_CACHE = SingleFlightCache("residual_rates")
+shared_plane.on_data_change(_RESIDUAL_CACHE.clear)
 
 
 def _load_residual_rates(capital_id: str) -> Dict:
@@ -23,17 +28,14 @@ def _load_residual_rates(capital_id: str) -> Dict:
 
     Raises:
         FileNotFoundError: 잔존율 파일이 없는 경우
+        ValueError: 아티팩트 스키마 버전/체크섬 불일치
     """
-    if capital_id not in _RESIDUAL_CACHE:
-        json_path = Path(__file__).parent / "residual_rates" / f"{capital_id}.json"
-
-        if not json_path.exists():
-            raise FileNotFoundError(f"잔존율 데이터 파일이 없습니다: {json_path}")
-
-        with open(json_path, 'r', encoding='utf-8') as f:
-            _RESIDUAL_CACHE[capital_id] = json.load(f)
+    def load() -> Dict:
+        path = Path(__file__).parent / "residual_rates" / f"{capital_id}{ARTIFACT_SUFFIX}"
+        with span("load.residual_rates", capital_id=capital_id):
+            return load_data(path, KIND_RESIDUAL_RATES)
 
-    return _RESIDUAL_CACHE[capital_id]
+    return _RESIDUAL_CACHE.get_or_load(capital_id, load)
 
 
 def get_residual_rate(capital_id: str, vehicle_id: str,
@@ -56,6 +58,19 @@ def get_residual_rate(capital_id: str, vehicle_id: str,
     Raises:
         ValueError: 데이터가 없는 경우
     """
+    plane = shared_plane.get_plane()  # 데이터 평면 모드: 카탈로그에 있는 차량은 폴백까지 공유 배열에서
+    if plane is not None and plane.has_vehicle(capital_id, vehicle_id):
+        rate = plane.residual_rate(capital_id, vehicle_id, contract_months, annual_mileage, grade_option)
+        if rate is None:
+            fallback_option = plane.first_grade_option(capital_id, vehicle_id)
+            if fallback_option is not None:
+                rate = plane.residual_rate(capital_id, vehicle_id, contract_months, annual_mileage, fallback_option)
+        if rate is None:
+            raise ValueError(
+                f"잔존율 데이터 없음: {capital_id}/{vehicle_id}/{grade_option}/{contract_months}/{annual_mileage}"
+            )
+        return rate
+
     data = _load_residual_rates(capital_id)
 
     # JSON은 키가 문자열이므로 변환
@@ -65,8 +80,8 @@ def get_residual_rate(capital_id: str, vehicle_id: str,
     try:
         # 새로운 데이터 구조: data[vehicle_id][grade_option][months][mileage]
         return data[vehicle_id][grade_option][months_key][mileage_key]
-    except KeyError as e:
-        # 폴백: 요청한 옵션이 없으면 다른 옵션 시도
+    except (KeyError, TypeError) as e:
+        # 폴백: 요청한 옵션이 없거나 비어 있으면(None) 다른 옵션 시도
         try:
             vehicle_data = data[vehicle_id]
             # 사용 가능한 옵션 찾기
@@ -82,13 +97,38 @@ def get_residual_rate(capital_id: str, vehicle_id: str,
         ) from e
 
 
-def get_vehicle_residual_table(capital_id: str, vehicle_id: str) -> Dict:
+def get_grade_options(capital_id: str, vehicle_id: str) -> List[str]:
+    """
+    차량의 잔가 옵션 목록 (데이터 순서 유지)
+
+    Raises:
+        ValueError: 차량 데이터가 없는 경우
+    """
+    plane = shared_plane.get_plane()
+    if plane is not None:
+        options = plane.grade_options(capital_id, vehicle_id)
+        if options is not None:
+            return options
+
+    data = _load_residual_rates(capital_id)
+
+    if vehicle_id not in data:
+        raise ValueError(f"차량 {vehicle_id}의 잔존율 데이터가 없습니다")
+
+    vehicle_data = data[vehicle_id] or {}
+    return [option for option, table in vehicle_data.items() if table]
+
+
+def get_vehicle_residual_table(capital_id: str, vehicle_id: str,
+                               grade_option: Optional[str] = None) -> Dict:
     """
     특정 차량의 전체 잔존율 테이블 조회
 
     Args:
         capital_id: 캐피탈 ID
         vehicle_id: 차량 ID
+        grade_option: 잔가 옵션 (None이거나 없는 옵션이면 첫 번째 옵션,
+                     get_residual_rate 폴백과 동일)
 
     Returns:
         Dict: {24: {10000: 0.65, ...}, 36: {...}, ...}
@@ -96,14 +136,19 @@ def get_vehicle_residual_table(capital_id: str, vehicle_id: str) -> Dict:
     Raises:
         ValueError: 차량 데이터가 없는 경우
     """
-    data = _load_residual_rates(capital_id)
+    options = get_grade_options(capital_id, vehicle_id)
 
-    if vehicle_id not in data:
+    if not options:
         raise ValueError(f"차량 {vehicle_id}의 잔존율 데이터가 없습니다")
 
+    if grade_option not in options:
+        grade_option = options[0]
+
+    data = _load_residual_rates(capital_id)
+
     # 문자열 키를 정수로 변환
     result = {}
-    for months_str, mileage_dict in data[vehicle_id].items():
+    for months_str, mileage_dict in data[vehicle_id][grade_option].items():
         months = int(months_str)
         result[months] = {
             int(mileage_str): rate
@@ -135,10 +180,11 @@ def get_available_capitals() -> list:
     if not data_dir.exists():
         return []
 
+    # 아티팩트와 JSON 내보내기가 함께 있으면 한 번만
     capitals = []
-    for json_file in data_dir.glob("*.json"):
-        capital_id = json_file.stem
-        capitals.append(capital_id)
+    for data_file in sorted(data_dir.glob(f"*{ARTIFACT_SUFFIX}")) + sorted(data_dir.glob("*.json")):
+        if data_file.stem not in capitals:
+            capitals.append(data_file.stem)
 
     return capitals
 
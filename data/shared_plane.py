@@ -0,0 +1,515 @@
+"""
+data/shared_plane.py
+워커 프로세스 간 공유 메모리 데이터 평면
+
+여러 API/Streamlit 워커 프로세스를 띄우면 워커마다 차량/잔존율/금리 데이터를 따로 적재해
+워커 수만큼 메모리가 늘어난다. 데이터 평면 모드에서는 적재 프로세스(publisher) 하나가
+캐피탈별 컴파일 배열(core.deal_search 카탈로그: 차량가/전기차/자동차세, 잔존율 (V, T, M, G),
+차량별 잔가 옵션 순서, 금리 (V, T))과 차량 마스터 컬럼을 multiprocessing.shared_memory 세그먼트에
+게시하고, 워커는 읽기 전용으로 매핑해 복사 없이 사용한다. (예산 검색 카탈로그, 잔존율 조회와 폴백,
+잔가 옵션 목록, 시나리오 그리드 잔존율, 차량 조회)
+
+평면에 없는 데이터는 워커가 처음 쓸 때 자기 프로세스에 적재한다: 카탈로그에 없는 차량(가격 또는
+잔존율 데이터 없음)의 잔존율, master_carinfo(비교 모드 차량가), 카탈로그 통계, 견적 큐브.
+
+세그먼트 구성:
+    {name}          제어 세그먼트: 세대 번호(seqlock) + 현재 데이터 세그먼트 이름
+    {name}_{n}      데이터 세그먼트 n: 헤더 길이(8바이트) + JSON 헤더 + 64바이트 정렬 배열
+
+갱신은 버전 교체 방식이다. 새 데이터 세그먼트를 다 쓴 뒤 제어 세그먼트의 이름만 바꾸고
+이전 세그먼트는 unlink 한다. 이미 매핑한 워커는 그 배열을 계속 읽을 수 있고(매핑은 살아 있음),
+다음 조회에서 새 버전으로 옮겨 간다. 새 버전으로 옮길 때 워커는 데이터 버전을 다시 계산하고,
+바뀌었으면 자기 프로세스에 적재해 둔 데이터를 버린다 (on_data_change 로 등록된 훅).
+그래도 데이터 버전이 워커와 다른 평면은 쓰지 않는다 (워커는 자기 로더로 대체).
+
+이 모듈은 세그먼트 형식과 워커 쪽 매핑만 담당하며 core 를 import 하지 않는다.
+데이터 버전 함수는 core.quote_cache 가 set_data_version 으로 넘겨 주고 (넘겨 주기 전에는 평면을
+쓰지 않음), 게시자(컴파일 + 게시)는 core.shared_plane_publisher 에 있다.
+
+사용법:
+    python -m core.shared_plane_publisher publish --interval 30   # 게시 + 데이터 변경 시 갱신 (종료: Ctrl+C)
+    LEASE_SHARED_PLANE=lease_plane streamlit run app.py            # 워커는 환경 변수로 평면 사용
+    python -m core.shared_plane_publisher info                     # 현재 게시된 버전/크기
+"""
+
+import json
+import mmap
+import os
+import threading
+import time
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Iterator, List, Mapping, Optional, Tuple
+
+import numpy as np
+
+try:
+    import _posixshmem  # POSIX: 워커는 shm_open + 읽기 전용 mmap
+except ImportError:  # Windows
+    _posixshmem = None
+
+PLANE_FORMAT = "lease-shared-plane"
+PLANE_ENV = "LEASE_SHARED_PLANE"
+DEFAULT_PLANE_NAME = "lease_plane"
+
+_CONTROL_SIZE = 256  # 세대(uint64) + 이름 길이(uint64) + 이름
+_ALIGN = 64
+_ATTACH_RETRY_SECONDS = 1.0  # 게시 전이면 이 간격으로만 다시 시도
+
+
+def catalog_group(capital_id: str) -> str:
+    """캐피탈별 컴파일 카탈로그 그룹 이름"""
+    return f"catalog:{capital_id}"
+
+
+def vehicle_group(master_name: str) -> str:
+    """차량 마스터 그룹 이름 (data.vehicle_master.vehicle_master_name)"""
+    return f"vehicles:{master_name}"
+
+
+def vehicle_columns(vehicles: Mapping[str, Dict]) -> Dict[str, Any]:
+    """
+    차량 마스터 → 게시할 컬럼 그룹
+
+    필드마다 값 배열 'field:{필드}' 와, None 이 있는 필드는 'null:{필드}' 마스크를 둔다.
+
+    Raises:
+        ValueError: 한 필드에 문자열/숫자가 섞여 있는 경우
+    """
+    rows = list(vehicles.values())
+    fields = list(dict.fromkeys(field for row in rows for field in row))
+    group: Dict[str, Any] = {'ids': np.array(list(vehicles), dtype=str), 'fields': fields}
+    for field in fields:
+        values = [row.get(field) for row in rows]
+        nulls = np.array([v is None for v in values], dtype=bool)
+        sample = next((v for v in values if v is not None), "")
+        fill = "" if isinstance(sample, str) else type(sample)()
+        column = np.array([fill if v is None else v for v in values])
+        if column.dtype == object:
+            raise ValueError(f"차량 마스터 필드의 타입이 섞여 있습니다: {field}")
+        group[f"field:{field}"] = column
+        if nulls.any():
+            group[f"null:{field}"] = nulls
+    return group
+
+
+class PlaneVehicles(Mapping):
+    """
+    게시된 차량 마스터 (vehicle_id → 차량 정보 dict, data.vehicle_master._load_vehicles 와 같은 값)
+
+    dict 는 조회할 때마다 새로 만든다 (전체 순회는 컬럼 단위로 한 번에 변환).
+    """
+
+    def __init__(self, group: Dict[str, Any]):
+        self._fields: List[str] = group['fields']
+        self._columns = [(field, group[f"field:{field}"], group.get(f"null:{field}")) for field in self._fields]
+        self._index = {vehicle_id: i for i, vehicle_id in enumerate(group['ids'].tolist())}
+
+    def __getitem__(self, vehicle_id: str) -> Dict:
+        i = self._index[vehicle_id]
+        return {
+            field: None if nulls is not None and nulls[i] else values[i].item()
+            for field, values, nulls in self._columns
+        }
+
+    def __contains__(self, vehicle_id: object) -> bool:
+        return vehicle_id in self._index
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def _rows(self) -> Iterator[Dict]:
+        columns = [
+            (field, values.tolist(), nulls.tolist() if nulls is not None else None)
+            for field, values, nulls in self._columns
+        ]
+        for i in range(len(self._index)):
+            yield {field: None if nulls is not None and nulls[i] else values[i] for field, values, nulls in columns}
+
+    def values(self) -> Iterator[Dict]:
+        return self._rows()
+
+    def items(self) -> Iterator[Tuple[str, Dict]]:
+        return zip(self._index, self._rows())
+
+
+# ========================================
+# 데이터 버전 훅 (core 가 등록)
+# ========================================
+
+_VERSION_HOOKS: Optional[Tuple[Callable[[], str], Callable[[], str]]] = None
+_DATA_CHANGE_HOOKS: List[Callable[[], None]] = []
+
+
+def set_data_version(current: Callable[[], str], refresh: Callable[[], str]) -> None:
+    """
+    데이터 버전 함수 등록 (core.quote_cache 가 import 시 호출)
+
+    Args:
+        current: 현재 데이터 버전 (프로세스 내 memo)
+        refresh: 데이터 파일을 다시 확인해 데이터 버전 재계산
+    """
+    global _VERSION_HOOKS
+    _VERSION_HOOKS = (current, refresh)
+
+
+def on_data_change(hook: Callable[[], None]) -> None:
+    """데이터 버전이 바뀌었을 때 호출할 함수 등록 (프로세스에 적재/컴파일한 캐시 비우기)"""
+    if hook not in _DATA_CHANGE_HOOKS:
+        _DATA_CHANGE_HOOKS.append(hook)
+
+
+def notify_data_change() -> None:
+    """등록된 캐시를 모두 비움 (데이터 버전이 바뀐 뒤, 다음 조회에서 새 파일로 적재)"""
+    for hook in list(_DATA_CHANGE_HOOKS):
+        hook()
+
+
+# ========================================
+# 세그먼트 입출력
+# ========================================
+
+def _map_readonly(name: str) -> memoryview:
+    """
+    게시된 세그먼트를 읽기 전용으로 매핑
+
+    Raises:
+        FileNotFoundError: 세그먼트 없음 (게시 전이거나 교체되어 unlink 됨)
+    """
+    if _posixshmem is None:
+        # Windows: 이름 있는 매핑은 쓰기 가능 핸들만 열 수 있음 (배열은 writeable=False 로 보호)
+        shm = shared_memory.SharedMemory(name=name)
+        return shm.buf
+    fd = _posixshmem.shm_open("/" + name, os.O_RDONLY, mode=0o600)
+    try:
+        size = os.fstat(fd).st_size
+        return memoryview(mmap.mmap(fd, size, access=mmap.ACCESS_READ))
+    finally:
+        os.close(fd)
+
+
+def _layout(groups: Dict[str, Dict[str, Any]]) -> Tuple[Dict, List[Tuple[int, np.ndarray]]]:
+    """그룹 → (헤더의 groups 항목, [(상대 오프셋, 배열)])"""
+    entries = {}
+    arrays = []
+    offset = 0
+    for group_name, group in groups.items():
+        spec = {'arrays': {}, 'values': {}}
+        for key, value in group.items():
+            if isinstance(value, np.ndarray):
+                if value.dtype == object:
+                    value = value.astype(str)  # 문자열 배열은 고정 폭 유니코드로
+                value = np.ascontiguousarray(value)
+                offset = -(-offset // _ALIGN) * _ALIGN
+                spec['arrays'][key] = {'offset': offset, 'dtype': value.dtype.str, 'shape': list(value.shape)}
+                arrays.append((offset, value))
+                offset += value.nbytes
+            else:
+                spec['values'][key] = value
+        entries[group_name] = spec
+    return entries, arrays
+
+
+def create_control(name: str) -> shared_memory.SharedMemory:
+    """
+    제어 세그먼트 생성 (세대 0 = 게시 전)
+
+    Raises:
+        ValueError: 같은 이름의 평면이 이미 게시 중
+    """
+    try:
+        control = shared_memory.SharedMemory(name=name, create=True, size=_CONTROL_SIZE)
+    except FileExistsError:
+        raise ValueError(f"이미 게시 중인 데이터 평면입니다: {name} (다른 이름을 쓰거나 기존 게시자를 종료)")
+    np.ndarray((2,), dtype=np.uint64, buffer=control.buf)[:] = 0
+    return control
+
+
+def write_segment(segment_name: str, groups: Dict[str, Dict[str, Any]], version: int,
+                  data_version: str) -> Tuple[shared_memory.SharedMemory, int]:
+    """
+    데이터 세그먼트 생성 + 기록 (헤더 + 64바이트 정렬 배열)
+
+    Returns:
+        Tuple[SharedMemory, int]: (세그먼트, 기록한 바이트 수)
+    """
+    entries, arrays = _layout(groups)
+    header = {
+        'format': PLANE_FORMAT,
+        'version': version,
+        'data_version': data_version,
+        'created_at': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        'data_offset': 0,
+        'groups': entries,
+    }
+    # data_offset 은 헤더 길이에 따라 정해지므로 자리수가 바뀌지 않을 때까지 맞춤
+    while True:
+        header_bytes = json.dumps(header, ensure_ascii=False).encode("utf-8")
+        data_offset = -(-(8 + len(header_bytes)) // _ALIGN) * _ALIGN
+        if header['data_offset'] == data_offset:
+            break
+        header['data_offset'] = data_offset
+    size = data_offset + max((offset + array.nbytes for offset, array in arrays), default=0)
+
+    segment = shared_memory.SharedMemory(name=segment_name, create=True, size=max(size, 1))
+    np.ndarray((1,), dtype=np.uint64, buffer=segment.buf)[0] = len(header_bytes)
+    segment.buf[8:8 + len(header_bytes)] = header_bytes
+    for offset, array in arrays:
+        np.ndarray(array.shape, dtype=array.dtype, buffer=segment.buf, offset=data_offset + offset)[...] = array
+    return segment, size
+
+
+def write_control(control: shared_memory.SharedMemory, segment_name: Optional[str]) -> None:
+    """
+    제어 세그먼트가 가리키는 데이터 세그먼트 교체 (seqlock: 홀수 동안 워커는 다시 읽음)
+
+    Args:
+        segment_name: 새 데이터 세그먼트 (None이면 세대 0 = 게시 없음, 워커는 다음 조회에서 평면을 놓음)
+    """
+    words = np.ndarray((2,), dtype=np.uint64, buffer=control.buf)
+    if segment_name is None:
+        words[:] = 0
+        return
+    name_bytes = segment_name.encode("utf-8")
+    words[0] += 1
+    control.buf[16:16 + len(name_bytes)] = name_bytes
+    words[1] = len(name_bytes)
+    words[0] += 1
+
+
+def _read_control(buf: memoryview) -> Tuple[int, str]:
+    """제어 세그먼트 → (세대, 데이터 세그먼트 이름). 세대 0 = 게시 전"""
+    words = np.frombuffer(buf, dtype=np.uint64, count=2)
+    while True:
+        generation = int(words[0])
+        if generation % 2 == 0:  # 홀수 = 게시자가 쓰는 중
+            name = bytes(buf[16:16 + int(words[1])]).decode("utf-8")
+            if int(words[0]) == generation:
+                return generation, name
+        time.sleep(0)
+
+
+# ========================================
+# 워커: 읽기 전용 뷰
+# ========================================
+
+class PlaneView:
+    """
+    게시된 데이터 세그먼트 1개의 읽기 전용 뷰
+
+    배열은 세그먼트를 직접 가리키며 (복사 없음) 쓰기 불가다.
+    """
+
+    def __init__(self, segment: str):
+        """
+        Raises:
+            FileNotFoundError: 세그먼트 없음
+            ValueError: 데이터 평면 형식이 아님
+        """
+        buf = _map_readonly(segment)
+        header_length = int(np.frombuffer(buf, dtype=np.uint64, count=1)[0])
+        header = json.loads(bytes(buf[8:8 + header_length]).decode("utf-8"))
+        if header.get('format') != PLANE_FORMAT:
+            raise ValueError(f"데이터 평면 세그먼트가 아닙니다: {segment}")
+
+        base = header['data_offset']
+        self.segment = segment
+        self.header = header
+        self.version: int = header['version']
+        self.data_version: str = header['data_version']
+        self.nbytes = len(buf)
+
+        self._groups: Dict[str, Dict[str, Any]] = {}
+        for group_name, spec in header['groups'].items():
+            group = dict(spec['values'])
+            for key, array in spec['arrays'].items():
+                dtype = np.dtype(array['dtype'])
+                count = int(np.prod(array['shape'], dtype=np.int64))
+                values = np.frombuffer(buf, dtype=dtype, count=count, offset=base + array['offset'])
+                values = values.reshape(array['shape'])
+                values.flags.writeable = False
+                group[key] = values
+            self._groups[group_name] = group
+        self._indexes: Dict[str, Tuple[Dict, Dict, Dict, Dict]] = {}
+        self._vehicles: Dict[str, PlaneVehicles] = {}
+
+    def group(self, name: str) -> Optional[Dict[str, Any]]:
+        """게시된 그룹 (없으면 None). 여러 요청이 공유하므로 수정하면 안 된다"""
+        return self._groups.get(name)
+
+    def catalog(self, capital_id: str) -> Optional[Dict[str, Any]]:
+        """core.deal_search.compile_catalog 와 같은 구조의 카탈로그 (없으면 None)"""
+        return self._groups.get(catalog_group(capital_id))
+
+    def vehicles(self, master_name: str) -> Optional[PlaneVehicles]:
+        """차량 마스터 (data.vehicle_master.vehicle_master_name 기준, 없으면 None)"""
+        vehicles = self._vehicles.get(master_name)
+        if vehicles is None:
+            group = self._groups.get(vehicle_group(master_name))
+            if group is None:
+                return None
+            vehicles = self._vehicles[master_name] = PlaneVehicles(group)  # 두 번 만들어도 무해
+        return vehicles
+
+    def _index(self, capital_id: str) -> Optional[Tuple[Dict, Dict, Dict, Dict]]:
+        """카탈로그 축 색인 (차량, 기간, 주행거리, 잔가 옵션 → 위치)"""
+        index = self._indexes.get(capital_id)
+        if index is None:
+            catalog = self.catalog(capital_id)
+            if catalog is None:
+                return None
+            index = (
+                {vid: i for i, vid in enumerate(catalog['vehicle_ids'])},
+                {t: i for i, t in enumerate(catalog['terms'])},
+                {m: i for i, m in enumerate(catalog['mileages'])},
+                {g: i for i, g in enumerate(catalog['grade_options'])},
+            )
+            self._indexes[capital_id] = index  # 같은 값을 두 번 만들어도 무해 (락 불필요)
+        return index
+
+    def has_vehicle(self, capital_id: str, vehicle_id: str) -> bool:
+        """카탈로그에 있는 차량인지 (있으면 잔존율/잔가 옵션을 평면만으로 조회)"""
+        index = self._index(capital_id)
+        return index is not None and vehicle_id in index[0]
+
+    def grade_options(self, capital_id: str, vehicle_id: str) -> Optional[List[str]]:
+        """
+        차량의 잔가 옵션 목록 (원본 데이터 순서, data.residual_rates.get_grade_options 와 같음)
+
+        Returns:
+            Optional[List[str]]: 카탈로그에 없는 차량이면 None
+        """
+        index = self._index(capital_id)
+        if index is None or vehicle_id not in index[0]:
+            return None
+        catalog = self.catalog(capital_id)
+        ranks = catalog['grade_rank'][index[0][vehicle_id]].tolist()
+        return [catalog['grade_options'][g] for _, g in sorted((r, g) for g, r in enumerate(ranks) if r >= 0)]
+
+    def first_grade_option(self, capital_id: str, vehicle_id: str) -> Optional[str]:
+        """원본 데이터의 첫 번째 잔가 옵션 (get_residual_rate 폴백, 비어 있거나 카탈로그에 없는 차량이면 None)"""
+        index = self._index(capital_id)
+        if index is None or vehicle_id not in index[0]:
+            return None
+        catalog = self.catalog(capital_id)
+        g = int(catalog['first_grade'][index[0][vehicle_id]])
+        return catalog['grade_options'][g] if g >= 0 else None
+
+    def residual_rate(self, capital_id: str, vehicle_id: str, contract_months: int,
+                      annual_mileage: int, grade_option: str) -> Optional[float]:
+        """
+        잔존율 단건 조회 (정확히 일치하는 값만)
+
+        Returns:
+            Optional[float]: 잔존율 (평면에 없는 차량/조건/옵션이거나 데이터 없음이면 None)
+        """
+        index = self._index(capital_id)
+        if index is None:
+            return None
+
+        vehicles, terms, mileages, grades = index
+        try:
+            position = (vehicles[vehicle_id], terms[int(contract_months)],
+                        mileages[int(annual_mileage)], grades[grade_option])
+        except KeyError:
+            return None
+        rate = float(self._groups[catalog_group(capital_id)]['residual_rate'][position])
+        return None if rate != rate else rate  # NaN = 데이터 없음
+
+    def info(self) -> Dict:
+        return {
+            'segment': self.segment,
+            'version': self.version,
+            'data_version': self.data_version,
+            'created_at': self.header['created_at'],
+            'bytes': self.nbytes,
+            'groups': sorted(self._groups),
+        }
+
+
+# 프로세스 전역 상태 (워커)
+_NAME: Optional[str] = os.environ.get(PLANE_ENV) or None
+_LOCK = threading.Lock()
+_CONTROL: Optional[memoryview] = None
+_VIEW: Optional[PlaneView] = None
+_GENERATION = 0
+_NEXT_ATTEMPT = 0.0
+
+
+def enable(name: str = DEFAULT_PLANE_NAME) -> None:
+    """
+    현재 프로세스에서 데이터 평면 사용 (워커 초기화 시)
+
+    하위 프로세스도 같은 평면을 쓰도록 환경 변수에도 기록한다.
+    """
+    global _NAME, _CONTROL, _VIEW, _GENERATION, _NEXT_ATTEMPT
+    with _LOCK:
+        os.environ[PLANE_ENV] = name
+        _NAME, _CONTROL, _VIEW, _GENERATION, _NEXT_ATTEMPT = name, None, None, 0, 0.0
+
+
+def disable() -> None:
+    """데이터 평면 사용 중지 (이후 조회는 프로세스 자체 로더)"""
+    global _NAME, _CONTROL, _VIEW, _GENERATION
+    with _LOCK:
+        os.environ.pop(PLANE_ENV, None)
+        _NAME, _CONTROL, _VIEW, _GENERATION = None, None, None, 0
+
+
+def get_plane() -> Optional[PlaneView]:
+    """
+    현재 게시된 데이터 평면 (워커)
+
+    게시자가 새 버전으로 교체했으면 새 세그먼트로 옮겨 가고, 데이터 버전도 다시 계산한다.
+
+    Returns:
+        Optional[PlaneView]: 평면 모드가 아니거나, 데이터 버전 함수가 등록되지 않았거나 (core 미사용),
+                             아직 게시 전이거나, 데이터 버전이 다르면 None
+    """
+    if _NAME is None or _VERSION_HOOKS is None:
+        return None
+
+    view = _VIEW
+    control = _CONTROL
+    if control is not None and view is not None and int(np.frombuffer(control, dtype=np.uint64, count=1)[0]) == _GENERATION:
+        return view if view.data_version == _VERSION_HOOKS[0]() else None
+
+    return _reattach()
+
+
+def _reattach() -> Optional[PlaneView]:
+    global _CONTROL, _VIEW, _GENERATION, _NEXT_ATTEMPT
+    if _VERSION_HOOKS is None:
+        return None
+    data_version, refresh_data_version = _VERSION_HOOKS
+    with _LOCK:
+        if _NAME is None or time.monotonic() < _NEXT_ATTEMPT:
+            return None
+        try:
+            if _CONTROL is None:
+                _CONTROL = _map_readonly(_NAME)
+            while True:
+                generation, segment = _read_control(_CONTROL)
+                if generation == 0:  # 게시 전이거나 게시자 종료 → 제어 세그먼트도 다시 찾음
+                    _CONTROL, _VIEW, _GENERATION = None, None, 0
+                    raise FileNotFoundError(_NAME)
+                if generation == _GENERATION and _VIEW is not None:
+                    break
+                try:
+                    _VIEW = PlaneView(segment)
+                    _GENERATION = generation
+                except FileNotFoundError:
+                    continue  # 읽는 사이 교체되어 unlink 됨 → 새 이름 다시 읽기
+                # 데이터 갱신 후 게시된 버전 → 워커도 지문을 다시 계산하고 이전 데이터를 버림
+                local = data_version()
+                if _VIEW.data_version != local and refresh_data_version() != local:
+                    notify_data_change()
+                break
+        except FileNotFoundError:
+            _NEXT_ATTEMPT = time.monotonic() + _ATTACH_RETRY_SECONDS
+            return None
+
+    view = _VIEW
+    return view if view.data_version == data_version() else None
@@ -5,38 +5,76 @@ data/vehicle_master.py
 
 import json
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Mapping, Optional
 
-# 싱글톤 캐시 (capital별)
-_VEHICLE_CACHE: Dict[str, Dict] = {}
-_MASTER_CARINFO_CACHE: Optional[Dict] = None
+from data import shared_plane
+from data.artifact_format import KIND_VEHICLE_MASTER, load_data
+from utils.single_flight import SingleFlightCache
+from utils.tracing import span, traced
 
+# 싱글톤 캐시 (capital별, 키당 1회 로드 후 락 없이 읽기)
+_VEHICLE_CACHE = SingleFlightCache("vehicle_master")
+_MASTER_CARINFO_CACHE = SingleFlightCache("master_carinfo")
+shared_plane.on_data_change(_VEHICLE_CACHE.clear)
+shared_plane.on_data_change(_MASTER_CARINFO_CACHE.clear)
 
-def _load_vehicles(capital_id: Optional[str] = None) -> Dict:
+DEFAULT_VEHICLE_MASTER = "vehicle_master"
+
+# 캐피탈 ID → 차량 마스터 파일 이름 (확장자 제외, core.registry 가 선언을 등록할 때 채움)
+VEHICLE_MASTER_FILES: Dict[str, str] = {}
+
+
+def vehicle_master_name(capital_id: Optional[str] = None) -> str:
+    """
+    캐피탈이 쓰는 차량 마스터 파일 이름 (확장자 제외)
+
+    Args:
+        capital_id: 캐피탈 ID (None이면 기본 vehicle_master)
+    """
+    if not capital_id:
+        return DEFAULT_VEHICLE_MASTER
+    name = VEHICLE_MASTER_FILES.get(capital_id)
+    if name:
+        return name
+    # 선언이 없는 캐피탈: MG 계열은 mg_vehicle_master, 나머지(메리츠 등)는 vehicle_master
+    return "mg_vehicle_master" if capital_id.startswith("mg_") else DEFAULT_VEHICLE_MASTER
+
+
+def vehicle_master_path(capital_id: Optional[str] = None) -> Path:
+    """
+    캐피탈이 쓰는 차량 마스터 아티팩트 경로
+
+    Args:
+        capital_id: 캐피탈 ID (None이면 기본 vehicle_master)
+    """
+    return Path(__file__).parent / f"{vehicle_master_name(capital_id)}.npz"
+
+
+def _load_vehicles(capital_id: Optional[str] = None) -> Mapping[str, Dict]:
     """
     차량 데이터 로드 (캐싱)
 
     Args:
         capital_id: 캐피탈 ID (예: "mg_capital")
-                   None이면 기본 vehicle_master.json 로드
-    """
-    cache_key = capital_id or "default"
+                   None이면 기본 vehicle_master 로드
 
-    if cache_key not in _VEHICLE_CACHE:
-        if capital_id and capital_id.startswith("mg_"):
-            # MG Capital: mg_vehicle_master.json 사용
-            json_path = Path(__file__).parent / "mg_vehicle_master.json"
-        else:
-            # Default: vehicle_master.json 사용 (메리츠 등)
-            json_path = Path(__file__).parent / "vehicle_master.json"
+    아티팩트(.npz)가 있으면 아티팩트, 없으면 같은 이름의 JSON 을 읽는다.
+    데이터 평면 모드에서는 게시된 컬럼을 그대로 쓴다 (파일을 읽지 않음, 차량 정보 dict 는 조회할 때 생성).
+    """
+    plane = shared_plane.get_plane()
+    if plane is not None:
+        vehicles = plane.vehicles(vehicle_master_name(capital_id))
+        if vehicles is not None:
+            return vehicles
 
-        if not json_path.exists():
-            raise FileNotFoundError(f"차량 마스터 파일이 없습니다: {json_path}")
+    path = vehicle_master_path(capital_id)
 
-        with open(json_path, 'r', encoding='utf-8') as f:
-            _VEHICLE_CACHE[cache_key] = json.load(f)
+    def load() -> Dict:
+        with span("load.vehicle_master", file=path.name):
+            return load_data(path, KIND_VEHICLE_MASTER)
 
-    return _VEHICLE_CACHE[cache_key]
+    # 같은 파일을 쓰는 캐피탈끼리는 한 번만 파싱 (키 = 파일명)
+    return _VEHICLE_CACHE.get_or_load(path.name, load)
 
 
 def get_vehicle(vehicle_id: str, capital_id: Optional[str] = None) -> Dict:
@@ -170,6 +208,7 @@ def get_trims_by_brand_model(brand: str, model: str, capital_id: Optional[str] =
     return result
 
 
+@traced("vehicle_master.search_vehicles")
 def search_vehicles(keyword: str, limit: int = 20) -> List[Dict]:
     """
     키워드로 차량 검색
@@ -200,6 +239,7 @@ def search_vehicles(keyword: str, limit: int = 20) -> List[Dict]:
     return result[:limit]
 
 
+@traced("vehicle_master.find_vehicle_by_name")
 def find_vehicle_by_name(brand: str, model: str, trim: str, capital_id: Optional[str] = None) -> Optional[Dict]:
     """
     브랜드, 모델, 트림으로 차량 찾기 (캐피탈별)
@@ -265,20 +305,83 @@ def _load_master_carinfo() -> Dict:
     Returns:
         Dict: {id_cargrade: {차량정보}}
     """
-    global _MASTER_CARINFO_CACHE
-
-    if _MASTER_CARINFO_CACHE is None:
+    def load() -> Dict:
         json_path = Path(__file__).parent / "master_carinfo.json"
 
         if not json_path.exists():
             raise FileNotFoundError(f"master_carinfo 파일이 없습니다: {json_path}")
 
-        with open(json_path, 'r', encoding='utf-8') as f:
-            _MASTER_CARINFO_CACHE = json.load(f)
+        with span("load.master_carinfo"), open(json_path, 'r', encoding='utf-8') as f:
+            return json.load(f)
+
+    return _MASTER_CARINFO_CACHE.get_or_load("master_carinfo", load)
+
+
+def _normalize_name(s: str) -> str:
+    """이름 비교용 정규화 (대문자, 한글 브랜드/키워드 → 영어, 공백/특수문자 제거)"""
+    if not s:
+        return ""
+    # 대문자 변환
+    s = s.upper()
+
+    # 브랜드명 한글 -> 영어 변환
+    brand_map = {
+        "아우디": "AUDI",
+        "벤츠": "BENZ",
+        "메르세데스벤츠": "BENZ",
+        "비엠더블유": "BMW",
+        "폭스바겐": "VOLKSWAGEN",
+        "포르쉐": "PORSCHE",
+        "포르셰": "PORSCHE",
+        "렉서스": "LEXUS",
+        "토요타": "TOYOTA",
+        "혼다": "HONDA",
+        "닛산": "NISSAN",
+        "현대": "HYUNDAI",
+        "기아": "KIA",
+        "제네시스": "GENESIS"
+    }
+    for kr, en in brand_map.items():
+        s = s.replace(kr, en)
+
+    # 일반 단어 한글 -> 영어 변환
+    s = s.replace("시리즈", "SERIES")
+    s = s.replace("베이스", "BASE")
+    s = s.replace("스포츠", "SPORT")
+    s = s.replace("프리미엄", "PREMIUM")
+    s = s.replace("럭셔리", "LUXURY")
+    s = s.replace("시그니처", "SIGNATURE")
+    s = s.replace("익스클루시브", "EXCLUSIVE")
+
+    # 공백, 특수문자 제거
+    s = s.replace(" ", "").replace("_", "").replace("-", "")
+
+    return s
+
+
+@traced("load.master_index")
+def _build_master_index() -> Dict[str, List[tuple]]:
+    index: Dict[str, List[tuple]] = {}
+    for car_data in _load_master_carinfo().values():
+        index.setdefault(_normalize_name(car_data.get('brand', '')), []).append((
+            _normalize_name(car_data.get('model', '')),
+            _normalize_name(car_data.get('grade', '')),
+            car_data
+        ))
+    return index
+
+
+def _load_master_index() -> Dict[str, List[tuple]]:
+    """
+    master_carinfo 정규화 인덱스 (캐싱)
 
-    return _MASTER_CARINFO_CACHE
+    정규화 브랜드 → [(정규화 모델, 정규화 등급, 원본), ...]
+    조회마다 전체 항목을 다시 정규화하지 않도록 한 번만 만든다.
+    """
+    return _MASTER_CARINFO_CACHE.get_or_load("master_index", _build_master_index)
 
 
+@traced("vehicle_master.get_price_from_master")
 def get_price_from_master(brand: str, model: str, grade: str) -> Optional[int]:
     """
     master_carinfo에서 차량 가격 조회
@@ -293,51 +396,8 @@ def get_price_from_master(brand: str, model: str, grade: str) -> Optional[int]:
     Returns:
         int: 차량 가격 또는 None
     """
-    master_carinfo = _load_master_carinfo()
-
-    # 정규화 함수 (비교를 위해)
-    def normalize(s: str) -> str:
-        if not s:
-            return ""
-        # 대문자 변환
-        s = s.upper()
-
-        # 브랜드명 한글 -> 영어 변환
-        brand_map = {
-            "아우디": "AUDI",
-            "벤츠": "BENZ",
-            "메르세데스벤츠": "BENZ",
-            "비엠더블유": "BMW",
-            "폭스바겐": "VOLKSWAGEN",
-            "포르쉐": "PORSCHE",
-            "포르셰": "PORSCHE",
-            "렉서스": "LEXUS",
-            "토요타": "TOYOTA",
-            "혼다": "HONDA",
-            "닛산": "NISSAN",
-            "현대": "HYUNDAI",
-            "기아": "KIA",
-            "제네시스": "GENESIS"
-        }
-        for kr, en in brand_map.items():
-            s = s.replace(kr, en)
-
-        # 일반 단어 한글 -> 영어 변환
-        s = s.replace("시리즈", "SERIES")
-        s = s.replace("베이스", "BASE")
-        s = s.replace("스포츠", "SPORT")
-        s = s.replace("프리미엄", "PREMIUM")
-        s = s.replace("럭셔리", "LUXURY")
-        s = s.replace("시그니처", "SIGNATURE")
-        s = s.replace("익스클루시브", "EXCLUSIVE")
-
-        # 공백, 특수문자 제거
-        s = s.replace(" ", "").replace("_", "").replace("-", "")
-
-        return s
-
-    norm_brand = normalize(brand)
-    norm_model = normalize(model)
+    norm_brand = _normalize_name(brand)
+    norm_model = _normalize_name(model)
 
     # 등급에서 모델명 제거 (예: "A3 40 TFSI" → "40 TFSI")
     # 일부 vehicle_master에서 trim에 모델명이 포함되어 있는 경우 대응
@@ -346,19 +406,12 @@ def get_price_from_master(brand: str, model: str, grade: str) -> Optional[int]:
         # 모델명으로 시작하면 제거
         grade_cleaned = grade[len(model):].strip()
 
-    norm_grade = normalize(grade_cleaned)
+    norm_grade = _normalize_name(grade_cleaned)
 
     # 매칭되는 차량 찾기
     matches = []
-    for id_cargrade, car_data in master_carinfo.items():
-        car_brand = normalize(car_data.get('brand', ''))
-        car_model = normalize(car_data.get('model', ''))
-        car_grade = normalize(car_data.get('grade', ''))
-
-        # 브랜드 일치 확인
-        if norm_brand != car_brand:
-            continue
-
+    # 브랜드 일치 항목만 확인 (정규화 인덱스)
+    for car_model, car_grade, car_data in _load_master_index().get(norm_brand, []):
         # 모델 일치 확인 (유연한 매칭)
         # 예: "1SERIES" ↔ "120", "X5" ↔ "X530D"
         model_matched = False
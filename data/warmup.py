@@ -0,0 +1,29 @@
+"""
+data/warmup.py
+공유 데이터 선적재
+
+서버 시작, 프로세스 워커 초기화, Streamlit 최초 실행 시 한 번 호출해
+이후 요청이 파일 I/O 없이 메모리 캐시만 읽도록 한다.
+"""
+
+from typing import List, Optional
+
+from data import vehicle_master, residual_rates
+
+
+def warm_all(capital_ids: Optional[List[str]] = None) -> None:
+    """
+    차량 마스터, master_carinfo(+정규화 인덱스), 캐피탈별 잔존율 적재
+
+    Args:
+        capital_ids: 미리 적재할 캐피탈 (None이면 데이터가 있는 전체, []이면 공용 데이터만 -
+                     나머지는 처음 조회할 때 적재)
+    """
+    vehicle_master._load_vehicles()
+    vehicle_master._load_master_carinfo()
+    vehicle_master._load_master_index()
+    if capital_ids is None:
+        capital_ids = residual_rates.get_available_capitals()
+    for capital_id in capital_ids:
+        vehicle_master._load_vehicles(capital_id)
+        residual_rates._load_residual_rates(capital_id)
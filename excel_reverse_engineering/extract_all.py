@@ -0,0 +1,320 @@
+"""
+excel_reverse_engineering/extract_all.py
+전체 캐피탈 엑셀 추출 오케스트레이터
+
+입력 디렉토리에서 캐피탈별 최신 워크북을 찾아 캐피탈마다 별도 프로세스로 추출한다.
+- 출력(차량 마스터, 잔존율 아티팩트 .npz, data/artifact_format.py)은 임시 파일에 쓴 뒤
+  rename 해서 원자적으로 교체. JSON 은 --export-json 이나 기존 JSON 내보내기가 있을 때만 함께 기록
+- 추출이 실패한 캐피탈의 기존 출력은 그대로 둔다
+- 캐피탈별 행 수, 잔존율 커버리지, 소요 시간을 보고서 1개(extraction_report.json)로 저장
+- 증분 추출 (기본): 행/테이블 해시가 같은 차량은 재계산하지 않고, 바뀐 차량이 없으면
+  출력 파일을 다시 쓰지 않는다 (파일 수정 시각이 그대로라 데이터 버전/캐시 유지).
+  실행마다 차량 단위 변경 내역을 extraction_diff/{capital_id}.json 으로 남긴다 (incremental.py)
+
+새 캐피탈 추출기는 CAPITAL_EXTRACTORS 에 등록한다.
+
+사용법:
+    python excel_reverse_engineering/extract_all.py                        # xlsx/ → data/
+    python excel_reverse_engineering/extract_all.py --input-dir ~/xlsx --workers 4
+    python excel_reverse_engineering/extract_all.py --capitals mg_capital --output-dir /tmp/data
+    python excel_reverse_engineering/extract_all.py --full                 # 이전 결과 무시하고 전체 재추출
+    python excel_reverse_engineering/extract_all.py --export-json          # 사람이 읽는 JSON 도 기록
+    python excel_reverse_engineering/extract_all.py --dry-run              # 워크북 탐색 결과만 출력
+"""
+
+import argparse
+import contextlib
+import fnmatch
+import importlib
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from data.artifact_format import KIND_RESIDUAL_RATES, KIND_VEHICLE_MASTER, export_json as write_json_export
+from data.artifact_format import json_path, write_artifact
+from excel_reverse_engineering import incremental
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_INPUT_DIR = ROOT / "xlsx"
+DEFAULT_OUTPUT_DIR = ROOT / "data"
+REPORT_FILENAME = "extraction_report.json"
+
+
+class CapitalExtractor(NamedTuple):
+    """캐피탈별 추출기 등록 정보"""
+    capital_id: str
+    patterns: Tuple[str, ...]       # 워크북 파일명 패턴 (소문자 비교)
+    module: str                     # 추출기 모듈
+    class_name: str                 # 추출기 클래스 (생성자 인자: 엑셀 경로)
+    method: str                     # (vehicle_master, residual_rates) 반환 메서드
+    vehicle_master_file: str        # 출력 디렉토리 기준 차량 마스터 아티팩트 파일명
+
+
+CAPITAL_EXTRACTORS: Dict[str, CapitalExtractor] = {
+    'meritz_capital': CapitalExtractor(
+        'meritz_capital', ('*meritz*.xlsx', '*메리츠*.xlsx'),
+        'excel_reverse_engineering.meritz_extractor', 'MeritzResidualExtractor', 'extract_all_vehicles',
+        'vehicle_master.npz'
+    ),
+    'mg_capital': CapitalExtractor(
+        'mg_capital', ('mg_*.xlsx', 'mg*.xlsx', '*mg캐피탈*.xlsx'),
+        'excel_reverse_engineering.mg_extractor', 'MGCapitalExtractor', 'extract_all_data',
+        'mg_vehicle_master.npz'
+    ),
+}
+
+
+def discover_workbooks(input_dir: Path, capital_ids: Optional[List[str]] = None) -> Dict[str, Path]:
+    """
+    캐피탈별 워크북 탐색 (패턴에 맞는 파일 중 가장 최근 수정된 것)
+
+    Args:
+        input_dir: 워크북 디렉토리
+        capital_ids: 대상 캐피탈 (None이면 등록된 전체)
+
+    Returns:
+        Dict[str, Path]: {capital_id: 워크북 경로} (찾지 못한 캐피탈은 제외)
+
+    Raises:
+        ValueError: 등록되지 않은 캐피탈 ID
+    """
+    capital_ids = capital_ids or list(CAPITAL_EXTRACTORS)
+    unknown = [c for c in capital_ids if c not in CAPITAL_EXTRACTORS]
+    if unknown:
+        raise ValueError(f"등록되지 않은 캐피탈입니다: {', '.join(unknown)}")
+
+    # 엑셀 잠금 파일(~$...)은 제외
+    files = [p for p in Path(input_dir).glob("*.xlsx") if not p.name.startswith("~$")]
+
+    found = {}
+    for capital_id in capital_ids:
+        patterns = CAPITAL_EXTRACTORS[capital_id].patterns
+        matches = [p for p in files if any(fnmatch.fnmatch(p.name.lower(), pat) for pat in patterns)]
+        if matches:
+            found[capital_id] = max(matches, key=lambda p: (p.stat().st_mtime, p.name))
+    return found
+
+
+def write_json_atomic(path: Path, data) -> int:
+    """
+    JSON 원자적 기록 (같은 디렉토리 임시 파일 → rename)
+
+    Returns:
+        int: 기록한 바이트 수
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    try:
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        size = tmp.stat().st_size
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+    return size
+
+
+def _coverage(vehicle_master: Dict, residual_rates: Dict) -> Dict:
+    """잔존율 커버리지 (잔존율이 있는 차량 수, 비율, 등급 옵션별 차량 수)"""
+    covered = [rates for rates in residual_rates.values() if rates]
+    grade_options: Dict[str, int] = {}
+    for rates in covered:
+        for option, table in rates.items():
+            if table:
+                grade_options[option] = grade_options.get(option, 0) + 1
+
+    return {
+        'vehicles': len(covered),
+        'ratio': round(len(covered) / len(vehicle_master), 4) if vehicle_master else 0.0,
+        'grade_options': dict(sorted(grade_options.items())),
+    }
+
+
+def extract_capital(capital_id: str, workbook: str, output_dir: str, full: bool = False,
+                    export_json: bool = False) -> Dict:
+    """
+    (작업 프로세스) 캐피탈 1개 추출 → 변경이 있으면 출력 원자적 교체
+
+    예외는 결과의 'error' 로 돌려준다 (다른 캐피탈 추출은 계속).
+
+    Args:
+        full: True면 이전 결과를 쓰지 않고 전체 재계산
+        export_json: True면 아티팩트 옆에 JSON 내보내기도 기록 (기존 JSON 내보내기는 항상 갱신)
+
+    Returns:
+        Dict: 캐피탈별 보고서 항목
+    """
+    spec = CAPITAL_EXTRACTORS[capital_id]
+    output_dir = Path(output_dir)
+    result = {'capital_id': capital_id, 'workbook': str(workbook), 'pid': os.getpid()}
+    log = io.StringIO()
+
+    start = time.perf_counter()
+    try:
+        # 추출기 진행 로그는 프로세스끼리 섞이지 않도록 모아서 보고서에 남긴다
+        with contextlib.redirect_stdout(log):
+            previous = None if full else incremental.load_previous(output_dir, capital_id, spec.vehicle_master_file)
+            extractor = getattr(importlib.import_module(spec.module), spec.class_name)(str(workbook))
+            vehicle_master, residual_rates = getattr(extractor, spec.method)(previous=previous)
+        extracted = time.perf_counter()
+
+        diff = incremental.diff_extraction(capital_id, previous, vehicle_master, residual_rates,
+                                           extractor.tables_hash)
+        outputs = {}
+        if incremental.has_changes(diff) or previous is None:
+            outputs = {
+                spec.vehicle_master_file: (vehicle_master, KIND_VEHICLE_MASTER),
+                f"residual_rates/{capital_id}.npz": (residual_rates, KIND_RESIDUAL_RATES),
+            }
+        written = {}
+        for name, (data, kind) in outputs.items():
+            written[name] = write_artifact(output_dir / name, data, kind)
+            # 오래된 JSON 내보내기가 아티팩트와 어긋나지 않도록 있으면 함께 갱신
+            export = json_path(output_dir / name)
+            if export_json or export.exists():
+                written[str(Path(name).with_suffix(".json"))] = write_json_export(data, export)
+        write_json_atomic(incremental.diff_path(output_dir, capital_id), diff)
+
+        # 상태는 출력을 쓴 뒤에 교체 (중간에 실패하면 다음 실행에서 다시 비교)
+        state = incremental.make_state(extractor.tables_hash, extractor.row_hashes)
+        if previous is None or state != {k: previous[k] for k in ('tables_hash', 'row_hashes')}:
+            write_json_atomic(incremental.state_path(output_dir, capital_id), state)
+
+        result.update({
+            'status': 'ok',
+            'vehicles': len(vehicle_master),
+            'coverage': _coverage(vehicle_master, residual_rates),
+            'incremental': previous is not None,
+            'reused': extractor.reused,
+            'changes': incremental.summarize(diff),
+            'outputs': written,
+            'extract_seconds': round(extracted - start, 3),
+            'write_seconds': round(time.perf_counter() - extracted, 3),
+        })
+    except Exception as e:
+        result.update({'status': 'error', 'error': f"{type(e).__name__}: {e}"})
+
+    result['seconds'] = round(time.perf_counter() - start, 3)
+    result['log'] = log.getvalue().splitlines()[-20:]
+    return result
+
+
+def extract_all(
+    input_dir: Path = DEFAULT_INPUT_DIR,
+    output_dir: Path = DEFAULT_OUTPUT_DIR,
+    capital_ids: Optional[List[str]] = None,
+    workers: Optional[int] = None,
+    full: bool = False,
+    export_json: bool = False
+) -> Dict:
+    """
+    전체 캐피탈 병렬 추출 + 통합 보고서 저장
+
+    Args:
+        input_dir: 워크북 디렉토리
+        output_dir: 출력 디렉토리 (data/ 구조와 동일)
+        capital_ids: 대상 캐피탈 (None이면 등록된 전체)
+        workers: 프로세스 수 (None이면 min(캐피탈 수, CPU 수))
+        full: True면 증분 추출 없이 전체 재계산/재기록
+        export_json: True면 아티팩트와 함께 JSON 내보내기 기록
+
+    Returns:
+        Dict: 보고서 {generated_at, seconds, workers, capitals: {capital_id: 항목}, missing: [...]}
+    """
+    output_dir = Path(output_dir)
+    workbooks = discover_workbooks(Path(input_dir), capital_ids)
+    missing = [c for c in (capital_ids or list(CAPITAL_EXTRACTORS)) if c not in workbooks]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(workbooks) or 1))
+
+    start = time.perf_counter()
+    capitals: Dict[str, Dict] = {}
+    if workbooks:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {
+                capital_id: pool.submit(extract_capital, capital_id, str(path), str(output_dir), full, export_json)
+                for capital_id, path in workbooks.items()
+            }
+            for capital_id, future in futures.items():
+                capitals[capital_id] = future.result()
+
+    report = {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'seconds': round(time.perf_counter() - start, 3),
+        'workers': workers,
+        'capitals': capitals,
+        'missing': missing,
+    }
+    write_json_atomic(output_dir / REPORT_FILENAME, report)
+    return report
+
+
+def _format_changes(item: Dict) -> str:
+    """변경 건수 요약 (예: 추가 3, 가격 2 / 전체 추출 / 변경 없음)"""
+    if not item['incremental']:
+        return "전체 추출"
+    labels = {'added': '추가', 'removed': '삭제', 'repriced': '가격', 'regraded': '등급',
+              'updated': '정보', 'residual_changed': '잔존율'}
+    parts = [f"{labels[key]} {count}" for key, count in item['changes'].items() if count]
+    return ", ".join(parts) if parts else "변경 없음 (기록 생략)"
+
+
+def print_report(report: Dict) -> None:
+    """통합 보고서 표 출력"""
+    print("=" * 80)
+    print(f"캐피탈 엑셀 추출 ({report['workers']}개 프로세스, 전체 {report['seconds']:.1f}초)")
+    print("=" * 80)
+    print(f"{'캐피탈':<18}{'상태':<8}{'차량':>8}{'잔존율':>8}{'커버리지':>10}{'추출(초)':>10}{'기록(초)':>10}"
+          f"{'재사용':>8}  변경")
+    for capital_id, item in report['capitals'].items():
+        if item['status'] != 'ok':
+            print(f"{capital_id:<18}{'실패':<8}  {item['error']}")
+            continue
+        coverage = item['coverage']
+        print(f"{capital_id:<18}{'완료':<8}{item['vehicles']:>8,}{coverage['vehicles']:>8,}"
+              f"{coverage['ratio']:>10.1%}{item['extract_seconds']:>10.2f}{item['write_seconds']:>10.2f}"
+              f"{item['reused']:>8,}  {_format_changes(item)}")
+    for capital_id in report['missing']:
+        print(f"{capital_id:<18}{'없음':<8}  워크북을 찾을 수 없습니다")
+    print("=" * 80)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전체 캐피탈 엑셀 병렬 추출")
+    parser.add_argument("--input-dir", default=str(DEFAULT_INPUT_DIR), help="워크북 디렉토리")
+    parser.add_argument("--output-dir", default=str(DEFAULT_OUTPUT_DIR), help="출력 디렉토리")
+    parser.add_argument("--capitals", default=None, help="쉼표 구분 캐피탈 ID (기본 전체)")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수")
+    parser.add_argument("--full", action="store_true", help="이전 결과 무시하고 전체 재추출/재기록")
+    parser.add_argument("--export-json", action="store_true", help="아티팩트와 함께 사람이 읽는 JSON 기록")
+    parser.add_argument("--dry-run", action="store_true", help="워크북 탐색 결과만 출력")
+    args = parser.parse_args()
+
+    capital_ids = args.capitals.split(",") if args.capitals else None
+
+    if args.dry_run:
+        workbooks = discover_workbooks(Path(args.input_dir), capital_ids)
+        for capital_id in capital_ids or CAPITAL_EXTRACTORS:
+            print(f"{capital_id:<18}{workbooks.get(capital_id, '(없음)')}")
+        return
+
+    report = extract_all(Path(args.input_dir), Path(args.output_dir), capital_ids, args.workers, args.full,
+                         args.export_json)
+    print_report(report)
+    print(f"보고서: {Path(args.output_dir) / REPORT_FILENAME}")
+
+    if any(item['status'] != 'ok' for item in report['capitals'].values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,1022 @@
+"""
+excel_reverse_engineering/formula_engine.py
+견적 시트 수식 평가기 (엑셀 없이 입력 시나리오별 재계산)
+
+data_only=True 로 읽은 값은 엑셀에서 마지막으로 저장한 한 시나리오뿐이다.
+이 모듈은 수식 자체를 읽어 출력 셀의 의존 그래프를 한 번 컴파일하고,
+입력 셀 값만 바꿔 가며 같은 프로세스에서 수천 개 시나리오를 다시 계산한다.
+
+지원 범위 (캐피탈 견적 시트에서 쓰는 부분집합):
+- 셀/범위 참조 (A1, $A$1, A1:C5, A:C, 시트!A1, '시트 이름'!A1), 단일 범위 이름 정의
+- 연산자: + - * / ^ & % 단항 -, 비교 = <> < > <= >=
+- 함수: PMT, ROUND, ROUNDDOWN, ROUNDUP, INT, ABS, SUM, MIN, MAX,
+        IF, IFERROR, AND, OR, NOT, VLOOKUP, HLOOKUP, INDEX, MATCH
+
+지원하지 않는 함수/구문은 컴파일 단계에서 ValueError 로 알린다.
+엑셀 오류 값(#N/A, #DIV/0! 등)은 ExcelError 로 셀에 저장되고 참조하면 다시 전파된다.
+
+사용 예:
+    with FormulaBook("MG.xlsx", default_sheet="운용리스") as book:
+        model = book.compile(targets=["AG14"], inputs=["K14", "AG9", "AG16"])
+    model.evaluate({"K14": 50_000_000, "AG9": 36, "AG16": 0.55})  # {'AG14': ...}
+"""
+
+import re
+import sys
+from decimal import ROUND_DOWN, ROUND_HALF_UP, ROUND_UP, Decimal, InvalidOperation
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+import openpyxl
+from openpyxl.utils.cell import column_index_from_string, get_column_letter
+
+# 상위 디렉토리를 path에 추가 (스크립트로 직접 실행할 때)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+CellKey = Tuple[str, int, int]  # (시트 이름, 행, 열)
+
+
+class ExcelError(Exception):
+    """엑셀 오류 값 (#N/A, #DIV/0!, #VALUE!, #REF!, #NUM!, #NAME?)"""
+
+    def __init__(self, code: str):
+        super().__init__(code)
+        self.code = code
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, ExcelError) and other.code == self.code
+
+    def __hash__(self) -> int:
+        return hash(self.code)
+
+    def __repr__(self) -> str:
+        return self.code
+
+
+# ============================================================
+# 토큰화 / 파싱
+# ============================================================
+
+_TOKEN_RE = re.compile(r"""
+    (?P<ws>\s+)
+  | (?P<str>"(?:[^"]|"")*")
+  | (?P<err>\#(?:NULL!|DIV/0!|VALUE!|REF!|NAME\?|NUM!|N/A))
+  | (?P<ref>(?:(?P<sheet>'(?:[^']|'')+'|[^\s'"!(),:;=<>&+\-*/^%{}\#]+)!)?
+        (?P<cells>\$?[A-Za-z]{1,3}\$?\d+(?::\$?[A-Za-z]{1,3}\$?\d+)?|\$?[A-Za-z]{1,3}:\$?[A-Za-z]{1,3})
+        (?![\w(.]))
+  | (?P<func>[A-Za-z_][\w.]*(?=\())
+  | (?P<num>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<name>[A-Za-z_\\][\w.]*)
+  | (?P<op><>|<=|>=|[-+*/^&=<>%(),])
+""", re.X)
+
+_CELL_RE = re.compile(r"\$?([A-Za-z]{1,3})\$?(\d+)$")
+_COLUMN_RE = re.compile(r"\$?([A-Za-z]{1,3})$")
+
+_COMPARISON_OPS = ('=', '<>', '<', '>', '<=', '>=')
+
+
+def tokenize(formula: str) -> List[Tuple[str, Any]]:
+    """
+    수식 문자열 → 토큰 목록 [(종류, 값), ...]
+
+    Raises:
+        ValueError: 해석할 수 없는 문자
+    """
+    text = formula[1:] if formula.startswith('=') else formula
+    tokens = []
+    pos = 0
+    while pos < len(text):
+        match = _TOKEN_RE.match(text, pos)
+        if not match:
+            raise ValueError(f"수식을 해석할 수 없습니다: {formula!r} (위치 {pos})")
+        pos = match.end()
+        kind = match.lastgroup
+        if kind == 'ws':
+            continue
+        if kind in ('sheet', 'cells', 'ref'):
+            sheet = match.group('sheet')
+            if sheet and sheet.startswith("'"):
+                sheet = sheet[1:-1].replace("''", "'")
+            tokens.append(('ref', (sheet, match.group('cells'))))
+        elif kind == 'str':
+            tokens.append(('str', match.group('str')[1:-1].replace('""', '"')))
+        elif kind == 'num':
+            literal = match.group('num')
+            number = float(literal)
+            tokens.append(('num', int(number) if number.is_integer() and abs(number) < 2 ** 53 else number))
+        elif kind == 'func':
+            name = match.group('func').upper()
+            tokens.append(('func', name[6:] if name.startswith('_XLFN.') else name))
+        else:
+            tokens.append((kind, match.group(kind)))
+    return tokens
+
+
+class _Parser:
+    """
+    재귀 하강 파서 (엑셀 연산자 우선순위)
+
+    비교 < & < +- < */ < ^ < 단항 -,+ < %
+    노드는 튜플: ('num', v), ('str', s), ('bool', b), ('err', code), ('ref', sheet, cells),
+    ('unary', op, node), ('binop', op, a, b), ('pct', node), ('call', NAME, [args]),
+    ('name', NAME), ('missing',)
+    """
+
+    def __init__(self, formula: str):
+        self.formula = formula
+        self.tokens = tokenize(formula)
+        self.pos = 0
+
+    def parse(self) -> tuple:
+        node = self._comparison()
+        if self.pos != len(self.tokens):
+            self._fail("예상하지 못한 토큰")
+        return node
+
+    def _fail(self, message: str):
+        token = self.tokens[self.pos] if self.pos < len(self.tokens) else ('end', '')
+        raise ValueError(f"{message}: {self.formula!r} ({token[1]!r})")
+
+    def _peek_op(self) -> Optional[str]:
+        if self.pos < len(self.tokens) and self.tokens[self.pos][0] == 'op':
+            return self.tokens[self.pos][1]
+        return None
+
+    def _expect(self, op: str) -> None:
+        if self._peek_op() != op:
+            self._fail(f"'{op}' 가 필요합니다")
+        self.pos += 1
+
+    def _binary(self, ops: Tuple[str, ...], operand: Callable[[], tuple]) -> tuple:
+        node = operand()
+        while self._peek_op() in ops:
+            op = self.tokens[self.pos][1]
+            self.pos += 1
+            node = ('binop', op, node, operand())
+        return node
+
+    def _comparison(self) -> tuple:
+        return self._binary(_COMPARISON_OPS, self._concat)
+
+    def _concat(self) -> tuple:
+        return self._binary(('&',), self._additive)
+
+    def _additive(self) -> tuple:
+        return self._binary(('+', '-'), self._term)
+
+    def _term(self) -> tuple:
+        return self._binary(('*', '/'), self._power)
+
+    def _power(self) -> tuple:
+        return self._binary(('^',), self._unary)
+
+    def _unary(self) -> tuple:
+        op = self._peek_op()
+        if op in ('-', '+'):
+            self.pos += 1
+            return ('unary', op, self._unary())
+        node = self._primary()
+        while self._peek_op() == '%':
+            self.pos += 1
+            node = ('pct', node)
+        return node
+
+    def _primary(self) -> tuple:
+        if self.pos >= len(self.tokens):
+            self._fail("수식이 끝났습니다")
+        kind, value = self.tokens[self.pos]
+        self.pos += 1
+
+        if kind in ('num', 'str'):
+            return (kind, value)
+        if kind == 'err':
+            return ('err', value)
+        if kind == 'ref':
+            return ('ref', value[0], value[1])
+        if kind == 'name':
+            upper = value.upper()
+            if upper in ('TRUE', 'FALSE'):
+                return ('bool', upper == 'TRUE')
+            return ('name', value)
+        if kind == 'func':
+            self._expect('(')
+            args = []
+            if self._peek_op() == ')':
+                self.pos += 1
+                return ('call', value, args)
+            while True:
+                if self._peek_op() in (',', ')'):
+                    args.append(('missing',))
+                else:
+                    args.append(self._comparison())
+                if self._peek_op() == ',':
+                    self.pos += 1
+                    continue
+                self._expect(')')
+                return ('call', value, args)
+        if kind == 'op' and value == '(':
+            node = self._comparison()
+            self._expect(')')
+            return node
+
+        self.pos -= 1
+        self._fail("피연산자가 필요합니다")
+
+
+def parse_formula(formula: str) -> tuple:
+    """수식 문자열 → 구문 트리 (형식은 _Parser 참조)"""
+    return _Parser(formula).parse()
+
+
+# ============================================================
+# 값 변환 (엑셀 규칙)
+# ============================================================
+
+def _scalar(value: Any) -> Any:
+    """범위 값은 1x1 일 때만 스칼라로 (암시적 교차는 지원하지 않음)"""
+    if isinstance(value, (list, tuple)):
+        if len(value) == 1 and len(value[0]) == 1:
+            value = value[0][0]
+        else:
+            raise ExcelError('#VALUE!')
+    if isinstance(value, ExcelError):
+        raise value
+    return value
+
+
+def _num(value: Any) -> Any:
+    value = _scalar(value)
+    if value is None:
+        return 0
+    if isinstance(value, bool):
+        return int(value)
+    if isinstance(value, (int, float)):
+        return value
+    if isinstance(value, str):
+        try:
+            return float(value.replace(',', ''))
+        except ValueError:
+            raise ExcelError('#VALUE!')
+    raise ExcelError('#VALUE!')
+
+
+def _text(value: Any) -> str:
+    value = _scalar(value)
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _bool(value: Any) -> bool:
+    value = _scalar(value)
+    if value is None:
+        return False
+    if isinstance(value, (bool, int, float)):
+        return bool(value)
+    if isinstance(value, str) and value.upper() in ('TRUE', 'FALSE'):
+        return value.upper() == 'TRUE'
+    raise ExcelError('#VALUE!')
+
+
+def _rank(value: Any) -> int:
+    """엑셀 비교 순서: 숫자 < 문자 < 논리값"""
+    if isinstance(value, bool):
+        return 2
+    if isinstance(value, str):
+        return 1
+    return 0
+
+
+def _compare(a: Any, b: Any) -> int:
+    """엑셀 비교 (-1/0/1). 빈 셀은 상대 형식의 빈 값, 문자열은 대소문자 무시"""
+    if a is None:
+        a = '' if isinstance(b, str) else False if isinstance(b, bool) else 0
+    if b is None:
+        b = '' if isinstance(a, str) else False if isinstance(a, bool) else 0
+    rank_a, rank_b = _rank(a), _rank(b)
+    if rank_a != rank_b:
+        return -1 if rank_a < rank_b else 1
+    if rank_a == 1:
+        a, b = a.casefold(), b.casefold()
+    return (a > b) - (a < b)
+
+
+def _array(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return value
+    if isinstance(value, ExcelError):
+        raise value
+    return ((value,),)
+
+
+def _cell_value(value: Any) -> Any:
+    """범위에서 꺼낸 값 (오류는 전파)"""
+    if isinstance(value, ExcelError):
+        raise value
+    return value
+
+
+def _round(value: Any, digits: Any, rounding: str) -> Any:
+    """
+    엑셀 ROUND 계열 (0.5 는 0에서 멀어지는 방향)
+
+    float 의 최단 표현(repr)을 기준으로 반올림해 ROUND(1.005, 2) = 1.01 처럼 엑셀과 맞춘다.
+    자릿수가 0 이하면 int 로 돌려준다.
+    """
+    number = _num(value)
+    places = int(_num(digits))
+    try:
+        quantized = Decimal(repr(float(number))).quantize(Decimal(1).scaleb(-places), rounding=rounding)
+    except InvalidOperation:
+        return number
+    return int(quantized) if places <= 0 else float(quantized)
+
+
+def _numbers(args: Iterable[Any]) -> List[Any]:
+    """SUM/MIN/MAX 인수: 범위 안의 숫자만, 직접 인수는 숫자로 변환"""
+    numbers = []
+    for arg in args:
+        if isinstance(arg, (list, tuple)):
+            for row in arg:
+                for value in row:
+                    if isinstance(value, ExcelError):
+                        raise value
+                    if isinstance(value, (int, float)) and not isinstance(value, bool):
+                        numbers.append(value)
+        elif arg is not None:
+            numbers.append(_num(arg))
+    return numbers
+
+
+def _bools(args: Iterable[Any]) -> List[bool]:
+    values = []
+    for arg in args:
+        if isinstance(arg, (list, tuple)):
+            for row in arg:
+                for value in row:
+                    if isinstance(value, ExcelError):
+                        raise value
+                    if isinstance(value, (bool, int, float)):
+                        values.append(bool(value))
+        else:
+            values.append(_bool(arg))
+    if not values:
+        raise ExcelError('#VALUE!')
+    return values
+
+
+def _lookup_index(value: Any, items: List[Any], mode: int) -> int:
+    """
+    찾기 위치 (0부터)
+
+    mode 0: 일치, 1: value 이하 중 마지막(오름차순), -1: value 이상 중 마지막(내림차순)
+    """
+    value = 0 if value is None else value
+    if mode == 0:
+        for idx, item in enumerate(items):
+            if item is None or isinstance(item, ExcelError) or _rank(item) != _rank(value):
+                continue
+            if _compare(item, value) == 0:
+                return idx
+        raise ExcelError('#N/A')
+
+    found = None
+    for idx, item in enumerate(items):
+        if item is None or isinstance(item, ExcelError) or _rank(item) != _rank(value):
+            continue
+        order = _compare(item, value)
+        if (order <= 0) if mode == 1 else (order >= 0):
+            found = idx
+        else:
+            break
+    if found is None:
+        raise ExcelError('#N/A')
+    return found
+
+
+# ============================================================
+# 함수
+# ============================================================
+
+def _fn_pmt(rate, nper, pv, fv=None, when=None):
+    """PMT (numpy_financial.pmt 와 같은 식)"""
+    rate, nper, pv, fv = _num(rate), _num(nper), _num(pv), _num(fv)
+    when = 1 if when is not None and _bool(when) else 0
+    if nper == 0:
+        raise ExcelError('#NUM!')
+    temp = (1 + rate) ** nper
+    fact = nper if rate == 0 else (1 + rate * when) * (temp - 1) / rate
+    return -(fv + pv * temp) / fact
+
+
+def _fn_vlookup(value, table, column, approximate=None):
+    table = _array(table)
+    column = int(_num(column))
+    if column < 1:
+        raise ExcelError('#VALUE!')
+    if column > len(table[0]):
+        raise ExcelError('#REF!')
+    mode = 1 if approximate is None or _bool(approximate) else 0
+    idx = _lookup_index(_scalar(value), [row[0] for row in table], mode)
+    return _cell_value(table[idx][column - 1])
+
+
+def _fn_hlookup(value, table, row, approximate=None):
+    table = _array(table)
+    row = int(_num(row))
+    if row < 1:
+        raise ExcelError('#VALUE!')
+    if row > len(table):
+        raise ExcelError('#REF!')
+    mode = 1 if approximate is None or _bool(approximate) else 0
+    idx = _lookup_index(_scalar(value), list(table[0]), mode)
+    return _cell_value(table[row - 1][idx])
+
+
+def _fn_index(array, row, column=None):
+    array = _array(array)
+    row_idx = int(_num(row))
+    if column is None:
+        if len(array) == 1:
+            row_idx, col_idx = 1, row_idx
+        elif len(array[0]) == 1:
+            col_idx = 1
+        else:
+            raise ExcelError('#VALUE!')
+    else:
+        col_idx = int(_num(column))
+    if row_idx < 1 or col_idx < 1:
+        # 0 (행/열 전체 반환)은 지원하지 않음
+        raise ExcelError('#VALUE!')
+    if row_idx > len(array) or col_idx > len(array[0]):
+        raise ExcelError('#REF!')
+    return _cell_value(array[row_idx - 1][col_idx - 1])
+
+
+def _fn_match(value, array, match_type=None):
+    array = _array(array)
+    if len(array) == 1:
+        items = list(array[0])
+    elif len(array[0]) == 1:
+        items = [row[0] for row in array]
+    else:
+        raise ExcelError('#N/A')
+    mode = 1 if match_type is None else int(_num(match_type))
+    mode = (mode > 0) - (mode < 0)
+    return _lookup_index(_scalar(value), items, mode) + 1
+
+
+def _fn_min(*args):
+    numbers = _numbers(args)
+    return min(numbers) if numbers else 0
+
+
+def _fn_max(*args):
+    numbers = _numbers(args)
+    return max(numbers) if numbers else 0
+
+
+def _fn_int(value):
+    number = _num(value)
+    return int(number // 1)
+
+
+# 즉시 평가 함수: 이름 → (함수, 최소 인수, 최대 인수)
+_FUNCTIONS: Dict[str, Tuple[Callable, int, int]] = {
+    'PMT': (_fn_pmt, 3, 5),
+    'ROUND': (lambda x, d=None: _round(x, d, ROUND_HALF_UP), 2, 2),
+    'ROUNDDOWN': (lambda x, d=None: _round(x, d, ROUND_DOWN), 2, 2),
+    'ROUNDUP': (lambda x, d=None: _round(x, d, ROUND_UP), 2, 2),
+    'INT': (_fn_int, 1, 1),
+    'ABS': (lambda x: abs(_num(x)), 1, 1),
+    'SUM': (lambda *args: sum(_numbers(args)), 1, 255),
+    'MIN': (_fn_min, 1, 255),
+    'MAX': (_fn_max, 1, 255),
+    'AND': (lambda *args: all(_bools(args)), 1, 255),
+    'OR': (lambda *args: any(_bools(args)), 1, 255),
+    'NOT': (lambda x: not _bool(x), 1, 1),
+    'VLOOKUP': (_fn_vlookup, 3, 4),
+    'HLOOKUP': (_fn_hlookup, 3, 4),
+    'INDEX': (_fn_index, 2, 3),
+    'MATCH': (_fn_match, 2, 3),
+}
+
+# 인수를 필요할 때만 평가하는 함수 (선택되지 않은 분기의 오류는 무시)
+_LAZY_FUNCTIONS = {'IF': (2, 3), 'IFERROR': (2, 2)}
+
+SUPPORTED_FUNCTIONS = sorted(set(_FUNCTIONS) | set(_LAZY_FUNCTIONS))
+
+
+def _arith(op: str, a: Any, b: Any) -> Any:
+    a, b = _num(a), _num(b)
+    if op == '+':
+        return a + b
+    if op == '-':
+        return a - b
+    if op == '*':
+        return a * b
+    if op == '/':
+        if b == 0:
+            raise ExcelError('#DIV/0!')
+        return a / b
+    try:
+        result = a ** b
+    except (OverflowError, ZeroDivisionError):
+        raise ExcelError('#NUM!')
+    if isinstance(result, complex):
+        raise ExcelError('#NUM!')
+    return result
+
+
+_COMPARATORS = {
+    '=': lambda order: order == 0,
+    '<>': lambda order: order != 0,
+    '<': lambda order: order < 0,
+    '>': lambda order: order > 0,
+    '<=': lambda order: order <= 0,
+    '>=': lambda order: order >= 0,
+}
+
+
+# ============================================================
+# 워크북 / 컴파일
+# ============================================================
+
+class FormulaBook:
+    """
+    수식이 들어 있는 워크북 (읽기 전용, 시트는 처음 참조할 때 한 번 읽음)
+
+    compile() 로 출력 셀별 계산 모델을 만든 뒤에는 워크북을 닫아도 된다.
+    """
+
+    def __init__(self, excel_path: str, default_sheet: Optional[str] = None):
+        """
+        Args:
+            excel_path: 엑셀 파일 경로
+            default_sheet: 시트 이름이 없는 주소의 기준 시트 (기본: 첫 시트)
+
+        Raises:
+            FileNotFoundError: 파일 없음
+            ValueError: 기준 시트 없음
+        """
+        if not Path(excel_path).exists():
+            raise FileNotFoundError(f"엑셀 파일을 찾을 수 없습니다: {excel_path}")
+
+        self.excel_path = str(excel_path)
+        self.workbook = openpyxl.load_workbook(excel_path, read_only=True, data_only=False)
+        self._titles = {title.casefold(): title for title in self.workbook.sheetnames}
+        self.default_sheet = self._sheet_title(default_sheet or self.workbook.sheetnames[0])
+
+        self._values: Dict[str, Dict[Tuple[int, int], Any]] = {}
+        self._formulas: Dict[str, Dict[Tuple[int, int], str]] = {}
+        self._max_row: Dict[str, int] = {}
+        self._parsed: Dict[CellKey, tuple] = {}
+        self._names = {name.casefold(): dn.attr_text for name, dn in self.workbook.defined_names.items()}
+
+    def close(self) -> None:
+        if self.workbook is not None:
+            self.workbook.close()
+            self.workbook = None
+
+    def __enter__(self) -> 'FormulaBook':
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    # ---------- 시트/주소 ----------
+
+    def _sheet_title(self, sheet: Optional[str]) -> str:
+        if sheet is None:
+            return self.default_sheet
+        title = self._titles.get(sheet.casefold())
+        if title is None:
+            raise ValueError(f"'{sheet}' 시트를 찾을 수 없습니다")
+        return title
+
+    def _load(self, title: str) -> None:
+        """시트 한 장을 한 번 순차로 읽어 값/수식 분리"""
+        if title in self._values:
+            return
+        if self.workbook is None:
+            raise ValueError(f"워크북이 닫혀 있어 '{title}' 시트를 읽을 수 없습니다")
+
+        values: Dict[Tuple[int, int], Any] = {}
+        formulas: Dict[Tuple[int, int], str] = {}
+        max_row = 0
+        for row in self.workbook[title].iter_rows(min_row=1, min_col=1):
+            for cell in row:
+                value = cell.value
+                if value is None:
+                    continue
+                if cell.data_type == 'f':
+                    if not isinstance(value, str):
+                        # 배열 수식/데이터 표 객체
+                        value = getattr(value, 'text', None) or str(value)
+                    formulas[(cell.row, cell.column)] = value
+                else:
+                    values[(cell.row, cell.column)] = value
+                max_row = max(max_row, cell.row)
+        self._values[title] = values
+        self._formulas[title] = formulas
+        self._max_row[title] = max_row
+
+    def key(self, address: str) -> CellKey:
+        """
+        셀 주소 → (시트, 행, 열)
+
+        Args:
+            address: 'A1', '$A$1', '시트!A1', "'시트 이름'!A1"
+
+        Raises:
+            ValueError: 주소 형식 오류 또는 시트 없음
+        """
+        sheet, _, cell = address.rpartition('!')
+        if sheet.startswith("'") and sheet.endswith("'"):
+            sheet = sheet[1:-1].replace("''", "'")
+        match = _CELL_RE.match(cell)
+        if not match:
+            raise ValueError(f"셀 주소 형식 오류: {address}")
+        title = self._sheet_title(sheet or None)
+        self._load(title)
+        return (title, int(match.group(2)), column_index_from_string(match.group(1).upper()))
+
+    def address(self, key: CellKey) -> str:
+        title, row, col = key
+        sheet = f"'{title}'" if re.search(r"[\s'!]", title) else title
+        return f"{sheet}!{get_column_letter(col)}{row}"
+
+    def value(self, key: CellKey) -> Any:
+        """상수 셀 값 (수식 셀/빈 셀은 None)"""
+        self._load(key[0])
+        return self._values[key[0]].get(key[1:])
+
+    def formula(self, key: CellKey) -> Optional[str]:
+        self._load(key[0])
+        return self._formulas[key[0]].get(key[1:])
+
+    def _range_keys(self, sheet: Optional[str], cells: str) -> Tuple[str, int, int, int, int]:
+        """범위 문자열 → (시트, 시작 행, 시작 열, 끝 행, 끝 열)"""
+        title = self._sheet_title(sheet)
+        self._load(title)
+        first, _, last = cells.partition(':')
+        last = last or first
+        start, end = _CELL_RE.match(first), _CELL_RE.match(last)
+        if start and end:
+            r1, c1 = int(start.group(2)), column_index_from_string(start.group(1).upper())
+            r2, c2 = int(end.group(2)), column_index_from_string(end.group(1).upper())
+        else:
+            # 열 전체 범위 (A:C) 는 시트에 값이 있는 마지막 행까지
+            start, end = _COLUMN_RE.match(first), _COLUMN_RE.match(last)
+            r1, r2 = 1, max(self._max_row[title], 1)
+            c1, c2 = column_index_from_string(start.group(1).upper()), column_index_from_string(end.group(1).upper())
+        return (title, min(r1, r2), min(c1, c2), max(r1, r2), max(c1, c2))
+
+    # ---------- 파싱 / 의존 관계 ----------
+
+    def _parse(self, key: CellKey) -> tuple:
+        """수식 셀 구문 트리 (참조/이름을 범위 튜플로 해석해 캐시)"""
+        node = self._parsed.get(key)
+        if node is None:
+            formula = self.formula(key)
+            try:
+                node = self._resolve(parse_formula(formula), key[0])
+            except ValueError as e:
+                raise ValueError(f"{self.address(key)}: {e}")
+            self._parsed[key] = node
+        return node
+
+    def _resolve(self, node: tuple, sheet: str) -> tuple:
+        """('ref', 시트, 문자열) / ('name', ...) → ('range', 시트, r1, c1, r2, c2), 함수 검사"""
+        kind = node[0]
+        if kind == 'ref':
+            return ('range',) + self._range_keys(node[1] or sheet, node[2])
+        if kind == 'name':
+            target = self._names.get(node[1].casefold())
+            if target is None:
+                raise ValueError(f"정의되지 않은 이름: {node[1]}")
+            resolved = parse_formula(target)
+            if resolved[0] != 'ref' or resolved[1] is None:
+                raise ValueError(f"범위가 아닌 이름은 지원하지 않습니다: {node[1]} = {target}")
+            return self._resolve(resolved, sheet)
+        if kind == 'call':
+            name, args = node[1], node[2]
+            if name in _FUNCTIONS:
+                low, high = _FUNCTIONS[name][1:]
+            elif name in _LAZY_FUNCTIONS:
+                low, high = _LAZY_FUNCTIONS[name]
+            else:
+                raise ValueError(f"지원하지 않는 함수: {name}")
+            if not low <= len(args) <= high:
+                raise ValueError(f"{name} 인수 개수 오류: {len(args)}")
+            return ('call', name, [self._resolve(arg, sheet) for arg in args])
+        if kind == 'unary':
+            return ('unary', node[1], self._resolve(node[2], sheet))
+        if kind == 'pct':
+            return ('pct', self._resolve(node[1], sheet))
+        if kind == 'binop':
+            return ('binop', node[1], self._resolve(node[2], sheet), self._resolve(node[3], sheet))
+        return node
+
+    def _ranges(self, node: tuple, out: List[tuple]) -> List[tuple]:
+        if node[0] == 'range':
+            out.append(node)
+        elif node[0] == 'call':
+            for arg in node[2]:
+                self._ranges(arg, out)
+        elif node[0] in ('unary', 'binop'):
+            for child in node[2:]:
+                self._ranges(child, out)
+        elif node[0] == 'pct':
+            self._ranges(node[1], out)
+        return out
+
+    def _dependencies(self, key: CellKey, inputs: Set[CellKey]) -> List[CellKey]:
+        """수식 셀이 참조하는 셀 중 수식 셀/입력 셀"""
+        deps = []
+        for _, title, r1, c1, r2, c2 in self._ranges(self._parse(key), []):
+            if r1 == r2 and c1 == c2:
+                cell = (title, r1, c1)
+                if cell in inputs or (r1, c1) in self._formulas[title]:
+                    deps.append(cell)
+                continue
+            candidates = [(title,) + pos for pos in self._formulas[title]]
+            candidates += [cell for cell in inputs if cell[0] == title]
+            deps.extend(cell for cell in candidates if r1 <= cell[1] <= r2 and c1 <= cell[2] <= c2)
+        return deps
+
+    def _order(self, targets: List[CellKey], inputs: Set[CellKey]) -> Tuple[List[CellKey], Dict[CellKey, List[CellKey]]]:
+        """출력 셀에 필요한 수식 셀의 위상 정렬 (입력 셀은 잎)"""
+        order: List[CellKey] = []
+        deps: Dict[CellKey, List[CellKey]] = {}
+        state: Dict[CellKey, int] = {}  # 1: 방문 중, 2: 완료
+
+        for target in targets:
+            if target in inputs or self.formula(target) is None or state.get(target) == 2:
+                continue
+            stack = [(target, None)]
+            while stack:
+                key, pending = stack[-1]
+                if pending is None:
+                    state[key] = 1
+                    deps[key] = self._dependencies(key, inputs)
+                    pending = iter(deps[key])
+                    stack[-1] = (key, pending)
+                for dep in pending:
+                    if dep in inputs or state.get(dep) == 2:
+                        continue
+                    if state.get(dep) == 1:
+                        raise ValueError(f"순환 참조: {self.address(dep)}")
+                    stack.append((dep, None))
+                    break
+                else:
+                    stack.pop()
+                    state[key] = 2
+                    order.append(key)
+        return order, deps
+
+    def compile(self, targets: List[str], inputs: Optional[List[str]] = None) -> 'FormulaModel':
+        """
+        출력 셀 계산 모델 컴파일
+
+        입력 셀에 의존하지 않는 수식 셀은 컴파일할 때 한 번만 계산해 상수로 접는다.
+        입력 셀에는 수식 셀도 지정할 수 있다 (수식 대신 시나리오 값을 쓴다).
+
+        Args:
+            targets: 출력 셀 주소 목록
+            inputs: 시나리오마다 바꿀 입력 셀 주소 목록
+
+        Returns:
+            FormulaModel: evaluate() 로 시나리오별 계산
+
+        Raises:
+            ValueError: 주소/시트 오류, 지원하지 않는 함수, 순환 참조
+        """
+        inputs = inputs or []
+        target_keys = [(address, self.key(address)) for address in targets]
+        input_keys = {address: self.key(address) for address in inputs}
+        input_set = set(input_keys.values())
+
+        order, deps = self._order([key for _, key in target_keys], input_set)
+
+        # 입력에 의존하는 수식 셀만 시나리오마다 다시 계산
+        live: Set[CellKey] = set()
+        for key in order:
+            if any(dep in input_set or dep in live for dep in deps[key]):
+                live.add(key)
+
+        folded: Dict[CellKey, Any] = {}
+        static_compiler = _Compiler(self, dynamic=set(), constants=folded)
+        for key in order:
+            if key not in live:
+                folded[key] = _run_cell(static_compiler.cell(key), folded)
+
+        compiler = _Compiler(self, dynamic=input_set | live, constants=folded)
+        steps = [(key, compiler.cell(key)) for key in order if key in live]
+
+        defaults = {key: self.value(key) if self.formula(key) is None else folded.get(key)
+                    for key in input_set}
+        outputs = []
+        for address, key in target_keys:
+            if key in input_set or key in live:
+                outputs.append((address, key, None, True))
+            else:
+                constant = folded[key] if key in folded else self.value(key)
+                outputs.append((address, key, constant, False))
+
+        return FormulaModel(input_keys, defaults, steps, outputs, formula_cells=len(order))
+
+
+def _run_cell(fn: Callable, values: Dict[CellKey, Any]) -> Any:
+    """수식 셀 하나 계산 (오류는 ExcelError 값으로, 빈 결과는 0)"""
+    try:
+        result = _scalar(fn(values))
+    except ExcelError as e:
+        return e
+    return 0 if result is None else result
+
+
+class _Compiler:
+    """구문 트리 → 클로저 (values: 셀 키 → 값 dict 를 받아 값을 돌려준다)"""
+
+    def __init__(self, book: FormulaBook, dynamic: Set[CellKey], constants: Dict[CellKey, Any]):
+        """
+        Args:
+            book: 워크북
+            dynamic: 시나리오마다 값이 바뀌는 셀 (values 에서 읽음)
+            constants: 미리 계산한 수식 셀 값 (나머지는 워크북 상수)
+        """
+        self.book = book
+        self.dynamic = dynamic
+        self.constants = constants
+
+    def cell(self, key: CellKey) -> Callable:
+        return self.node(self.book._parse(key))
+
+    def _constant(self, key: CellKey) -> Any:
+        if key in self.constants:
+            return self.constants[key]
+        return self.book.value(key)
+
+    def node(self, node: tuple) -> Callable:
+        kind = node[0]
+        if kind in ('num', 'str', 'bool'):
+            constant = node[1]
+            return lambda values: constant
+        if kind == 'missing':
+            return lambda values: None
+        if kind == 'err':
+            error = ExcelError(node[1])
+
+            def raise_error(values):
+                raise error
+            return raise_error
+        if kind == 'range':
+            return self._range(node)
+        if kind == 'unary':
+            operand = self.node(node[2])
+            if node[1] == '-':
+                return lambda values: -_num(operand(values))
+            return lambda values: _scalar(operand(values))
+        if kind == 'pct':
+            operand = self.node(node[1])
+            return lambda values: _num(operand(values)) / 100
+        if kind == 'binop':
+            return self._binop(node[1], self.node(node[2]), self.node(node[3]))
+        if kind == 'call':
+            return self._call(node[1], [self.node(arg) for arg in node[2]])
+        raise ValueError(f"알 수 없는 구문: {kind}")
+
+    def _range(self, node: tuple) -> Callable:
+        _, title, r1, c1, r2, c2 = node
+        if r1 == r2 and c1 == c2:
+            key = (title, r1, c1)
+            if key in self.dynamic:
+                def ref(values):
+                    value = values[key]
+                    if isinstance(value, ExcelError):
+                        raise value
+                    return value
+                return ref
+            constant = self._constant(key)
+            if isinstance(constant, ExcelError):
+                def raise_error(values):
+                    raise constant
+                return raise_error
+            return lambda values: constant
+
+        cells = [[(title, row, col) for col in range(c1, c2 + 1)] for row in range(r1, r2 + 1)]
+        if not any(key in self.dynamic for row in cells for key in row):
+            static = tuple(tuple(self._constant(key) for key in row) for row in cells)
+            return lambda values: static
+        getters = [[(key in self.dynamic, key, self._constant(key)) for key in row] for row in cells]
+        return lambda values: [[values[key] if dynamic else constant for dynamic, key, constant in row]
+                               for row in getters]
+
+    def _binop(self, op: str, left: Callable, right: Callable) -> Callable:
+        if op == '&':
+            return lambda values: _text(left(values)) + _text(right(values))
+        if op in _COMPARATORS:
+            test = _COMPARATORS[op]
+            return lambda values: test(_compare(_scalar(left(values)), _scalar(right(values))))
+        return lambda values: _arith(op, left(values), right(values))
+
+    def _call(self, name: str, args: List[Callable]) -> Callable:
+        if name == 'IF':
+            condition, then = args[0], args[1]
+            otherwise = args[2] if len(args) > 2 else (lambda values: False)
+            return lambda values: then(values) if _bool(condition(values)) else otherwise(values)
+        if name == 'IFERROR':
+            value, fallback = args
+
+            def iferror(values):
+                try:
+                    return _scalar(value(values))
+                except ExcelError:
+                    return fallback(values)
+            return iferror
+
+        fn = _FUNCTIONS[name][0]
+        return lambda values: fn(*[arg(values) for arg in args])
+
+
+class FormulaModel:
+    """컴파일된 출력 셀 계산 모델 (워크북 없이 시나리오 반복 계산)"""
+
+    def __init__(
+        self,
+        inputs: Dict[str, CellKey],
+        defaults: Dict[CellKey, Any],
+        steps: List[Tuple[CellKey, Callable]],
+        outputs: List[Tuple[str, CellKey, Any, bool]],
+        formula_cells: int
+    ):
+        self.inputs = inputs
+        self._defaults = defaults
+        self._steps = steps
+        self._outputs = outputs
+        self.formula_cells = formula_cells
+        self.live_cells = len(steps)
+
+    def evaluate(self, scenario: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        """
+        시나리오 하나 계산
+
+        Args:
+            scenario: {입력 셀 주소: 값} (빠진 입력은 워크북 값)
+
+        Returns:
+            Dict[str, Any]: {출력 셀 주소: 값} (엑셀 오류는 ExcelError)
+
+        Raises:
+            ValueError: 컴파일할 때 입력으로 지정하지 않은 셀
+        """
+        values = dict(self._defaults)
+        for address, value in (scenario or {}).items():
+            key = self.inputs.get(address)
+            if key is None:
+                raise ValueError(f"입력 셀로 컴파일하지 않은 주소: {address}")
+            values[key] = value
+
+        for key, fn in self._steps:
+            values[key] = _run_cell(fn, values)
+
+        return {address: values[key] if dynamic else constant
+                for address, key, constant, dynamic in self._outputs}
+
+    def evaluate_many(self, scenarios: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        """여러 시나리오 계산 (순서 유지)"""
+        return [self.evaluate(scenario) for scenario in scenarios]
+
+
+def main():
+    """수식 셀 평가: python formula_engine.py <엑셀> <시트> <셀> [입력셀=값 ...]"""
+    if len(sys.argv) < 4:
+        print("사용법: python formula_engine.py <엑셀파일> <시트> <출력셀,...> [입력셀=값 ...]")
+        print("예시: python formula_engine.py xlsx/mg.xlsx 운용리스 AG14,AJ16 K14=50000000 AG9=36")
+        sys.exit(1)
+
+    targets = sys.argv[3].split(',')
+    scenario = {}
+    for arg in sys.argv[4:]:
+        address, _, raw = arg.partition('=')
+        try:
+            scenario[address] = float(raw) if '.' in raw else int(raw)
+        except ValueError:
+            scenario[address] = raw
+
+    with FormulaBook(sys.argv[1], default_sheet=sys.argv[2]) as book:
+        model = book.compile(targets, inputs=list(scenario))
+
+    print(f"수식 셀 {model.formula_cells}개 중 입력 의존 {model.live_cells}개")
+    for address, value in model.evaluate(scenario).items():
+        print(f"  {address}: {value!r}")
+
+
+if __name__ == "__main__":
+    main()
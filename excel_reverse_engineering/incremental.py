@@ -0,0 +1,165 @@
+"""
+excel_reverse_engineering/incremental.py
+증분 추출 상태와 차량 단위 변경 내역(diff)
+
+캐피탈별 상태 파일(extraction_state/{capital_id}.json)에
+잔가 테이블 해시와 차량 행 해시를 저장해 두고, 다음 추출에서 이전 출력과 함께 넘긴다.
+추출기는 테이블 해시가 같고 행 해시가 같은 차량을 다시 계산하지 않는다.
+
+diff 형식 (extraction_diff/{capital_id}.json):
+    {
+        'capital_id', 'generated_at', 'full', 'tables_changed',
+        'added': [vehicle_id, ...],
+        'removed': [vehicle_id, ...],
+        'repriced': [{'vehicle_id', 'old', 'new'}, ...],
+        'regraded': [{'vehicle_id', 'changes': {field: [old, new]}}, ...],
+        'updated': [vehicle_id, ...],            # 가격/등급 외 차량 정보 변경
+        'residual_changed': [vehicle_id, ...],   # 잔존율 변경 (테이블 변경 포함)
+    }
+"""
+
+import json
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from data.artifact_format import ARTIFACT_SUFFIX, KIND_RESIDUAL_RATES, KIND_VEHICLE_MASTER, read_artifact
+
+STATE_DIRNAME = "extraction_state"
+DIFF_DIRNAME = "extraction_diff"
+
+# 차량 정보 중 등급으로 취급하는 필드 (메리츠: *_grade, MG: grade_*, 고잔가 가능 여부)
+GRADE_FIELD_SUFFIX = "_grade"
+GRADE_FIELD_PREFIX = "grade_"
+GRADE_FIELDS = ("premium_available",)
+
+DIFF_KEYS = ('added', 'removed', 'repriced', 'regraded', 'updated', 'residual_changed')
+
+
+def state_path(output_dir: Path, capital_id: str) -> Path:
+    return Path(output_dir) / STATE_DIRNAME / f"{capital_id}.json"
+
+
+def diff_path(output_dir: Path, capital_id: str) -> Path:
+    return Path(output_dir) / DIFF_DIRNAME / f"{capital_id}.json"
+
+
+def load_previous(output_dir: Path, capital_id: str, vehicle_master_file: str) -> Optional[Dict]:
+    """
+    이전 추출 결과 로드 (상태 파일과 출력 아티팩트가 모두 있을 때만)
+
+    Returns:
+        Optional[Dict]: {tables_hash, row_hashes, vehicle_master, residual_rates} (없으면 None)
+    """
+    paths = {
+        'state': state_path(output_dir, capital_id),
+        'vehicle_master': Path(output_dir) / vehicle_master_file,
+        'residual_rates': Path(output_dir) / "residual_rates" / f"{capital_id}{ARTIFACT_SUFFIX}",
+    }
+    if not all(path.exists() for path in paths.values()):
+        return None
+
+    loaded = {}
+    try:
+        with open(paths['state'], 'r', encoding='utf-8') as f:
+            loaded['state'] = json.load(f)
+        loaded['vehicle_master'] = read_artifact(paths['vehicle_master'], KIND_VEHICLE_MASTER)
+        loaded['residual_rates'] = read_artifact(paths['residual_rates'], KIND_RESIDUAL_RATES)
+    except (OSError, ValueError):
+        # 깨진 상태/출력은 전체 재추출
+        return None
+
+    state = loaded['state']
+    if 'tables_hash' not in state or 'row_hashes' not in state:
+        return None
+
+    return {
+        'tables_hash': state['tables_hash'],
+        'row_hashes': state['row_hashes'],
+        'vehicle_master': loaded['vehicle_master'],
+        'residual_rates': loaded['residual_rates'],
+    }
+
+
+def make_state(tables_hash: str, row_hashes: Dict[str, str]) -> Dict:
+    return {'tables_hash': tables_hash, 'row_hashes': row_hashes}
+
+
+def _normalize(value: Any) -> Any:
+    """JSON 왕복 값 (새로 계산한 int 키와 파일에서 읽은 str 키를 같게 비교)"""
+    return json.loads(json.dumps(value, ensure_ascii=False))
+
+
+def _is_grade_field(field: str) -> bool:
+    return field.endswith(GRADE_FIELD_SUFFIX) or field.startswith(GRADE_FIELD_PREFIX) or field in GRADE_FIELDS
+
+
+def diff_extraction(
+    capital_id: str,
+    previous: Optional[Dict],
+    vehicle_master: Dict,
+    residual_rates: Dict,
+    tables_hash: str
+) -> Dict:
+    """
+    이전 결과 대비 차량 단위 변경 내역
+
+    재사용된 차량(이전 결과 객체를 그대로 쓴 차량)은 비교하지 않는다.
+    이전 결과가 없으면 전체를 added 로 보고 full=True.
+
+    Returns:
+        Dict: diff (형식은 모듈 설명 참조)
+    """
+    diff: Dict[str, Any] = {
+        'capital_id': capital_id,
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'full': previous is None,
+        'tables_changed': previous is None or previous['tables_hash'] != tables_hash,
+    }
+    lists: Dict[str, List] = {key: [] for key in DIFF_KEYS}
+
+    old_master = previous['vehicle_master'] if previous else {}
+    old_rates = previous['residual_rates'] if previous else {}
+
+    for vehicle_id, vehicle in vehicle_master.items():
+        old = old_master.get(vehicle_id)
+        if old is None:
+            lists['added'].append(vehicle_id)
+            continue
+
+        if vehicle is not old:
+            new = _normalize(vehicle)
+            if new != old:
+                if new.get('price') != old.get('price'):
+                    lists['repriced'].append({'vehicle_id': vehicle_id, 'old': old.get('price'),
+                                              'new': new.get('price')})
+                grade_changes = {
+                    field: [old.get(field), new.get(field)]
+                    for field in sorted(set(new) | set(old))
+                    if _is_grade_field(field) and new.get(field) != old.get(field)
+                }
+                if grade_changes:
+                    lists['regraded'].append({'vehicle_id': vehicle_id, 'changes': grade_changes})
+                other = [f for f in set(new) | set(old)
+                         if f != 'price' and not _is_grade_field(f) and new.get(f) != old.get(f)]
+                if other:
+                    lists['updated'].append(vehicle_id)
+
+        rates = residual_rates.get(vehicle_id)
+        old_rate = old_rates.get(vehicle_id)
+        if rates is not old_rate and _normalize(rates) != old_rate:
+            lists['residual_changed'].append(vehicle_id)
+
+    lists['removed'] = [vehicle_id for vehicle_id in old_master if vehicle_id not in vehicle_master]
+    diff.update(lists)
+    return diff
+
+
+def has_changes(diff: Dict) -> bool:
+    """출력 파일을 다시 써야 하는 변경이 있는지"""
+    return any(diff[key] for key in DIFF_KEYS)
+
+
+def summarize(diff: Dict) -> Dict[str, int]:
+    """보고서용 변경 건수"""
+    return {key: len(diff[key]) for key in DIFF_KEYS}
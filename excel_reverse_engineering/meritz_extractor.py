@@ -1,38 +1,73 @@
 """
 excel_reverse_engineering/meritz_extractor.py
 메리츠캐피탈 엑셀 전용 추출기
+
+시트/좌표는 specs/meritz_capital.json 에 선언하고 sheet_spec.SheetReader 로 읽는다.
+- 차종 시트: 7행부터 끝까지 한 번만 순차 순회 (레코드 vehicles)
+- 잔가 시트: 주행거리 조정값/등급별 잔가 테이블 영역을 한 번에 값 배열로 읽음
+
+이전 추출 결과(previous)를 넘기면 잔가 테이블 해시와 차량 행 해시가 같은 차량은
+다시 계산하지 않고 이전 결과를 그대로 쓴다 (extract_all.py 증분 추출).
 """
 
-import openpyxl
-from typing import Dict, Optional, Tuple
+import sys
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+import hashlib
 import json
 from pathlib import Path
 
+# 상위 디렉토리를 path에 추가 (스크립트로 실행할 때)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from data.artifact_format import KIND_RESIDUAL_RATES, KIND_VEHICLE_MASTER, export_json, json_path, write_artifact
+from excel_reverse_engineering.sheet_spec import Region, SheetReader
+
+SPEC = "meritz_capital"
+
+# 잔가 테이블 영역 (스펙의 regions 이름 = 잔가사)
+RESIDUAL_TABLES = ('west', 'aj', 'aps', 'vgs')
+
+
+def _content_hash(value: Any) -> str:
+    """값의 내용 해시 (행/테이블 변경 감지용)"""
+    payload = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _row_hash(row: Sequence) -> str:
+    """행 해시 (뒤쪽 빈 셀은 무시: 읽기 전용 모드는 저장한 프로그램에 따라 생략하기도 함)"""
+    end = len(row)
+    while end and row[end - 1] is None:
+        end -= 1
+    return _content_hash(list(row[:end]))
+
 
 class MeritzResidualExtractor:
     """메리츠캐피탈 엑셀에서 잔존율 데이터 추출"""
 
-    def __init__(self, excel_path: str):
-        self.workbook = openpyxl.load_workbook(excel_path, data_only=True)
-        self.vehicle_sheet = None
-        self.residual_sheet = None
+    def __init__(self, excel_path: str, spec: Union[str, Dict] = SPEC):
+        self.reader = SheetReader(excel_path, spec)
+        self.workbook = self.reader.workbook
+        self.vehicle_sheet = self.reader.sheets['vehicles']
+        self.residual_sheet = self.reader.sheets['residual']
 
-        # 시트 찾기
-        for sheet in self.workbook.worksheets:
-            if '차종' in sheet.title:
-                self.vehicle_sheet = sheet
-            elif '잔가' in sheet.title:
-                self.residual_sheet = sheet
+        # 증분 추출 정보 (추출 후 채워짐)
+        self.tables_hash: Optional[str] = None
+        self.row_hashes: Dict[str, str] = {}
+        self.reused = 0
 
-        if not self.vehicle_sheet:
-            raise ValueError("'차종' 시트를 찾을 수 없습니다")
-        if not self.residual_sheet:
-            raise ValueError("'잔가' 시트를 찾을 수 없습니다")
+    def close(self) -> None:
+        """워크북 파일 핸들 닫기 (읽기 전용 모드는 명시적으로 닫아야 함)"""
+        self.reader.close()
 
-    def extract_all_vehicles(self) -> Tuple[Dict, Dict]:
+    def extract_all_vehicles(self, previous: Optional[Dict] = None) -> Tuple[Dict, Dict]:
         """
         모든 차량 데이터 및 잔존율 추출
 
+        Args:
+            previous: 이전 추출 결과 {tables_hash, row_hashes, vehicle_master, residual_rates}
+                      (None이면 전체 계산)
+
         Returns:
             Tuple[Dict, Dict]: (vehicle_master, residual_rates)
         """
@@ -40,6 +75,12 @@ class MeritzResidualExtractor:
         print("메리츠캐피탈 데이터 추출 시작")
         print("="*80)
 
+        try:
+            return self._extract_all_vehicles(previous)
+        finally:
+            self.close()
+
+    def _extract_all_vehicles(self, previous: Optional[Dict]) -> Tuple[Dict, Dict]:
         # 1. 잔가 테이블 추출 (등급별)
         print("\n[1/3] 잔가 테이블 추출 중...")
         residual_tables = self._extract_residual_tables()
@@ -49,14 +90,16 @@ class MeritzResidualExtractor:
         print("\n[2/3] 주행거리 조정값 추출 중...")
         mileage_adjustments = self._extract_mileage_adjustments()
         print(f"  ✓ 주행거리 조정값: {mileage_adjustments}")
+        self.tables_hash = _content_hash([residual_tables, mileage_adjustments])
 
         # 3. 차량 정보 및 잔가 등급 추출
         print("\n[3/3] 차량 데이터 추출 중...")
         vehicle_master, residual_rates = self._extract_vehicles_with_residuals(
             residual_tables,
-            mileage_adjustments
+            mileage_adjustments,
+            previous
         )
-        print(f"  ✓ {len(vehicle_master)}대 차량 처리 완료")
+        print(f"  ✓ {len(vehicle_master)}대 차량 처리 완료 (재사용 {self.reused}대)")
 
         return vehicle_master, residual_rates
 
@@ -67,53 +110,23 @@ class MeritzResidualExtractor:
         Returns:
             Dict: {grade_name: {period: {grade_letter: rate, ...}, ...}, ...}
         """
-        tables = {}
-
-        # West 테이블 (Row 48-53, Col 2-12)
-        tables['west'] = self._parse_residual_table(
-            start_row=49, end_row=54,
-            grade_row=48, grade_col_start=2, grade_col_end=13
-        )
+        # West B48:M53, AJ B57:W62, APS B65:X70, VGS B73:L77 (스펙 regions)
+        return {name: self._parse_residual_table(self.reader.region(name)) for name in RESIDUAL_TABLES}
 
-        # AJ 테이블 (Row 57-62, Col 2-22)
-        tables['aj'] = self._parse_residual_table(
-            start_row=58, end_row=63,
-            grade_row=57, grade_col_start=2, grade_col_end=23
-        )
-
-        # APS 테이블 (Row 65-70, Col 2-23)
-        tables['aps'] = self._parse_residual_table(
-            start_row=66, end_row=71,
-            grade_row=65, grade_col_start=2, grade_col_end=24
-        )
-
-        # VGS 테이블 (Row 73-77, Col 2-11)
-        tables['vgs'] = self._parse_residual_table(
-            start_row=74, end_row=78,
-            grade_row=73, grade_col_start=2, grade_col_end=12
-        )
-
-        return tables
-
-    def _parse_residual_table(self, start_row: int, end_row: int,
-                             grade_row: int, grade_col_start: int,
-                             grade_col_end: int) -> Dict:
+    def _parse_residual_table(self, region: Region) -> Dict:
         """
         특정 영역의 잔가 테이블 파싱
 
+        Args:
+            region: 첫 행은 등급 헤더, 첫 열은 기간인 영역
+
         Returns:
             Dict: {period: {grade: rate, ...}, ...}
         """
         table = {}
 
-        # 등급 헤더 읽기 (grade_row)
-        grade_header_cells = list(self.residual_sheet.iter_rows(
-            min_row=grade_row,
-            max_row=grade_row,
-            min_col=grade_col_start,
-            max_col=grade_col_end,
-            values_only=True
-        ))[0]
+        # 등급 헤더 읽기 (영역 첫 행)
+        grade_header_cells = region.values[0]
 
         # 첫 컬럼(기간) 제외하고 등급만 추출
         grades = []
@@ -122,15 +135,7 @@ class MeritzResidualExtractor:
                 grades.append(cell)
 
         # 기간별 데이터 읽기
-        for row_idx in range(start_row, end_row):
-            row_data = list(self.residual_sheet.iter_rows(
-                min_row=row_idx,
-                max_row=row_idx,
-                min_col=grade_col_start,
-                max_col=grade_col_end,
-                values_only=True
-            ))[0]
-
+        for row_data in region.values[1:]:
             period = row_data[0]  # 첫 컬럼은 기간 (12, 24, 36, 48, 60, 72)
 
             if not isinstance(period, (int, float)):
@@ -159,16 +164,8 @@ class MeritzResidualExtractor:
         """
         adjustments = {}
 
-        # Row 36-39, 컬럼 9-10 (km, W(West) 조정값)
-        for row_idx in range(36, 40):
-            row_data = list(self.residual_sheet.iter_rows(
-                min_row=row_idx,
-                max_row=row_idx,
-                min_col=9,
-                max_col=10,
-                values_only=True
-            ))[0]
-
+        # I36:J39 (km, W(West) 조정값)
+        for row_data in self.reader.region('mileage_adjustments').values:
             mileage = row_data[0]  # 컬럼 9: km
             adjustment = row_data[1]  # 컬럼 10: W (West 기준 조정값)
 
@@ -179,37 +176,41 @@ class MeritzResidualExtractor:
         return adjustments
 
     def _extract_vehicles_with_residuals(self, residual_tables: Dict,
-                                        mileage_adjustments: Dict) -> Tuple[Dict, Dict]:
+                                        mileage_adjustments: Dict,
+                                        previous: Optional[Dict] = None) -> Tuple[Dict, Dict]:
         """
         차량 정보 및 잔존율 계산
 
+        Args:
+            previous: 이전 추출 결과 (잔가 테이블이 같을 때만 행 해시가 같은 차량 재사용)
+
         Returns:
             Tuple[Dict, Dict]: (vehicle_master, residual_rates)
         """
         vehicle_master = {}
         residual_rates = {}
-
-        # 데이터 행 (Row 7부터)
-        for row_idx in range(7, self.vehicle_sheet.max_row + 1):
-            row_data = list(self.vehicle_sheet.iter_rows(
-                min_row=row_idx,
-                max_row=row_idx,
-                values_only=True
-            ))[0]
-
-            # 기본 정보 추출
-            maker = row_data[1] if len(row_data) > 1 else None  # Maker (컬럼 B = 2)
-            model1 = row_data[2] if len(row_data) > 2 else None  # Model1 (컬럼 C = 3)
-            model3 = row_data[4] if len(row_data) > 4 else None  # Model3 (컬럼 E = 5)
-            price = row_data[5] if len(row_data) > 5 else None  # 차량가격 (컬럼 F = 6)
-            engine_cc = row_data[6] if len(row_data) > 6 else None  # 배기량 (컬럼 G = 7)
-            fuel_type = row_data[7] if len(row_data) > 7 else None  # 유종 (컬럼 H = 8)
-            west_grade = row_data[9] if len(row_data) > 9 else None  # 웨스트 (컬럼 J = 10)
-            aj_grade = row_data[10] if len(row_data) > 10 else None  # 오토준 (컬럼 K = 11)
-            aps_grade = row_data[11] if len(row_data) > 11 else None  # APS (컬럼 L = 12)
-            vgs_grade = row_data[12] if len(row_data) > 12 else None  # VGS (컬럼 M = 13)
-            premium_add_15k = row_data[15] if len(row_data) > 15 else None  # 고잔가추가 15,000 (컬럼 P = 16)
-            premium_add_10k = row_data[16] if len(row_data) > 16 else None  # 고잔가추가1 10,000 (컬럼 Q = 17)
+        self.row_hashes = {}
+        self.reused = 0
+
+        previous_rows = {}
+        if previous and previous.get('tables_hash') == self.tables_hash:
+            previous_rows = previous['row_hashes']
+
+        # 데이터 행 (Row 7부터, 한 번의 순차 순회)
+        for _, fields, row_data in self.reader.records('vehicles'):
+            # 기본 정보 추출 (열 위치는 스펙 records.vehicles.columns)
+            maker = fields['maker']
+            model1 = fields['model1']
+            model3 = fields['model3']
+            price = fields['price']
+            engine_cc = fields['engine_cc']
+            fuel_type = fields['fuel_type']
+            west_grade = fields['west_grade']  # 웨스트
+            aj_grade = fields['aj_grade']  # 오토준
+            aps_grade = fields['aps_grade']
+            vgs_grade = fields['vgs_grade']
+            premium_add_15k = fields['premium_add_15k']  # 고잔가추가 15,000
+            premium_add_10k = fields['premium_add_10k']  # 고잔가추가1 10,000
 
             # 필수 데이터 검증
             if not all([maker, model3, price]):
@@ -218,6 +219,16 @@ class MeritzResidualExtractor:
             # 차량 ID 생성
             vehicle_id = self._normalize_vehicle_id(maker, model1, model3)
 
+            # 행이 바뀌지 않았으면 이전 결과 재사용
+            row_hash = _row_hash(row_data)
+            self.row_hashes[vehicle_id] = row_hash
+            if previous_rows.get(vehicle_id) == row_hash and vehicle_id in previous['vehicle_master']:
+                vehicle_master[vehicle_id] = previous['vehicle_master'][vehicle_id]
+                if vehicle_id in previous['residual_rates']:
+                    residual_rates[vehicle_id] = previous['residual_rates'][vehicle_id]
+                self.reused += 1
+                continue
+
             # 차량 마스터 데이터
             vehicle_master[vehicle_id] = {
                 "brand": str(maker),
@@ -400,14 +411,15 @@ def main():
     output_dir.mkdir(exist_ok=True)
     (output_dir / "residual_rates").mkdir(exist_ok=True)
 
-    # vehicle_master.json
-    vehicle_master_path = output_dir / "vehicle_master.json"
-    with open(vehicle_master_path, 'w', encoding='utf-8') as f:
-        json.dump(vehicle_master, f, indent=2, ensure_ascii=False)
+    # vehicle_master.npz (기존 JSON 내보내기가 있으면 함께 갱신)
+    vehicle_master_path = output_dir / "vehicle_master.npz"
+    write_artifact(vehicle_master_path, vehicle_master, KIND_VEHICLE_MASTER)
+    if json_path(vehicle_master_path).exists():
+        export_json(vehicle_master, json_path(vehicle_master_path))
     print(f"\n✓ 저장: {vehicle_master_path} ({len(vehicle_master)}대)")
 
-    # residual_rates/meritz_capital.json
-    # JSON 키를 문자열로 변환
+    # residual_rates/meritz_capital.npz
+    # 키를 문자열로 변환 (JSON 내보내기와 같은 키)
     residual_json = {}
     for vehicle_id, periods in residual_rates.items():
         residual_json[vehicle_id] = {
@@ -418,9 +430,10 @@ def main():
             for period, mileages in periods.items()
         }
 
-    residual_rates_path = output_dir / "residual_rates" / "meritz_capital.json"
-    with open(residual_rates_path, 'w', encoding='utf-8') as f:
-        json.dump(residual_json, f, indent=2, ensure_ascii=False)
+    residual_rates_path = output_dir / "residual_rates" / "meritz_capital.npz"
+    write_artifact(residual_rates_path, residual_json, KIND_RESIDUAL_RATES)
+    if json_path(residual_rates_path).exists():
+        export_json(residual_json, json_path(residual_rates_path))
     print(f"✓ 저장: {residual_rates_path} ({len(residual_rates)}대)")
 
     # 통계
@@ -6,38 +6,72 @@ MG캐피탈 엑셀 전용 추출기
 - 잔가map 시트: 등급별 테이블
 - 차량DB: 차량별 등급 정보 (S열)
 - PMT 계산 방식
+
+시트/좌표는 specs/mg_capital.json 에 선언하고 sheet_spec.SheetReader 로 읽는다.
+- 차량DB: 헤더(BRAND, MODEL) 탐색과 데이터 추출을 한 번의 순차 순회로 처리
+- 잔가map: 테이블 이름 셀(■ 에스앤케이모터스, ■ APS)을 앵커로 등급 테이블 영역을 값 배열로 읽음
+
+이전 추출 결과(previous)를 넘기면 등급 테이블 해시와 차량 행 해시가 같은 차량은
+다시 계산하지 않고 이전 결과를 그대로 쓴다 (extract_all.py 증분 추출).
 """
 
-import openpyxl
-from typing import Dict, Optional, Tuple, List
+import sys
+from typing import Any, Dict, Optional, Sequence, Set, Tuple, Union
+import hashlib
 import json
 from pathlib import Path
 
+# 상위 디렉토리를 path에 추가 (스크립트로 실행할 때)
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from data.artifact_format import KIND_RESIDUAL_RATES, KIND_VEHICLE_MASTER, export_json, json_path, write_artifact
+from excel_reverse_engineering.sheet_spec import Region, SheetReader
+
+SPEC = "mg_capital"
+
+
+def _content_hash(value: Any) -> str:
+    """값의 내용 해시 (행/테이블 변경 감지용)"""
+    payload = json.dumps(value, sort_keys=True, default=str, ensure_ascii=False)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()
+
+
+def _row_hash(row: Sequence) -> str:
+    """행 해시 (뒤쪽 빈 셀은 무시: 읽기 전용 모드는 저장한 프로그램에 따라 생략하기도 함)"""
+    end = len(row)
+    while end and row[end - 1] is None:
+        end -= 1
+    return _content_hash(list(row[:end]))
+
 
 class MGCapitalExtractor:
     """MG캐피탈 엑셀에서 데이터 추출"""
 
-    def __init__(self, excel_path: str):
-        self.workbook = openpyxl.load_workbook(excel_path, data_only=True)
-        self.vehicle_db_sheet = None
-        self.residual_map_sheet = None
+    def __init__(self, excel_path: str, spec: Union[str, Dict] = SPEC):
+        self.reader = SheetReader(excel_path, spec)
+        self.workbook = self.reader.workbook
+        self.vehicle_db_sheet = self.reader.sheets['vehicle_db']
+        self.residual_map_sheet = self.reader.sheets['grade_map']
 
-        # 시트 찾기
-        for sheet in self.workbook.worksheets:
-            if sheet.title == '차량DB':
-                self.vehicle_db_sheet = sheet
-            elif sheet.title == '잔가map':
-                self.residual_map_sheet = sheet
+        # 증분 추출 정보 (추출 후 채워짐)
+        self.tables_hash: Optional[str] = None
+        self.row_hashes: Dict[str, str] = {}
+        self.reused = 0
+        self._previous: Optional[Dict] = None
+        self._reusable: Set[str] = set()
 
-        if not self.vehicle_db_sheet:
-            raise ValueError("'차량DB' 시트를 찾을 수 없습니다")
-        if not self.residual_map_sheet:
-            raise ValueError("'잔가map' 시트를 찾을 수 없습니다")
+    def close(self) -> None:
+        """워크북 파일 핸들 닫기 (읽기 전용 모드는 명시적으로 닫아야 함)"""
+        self.reader.close()
 
-    def extract_all_data(self) -> Tuple[Dict, Dict]:
+    def extract_all_data(self, previous: Optional[Dict] = None) -> Tuple[Dict, Dict]:
         """
         모든 차량 데이터 및 잔존율 추출
 
+        Args:
+            previous: 이전 추출 결과 {tables_hash, row_hashes, vehicle_master, residual_rates}
+                      (None이면 전체 계산)
+
         Returns:
             Tuple[Dict, Dict]: (vehicle_master, residual_rates)
         """
@@ -45,6 +79,12 @@ class MGCapitalExtractor:
         print("MG캐피탈 데이터 추출 시작")
         print("="*80)
 
+        try:
+            return self._extract_all_data(previous)
+        finally:
+            self.close()
+
+    def _extract_all_data(self, previous: Optional[Dict]) -> Tuple[Dict, Dict]:
         # 1. 잔가 등급 테이블 추출 (잔가map 시트)
         print("\n[1/3] 잔가 등급 테이블 추출 중...")
         grade_tables = self._extract_grade_tables()
@@ -52,6 +92,10 @@ class MGCapitalExtractor:
         for table_name, data in grade_tables.items():
             print(f"    - {table_name}: {len(data['grades'])}개 등급")
 
+        # 등급 테이블이 같을 때만 이전 결과 재사용
+        self.tables_hash = _content_hash(grade_tables)
+        self._previous = previous if previous and previous.get('tables_hash') == self.tables_hash else None
+
         # 2. 차량 마스터 추출
         print("\n[2/3] 차량 마스터 추출 중...")
         vehicle_master = self._extract_vehicle_master()
@@ -66,7 +110,7 @@ class MGCapitalExtractor:
 
         # 통계
         vehicles_with_rates = sum(1 for v in residual_rates.values() if v)
-        print(f"  ✓ {vehicles_with_rates}/{len(vehicle_master)}대 차량에 잔존율 계산 완료")
+        print(f"  ✓ {vehicles_with_rates}/{len(vehicle_master)}대 차량에 잔존율 계산 완료 (재사용 {self.reused}대)")
 
         return vehicle_master, residual_rates
 
@@ -80,33 +124,16 @@ class MGCapitalExtractor:
                 'aps': {'grades': [...], 'residual_rates': {...}}
             }
         """
-        tables = {}
-
-        # 에스앤케이모터스 테이블 (Row 2-7)
-        tables['snk'] = self._parse_grade_table(
-            name_row=1, name_col=1,  # A1: ■ 에스앤케이모터스
-            grade_row=2, grade_col_start=3, grade_col_end=30,  # C2:AD2
-            data_start_row=3, data_end_row=7,  # 12/24/36/48/60개월
-            period_col=2  # B열에 기간
-        )
-
-        # APS 테이블 (Row 13-18)
-        tables['aps'] = self._parse_grade_table(
-            name_row=12, name_col=1,  # A12: ■ APS
-            grade_row=13, grade_col_start=3, grade_col_end=30,  # C13:AD13
-            data_start_row=14, data_end_row=18,
-            period_col=2
-        )
+        # A1: ■ 에스앤케이모터스 → B2:AD7, A12: ■ APS → B13:AD18 (스펙 regions, 12/24/36/48/60개월)
+        return {name: self._parse_grade_table(self.reader.region(name)) for name in ('snk', 'aps')}
 
-        return tables
-
-    def _parse_grade_table(self, name_row: int, name_col: int,
-                           grade_row: int, grade_col_start: int, grade_col_end: int,
-                           data_start_row: int, data_end_row: int,
-                           period_col: int) -> Dict:
+    def _parse_grade_table(self, region: Region) -> Dict:
         """
         잔가map에서 하나의 등급 테이블 파싱
 
+        Args:
+            region: 앵커(테이블 이름) 셀 기준 영역, 첫 행은 등급 헤더, 첫 열은 기간
+
         Returns:
             Dict: {
                 'name': '에스앤케이모터스',
@@ -118,15 +145,12 @@ class MGCapitalExtractor:
                 }
             }
         """
-        ws = self.residual_map_sheet
-
         # 테이블 이름
-        table_name = ws.cell(name_row, name_col).value
+        table_name = region.anchor
 
-        # 등급 추출 (헤더 행)
+        # 등급 추출 (헤더 행, 첫 열은 기간)
         grades = []
-        for col in range(grade_col_start, grade_col_end + 1):
-            grade = ws.cell(grade_row, col).value
+        for grade in region.values[0][1:]:
             if grade and grade not in [None, '']:
                 grades.append(str(grade))
             else:
@@ -134,16 +158,15 @@ class MGCapitalExtractor:
 
         # 잔가율 데이터 추출 (기간별)
         residual_rates = {}
-        for row in range(data_start_row, data_end_row + 1):
-            period = ws.cell(row, period_col).value
+        for row in region.values[1:]:
+            period = row[0]
             if not period or not isinstance(period, (int, float)):
                 continue
 
             period = int(period)
             rates = []
 
-            for col_idx, grade in enumerate(grades, start=grade_col_start):
-                rate = ws.cell(row, col_idx).value
+            for rate in row[1:len(grades) + 1]:
                 if rate is not None and isinstance(rate, (int, float)):
                     rates.append(round(float(rate), 4))
                 else:
@@ -174,24 +197,16 @@ class MGCapitalExtractor:
                 }
             }
         """
-        ws = self.vehicle_db_sheet
         vehicles = {}
+        self.row_hashes = {}
+        self.reused = 0
+        self._reusable = set()
+        previous = self._previous
 
-        # 헤더 행 찾기 (BRAND, MODEL 포함된 행)
-        header_row = None
-        for row_idx in range(1, 10):
-            row_values = [ws.cell(row_idx, col).value for col in range(1, 20)]
-            if 'BRAND' in row_values and 'MODEL' in row_values:
-                header_row = row_idx
-                break
-
-        if not header_row:
-            raise ValueError("차량DB 헤더를 찾을 수 없습니다")
-
-        # 데이터 추출 (헤더 다음 행부터)
-        for row_idx in range(header_row + 1, ws.max_row + 1):
-            brand = ws.cell(row_idx, 5).value  # E열 (col 5)
-            model = ws.cell(row_idx, 6).value  # F열 (col 6)
+        # 헤더 행(BRAND, MODEL 포함, 1~9행) 다음 행부터 데이터 (열 위치는 스펙 records.vehicles.columns)
+        for _, fields, row in self.reader.records('vehicles'):
+            brand = fields['brand']
+            model = fields['model']
 
             if not brand or not model:
                 continue  # 빈 행 건너뛰기
@@ -199,13 +214,23 @@ class MGCapitalExtractor:
             # 차량 ID 생성 (BRAND_MODEL, 공백/특수문자 제거)
             vehicle_id = self._generate_vehicle_id(brand, model)
 
+            # 행이 바뀌지 않았으면 이전 결과 재사용
+            row_hash = _row_hash(row)
+            self.row_hashes[vehicle_id] = row_hash
+            if (previous and previous['row_hashes'].get(vehicle_id) == row_hash
+                    and vehicle_id in previous['vehicle_master'] and vehicle_id in previous['residual_rates']):
+                vehicles[vehicle_id] = previous['vehicle_master'][vehicle_id]
+                self._reusable.add(vehicle_id)
+                continue
+            self._reusable.discard(vehicle_id)
+
             # model을 기본 모델과 트림으로 분리 (간단히 첫 단어를 model로)
             model_parts = str(model).split(' ', 1)
             base_model = model_parts[0] if len(model_parts) > 0 else str(model)
             trim = model_parts[1] if len(model_parts) > 1 else ""
 
             # 배기량 확인
-            displacement = ws.cell(row_idx, 7).value
+            displacement = fields['displacement']
             engine_cc = int(displacement) if displacement and isinstance(displacement, (int, float)) else 0
 
             # 연료 타입 추정 (전기차는 배기량 0)
@@ -229,11 +254,11 @@ class MGCapitalExtractor:
                 'displacement': displacement,  # G열: 배기량
                 'engine_cc': engine_cc,
                 'fuel_type': fuel_type,
-                'vehicle_type': ws.cell(row_idx, 8).value,  # H열: 차종분류
-                'price': ws.cell(row_idx, 9).value,  # I열: 차량가
+                'vehicle_type': fields['vehicle_type'],  # H열: 차종분류
+                'price': fields['price'],  # I열: 차량가
                 'is_import': is_import,
-                'grade_snk': ws.cell(row_idx, 19).value,  # S열: 에스앤케이모터스 등급
-                'premium_available': ws.cell(row_idx, 16).value  # P열: 고잔가 가능
+                'grade_snk': fields['grade_snk'],  # S열: 에스앤케이모터스 등급
+                'premium_available': fields['premium_available']  # P열: 고잔가 가능
             }
 
         return vehicles
@@ -273,6 +298,11 @@ class MGCapitalExtractor:
         mileages = [10000, 15000, 20000, 30000]
 
         for vehicle_id, vehicle_data in vehicle_master.items():
+            if vehicle_id in self._reusable:
+                residual_rates[vehicle_id] = self._previous['residual_rates'][vehicle_id]
+                self.reused += 1
+                continue
+
             grade_snk = vehicle_data.get('grade_snk')
             premium_available = vehicle_data.get('premium_available')
 
@@ -369,17 +399,18 @@ def main():
         print("데이터 저장 중...")
         print("="*80)
 
-        # 차량 마스터 저장
-        vehicle_output = output_dir / "mg_vehicle_master.json"
-        with open(vehicle_output, 'w', encoding='utf-8') as f:
-            json.dump(vehicle_master, f, ensure_ascii=False, indent=2)
+        # 차량 마스터 저장 (아티팩트, 기존 JSON 내보내기가 있으면 함께 갱신)
+        vehicle_output = output_dir / "mg_vehicle_master.npz"
+        write_artifact(vehicle_output, vehicle_master, KIND_VEHICLE_MASTER)
+        if json_path(vehicle_output).exists():
+            export_json(vehicle_master, json_path(vehicle_output))
         print(f"✓ 차량 마스터: {vehicle_output} ({len(vehicle_master)}대)")
 
         # 잔존율 저장
-        residual_output = output_dir / "residual_rates" / "mg_capital.json"
-        residual_output.parent.mkdir(exist_ok=True)
-        with open(residual_output, 'w', encoding='utf-8') as f:
-            json.dump(residual_rates, f, ensure_ascii=False, indent=2)
+        residual_output = output_dir / "residual_rates" / "mg_capital.npz"
+        write_artifact(residual_output, residual_rates, KIND_RESIDUAL_RATES)
+        if json_path(residual_output).exists():
+            export_json(residual_rates, json_path(residual_output))
 
         vehicles_with_rates = sum(1 for v in residual_rates.values() if v)
         print(f"✓ 잔존율: {residual_output} ({vehicles_with_rates}대)")
@@ -0,0 +1,351 @@
+"""
+excel_reverse_engineering/sheet_spec.py
+선언형 시트 영역 스펙과 공용 리더
+
+캐피탈별 스펙(specs/{capital_id}.json)에 시트, 헤더 앵커, 표 영역을 적어 두면
+리더가 시트마다 한 번만 순차로 읽어 영역을 값 배열로 돌려준다.
+새 캐피탈은 스펙 작성 + 값 배열을 해석하는 추출기 로직만 있으면 된다.
+
+스펙 형식:
+    {
+      "capital_id": "mg_capital",
+      "sheets": {                                   # 별칭: 시트 선택자
+        "vehicle_db": {"title": "차량DB"},           #   제목 일치
+        "residual": {"contains": "잔가"}             #   제목 포함 (시트 순서상 마지막 일치)
+      },
+      "regions": {                                  # 2차원 값 배열
+        "west": {"sheet": "residual", "range": "B48:M53"},          # 고정 좌표
+        "snk": {"sheet": "grade_map",                               # 앵커 셀 기준
+                "anchor": {"contains": "에스앤케이", "within": "A1:A10"},
+                "offset": [1, 1], "size": [6, 29]}                  # [행, 열]
+      },
+      "records": {                                  # 데이터 행 스트리밍
+        "vehicles": {"sheet": "vehicle_db",
+                     "header": {"labels": ["BRAND", "MODEL"], "within": "A1:S9"},  # 또는 "start_row": 7
+                     "columns": {"brand": "E", "price": {"header": "차량가"}}}    # 열 문자 또는 헤더 이름
+      }
+    }
+
+영역은 시트별로 필요한 범위(영역/앵커 탐색 범위의 마지막 행·열)까지 한 번에 읽고
+앵커는 그 값 배열에서 찾는다. 레코드는 헤더 탐색과 데이터 행을 한 번의 순회로 처리한다.
+
+사용법 (워크북에서 스펙이 가리키는 위치 확인):
+    python excel_reverse_engineering/sheet_spec.py xlsx/mg_capital_2510_vol3.xlsx mg_capital
+    python excel_reverse_engineering/sheet_spec.py 새캐피탈.xlsx specs/new_capital.json --sample 10
+"""
+
+import json
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
+
+import openpyxl
+from openpyxl.utils.cell import column_index_from_string, get_column_letter, range_boundaries
+
+SPEC_DIR = Path(__file__).parent / "specs"
+
+
+class Region(NamedTuple):
+    """읽은 영역 (top/left: 1부터 시작하는 엑셀 좌표)"""
+    name: str
+    top: int
+    left: int
+    anchor: Any                 # 앵커 셀 값 (고정 좌표 영역이면 None)
+    values: List[List[Any]]     # 행 × 열 (범위 밖/빈 셀은 None)
+
+    @property
+    def ref(self) -> str:
+        """영역 좌표 문자열 (예: B2:AD7)"""
+        bottom = self.top + len(self.values) - 1
+        right = self.left + (len(self.values[0]) if self.values else 1) - 1
+        return f"{get_column_letter(self.left)}{self.top}:{get_column_letter(right)}{bottom}"
+
+
+def load_spec(spec: Union[str, Path, Dict]) -> Dict:
+    """
+    스펙 로드 및 검증
+
+    Args:
+        spec: 캐피탈 ID (specs/{capital_id}.json), JSON 파일 경로, 또는 스펙 딕셔너리
+
+    Returns:
+        Dict: 스펙
+
+    Raises:
+        FileNotFoundError: 스펙 파일이 없는 경우
+        ValueError: 스펙 형식 오류
+    """
+    if not isinstance(spec, dict):
+        path = Path(spec)
+        if path.suffix != ".json":
+            path = SPEC_DIR / f"{spec}.json"
+        if not path.exists():
+            raise FileNotFoundError(f"시트 스펙 파일이 없습니다: {path}")
+        with open(path, 'r', encoding='utf-8') as f:
+            spec = json.load(f)
+
+    _validate(spec)
+    return spec
+
+
+def _validate(spec: Dict) -> None:
+    """스펙 형식 검증 (정의되지 않은 시트 별칭, 좌표 지정 누락)"""
+    sheets = spec.get('sheets') or {}
+    if not sheets:
+        raise ValueError("스펙에 sheets 가 없습니다")
+    for alias, selector in sheets.items():
+        if not ('title' in selector or 'contains' in selector):
+            raise ValueError(f"시트 선택자에 title 또는 contains 가 필요합니다: {alias}")
+
+    for name, region in (spec.get('regions') or {}).items():
+        if region.get('sheet') not in sheets:
+            raise ValueError(f"정의되지 않은 시트입니다: {name} → {region.get('sheet')}")
+        if ('range' in region) == ('anchor' in region):
+            raise ValueError(f"영역은 range 또는 anchor 중 하나만 지정합니다: {name}")
+        if 'anchor' in region and not ('size' in region and 'within' in region['anchor']):
+            raise ValueError(f"앵커 영역에는 anchor.within 과 size 가 필요합니다: {name}")
+
+    for name, records in (spec.get('records') or {}).items():
+        if records.get('sheet') not in sheets:
+            raise ValueError(f"정의되지 않은 시트입니다: {name} → {records.get('sheet')}")
+        if ('header' in records) == ('start_row' in records):
+            raise ValueError(f"레코드는 header 또는 start_row 중 하나만 지정합니다: {name}")
+        for field, column in records.get('columns', {}).items():
+            if isinstance(column, dict) and 'header' not in records:
+                raise ValueError(f"헤더 이름으로 열을 지정하려면 header 가 필요합니다: {name}.{field}")
+
+
+def _region_extent(region: Dict) -> Tuple[int, int]:
+    """영역을 읽기 위해 필요한 (마지막 행, 마지막 열)"""
+    if 'range' in region:
+        _, _, max_col, max_row = range_boundaries(region['range'])
+        return max_row, max_col
+
+    _, _, max_col, max_row = range_boundaries(region['anchor']['within'])
+    row_offset, col_offset = region.get('offset', [0, 0])
+    rows, cols = region['size']
+    return max_row + row_offset + rows - 1, max_col + col_offset + cols - 1
+
+
+def _cell(block: List[Tuple], row: int, col: int) -> Any:
+    """값 배열에서 셀 값 (1부터 시작, 범위 밖은 None)"""
+    if 0 < row <= len(block):
+        values = block[row - 1]
+        if 0 < col <= len(values):
+            return values[col - 1]
+    return None
+
+
+def _is_header(row: Tuple, labels: List[str], min_col: int, max_col: int) -> bool:
+    """헤더 탐색 열 범위 안에 라벨이 모두 있는 행인지"""
+    window = row[min_col - 1:max_col]
+    return all(label in window for label in labels)
+
+
+def _sheet_matches(title: str, selector: Dict) -> bool:
+    if 'title' in selector:
+        return title == selector['title']
+    return selector['contains'] in title
+
+
+def _matches(value: Any, anchor: Dict) -> bool:
+    if value is None:
+        return False
+    if 'equals' in anchor:
+        return value == anchor['equals']
+    return anchor['contains'] in str(value)
+
+
+class SheetReader:
+    """
+    스펙 기반 워크북 리더 (읽기 전용 스트리밍 모드)
+
+    사용 예:
+        reader = SheetReader("mg.xlsx", "mg_capital")
+        snk = reader.region("snk").values
+        for row_idx, fields, row in reader.records("vehicles"):
+            ...
+        reader.close()
+    """
+
+    def __init__(self, excel_path: Union[str, Path], spec: Union[str, Path, Dict]):
+        self.spec = load_spec(spec)
+        self.workbook = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
+        self.sheets: Dict[str, Any] = {}
+        self._blocks: Dict[str, List[Tuple]] = {}
+        self._regions: Dict[str, Region] = {}
+
+        # 시트 찾기 (시트마다 스펙 순서상 처음 맞는 별칭, 같은 별칭은 뒤의 시트가 우선)
+        selectors = self.spec['sheets']
+        for sheet in self.workbook.worksheets:
+            for alias, selector in selectors.items():
+                if _sheet_matches(sheet.title, selector):
+                    self.sheets[alias] = sheet
+                    break
+
+        for alias, selector in selectors.items():
+            if alias not in self.sheets:
+                self.close()
+                raise ValueError(f"'{selector.get('title') or selector['contains']}' 시트를 찾을 수 없습니다")
+
+    def close(self) -> None:
+        """워크북 파일 핸들 닫기 (읽기 전용 모드는 명시적으로 닫아야 함)"""
+        self.workbook.close()
+
+    def _block(self, alias: str) -> List[Tuple]:
+        """시트의 영역 전체를 덮는 값 배열 (처음 한 번만 순차로 읽음)"""
+        if alias not in self._blocks:
+            extents = [_region_extent(region) for region in self.spec.get('regions', {}).values()
+                       if region['sheet'] == alias]
+            max_row = max(row for row, _ in extents)
+            max_col = max(col for _, col in extents)
+            self._blocks[alias] = list(self.sheets[alias].iter_rows(
+                min_row=1, max_row=max_row, max_col=max_col, values_only=True
+            ))
+        return self._blocks[alias]
+
+    def region(self, name: str) -> Region:
+        """
+        영역 값 배열
+
+        Raises:
+            KeyError: 스펙에 없는 영역
+            ValueError: 앵커를 찾을 수 없는 경우
+        """
+        if name in self._regions:
+            return self._regions[name]
+
+        spec = self.spec.get('regions', {}).get(name)
+        if spec is None:
+            raise KeyError(f"스펙에 없는 영역입니다: {name}")
+        block = self._block(spec['sheet'])
+
+        anchor_value = None
+        if 'range' in spec:
+            left, top, right, bottom = range_boundaries(spec['range'])
+        else:
+            anchor = spec['anchor']
+            min_col, min_row, max_col, max_row = range_boundaries(anchor['within'])
+            found = next(
+                ((row, col) for row in range(min_row, max_row + 1) for col in range(min_col, max_col + 1)
+                 if _matches(_cell(block, row, col), anchor)),
+                None
+            )
+            if found is None:
+                text = anchor.get('equals', anchor.get('contains'))
+                raise ValueError(f"앵커를 찾을 수 없습니다: {name} ('{text}', {anchor['within']})")
+
+            anchor_value = _cell(block, *found)
+            row_offset, col_offset = spec.get('offset', [0, 0])
+            top, left = found[0] + row_offset, found[1] + col_offset
+            bottom, right = top + spec['size'][0] - 1, left + spec['size'][1] - 1
+
+        values = [[_cell(block, row, col) for col in range(left, right + 1)] for row in range(top, bottom + 1)]
+        region = Region(name, top, left, anchor_value, values)
+        self._regions[name] = region
+        return region
+
+    def _columns(self, name: str, header_values: Optional[Tuple]) -> Dict[str, int]:
+        """레코드 필드 → 열 번호 (열 문자 또는 헤더 이름)"""
+        columns = {}
+        for field, column in self.spec['records'][name]['columns'].items():
+            if isinstance(column, dict):
+                try:
+                    columns[field] = list(header_values).index(column['header']) + 1
+                except ValueError:
+                    raise ValueError(f"헤더에서 열을 찾을 수 없습니다: {name}.{field} ('{column['header']}')") from None
+            else:
+                columns[field] = column_index_from_string(column)
+        return columns
+
+    def records(self, name: str) -> Iterator[Tuple[int, Dict[str, Any], Tuple]]:
+        """
+        데이터 행 스트리밍 (헤더 탐색과 데이터 행을 한 번의 순회로)
+
+        Yields:
+            (행 번호, {필드: 값}, 행 전체 값)
+
+        Raises:
+            KeyError: 스펙에 없는 레코드
+            ValueError: 헤더 또는 헤더 이름 열을 찾을 수 없는 경우
+        """
+        spec = self.spec.get('records', {}).get(name)
+        if spec is None:
+            raise KeyError(f"스펙에 없는 레코드입니다: {name}")
+        sheet = self.sheets[spec['sheet']]
+
+        if 'start_row' in spec:
+            columns = self._columns(name, None)
+            rows = enumerate(sheet.iter_rows(min_row=spec['start_row'], values_only=True), start=spec['start_row'])
+        else:
+            header = spec['header']
+            min_col, min_row, max_col, max_row = range_boundaries(header['within'])
+            columns = None
+            rows = enumerate(sheet.iter_rows(values_only=True), start=1)
+
+            for row_idx, row in rows:
+                if row_idx > max_row:
+                    break
+                if row_idx < min_row:
+                    continue
+                if _is_header(row, header['labels'], min_col, max_col):
+                    columns = self._columns(name, row)
+                    break
+
+            if columns is None:
+                raise ValueError(f"{sheet.title} 헤더를 찾을 수 없습니다")
+
+        for row_idx, row in rows:
+            yield row_idx, {field: row[col - 1] if col <= len(row) else None for field, col in columns.items()}, row
+
+    def header_row(self, name: str) -> Optional[int]:
+        """레코드 헤더 행 번호 (헤더 탐색 범위만 읽음, start_row 지정이거나 못 찾으면 None)"""
+        spec = self.spec['records'][name]
+        if 'header' not in spec:
+            return None
+        min_col, min_row, max_col, max_row = range_boundaries(spec['header']['within'])
+        rows = self.sheets[spec['sheet']].iter_rows(max_row=max_row, values_only=True)
+        for row_idx, row in enumerate(rows, start=1):
+            if row_idx >= min_row and _is_header(row, spec['header']['labels'], min_col, max_col):
+                return row_idx
+        return None
+
+
+def main():
+    """워크북에서 스펙이 가리키는 위치와 표본 값 출력"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="시트 스펙 위치 확인")
+    parser.add_argument("workbook", help="엑셀 파일 경로")
+    parser.add_argument("spec", help="캐피탈 ID 또는 스펙 JSON 경로")
+    parser.add_argument("--sample", type=int, default=5, help="레코드 표본 행 수")
+    args = parser.parse_args()
+
+    reader = SheetReader(args.workbook, args.spec)
+    try:
+        print("=" * 80)
+        print(f"시트 스펙: {reader.spec.get('capital_id', args.spec)}")
+        print("=" * 80)
+        for alias, sheet in reader.sheets.items():
+            print(f"  시트 {alias:<16}→ {sheet.title}")
+
+        for name in reader.spec.get('regions', {}):
+            region = reader.region(name)
+            anchor = f" (앵커: {region.anchor})" if region.anchor is not None else ""
+            print(f"\n[영역] {name}: {region.ref}{anchor}")
+            for values in region.values[:3]:
+                print("    " + ", ".join("" if v is None else str(v) for v in values[:12]))
+
+        for name, spec in reader.spec.get('records', {}).items():
+            header_row = reader.header_row(name)
+            start = f"헤더 {header_row}행" if header_row else f"{spec['start_row']}행부터"
+            print(f"\n[레코드] {name}: {start}")
+            for idx, (row_idx, fields, _) in enumerate(reader.records(name)):
+                if idx >= args.sample:
+                    break
+                print(f"    {row_idx:>6}: {fields}")
+    finally:
+        reader.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+excel_reverse_engineering/synthetic_workbooks.py
+추출기 벤치마크/테스트용 합성 워크북 생성
+
+실제 캐피탈 엑셀과 같은 시트 이름과 좌표를 쓴다 (값은 임의).
+- 메리츠: '차종' 시트 7행부터 차량, '잔가' 시트 36~39행 주행거리 조정, 48~77행 등급 테이블
+- MG: '차량DB' 시트 헤더(3행) 다음부터 차량, '잔가map' 시트 SNK/APS 등급 테이블
+- MG 견적: '운용리스' 시트에 tools/mg_validator.py 가 읽는 좌표의 수식 (formula_engine 테스트용)
+- MG 저장 견적: 같은 좌표에 계산 값만 저장한 견적서 (parity_runner 테스트용)
+"""
+
+import random
+from pathlib import Path
+from typing import Any, Dict, List, Union
+
+import openpyxl
+
+MERITZ_GRADES = ['SA1', 'SA', 'A1', 'A', 'B', 'C', 'D', 'E', 'F', 'G', 'H',
+                 'I', 'J', 'K', 'L', 'M', 'N', 'O', 'P', 'Q', 'R', 'S']
+MG_GRADES = [chr(ord('A') + i) for i in range(20)]
+MERITZ_MILEAGE_ADJUSTMENTS = {10000: 0.01, 15000: 0.0, 20000: -0.02, 30000: -0.06}
+PERIODS = [12, 24, 36, 48, 60]
+
+_BRANDS = ['현대', '기아', '제네시스', 'BMW', 'BENZ', 'AUDI', 'VOLVO', 'LEXUS']
+
+
+def _rate(period: int, grade_idx: int) -> float:
+    """기간/등급별 잔가율 (기간·등급이 낮을수록 높음)"""
+    return round(0.9 - period * 0.006 - grade_idx * 0.012, 4)
+
+
+def _empty_rows(ws, count: int) -> None:
+    for _ in range(count):
+        ws.append([])
+
+
+def _append_grade_table(ws, grades: List[str], periods: List[int], first_col: int) -> None:
+    """등급 헤더 1행 + 기간별 데이터 행 (first_col: 기간 컬럼, 그 다음 컬럼부터 등급)"""
+    pad = [None] * (first_col - 1)
+    ws.append(pad + ['기간'] + grades)
+    for period in periods:
+        ws.append(pad + [period] + [_rate(period, idx) for idx in range(len(grades))])
+
+
+def write_meritz_workbook(path: Union[str, Path], rows: int, seed: int = 0) -> Path:
+    """
+    메리츠 형식 합성 워크북 저장
+
+    Args:
+        path: 저장 경로 (.xlsx)
+        rows: 차량 행 수
+        seed: 난수 시드
+
+    Returns:
+        Path: 저장 경로
+    """
+    rng = random.Random(seed)
+    wb = openpyxl.Workbook(write_only=True)
+
+    vehicles = wb.create_sheet('차종')
+    _empty_rows(vehicles, 5)
+    vehicles.append([None, 'Maker', 'Model1', 'Model2', 'Model3', '차량가격', '배기량', '유종',
+                     None, '웨스트', '오토준', 'APS', 'VGS', None, None, '고잔가추가', '고잔가추가1'])
+    for idx in range(rows):
+        vehicles.append([
+            idx + 1,
+            rng.choice(_BRANDS),
+            f"MODEL{idx % 97}",
+            None,
+            f"TRIM {idx}",
+            rng.randrange(20_000_000, 150_000_000, 10_000),
+            rng.choice([0, 1598, 1998, 2998]),
+            rng.choice(['휘발유', '경유', '전기']),
+            None,
+            rng.choice(MERITZ_GRADES[:11]),
+            rng.choice(MERITZ_GRADES),
+            rng.choice(MERITZ_GRADES),
+            rng.choice(MERITZ_GRADES[:10]),
+            None,
+            None,
+            rng.choice([None, 0.01, 0.02]),
+            rng.choice([None, 0.01]),
+        ])
+
+    residual = wb.create_sheet('잔가')
+    _empty_rows(residual, 35)
+    for mileage, adjustment in MERITZ_MILEAGE_ADJUSTMENTS.items():  # 36~39행
+        residual.append([None] * 8 + [mileage, adjustment])
+    _empty_rows(residual, 8)                                        # 40~47행
+    _append_grade_table(residual, MERITZ_GRADES[:11], PERIODS, 2)   # West 48~53행
+    _empty_rows(residual, 3)
+    _append_grade_table(residual, MERITZ_GRADES[:21], PERIODS, 2)   # AJ 57~62행
+    _empty_rows(residual, 2)
+    _append_grade_table(residual, MERITZ_GRADES, PERIODS, 2)        # APS 65~70행
+    _empty_rows(residual, 2)
+    _append_grade_table(residual, MERITZ_GRADES[:10], PERIODS[:4], 2)  # VGS 73~77행
+
+    path = Path(path)
+    wb.save(path)
+    return path
+
+
+def write_mg_workbook(path: Union[str, Path], rows: int, seed: int = 0) -> Path:
+    """
+    MG 형식 합성 워크북 저장
+
+    Args:
+        path: 저장 경로 (.xlsx)
+        rows: 차량 행 수
+        seed: 난수 시드
+
+    Returns:
+        Path: 저장 경로
+    """
+    rng = random.Random(seed)
+    wb = openpyxl.Workbook(write_only=True)
+
+    vehicles = wb.create_sheet('차량DB')
+    _empty_rows(vehicles, 2)
+    vehicles.append([None, None, None, 'NO', 'BRAND', 'MODEL', '배기량', '차종', '차량가',
+                     None, None, None, None, None, None, '고잔가', None, None, '등급'])
+    for idx in range(rows):
+        vehicles.append([
+            None, None, None, idx + 1,
+            rng.choice(_BRANDS),
+            f"MODEL{idx % 97} TRIM {idx}",
+            rng.choice([0, 1598, 1998, 2998]),
+            rng.choice(['승용', '승용SUV(7~10인)']),
+            rng.randrange(20_000_000, 150_000_000, 10_000),
+            None, None, None, None, None, None,
+            rng.choice(['Y', 'N']),
+            None, None,
+            rng.choice(MG_GRADES + [None]),
+        ])
+
+    grade_map = wb.create_sheet('잔가map')
+    grade_map.append(['■ 에스앤케이모터스'])                     # 1행
+    _append_grade_table(grade_map, MG_GRADES, PERIODS, 2)      # 2~7행
+    _empty_rows(grade_map, 4)
+    grade_map.append(['■ APS'])                                # 12행
+    _append_grade_table(grade_map, MG_GRADES, PERIODS, 2)      # 13~18행
+
+    path = Path(path)
+    wb.save(path)
+    return path
+
+
+# MG 견적 시트 주행거리별 잔가 조정 (AL30:AM33)
+MG_QUOTE_MILEAGE_ADJUSTMENTS = {10000: 0.02, 15000: 0.01, 20000: 0.0, 30000: -0.03}
+
+
+def write_mg_quote_workbook(
+    path: Union[str, Path],
+    vehicle_price: int = 115_500_000,
+    contract_months: int = 60,
+    annual_mileage: int = 20000,
+    grade: str = 'A'
+) -> Path:
+    """
+    MG 견적 시트 합성 워크북 저장 (값 대신 수식)
+
+    '운용리스' 시트 좌표는 tools/mg_validator.py 와 같다.
+    - K14 차량가, K15 취득세, K19 취득원가, AG9 기간, AG10 등급, AG15 주행거리
+    - AG16 잔존율 (잔가map INDEX/MATCH + 주행거리 VLOOKUP), AJ16 잔존가치
+    - BD37 금리 (기간별 IF), AG14 월 납입금 (PMT, 백원 단위 내림)
+    openpyxl 은 수식을 계산하지 않으므로 저장된 계산 값은 없다.
+
+    Args:
+        path: 저장 경로 (.xlsx)
+        vehicle_price: 차량가
+        contract_months: 계약 기간
+        annual_mileage: 연간 주행거리
+        grade: 잔가 등급 (MG_GRADES)
+
+    Returns:
+        Path: 저장 경로
+    """
+    wb = openpyxl.Workbook()
+    quote = wb.active
+    quote.title = '운용리스'
+
+    quote['D8'] = 'BMW X5 30d xLine'
+    quote['D9'] = '=D8&" "&AG9&"개월"'
+    quote['K14'] = vehicle_price
+    quote['K15'] = '=ROUNDDOWN(K14/1.1*0.07,-1)'
+    quote['K16'] = 0
+    quote['K17'] = 0
+    quote['K19'] = '=SUM(K14:K17)'
+
+    quote['AG9'] = contract_months
+    quote['AG10'] = grade
+    quote['AG11'] = 0
+    quote['AG15'] = annual_mileage
+    quote['AG16'] = ("=ROUND(INDEX(잔가map!$C$3:$V$7,MATCH(AG9,잔가map!$B$3:$B$7,0),"
+                     "MATCH(AG10,잔가map!$C$2:$V$2,0))+VLOOKUP(AG15,$AL$30:$AM$33,2,TRUE),4)")
+    quote['AG17'] = 0
+    quote['AG18'] = 0
+    quote['AJ16'] = '=ROUNDDOWN(K14*AG16,0)'
+    quote['BD37'] = '=IF(AG9<=36,0.0495,0.0515)'
+    quote['AG14'] = '=ROUNDDOWN(-PMT(BD37/12,AG9,K19-AG11-AG17-AG18,-AJ16),-2)'
+
+    for offset, (mileage, adjustment) in enumerate(MG_QUOTE_MILEAGE_ADJUSTMENTS.items()):
+        quote.cell(30 + offset, 38).value = mileage      # AL
+        quote.cell(30 + offset, 39).value = adjustment   # AM
+
+    grade_map = wb.create_sheet('잔가map')
+    grade_map.append(['■ 에스앤케이모터스'])                     # 1행
+    _append_grade_table(grade_map, MG_GRADES, PERIODS, 2)      # 2~7행 (B열 기간, C~V열 등급)
+
+    path = Path(path)
+    wb.save(path)
+    return path
+
+
+def write_mg_saved_quote(path: Union[str, Path], cells: Dict[str, Any], vehicle_rows: int = 0) -> Path:
+    """
+    엑셀에서 계산 후 저장한 MG 견적서 흉내 (수식 없이 '운용리스' 시트에 값만)
+
+    data_only=True 로 읽으면 저장된 계산 값이 보이는 것과 같다 (tools/parity_runner.py 테스트용).
+
+    Args:
+        path: 저장 경로 (.xlsx)
+        cells: {셀 주소: 값} (예: {'K14': 115500000, 'AG14': 1413100})
+        vehicle_rows: 함께 넣을 '차량DB' 시트 행 수 (실제 파일 크기 흉내, 0이면 생략)
+
+    Returns:
+        Path: 저장 경로
+    """
+    wb = openpyxl.Workbook()
+    quote = wb.active
+    quote.title = '운용리스'
+    for address, value in cells.items():
+        quote[address] = value
+
+    if vehicle_rows:
+        rng = random.Random(vehicle_rows)
+        vehicles = wb.create_sheet('차량DB')
+        for idx in range(vehicle_rows):
+            vehicles.append([None, None, None, idx + 1, rng.choice(_BRANDS), f"MODEL{idx % 97}",
+                             None, None, rng.randrange(20_000_000, 150_000_000, 10_000)])
+
+    path = Path(path)
+    wb.save(path)
+    return path
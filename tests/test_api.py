@@ -0,0 +1,155 @@
+"""
+tests/test_api.py
+HTTP 견적 서비스 테스트 (로컬 서버를 임의 포트로 실행)
+"""
+
+import sys
+import json
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.server import BackgroundServer
+from core.quote import quote_for_capital
+from data import vehicle_master
+
+VEHICLE_ID = "AUDI_A3_A3_40_TFSI"
+
+
+def _call(url, path, payload=None):
+    """(상태 코드, JSON 응답)"""
+    data = json.dumps(payload).encode("utf-8") if payload is not None else None
+    request = urllib.request.Request(url + path, data=data, method="POST" if data else "GET")
+    try:
+        with urllib.request.urlopen(request, timeout=10) as response:
+            return response.status, json.loads(response.read())
+    except urllib.error.HTTPError as e:
+        return e.code, json.loads(e.read())
+
+
+def test_api_endpoints():
+    """health/quote/compare/grid 정상 응답 + 스칼라 계산과 일치"""
+    print("=" * 80)
+    print("HTTP 견적 서비스 테스트")
+    print("=" * 80)
+
+    with BackgroundServer(executor="thread", workers=2) as server:
+        status, health = _call(server.url, "/health")
+        assert status == 200 and health['status'] == 'ok'
+
+        status, quote = _call(server.url, "/quote", {
+            'capital_id': 'meritz_capital', 'vehicle_id': VEHICLE_ID,
+            'contract_months': 36, 'annual_mileage': 20000
+        })
+        assert status == 200
+        vehicle = {**vehicle_master.get_vehicle(VEHICLE_ID), 'id': VEHICLE_ID}
+        expected = quote_for_capital('meritz_capital', vehicle, vehicle['price'], 36, 20000)
+        assert quote['monthly_payment'] == expected['monthly_payment']
+        print(f"✓ /quote: {quote['monthly_payment']:,.0f}원")
+
+        # 쿼리스트링도 지원
+        status, by_query = _call(
+            server.url,
+            f"/quote?capital_id=meritz_capital&vehicle_id={VEHICLE_ID}&contract_months=36&annual_mileage=20000"
+        )
+        assert status == 200 and by_query['monthly_payment'] == quote['monthly_payment']
+
+        status, compare = _call(server.url, "/compare", {
+            'vehicle_id': VEHICLE_ID, 'contract_months': 36, 'annual_mileage': 20000
+        })
+        assert status == 200
+        assert {r['capital_id'] for r in compare['results']} >= {'meritz_capital', 'mg_capital'}
+        print(f"✓ /compare: {len(compare['results'])}개 캐피탈")
+
+        status, grid = _call(server.url, "/grid", {
+            'capital_id': 'meritz_capital', 'vehicle_id': VEHICLE_ID
+        })
+        assert status == 200
+        t, m = grid['terms'].index(36), grid['mileages'].index(20000)
+        g = grid['grade_options'].index(quote['grade_option'])
+        assert grid['monthly_payment'][t][m][g] == quote['monthly_payment']
+        print(f"✓ /grid: {len(grid['terms'])}×{len(grid['mileages'])}×{len(grid['grade_options'])}")
+
+        status, deals = _call(server.url, "/deals?max_monthly_payment=700000&top_k=5&terms=36,48")
+        assert status == 200 and len(deals['results']) == 5
+        assert all(d['monthly_payment'] <= 700000 and d['contract_months'] in (36, 48) for d in deals['results'])
+        print(f"✓ /deals: {deals['stats']['matches']}건 중 상위 5건")
+
+        status, stats = _call(server.url, "/stats")
+        assert status == 200 and set(stats['capitals']) >= {'meritz_capital', 'mg_capital'}
+
+        status, health = _call(server.url, "/health")
+        assert health['requests']['/quote'] == 2
+
+
+def test_api_errors():
+    """잘못된 입력/없는 캐피탈 400, 없는 경로 404"""
+    with BackgroundServer(executor="thread", workers=1) as server:
+        status, body = _call(server.url, "/quote", {'capital_id': 'meritz_capital', 'vehicle_id': VEHICLE_ID})
+        assert status == 400 and 'contract_months' in body['error']
+
+        status, body = _call(server.url, "/quote", {
+            'capital_id': 'meritz_capital', 'vehicle_id': 'NO_SUCH_CAR',
+            'contract_months': 36, 'annual_mileage': 20000
+        })
+        assert status == 400
+
+        status, body = _call(server.url, "/quote", {
+            'capital_id': 'meritz_capital', 'vehicle_id': VEHICLE_ID,
+            'contract_months': 30, 'annual_mileage': 20000
+        })
+        assert status == 400 and '계약 기간' in body['error']
+
+        # 데이터 파일이 없는 캐피탈은 500이 아니라 400
+        status, body = _call(server.url, "/quote", {
+            'capital_id': 'no_such_capital', 'vehicle_id': VEHICLE_ID,
+            'contract_months': 36, 'annual_mileage': 20000
+        })
+        assert status == 400 and 'no_such_capital' in body['error']
+        status, body = _call(server.url, "/deals?max_monthly_payment=700000&capital_ids=no_such_capital")
+        assert status == 400
+
+        # NaN/Infinity 는 숫자로 받지 않음 (응답 JSON 에 NaN 이 섞이지 않도록)
+        for value in ("nan", "inf"):
+            status, body = _call(
+                server.url,
+                f"/quote?capital_id=meritz_capital&vehicle_id={VEHICLE_ID}&contract_months=36"
+                f"&annual_mileage=20000&down_payment_percent={value}"
+            )
+            assert status == 400 and 'down_payment_percent' in body['error']
+
+        # /compare, /grid 도 /quote 와 같은 입력 검증
+        status, body = _call(server.url, "/compare", {
+            'vehicle_id': VEHICLE_ID, 'contract_months': 36, 'annual_mileage': 20000,
+            'down_payment_percent': -500
+        })
+        assert status == 400 and '선납금' in body['error']
+        status, body = _call(server.url, "/grid", {
+            'capital_id': 'meritz_capital', 'vehicle_id': VEHICLE_ID, 'down_payment_percent': -300
+        })
+        assert status == 400 and '선납금' in body['error']
+
+        # 가격 정보가 없는 차량은 계산 전에 400 (vehicle_price 를 주면 계산)
+        for path, extra in (("/quote", {'contract_months': 36, 'annual_mileage': 20000}), ("/grid", {})):
+            payload = {'capital_id': 'mg_capital', 'vehicle_id': 'TESLA_MODEL_X_EV_AWD_LONG_RANGE', **extra}
+            status, body = _call(server.url, path, payload)
+            assert status == 400 and '가격' in body['error'], (path, status, body)
+        status, grid = _call(server.url, "/grid", {**payload, 'vehicle_price': 120_000_000})
+        assert status == 200 and grid['vehicle_price'] == 120_000_000
+
+        status, _ = _call(server.url, "/nope")
+        assert status == 404
+
+
+def main():
+    """메인 테스트 실행"""
+    test_api_endpoints()
+    test_api_errors()
+    print("\n✅ 모든 API 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,146 @@
+"""
+tests/test_artifact_format.py
+추출 산출물 아티팩트 형식 테스트 (JSON 과 같은 왕복, 결정적 기록, 체크섬/스키마 버전 검증, JSON 대체 읽기)
+"""
+
+import io
+import json
+import sys
+import tempfile
+import zipfile
+from pathlib import Path
+
+import numpy as np
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from data import artifact_format
+from data.artifact_format import (KIND_RESIDUAL_RATES, KIND_VEHICLE_MASTER, load_data, read_artifact,
+                                  read_header, write_artifact)
+
+DATA_DIR = Path(__file__).parent.parent / "data"
+
+SAMPLE = {
+    'BMW_X5': {'36': {'10000': 0.55, '20000': 0.5}, '48': {'10000': 0.45, '20000': None}},
+    'KIA_EV6': {'36': {'10000': 0.6, '20000': 0.55}, '48': {'10000': 0.5, '20000': 0.45}},
+    'SOLO': 1,
+    'FLAGS': {'a': True, 'b': 1.0, 'c': 1, 'd': '1', 'e': {}},
+}
+
+
+def test_round_trip_matches_json():
+    """읽은 결과가 JSON 왕복과 같음 (키 순서, int 키 → str, 1/1.0/True 구분)"""
+    print("=" * 80)
+    print("아티팩트 형식 테스트")
+    print("=" * 80)
+
+    data = dict(SAMPLE, INT_KEYS={36: {10000: 0.5}})
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "sample.npz"
+        write_artifact(path, data, KIND_RESIDUAL_RATES)
+        loaded = read_artifact(path, KIND_RESIDUAL_RATES)
+
+        expected = json.loads(json.dumps(data))
+        assert json.dumps(loaded) == json.dumps(expected)
+        assert [type(v) for v in loaded['FLAGS'].values()] == [bool, float, int, str, dict]
+
+        header = read_header(path)
+        assert header['records'] == len(data) and header['shapes'] == 4, "BMW_X5/KIA_EV6 는 같은 구조"
+
+        # 같은 데이터 → 같은 바이트 (증분 추출의 '변경 없음' 판단과 파일 비교에 사용)
+        again = Path(tmp) / "again.npz"
+        write_artifact(again, data, KIND_RESIDUAL_RATES)
+        assert path.read_bytes() == again.read_bytes()
+    print("✓ JSON 과 같은 왕복, 결정적 기록")
+
+
+def test_shipped_artifacts_match_json_exports():
+    """저장소의 아티팩트 = 함께 둔 JSON 내보내기"""
+    for name in ("vehicle_master", "mg_vehicle_master", "residual_rates/meritz_capital", "residual_rates/mg_capital"):
+        artifact = DATA_DIR / f"{name}.npz"
+        export = DATA_DIR / f"{name}.json"
+        data = read_artifact(artifact)
+        assert data == json.loads(export.read_text(encoding='utf-8')), name
+        print(f"✓ {name}: {export.stat().st_size:,} → {artifact.stat().st_size:,} bytes ({len(data)}건)")
+
+
+def test_integrity_checks():
+    """체크섬 불일치, 스키마 버전/종류 불일치는 ValueError"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "vehicles.npz"
+        write_artifact(path, SAMPLE, KIND_VEHICLE_MASTER)
+
+        try:
+            read_artifact(path, KIND_RESIDUAL_RATES)
+            assert False, "종류 불일치는 ValueError"
+        except ValueError as e:
+            assert "종류" in str(e)
+
+        # 값 번호 배열을 다른 값으로 바꿔 기록 (헤더 체크섬은 그대로)
+        tables, record_shape, leaf_value = artifact_format.encode(SAMPLE)
+        leaf_value[0] = leaf_value[1]
+        tampered = Path(tmp) / "tampered.npz"
+        with zipfile.ZipFile(path) as src, zipfile.ZipFile(tampered, 'w') as dst:
+            for item in src.infolist():
+                payload = src.read(item)
+                if item.filename == 'leaf_value.npy':
+                    buffer = io.BytesIO()
+                    np.lib.format.write_array(buffer, leaf_value)
+                    payload = buffer.getvalue()
+                dst.writestr(item, payload)
+        try:
+            read_artifact(tampered)
+            assert False, "체크섬 불일치는 ValueError"
+        except ValueError as e:
+            assert "체크섬" in str(e)
+
+        original = artifact_format.ARTIFACT_SCHEMA_VERSION
+        artifact_format.ARTIFACT_SCHEMA_VERSION = original + 1
+        try:
+            read_artifact(path)
+            assert False, "스키마 버전 불일치는 ValueError"
+        except ValueError as e:
+            assert "스키마 버전" in str(e)
+        finally:
+            artifact_format.ARTIFACT_SCHEMA_VERSION = original
+
+        (Path(tmp) / "plain.npz").write_bytes(b"not a zip")
+        try:
+            read_artifact(Path(tmp) / "plain.npz")
+            assert False, "아티팩트가 아니면 ValueError"
+        except ValueError:
+            pass
+    print("✓ 체크섬/스키마 버전/종류/형식 검증")
+
+
+def test_load_data_prefers_artifact():
+    """아티팩트가 있으면 아티팩트, 없으면 JSON, 둘 다 없으면 FileNotFoundError"""
+    with tempfile.TemporaryDirectory() as tmp:
+        base = Path(tmp) / "vehicle_master.json"
+        base.write_text(json.dumps({'OLD': {'price': 1}}), encoding='utf-8')
+        assert load_data(base) == {'OLD': {'price': 1}}
+
+        write_artifact(base.with_suffix(".npz"), {'NEW': {'price': 2}}, KIND_VEHICLE_MASTER)
+        assert load_data(base) == {'NEW': {'price': 2}}
+        assert load_data(base.with_suffix(".npz"), KIND_VEHICLE_MASTER) == {'NEW': {'price': 2}}
+
+        try:
+            load_data(Path(tmp) / "missing.npz")
+            assert False, "파일 없음은 FileNotFoundError"
+        except FileNotFoundError:
+            pass
+    print("✓ 아티팩트 우선, JSON 대체 읽기")
+
+
+def main():
+    """메인 테스트 실행"""
+    test_round_trip_matches_json()
+    test_shipped_artifacts_match_json_exports()
+    test_integrity_checks()
+    test_load_data_prefers_artifact()
+    print("\n✅ 모든 아티팩트 형식 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+tests/test_batch_quote.py
+배치 견적 엔진 테스트 (스트리밍, 병렬, 체크포인트 이어쓰기)
+"""
+
+import sys
+import csv
+import tempfile
+from pathlib import Path
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.batch_quote import run_batch, checkpoint_path
+from core.quote import quote_for_capital
+from data import vehicle_master
+
+TERMS = [24, 36, 48, 60]
+MILEAGES = [10000, 15000, 20000, 30000]
+
+
+def _write_input(path: Path, n_rows: int) -> None:
+    """메리츠/MG 혼합 입력 (일부는 일부러 잘못된 행)"""
+    with open(path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(['capital_id', 'vehicle_id', 'contract_months', 'annual_mileage', 'down_payment_percent'])
+        for i in range(n_rows):
+            if i % 10 == 9:
+                writer.writerow(['meritz_capital', 'NO_SUCH_CAR', 36, 20000, 0])
+            elif i % 2:
+                writer.writerow(['mg_capital', 'AUDI_A3_40_TFSI', TERMS[i % 4], MILEAGES[i % 4], 10])
+            else:
+                writer.writerow(['meritz_capital', 'AUDI_A3_A3_40_TFSI', TERMS[i % 4], MILEAGES[(i // 4) % 4], 0])
+
+
+def _read_output(path: Path):
+    with open(path, 'r', encoding='utf-8', newline='') as f:
+        return list(csv.DictReader(f))
+
+
+def test_batch_matches_single_quotes():
+    """배치 결과 = 단일 견적 (순차/병렬 모두 입력 순서 유지)"""
+    print("=" * 80)
+    print("배치 견적 테스트")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        _write_input(tmp / "in.csv", 60)
+
+        sequential = run_batch(tmp / "in.csv", tmp / "seq.csv", chunk_size=7, workers=1)
+        parallel = run_batch(tmp / "in.csv", tmp / "par.csv", chunk_size=7, workers=2)
+
+        assert sequential['rows'] == parallel['rows'] == 60
+        assert sequential['errors'] == 6 and sequential['completed']
+        assert _read_output(tmp / "seq.csv") == _read_output(tmp / "par.csv")
+
+        for row in _read_output(tmp / "seq.csv"):
+            if row['error']:
+                assert 'NO_SUCH_CAR' in row['error']
+                continue
+            vehicle = {**vehicle_master.get_vehicle(row['vehicle_id'], capital_id=row['capital_id']),
+                       'id': row['vehicle_id']}
+            expected = quote_for_capital(
+                row['capital_id'], vehicle, vehicle['price'],
+                int(row['contract_months']), int(row['annual_mileage']),
+                down_payment_percent=float(row['down_payment_percent'])
+            )
+            assert float(row['monthly_payment']) == expected['monthly_payment']
+
+        print(f"✓ {sequential['rows']}행, 오류 {sequential['errors']}행 - 순차/병렬 결과 일치")
+
+
+def test_batch_resume_from_checkpoint():
+    """중간에 멈춘 작업을 이어서 실행하면 한 번에 실행한 결과와 동일"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        _write_input(tmp / "in.csv", 45)
+
+        run_batch(tmp / "in.csv", tmp / "full.csv", chunk_size=10, workers=1)
+
+        first = run_batch(tmp / "in.csv", tmp / "resumed.csv", chunk_size=10, workers=1, max_chunks=2)
+        assert first['rows'] == 20 and not first['completed']
+        assert checkpoint_path(tmp / "resumed.csv").exists()
+
+        second = run_batch(tmp / "in.csv", tmp / "resumed.csv", chunk_size=10, workers=1, resume=True)
+        assert second['skipped_rows'] == 20 and second['rows'] == 25 and second['completed']
+        assert not checkpoint_path(tmp / "resumed.csv").exists()
+
+        assert _read_output(tmp / "resumed.csv") == _read_output(tmp / "full.csv")
+        print("✓ 체크포인트 이어쓰기 결과 일치")
+
+
+def main():
+    """메인 테스트 실행"""
+    test_batch_matches_single_quotes()
+    test_batch_resume_from_checkpoint()
+    print("\n✅ 모든 배치 견적 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
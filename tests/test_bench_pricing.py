@@ -0,0 +1,98 @@
+"""
+tests/test_bench_pricing.py
+견적 계산 벤치마크 테스트 (측정 결과 형식, 기준선 비교: 회귀/개선/신규, 기계 속도 drift 보정)
+"""
+
+import json
+import sys
+from pathlib import Path
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.bench_pricing import DEFAULT_BASELINE, build_benchmarks, compare_to_baseline, run_benchmarks
+
+
+def _report(times):
+    return {'environment': {'python': '3.11.7', 'machine': 'x86_64', 'cpu_count': 4},
+            'benchmarks': {name: {'min_us': value} for name, value in times.items()}}
+
+
+def test_run_benchmarks_report():
+    """선택 항목 측정 → 환경 정보 + 항목별 최소/중앙값/p95"""
+    print("=" * 80)
+    print("견적 계산 벤치마크 테스트")
+    print("=" * 80)
+
+    names = [bench.name for bench in build_benchmarks()]
+    for required in ("calculator.simple", "mg_calculator.calculate", "calculator.calculate_irr",
+                     "lookup.get_price_from_master", "lookup.find_vehicle_by_name", "lookup.search_vehicles",
+                     "load.vehicle_master.cold", "load.vehicle_master.warm", "compare_all.uncached"):
+        assert required in names, required
+    assert any(name.startswith("load.residual_rates.") for name in names)
+
+    report = run_benchmarks(["calculator.", "load.mg_vehicle_master"], repeat=3, min_time=0.001)
+    assert set(report['benchmarks']) == {"calculator.simple", "calculator.annuity", "calculator.calculate_irr",
+                                         "mg_calculator.calculate",
+                                         "load.mg_vehicle_master.cold", "load.mg_vehicle_master.warm"}
+    cold = report['benchmarks']['load.mg_vehicle_master.cold']
+    assert cold['cold'] and cold['loops'] == 1 and cold['repeat'] == 3
+    for result in report['benchmarks'].values():
+        assert 0 < result['min_us'] <= result['median_us'] <= result['p95_us']
+    assert report['environment']['python'] and report['environment']['data_version']
+    json.dumps(report)
+
+    try:
+        run_benchmarks(["없는 항목"])
+        assert False, "선택된 항목이 없으면 ValueError"
+    except ValueError:
+        pass
+    print(f"✓ {len(report['benchmarks'])}개 항목 측정 (전체 {len(names)}개)")
+
+
+def test_compare_to_baseline():
+    """기준선 대비 회귀/개선/신규 판정, 전체가 함께 느려진 만큼은 drift 로 보정"""
+    baseline = _report({f"item{i}": 100.0 for i in range(6)})
+
+    # 전체 2배 (기계가 느려짐) + item0 만 추가로 2배 → item0 만 회귀
+    current = _report({f"item{i}": 200.0 for i in range(6)})
+    current['benchmarks']['item0']['min_us'] = 400.0
+    current['benchmarks']['item5']['min_us'] = 90.0
+    current['benchmarks']['new_item'] = {'min_us': 1.0}
+    result = compare_to_baseline(current, baseline, threshold=0.5)
+    assert result['machine_drift'] == 2.0
+    assert result['regressions'] == ["item0"]
+    assert result['items']['item0']['raw_ratio'] == 4.0 and result['items']['item0']['ratio'] == 2.0
+    assert result['items']['item5']['status'] == 'improved'
+    assert result['items']['new_item']['status'] == 'new'
+    assert result['environment_mismatch'] == []
+
+    # 비교 항목이 적으면 drift 보정 없음
+    few = compare_to_baseline(_report({'item0': 200.0}), baseline, threshold=0.5)
+    assert few['machine_drift'] == 1.0 and few['regressions'] == ['item0']
+
+    other = _report({'item0': 100.0})
+    other['environment']['cpu_count'] = 8
+    assert compare_to_baseline(other, baseline)['environment_mismatch'] == ['cpu_count']
+    print("✓ 회귀/개선/신규 판정, drift 보정, 환경 차이 경고")
+
+
+def test_stored_baseline_covers_benchmarks():
+    """저장된 기준선이 모든 항목과 환경 정보를 포함"""
+    baseline = json.loads(DEFAULT_BASELINE.read_text(encoding='utf-8'))
+    names = {bench.name for bench in build_benchmarks()}
+    assert names <= set(baseline['benchmarks']), names - set(baseline['benchmarks'])
+    assert baseline['environment']['python'] and baseline['threshold'] > 0
+    print(f"✓ 기준선 {len(baseline['benchmarks'])}개 항목 (허용 +{baseline['threshold']:.0%})")
+
+
+def main():
+    """메인 테스트 실행"""
+    test_run_benchmarks_report()
+    test_compare_to_baseline()
+    test_stored_baseline_covers_benchmarks()
+    print("\n✅ 모든 벤치마크 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
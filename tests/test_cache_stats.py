@@ -0,0 +1,68 @@
+"""
+tests/test_cache_stats.py
+캐시 적중률/재실행 지연시간 계측 테스트 (적중 = 호출 - 미스, 백분위수)
+"""
+
+import sys
+from pathlib import Path
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.cache_stats import CacheStats, percentile
+
+
+def test_hit_rate_from_calls_and_misses():
+    """호출 4회 중 미스 1회 → 적중 3회 (75%), 호출 없는 미스는 적중률 0"""
+    print("=" * 80)
+    print("캐시 계측 테스트")
+    print("=" * 80)
+
+    stats = CacheStats()
+    for _ in range(4):
+        stats.record_call("compare")
+    stats.record_miss("compare")
+    stats.record_miss("brands")
+
+    caches = stats.snapshot()['caches']
+    assert caches['compare'] == {'calls': 4, 'hits': 3, 'misses': 1, 'hit_rate': 0.75}
+    assert caches['brands'] == {'calls': 0, 'hits': 0, 'misses': 1, 'hit_rate': 0.0}
+    assert list(caches) == ['brands', 'compare']
+
+    stats.reset()
+    assert stats.snapshot() == {'caches': {}, 'reruns': {}}
+    print("✓ 적중률: 호출 4, 미스 1 → 75%")
+
+
+def test_rerun_percentiles():
+    """재실행 시간 p50/p95 (최근접 순위), 최근 max_samples 개만 유지"""
+    assert percentile([], 0.5) == 0.0
+    assert percentile([1.0, 2.0, 3.0], 0.5) == 2.0
+
+    stats = CacheStats(max_samples=100)
+    for ms in range(1, 101):
+        stats.record_rerun(ms / 1000)
+    stats.record_rerun(0.5, label="uncached")
+
+    reruns = stats.snapshot()['reruns']
+    cached = reruns['cached']
+    assert cached['count'] == 100 and cached['last'] == 0.1
+    assert cached['p50'] == 0.051 and cached['p95'] == 0.095  # 순위 round(0.5 × 99) = 50
+    assert abs(cached['mean'] - 0.0505) < 1e-12
+    assert reruns['uncached'] == {'count': 1, 'last': 0.5, 'mean': 0.5, 'p50': 0.5, 'p95': 0.5}
+
+    stats.record_rerun(0.2)  # 가장 오래된 1ms 표본이 밀려남
+    cached = stats.snapshot()['reruns']['cached']
+    assert cached['count'] == 100 and cached['p50'] == 0.052
+    print(f"✓ 재실행 p50 {cached['p50'] * 1000:.0f}ms, p95 {cached['p95'] * 1000:.0f}ms")
+
+
+def main():
+    """메인 테스트 실행"""
+    test_hit_rate_from_calls_and_misses()
+    test_rerun_percentiles()
+    print("\n✅ 모든 캐시 계측 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
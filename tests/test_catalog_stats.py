@@ -0,0 +1,94 @@
+"""
+tests/test_catalog_stats.py
+카탈로그 통계 테스트 (기존 조회 함수와 같은 값, 1회 집계)
+"""
+
+import sys
+from pathlib import Path
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import catalog_stats
+from core.catalog_stats import get_capital_stats, get_catalog_stats, get_catalog_summary
+from data import vehicle_master, residual_rates
+
+
+def test_stats_match_lookup_functions():
+    """총계/브랜드별 차량 수/가격 범위 = 기존 조회 함수 결과"""
+    print("=" * 80)
+    print("카탈로그 통계 테스트")
+    print("=" * 80)
+
+    stats = get_catalog_stats()
+
+    assert stats['totals'] == {
+        'vehicles': len(vehicle_master.get_all_vehicle_ids()),
+        'capitals': len(residual_rates.get_available_capitals()),
+        'brands': len(vehicle_master.get_brands()),
+    }
+    assert list(stats['brands']) == vehicle_master.get_brands()
+
+    for brand in vehicle_master.get_brands():
+        listed = vehicle_master.get_vehicle_list(brand=brand)
+        prices = [v['price'] for v in listed if v['price']]
+        assert stats['brands'][brand]['vehicles'] == len(listed)
+        if prices:
+            assert stats['brands'][brand]['price']['min'] == min(prices)
+            assert stats['brands'][brand]['price']['max'] == max(prices)
+
+    for capital_id, capital in stats['capitals'].items():
+        assert capital['vehicles'] == len(vehicle_master.get_all_vehicle_ids(capital_id))
+        assert capital['residual_coverage']['vehicles'] <= capital['vehicles']
+        assert 0 < capital['residual_coverage']['ratio'] <= 1
+        assert capital['updated_at']['residual_rates'] is not None
+        print(f"✓ {capital_id}: {capital['vehicles']}대, 잔존율 보유 "
+              f"{capital['residual_coverage']['vehicles']}대 ({capital['residual_coverage']['ratio']:.0%})")
+
+
+def test_stats_computed_once_per_data_version():
+    """같은 데이터 버전에서는 같은 객체 반환"""
+    assert get_catalog_stats() is get_catalog_stats()
+    print(f"✓ 집계 {get_catalog_stats()['build_ms']:.1f}ms (이후 재사용)")
+
+
+def test_summary_and_capital_stats_share_cache():
+    """요약 = 전체 통계에서 캐피탈 집계만 뺀 값, 캐피탈별 통계는 전체 통계와 같은 객체"""
+    summary, stats = get_catalog_summary(), get_catalog_stats()
+    assert summary['totals'] == stats['totals'] and summary['brands'] is stats['brands']
+    assert list(summary['capitals']) == list(stats['capitals'])
+    for capital_id, files in summary['capitals'].items():
+        assert files['updated_at'] == stats['capitals'][capital_id]['updated_at']
+        assert get_capital_stats(capital_id) is stats['capitals'][capital_id]
+    print(f"✓ 요약 {summary['build_ms']:.1f}ms (캐피탈별 데이터 미적재)")
+
+
+def test_stale_versions_are_evicted():
+    """데이터 버전이 바뀐 뒤 처음 집계할 때 이전 버전 항목을 버림 (주기적 갱신에도 메모리 일정)"""
+    get_catalog_stats()
+    current = catalog_stats.data_version()
+    original = catalog_stats.data_version
+    catalog_stats.data_version = lambda: "next-version"
+    try:
+        summary = get_catalog_summary()
+        assert summary['data_version'] == "next-version"
+        assert {key[0] for key in catalog_stats._STATS_CACHE} == {"next-version"}
+    finally:
+        catalog_stats.data_version = original
+
+    assert get_catalog_summary()['data_version'] == current
+    assert {key[0] for key in catalog_stats._STATS_CACHE} == {current}
+    print(f"✓ 이전 버전 통계 제거 (남은 항목 {len(catalog_stats._STATS_CACHE)}개)")
+
+
+def main():
+    """메인 테스트 실행"""
+    test_stats_match_lookup_functions()
+    test_stats_computed_once_per_data_version()
+    test_summary_and_capital_stats_share_cache()
+    test_stale_versions_are_evicted()
+    print("\n✅ 모든 카탈로그 통계 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+tests/test_comparison.py
+다중 캐피탈 비교 엔진 테스트
+"""
+
+import sys
+import time
+from pathlib import Path
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import comparison
+from core.comparison import compare_all
+from data import vehicle_master
+
+VEHICLE_ID = "AUDI_A3_A3_40_TFSI"
+
+
+def _strip(results):
+    """비교용: 실행 방식과 무관한 필드만 남김"""
+    return [
+        (r['capital_id'], r['monthly_payment'], r['grade_option'], r['residual_rate'])
+        for r in results
+    ]
+
+
+def test_compare_all_parallel_matches_sequential():
+    """스레드/프로세스 풀 결과가 순차 실행과 동일"""
+    print("=" * 80)
+    print("병렬 비교 테스트")
+    print("=" * 80)
+
+    vehicle = vehicle_master.get_vehicle(VEHICLE_ID)
+
+    sequential = compare_all(vehicle, 36, 20000, executor=None, use_cache=False)
+    threaded = compare_all(vehicle, 36, 20000, executor="thread", use_cache=False)
+    assert _strip(sequential) == _strip(threaded)
+
+    processed = compare_all(vehicle, 36, 20000, executor="process", max_workers=2, use_cache=False)
+    assert _strip(sequential) == _strip(processed)
+    comparison.shutdown_executors()
+
+    # 월 납입료 낮은 순 정렬
+    payments = [r['monthly_payment'] for r in sequential if r['monthly_payment'] is not None]
+    assert payments == sorted(payments)
+    assert len(payments) >= 2
+
+    print(f"\n✓ {vehicle['display_name']}")
+    for r in sequential:
+        print(f"  {r['capital_id']}: {r['monthly_payment']:,}원 ({r['grade_option']})")
+
+
+def test_compare_all_partial_results_on_timeout():
+    """느린 캐피탈은 타임아웃 에러 항목으로, 나머지는 정상 반환"""
+    vehicle = vehicle_master.get_vehicle(VEHICLE_ID)
+    original = comparison.quote_for_capital
+
+    def slow_quote(capital_id, **kwargs):
+        if capital_id == "mg_capital":
+            time.sleep(1.0)
+        return original(capital_id=capital_id, **kwargs)
+
+    comparison.quote_for_capital = slow_quote
+    try:
+        start = time.perf_counter()
+        results = compare_all(vehicle, 36, 20000, executor="thread", timeout=0.3, use_cache=False)
+        elapsed = time.perf_counter() - start
+    finally:
+        comparison.quote_for_capital = original
+
+    by_capital = {r['capital_id']: r for r in results}
+    assert by_capital['mg_capital']['monthly_payment'] is None
+    assert "시간 초과" in by_capital['mg_capital']['error']
+    assert by_capital['meritz_capital']['monthly_payment'] is not None
+    assert elapsed < 1.0
+
+    # 실패 항목은 맨 뒤
+    assert results[-1]['capital_id'] == 'mg_capital'
+    print(f"\n✓ 타임아웃 부분 결과: {elapsed:.2f}초")
+
+
+def test_compare_all_unknown_vehicle():
+    """캐피탈에 없는 차량은 에러 항목"""
+    vehicle = {'brand': 'Audi', 'model': 'A3', 'trim': '존재하지 않는 트림'}
+    results = compare_all(vehicle, 36, 20000, vehicle_price=50_000_000, executor=None)
+
+    assert results
+    assert all(r['monthly_payment'] is None for r in results)
+    assert all('찾을 수 없습니다' in r['error'] for r in results)
+
+
+def main():
+    """메인 테스트 실행"""
+    test_compare_all_parallel_matches_sequential()
+    test_compare_all_partial_results_on_timeout()
+    test_compare_all_unknown_vehicle()
+    print("\n✅ 모든 비교 엔진 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
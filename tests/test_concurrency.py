@@ -0,0 +1,223 @@
+"""
+tests/test_concurrency.py
+데이터 캐시 동시성 테스트 (Streamlit 다중 세션 시뮬레이션)
+"""
+
+import sys
+import threading
+import time
+from pathlib import Path
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from data import vehicle_master, residual_rates
+from utils.single_flight import SingleFlightCache
+
+THREADS = 32
+
+
+def _run_burst(target, n_threads: int = THREADS) -> list:
+    """Barrier로 동시에 출발시켜 결과 수집"""
+    barrier = threading.Barrier(n_threads)
+    results = [None] * n_threads
+    errors = []
+
+    def worker(idx):
+        try:
+            barrier.wait()
+            results[idx] = target()
+        except BaseException as e:  # pragma: no cover - 실패 시 원인 보고용
+            errors.append(e)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(n_threads)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not errors, f"스레드 오류: {errors[:3]}"
+    return results
+
+
+def test_single_flight_loads_once():
+    """같은 키를 동시에 요청해도 로더는 한 번만 실행"""
+    print("=" * 80)
+    print("single-flight 로드 테스트")
+    print("=" * 80)
+
+    cache = SingleFlightCache("test")
+    calls = []
+
+    def slow_loader():
+        calls.append(threading.get_ident())
+        time.sleep(0.05)  # 파싱 시간 흉내 (경합 구간 확대)
+        return {"value": 42}
+
+    for _ in range(20):
+        cache.clear()
+        calls.clear()
+        results = _run_burst(lambda: cache.get_or_load("key", slow_loader))
+
+        assert len(calls) == 1
+        assert all(r is results[0] for r in results)
+
+    print(f"\n✓ {THREADS}개 스레드 × 20회: 로더 실행 1회/라운드, 동일 객체 공유")
+
+
+def test_single_flight_error_propagation():
+    """로더 실패 시 대기 스레드 모두 예외를 받고 다음 요청에서 재시도"""
+    cache = SingleFlightCache("test")
+    attempts = []
+
+    def failing_loader():
+        attempts.append(1)
+        time.sleep(0.02)
+        raise FileNotFoundError("missing")
+
+    def target():
+        try:
+            cache.get_or_load("key", failing_loader)
+        except FileNotFoundError:
+            return "error"
+        return "ok"
+
+    results = _run_burst(target)
+    assert all(r == "error" for r in results)
+    assert "key" not in cache
+
+    # 실패는 캐시되지 않음
+    assert cache.get_or_load("key", lambda: "loaded") == "loaded"
+    print(f"\n✓ 실패 전파: {len(attempts)}회 시도, 재시도 성공")
+
+
+def test_clear_during_load_does_not_publish_stale_value():
+    """clear() 이전에 시작된 로드는 결과를 돌려주되 캐시에 넣지 않음 (갱신 후 이전 데이터 재게시 방지)"""
+    cache = SingleFlightCache("test")
+    started, release = threading.Event(), threading.Event()
+    result = {}
+
+    def stale_loader():
+        started.set()
+        release.wait(5)
+        return "old"
+
+    loader_thread = threading.Thread(target=lambda: result.update(value=cache.get_or_load("key", stale_loader)))
+    loader_thread.start()
+    assert started.wait(5)
+    cache.clear()
+    assert cache.get_or_load("key", lambda: "new") == "new"  # 진행 중인 이전 로드를 기다리지 않음
+    release.set()
+    loader_thread.join()
+    assert result['value'] == "old" and cache.get("key") == "new"
+
+    # 스트레스: 로드와 무효화가 계속 겹쳐도, 마지막 clear() 이후의 값만 남음
+    version = [0]
+    stop = threading.Event()
+
+    def loader():
+        seen = version[0]
+        time.sleep(0.001)
+        return seen
+
+    def clearer():
+        for _ in range(200):
+            version[0] += 1
+            cache.clear()
+            time.sleep(0.0005)
+        stop.set()
+
+    def reader():
+        while not stop.is_set():
+            cache.get_or_load("key", loader)
+
+    threads = [threading.Thread(target=clearer)] + [threading.Thread(target=reader) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert cache.get_or_load("key", loader) == version[0]
+    print(f"✓ 로드 중 무효화: 이전 값 미게시 ({version[0]}회 clear)")
+
+
+def test_snapshot_is_immutable():
+    """게시된 스냅샷은 읽기 전용이고, 쓰기는 새 스냅샷으로 교체"""
+    cache = SingleFlightCache("test")
+    cache.get_or_load("a", lambda: 1)
+    before = cache.snapshot()
+
+    try:
+        before["b"] = 2
+        raise AssertionError("스냅샷이 수정 가능합니다")
+    except TypeError:
+        pass
+
+    cache.get_or_load("b", lambda: 2)
+    assert "b" not in before  # 이전 스냅샷은 그대로
+    assert "b" in cache.snapshot()
+
+
+def test_data_loaders_under_burst():
+    """실제 로더에 동시 최초 요청: 파일당 1회 파싱"""
+    print("\n" + "=" * 80)
+    print("데이터 로더 동시 요청 테스트")
+    print("=" * 80)
+
+    caches = [
+        vehicle_master._VEHICLE_CACHE,
+        vehicle_master._MASTER_CARINFO_CACHE,
+        residual_rates._RESIDUAL_CACHE,
+    ]
+    for cache in caches:
+        cache.clear()
+    load_counts = [cache.load_count for cache in caches]
+
+    capitals = residual_rates.get_available_capitals()
+
+    def session():
+        vehicles = vehicle_master._load_vehicles()
+        master = vehicle_master._load_master_carinfo()
+        rates = {cap: residual_rates._load_residual_rates(cap) for cap in capitals}
+        return vehicles, master, rates
+
+    start = time.perf_counter()
+    results = _run_burst(session)
+    elapsed = time.perf_counter() - start
+
+    first = results[0]
+    for vehicles, master, rates in results:
+        assert vehicles is first[0]
+        assert master is first[1]
+        for cap in capitals:
+            assert rates[cap] is first[2][cap]
+
+    assert vehicle_master._VEHICLE_CACHE.load_count - load_counts[0] == 1
+    assert vehicle_master._MASTER_CARINFO_CACHE.load_count - load_counts[1] == 1
+    assert residual_rates._RESIDUAL_CACHE.load_count - load_counts[2] == len(capitals)
+
+    print(f"\n✓ {THREADS}개 세션 동시 최초 요청: {elapsed:.3f}초")
+    print(f"  파싱 횟수: 차량 1회, master_carinfo 1회, 잔존율 {len(capitals)}회")
+
+    # 워밍업 이후 조회 결과가 일관적인지 확인
+    vehicle_ids = vehicle_master.get_all_vehicle_ids()
+
+    def reader():
+        return [vehicle_master.get_vehicle(vid)["price"] for vid in vehicle_ids[:200]]
+
+    reads = _run_burst(reader)
+    assert all(r == reads[0] for r in reads)
+    print("✓ 워밍업 이후 동시 읽기 결과 일관")
+
+
+def main():
+    """메인 테스트 실행"""
+    test_single_flight_loads_once()
+    test_single_flight_error_propagation()
+    test_clear_during_load_does_not_publish_stale_value()
+    test_snapshot_is_immutable()
+    test_data_loaders_under_burst()
+    print("\n✅ 모든 동시성 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
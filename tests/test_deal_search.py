@@ -0,0 +1,90 @@
+"""
+tests/test_deal_search.py
+예산 내 최적 조건 검색 테스트 (가지치기 정확성, 스칼라 계산과 일치)
+"""
+
+import sys
+from pathlib import Path
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.deal_search import search_deals
+from core.quote import calculate_capital_quote
+from data import vehicle_master, residual_rates, interest_rates
+
+
+def _cell_key(row):
+    return (row['capital_id'], row['vehicle_id'], row['contract_months'],
+            row['annual_mileage'], row['grade_option'])
+
+
+def test_pruning_keeps_every_match():
+    """가지치기 결과 = 전체 셀 계산 결과 (예산 경계 근처 포함)"""
+    print("=" * 80)
+    print("예산 검색 테스트")
+    print("=" * 80)
+
+    for budget, down_payment_percent in [(450000, 0), (700000, 0), (700000, 20), (1200000, 0)]:
+        options = dict(top_k=100000, one_per_vehicle=False, sort_by='monthly_payment',
+                       down_payment_percent=down_payment_percent)
+        pruned = search_deals(budget, **options)
+        full = search_deals(budget, prune=False, **options)
+
+        assert pruned['stats']['matches'] == full['stats']['matches'] > 0
+        assert {_cell_key(r) for r in pruned['results']} == {_cell_key(r) for r in full['results']}
+        assert pruned['stats']['cells_priced'] < full['stats']['cells_priced']
+        print(f"✓ {budget:,}원 (선납 {down_payment_percent}%): {pruned['stats']['matches']:,}건, "
+              f"계산 {pruned['stats']['cells_priced']:,}/{full['stats']['cells_priced']:,}셀")
+
+
+def test_results_match_scalar_quotes():
+    """상위 결과의 월 납입료 = 스칼라 계산기 결과, 필터/정렬 적용"""
+    found = search_deals(700000, top_k=30, down_payment_percent=10)
+    assert len(found['results']) == 30
+
+    prices = [r['vehicle_price'] for r in found['results']]
+    assert prices == sorted(prices, reverse=True)
+    assert len({(r['capital_id'], r['vehicle_id']) for r in found['results']}) == 30
+
+    for row in found['results'] + search_deals(700000, top_k=10, capital_ids=['mg_capital'])['results']:
+        vehicle = vehicle_master.get_vehicle(row['vehicle_id'], capital_id=row['capital_id'])
+        residual_rate = residual_rates.get_residual_rate(
+            row['capital_id'], row['vehicle_id'], row['contract_months'],
+            row['annual_mileage'], grade_option=row['grade_option']
+        )
+        annual_rate = interest_rates.get_interest_rate(
+            capital_id=row['capital_id'],
+            vehicle_price=vehicle['price'],
+            brand=vehicle['brand'],
+            is_import=vehicle['is_import'],
+            is_ev=(vehicle['engine_cc'] == 0),
+            contract_months=row['contract_months']
+        )
+        expected = calculate_capital_quote(
+            row['capital_id'], vehicle, vehicle['price'],
+            row['contract_months'], row['annual_mileage'],
+            residual_rate, annual_rate, down_payment=row['down_payment']
+        )
+        assert row['monthly_payment'] == expected['monthly_payment'] <= 700000
+
+    filtered = search_deals(800000, top_k=50, brands=['bmw'], terms=[48], mileages=[20000],
+                            sort_by='monthly_payment')['results']
+    assert filtered and all(
+        r['brand'].upper() == 'BMW' and r['contract_months'] == 48 and r['annual_mileage'] == 20000
+        for r in filtered
+    )
+    payments = [r['monthly_payment'] for r in filtered]
+    assert payments == sorted(payments)
+    print(f"✓ 상위 {len(found['results'])}건 스칼라 계산 일치 ({found['stats']['elapsed_ms']:.1f}ms)")
+
+
+def main():
+    """메인 테스트 실행"""
+    test_pruning_keeps_every_match()
+    test_results_match_scalar_quotes()
+    print("\n✅ 모든 예산 검색 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
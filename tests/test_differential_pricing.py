@@ -0,0 +1,90 @@
+"""
+tests/test_differential_pricing.py
+스칼라 ↔ 배열 계산 엔진 차분 퍼징 테스트 (유효 입력 생성, 시드 재현성, 원 단위 일치, 불일치 축소)
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.validator import validate_lease_input
+from tools.fuzz_pricing import TARGETS, check_case, run_chunk, run_fuzz, shrink
+
+# CI 에서 대상별로 돌리는 입력 수 (전체 실행은 python tools/fuzz_pricing.py)
+CI_CASES = 20_000
+
+
+def test_generated_inputs_are_valid_and_seeded():
+    """생성 입력은 validate_lease_input 을 통과하고, 같은 시드는 같은 입력"""
+    print("=" * 80)
+    print("차분 퍼징 테스트")
+    print("=" * 80)
+
+    for name, target in TARGETS.items():
+        columns = target.generate(np.random.default_rng([1, 2]), 2000)
+        again = target.generate(np.random.default_rng([1, 2]), 2000)
+        assert all(np.array_equal(columns[key], again[key]) for key in columns), name
+        assert set(columns) == set(target.fields), name
+
+        rows = [{key: values[i].item() for key, values in columns.items()} for i in range(len(columns[next(iter(columns))]))]
+        assert all(target.valid(row) for row in rows), name
+        if 'contract_months' in columns:
+            for row in rows[:200]:
+                down = row.get('down_payment', 0)
+                validate_lease_input(row['vehicle_price'], row['contract_months'], down_payment=down,
+                                     residual_rate=row['residual_rate'])
+        print(f"✓ {name}: 입력 {len(rows):,}건 유효")
+
+
+def test_engines_agree():
+    """대상별 CI_CASES 건에서 스칼라 = 배열 (원 단위)"""
+    report = run_fuzz(cases=CI_CASES, seed=11, workers=1, chunk_size=10_000)
+    for name, result in report['targets'].items():
+        assert result['cases'] == CI_CASES
+        assert result['mismatches'] == 0, (name, result['reproducers'])
+        print(f"✓ {name}: {result['cases']:,}건 일치 ({result['cases_per_second']:,}건/초)")
+    assert report['mismatches'] == 0
+
+
+def test_mismatch_is_shrunk_to_minimal_reproducer():
+    """배열 엔진에 일부 조건에서만 틀리는 결함을 넣으면 찾아서 최소 입력으로 축소"""
+    target = TARGETS['mg_lease']
+
+    def faulty_batch(columns):
+        result = dict(target.batch(columns))
+        broken = (np.asarray(columns['contract_months']) == 48) & (np.asarray(columns['vehicle_price']) > 50_000_000)
+        result['monthly_payment'] = np.where(broken, result['monthly_payment'] + 100, result['monthly_payment'])
+        return result
+
+    faulty = target._replace(batch=faulty_batch)
+    result = run_chunk(faulty, seed=3, chunk=0, size=2000)
+    assert result['mismatches'] > 0 and set(result['fields']) == {'monthly_payment'}
+
+    original = result['examples'][0]
+    minimal = shrink(faulty, original)
+    assert minimal['contract_months'] == 48 and 50_000_000 < minimal['vehicle_price'] <= original['vehicle_price']
+    assert minimal['vehicle_price'] % 10_000_000 == 0
+    assert minimal['residual_rate'] == 0.0 and minimal['annual_interest_rate'] == 0.0
+    assert minimal['down_payment_rate'] == 0.0 and not minimal['is_ev'] and not minimal['is_hybrid']
+
+    diff = check_case(faulty, minimal)
+    assert list(diff) == ['monthly_payment']
+    assert diff['monthly_payment']['batch'] - diff['monthly_payment']['scalar'] == 100
+    assert check_case(target, minimal) == {}
+    print(f"✓ 불일치 {result['mismatches']}건 → 최소 재현 입력 {minimal}")
+
+
+def main():
+    """메인 테스트 실행"""
+    test_generated_inputs_are_valid_and_seeded()
+    test_engines_agree()
+    test_mismatch_is_shrunk_to_minimal_reproducer()
+    print("\n✅ 모든 차분 퍼징 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
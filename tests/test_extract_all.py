@@ -0,0 +1,154 @@
+"""
+tests/test_extract_all.py
+전체 캐피탈 추출 오케스트레이터 테스트 (워크북 탐색, 병렬 추출, 원자적 기록, 통합 보고서)
+"""
+
+import json
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import openpyxl
+
+from data.artifact_format import KIND_VEHICLE_MASTER, read_artifact, write_artifact
+from excel_reverse_engineering.extract_all import REPORT_FILENAME, discover_workbooks, extract_all
+from excel_reverse_engineering.synthetic_workbooks import write_meritz_workbook, write_mg_workbook
+
+
+def test_discover_workbooks():
+    """캐피탈별 최신 워크북 선택, 잠금 파일 제외"""
+    print("=" * 80)
+    print("추출 오케스트레이터 테스트")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        for name in ("meritz_2509.xlsx", "MG_capital_2510_vol3.xlsx", "~$meritz_2510.xlsx", "notes.xlsx"):
+            (tmp / name).write_bytes(b"")
+        (tmp / "meritz_2510.xlsx").write_bytes(b"")
+        os.utime(tmp / "meritz_2509.xlsx", (1_000_000, 1_000_000))
+
+        found = discover_workbooks(tmp)
+        assert found['meritz_capital'].name == "meritz_2510.xlsx"
+        assert found['mg_capital'].name == "MG_capital_2510_vol3.xlsx"
+        assert set(found) == {'meritz_capital', 'mg_capital'}
+
+        try:
+            discover_workbooks(tmp, ["unknown_capital"])
+            assert False, "등록되지 않은 캐피탈은 ValueError"
+        except ValueError:
+            pass
+        print("✓ 워크북 탐색")
+
+
+def test_extract_all_parallel():
+    """캐피탈별 별도 프로세스 추출 → 출력 파일 + 통합 보고서"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        input_dir, output_dir = tmp / "xlsx", tmp / "data"
+        input_dir.mkdir()
+        write_meritz_workbook(input_dir / "meritz_2510.xlsx", 120)
+        write_mg_workbook(input_dir / "mg_capital_2510.xlsx", 80)
+        (input_dir / "mg_broken.xlsx").write_bytes(b"not a workbook")
+        os.utime(input_dir / "mg_capital_2510.xlsx", (1_000_000, 1_000_000))
+
+        report = extract_all(input_dir, output_dir, capital_ids=["meritz_capital"], workers=2)
+        assert report['capitals']['meritz_capital']['status'] == 'ok'
+        assert report['capitals']['meritz_capital']['vehicles'] == 120
+        vehicles = read_artifact(output_dir / "vehicle_master.npz")
+        residuals = read_artifact(output_dir / "residual_rates" / "meritz_capital.npz")
+        assert len(vehicles) == 120 and len(residuals) == 120
+        assert not (output_dir / "vehicle_master.json").exists(), "JSON 내보내기는 요청할 때만"
+
+        # 최신 MG 워크북이 깨져 있으면 해당 캐피탈만 실패, 기존 출력 유지
+        write_artifact(output_dir / "mg_vehicle_master.npz", {}, KIND_VEHICLE_MASTER)
+        report = extract_all(input_dir, output_dir, workers=2)
+        assert report['capitals']['meritz_capital']['status'] == 'ok'
+        assert report['capitals']['mg_capital']['status'] == 'error'
+        assert read_artifact(output_dir / "mg_vehicle_master.npz") == {}
+        assert not list(output_dir.rglob("*.tmp"))
+
+        (input_dir / "mg_broken.xlsx").unlink()
+        report = extract_all(input_dir, output_dir, workers=2, export_json=True)
+        mg = report['capitals']['mg_capital']
+        assert mg['status'] == 'ok' and mg['vehicles'] == 80
+        exported = json.loads((output_dir / "mg_vehicle_master.json").read_text(encoding='utf-8'))
+        assert exported == read_artifact(output_dir / "mg_vehicle_master.npz") and len(exported) == 80
+        assert 0 < mg['coverage']['ratio'] <= 1
+
+        saved = json.loads((output_dir / REPORT_FILENAME).read_text(encoding='utf-8'))
+        assert set(saved['capitals']) == {'meritz_capital', 'mg_capital'}
+        counts = ", ".join(f"{c} {item['vehicles']}대" for c, item in report['capitals'].items())
+        print(f"✓ 병렬 추출: {report['seconds']:.2f}초, {counts}")
+
+
+def _edit_meritz(path: Path) -> None:
+    """7행 가격, 8행 웨스트 등급 변경, 9행 삭제(빈 행), 끝에 1대 추가"""
+    wb = openpyxl.load_workbook(path)
+    ws = wb['차종']
+    ws.cell(7, 6).value = ws.cell(7, 6).value + 1_000_000
+    ws.cell(8, 10).value = 'SA1' if ws.cell(8, 10).value != 'SA1' else 'H'
+    for col in range(1, 18):
+        ws.cell(9, col).value = None
+    ws.append([999, 'BMW', 'NEW', None, 'ADDED TRIM', 55_000_000, 1998, '휘발유', None, 'A', 'A', 'A', 'A'])
+    wb.save(path)
+
+
+def test_incremental_extraction():
+    """변경 없으면 기록 생략, 바뀐 차량만 재계산 + diff, 결과는 전체 재추출과 동일"""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+        input_dir, output_dir = tmp / "xlsx", tmp / "data"
+        input_dir.mkdir()
+        workbook = write_meritz_workbook(input_dir / "meritz_2510.xlsx", 100)
+        master_path = output_dir / "vehicle_master.npz"
+        diff_file = output_dir / "extraction_diff" / "meritz_capital.json"
+
+        item = extract_all(input_dir, output_dir, workers=1)['capitals']['meritz_capital']
+        assert not item['incremental'] and item['changes']['added'] == 100
+        mtime = master_path.stat().st_mtime_ns
+
+        # 변경 없음 → 전부 재사용, 출력 파일 그대로
+        item = extract_all(input_dir, output_dir, workers=1)['capitals']['meritz_capital']
+        assert item['incremental'] and item['reused'] == 100
+        assert not any(item['changes'].values()) and item['outputs'] == {}
+        assert master_path.stat().st_mtime_ns == mtime
+        print("✓ 변경 없음: 100대 재사용, 기록 생략")
+
+        _edit_meritz(workbook)
+        vehicles = read_artifact(master_path)
+        first, second, third = list(vehicles)[:3]
+
+        item = extract_all(input_dir, output_dir, workers=1)['capitals']['meritz_capital']
+        diff = json.loads(diff_file.read_text(encoding='utf-8'))
+        assert item['reused'] == 97
+        assert diff['added'] == ['BMW_NEW_ADDED_TRIM'] and diff['removed'] == [third]
+        assert [r['vehicle_id'] for r in diff['repriced']] == [first]
+        assert diff['repriced'][0]['new'] - diff['repriced'][0]['old'] == 1_000_000
+        assert [r['vehicle_id'] for r in diff['regraded']] == [second]
+        assert list(diff['regraded'][0]['changes']) == ['west_grade']
+        assert second in diff['residual_changed'] and first not in diff['residual_changed']
+        print(f"✓ 변경 감지: {item['changes']}")
+
+        # 증분 결과 파일 = 전체 재추출 결과 파일
+        full_dir = tmp / "full"
+        extract_all(input_dir, full_dir, workers=1, full=True)
+        for name in ("vehicle_master.npz", "residual_rates/meritz_capital.npz"):
+            assert (output_dir / name).read_bytes() == (full_dir / name).read_bytes(), name
+        print("✓ 증분 결과 = 전체 재추출 결과")
+
+
+def main():
+    """메인 테스트 실행"""
+    test_discover_workbooks()
+    test_extract_all_parallel()
+    test_incremental_extraction()
+    print("\n✅ 모든 추출 오케스트레이터 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
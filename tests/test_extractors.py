@@ -0,0 +1,103 @@
+"""
+tests/test_extractors.py
+엑셀 추출기 테스트 (읽기 전용 스트리밍 추출, 합성 워크북)
+"""
+
+import contextlib
+import io
+import sys
+import tempfile
+from pathlib import Path
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from excel_reverse_engineering.meritz_extractor import MeritzResidualExtractor
+from excel_reverse_engineering.mg_extractor import MGCapitalExtractor
+from excel_reverse_engineering.synthetic_workbooks import (
+    MERITZ_GRADES,
+    MERITZ_MILEAGE_ADJUSTMENTS,
+    MG_GRADES,
+    write_meritz_workbook,
+    write_mg_workbook,
+)
+
+ROWS = 200
+
+
+def _quiet(fn):
+    with contextlib.redirect_stdout(io.StringIO()):
+        return fn()
+
+
+def test_meritz_extractor():
+    """메리츠: 잔가 테이블/주행거리 조정/차량 행 전부 추출"""
+    print("=" * 80)
+    print("엑셀 추출기 테스트")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_meritz_workbook(Path(tmp) / "meritz.xlsx", ROWS)
+
+        extractor = MeritzResidualExtractor(str(path))
+        tables = extractor._extract_residual_tables()
+        adjustments = extractor._extract_mileage_adjustments()
+        extractor.close()
+
+        assert adjustments == MERITZ_MILEAGE_ADJUSTMENTS
+        assert sorted(tables['west']) == [24, 36, 48, 60]
+        assert list(tables['aps'][36]) == MERITZ_GRADES
+        assert sorted(tables['vgs']) == [24, 36, 48]
+
+        vehicle_master, residual_rates = _quiet(MeritzResidualExtractor(str(path)).extract_all_vehicles)
+        assert len(vehicle_master) == ROWS
+
+        vehicle_id, vehicle = next(iter(vehicle_master.items()))
+        expected = round(tables['west'][36][vehicle['west_grade']] + adjustments[20000], 4)
+        assert residual_rates[vehicle_id]['west_normal'][36][20000] == expected
+        print(f"✓ 메리츠 {len(vehicle_master)}대, {vehicle_id} 36개월/20,000km {expected:.2%}")
+
+
+def test_mg_extractor():
+    """MG: 헤더 탐색 후 데이터 행 추출, 등급 테이블"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_mg_workbook(Path(tmp) / "mg.xlsx", ROWS)
+
+        vehicle_master, residual_rates = _quiet(MGCapitalExtractor(str(path)).extract_all_data)
+        assert len(vehicle_master) == ROWS
+        assert not any(v['brand'] == 'BRAND' for v in vehicle_master.values())
+
+        extractor = MGCapitalExtractor(str(path))
+        tables = extractor._extract_grade_tables()
+        extractor.close()
+        assert tables['snk']['name'] == '■ 에스앤케이모터스'
+        assert tables['snk']['grades'] == MG_GRADES
+        assert sorted(tables['aps']['residual_rates']) == [12, 24, 36, 48, 60]
+
+        graded = [vid for vid, v in vehicle_master.items() if v['grade_snk']]
+        assert all(residual_rates[vid] for vid in graded)
+        assert all(residual_rates[vid] is None for vid in vehicle_master if vid not in graded)
+        print(f"✓ MG {len(vehicle_master)}대, 잔존율 {len(graded)}대")
+
+
+def test_missing_sheet_raises():
+    """필수 시트가 없으면 ValueError"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_mg_workbook(Path(tmp) / "mg.xlsx", 1)
+        try:
+            MeritzResidualExtractor(str(path))
+            assert False, "차종 시트 없음은 ValueError"
+        except ValueError:
+            pass
+
+
+def main():
+    """메인 테스트 실행"""
+    test_meritz_extractor()
+    test_mg_extractor()
+    test_missing_sheet_raises()
+    print("\n✅ 모든 추출기 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
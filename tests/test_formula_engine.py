@@ -0,0 +1,195 @@
+"""
+tests/test_formula_engine.py
+견적 시트 수식 평가기 테스트 (연산자/함수 의미, 입력 재계산, MG 계산기 시나리오 비교)
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy_financial as npf
+import openpyxl
+from openpyxl.workbook.defined_name import DefinedName
+
+from excel_reverse_engineering.formula_engine import ExcelError, FormulaBook
+from excel_reverse_engineering.synthetic_workbooks import write_mg_quote_workbook
+from tools.mg_validator import validate_mg_scenarios
+
+# 셀 → (수식, 기대값)
+EXPRESSIONS = {
+    'C1': ('=-2^2', 4),
+    'C2': ('=2+3*4-6/3', 12),
+    'C3': ('=50%*A1', 5),
+    'C4': ('=A1&"개월 "&TRUE', '10개월 TRUE'),
+    'C5': ('=AND(A1>=10, "abc"="ABC", A1<>A2, NOT(A1<A2))', False),
+    'C6': ('=IF(A1>5, "큼", 1/0)', '큼'),
+    'C7': ('=IFERROR(1/0, "오류")', '오류'),
+    'C8': ('=ROUND(2.5,0)+ROUND(-2.5,0)*10', -27),
+    'C9': ('=ROUND(1.005,2)', 1.01),
+    'C10': ('=ROUNDDOWN(-1.99,0)+ROUNDUP(1.01,0)+ROUNDDOWN(12345,-2)', 12301),
+    'C11': ("=VLOOKUP(25000,E1:F4,2)+VLOOKUP(20000,$E$1:$F$4,2,FALSE)", -0.04),
+    'C12': ('=INDEX(E1:F4,MATCH("B",G1:G4,0),2)', 0.0),
+    'C13': ('=MATCH(15,H1:H4,-1)', 2),
+    'C14': ('=SUM(A1:A5)+MIN(E1:E4)/1000+MAX(A1,A2,7)', 72),
+    'C15': ("='My Sheet'!A1*rate", 25),
+    'C16': ('=HLOOKUP("y",I1:K2,2,FALSE)', 200),
+    'C17': ('=VLOOKUP(1,E1:F4,2,FALSE)', ExcelError('#N/A')),
+    'C18': ('=C17+1', ExcelError('#N/A')),
+    'C19': ('=INT(-1.5)+ABS(-3)', 1),
+    'C20': ('=_xlfn.IFERROR(PMT(0,10,-1000),0)', 100.0),
+}
+
+
+def _write_expression_book(path: Path) -> Path:
+    wb = openpyxl.Workbook()
+    ws = wb.active
+    ws.title = '계산'
+    for row, value in enumerate([10, 20, '텍스트', None, 12], start=1):
+        ws.cell(row, 1).value = value
+    for row, (mileage, adjustment, code, desc) in enumerate(
+            [(10000, 0.01, 'A', 30), (15000, 0.0, 'B', 20), (20000, -0.02, 'C', 10), (30000, -0.06, 'D', 0)],
+            start=1):
+        ws.cell(row, 5).value, ws.cell(row, 6).value = mileage, adjustment
+        ws.cell(row, 7).value, ws.cell(row, 8).value = code, desc
+    for col, (label, value) in enumerate([('x', 100), ('y', 200), ('z', 300)], start=9):
+        ws.cell(1, col).value, ws.cell(2, col).value = label, value
+    for address, (formula, _) in EXPRESSIONS.items():
+        ws[address] = formula
+
+    other = wb.create_sheet('My Sheet')
+    other['A1'] = 5
+    other['A2'] = 5
+    wb.defined_names['rate'] = DefinedName('rate', attr_text="'My Sheet'!$A$2")
+    wb.save(path)
+    return path
+
+
+def test_expression_semantics():
+    """연산자 우선순위, 반올림, 찾기 함수, 오류 전파가 엑셀과 같은지"""
+    print("=" * 80)
+    print("수식 평가기 테스트")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        with FormulaBook(_write_expression_book(Path(tmp) / "expr.xlsx")) as book:
+            model = book.compile(list(EXPRESSIONS))
+        results = model.evaluate()
+
+    for address, (formula, expected) in EXPRESSIONS.items():
+        actual = results[address]
+        if isinstance(expected, float):
+            assert abs(actual - expected) < 1e-12, f"{address} {formula}: {actual!r} != {expected!r}"
+        else:
+            assert actual == expected, f"{address} {formula}: {actual!r} != {expected!r}"
+    # 입력이 없으면 모든 수식은 컴파일할 때 상수로 접힌다
+    assert model.live_cells == 0 and model.formula_cells == len(EXPRESSIONS)
+    print(f"✓ 수식 {len(EXPRESSIONS)}개 (연산자/ROUND/찾기/이름/오류 전파)")
+
+
+def test_inputs_recompute_only_dependents():
+    """입력 셀 변경은 의존 셀만 다시 계산, 입력으로 지정한 수식 셀은 시나리오 값 사용"""
+    with tempfile.TemporaryDirectory() as tmp:
+        with FormulaBook(_write_expression_book(Path(tmp) / "expr.xlsx"), default_sheet='계산') as book:
+            model = book.compile(['C3', 'C11', 'C14', 'C18', 'E2'], inputs=['A1', 'F3', 'C17'])
+
+        assert model.live_cells == 4, "C3/C11/C14/C18 만 입력에 의존"
+        base = model.evaluate()
+        assert base['C3'] == 5 and base['E2'] == 15000
+
+        changed = model.evaluate({'A1': 30, 'F3': 0.5, 'C17': 41})
+        assert changed['C3'] == 15
+        assert changed['C11'] == 1.0
+        assert changed['C14'] == 102 and changed['C18'] == 42
+        assert model.evaluate() == base, "시나리오 값은 다음 계산에 남지 않음"
+
+        results = model.evaluate_many([{'A1': value} for value in (0, 100)])
+        assert [row['C3'] for row in results] == [0, 50]
+
+        try:
+            model.evaluate({'A2': 1})
+            assert False, "입력으로 컴파일하지 않은 셀은 ValueError"
+        except ValueError:
+            pass
+    print("✓ 입력 재계산 (의존 셀 4개), 수식 셀 입력 덮어쓰기")
+
+
+def test_pmt_matches_numpy_financial():
+    """PMT 가 numpy_financial.pmt 와 같은 값 (numpy 거듭제곱 구현에 따른 마지막 자리 차이만 허용)"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "pmt.xlsx"
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws['A1'], ws['A2'], ws['A3'], ws['A4'], ws['A5'] = 0.05, 36, 50_000_000, -20_000_000, 0
+        ws['B1'] = '=PMT(A1/12,A2,A3,A4,A5)'
+        wb.save(path)
+        with FormulaBook(path) as book:
+            model = book.compile(['B1'], inputs=['A1', 'A2', 'A3', 'A4', 'A5'])
+
+    count = 0
+    for rate in (0.0, 0.0315, 0.0515, 0.089):
+        for months in (12, 36, 60):
+            for when in (0, 1):
+                scenario = {'A1': rate, 'A2': months, 'A3': 80_000_000, 'A4': -30_000_000, 'A5': when}
+                expected = float(npf.pmt(rate / 12, months, 80_000_000, -30_000_000, when))
+                assert abs(model.evaluate(scenario)['B1'] - expected) < 1e-6
+                count += 1
+    print(f"✓ PMT = numpy_financial.pmt ({count}개 조합)")
+
+
+def test_mg_quote_scenarios_match_calculator():
+    """합성 MG 견적 시트 수식 재계산 결과가 MG 계산기와 일치"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = write_mg_quote_workbook(Path(tmp) / "mg_quote.xlsx")
+        report = validate_mg_scenarios(str(path), scenarios=500, tolerance=0, seed=1)
+
+    assert report['scenarios'] == 500 and report['errors'] == 0
+    assert report['passed'] == 500 and report['max_diff'] == 0
+    assert report['worst'][0]['acquisition_diff'] == 0
+    print(f"✓ MG 시나리오 500개 일치 (수식 셀 {report['formula_cells']}개)")
+
+
+def test_compile_errors():
+    """순환 참조/지원하지 않는 함수/없는 시트는 컴파일 단계 ValueError"""
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "bad.xlsx"
+        wb = openpyxl.Workbook()
+        ws = wb.active
+        ws.title = 'S'
+        ws['A1'], ws['A2'], ws['A3'] = '=A2+1', '=A1*2', '=OFFSET(B1,1,1)'
+        ws['A4'] = '=없는시트!A1'
+        wb.save(path)
+
+        with FormulaBook(path) as book:
+            for targets, message in ((['A1'], '순환 참조'), (['A3'], 'OFFSET'), (['A4'], '없는시트')):
+                try:
+                    book.compile(targets)
+                    assert False, f"{targets} 는 ValueError"
+                except ValueError as e:
+                    assert message in str(e), str(e)
+            # 순환 고리를 입력으로 끊으면 계산 가능
+            model = book.compile(['A1'], inputs=['A2'])
+            assert model.evaluate({'A2': 4})['A1'] == 5
+
+    try:
+        FormulaBook(Path(tmp) / "missing.xlsx")
+        assert False, "파일 없음은 FileNotFoundError"
+    except FileNotFoundError:
+        pass
+    print("✓ 순환 참조/미지원 함수/시트 없음/파일 없음")
+
+
+def main():
+    """메인 테스트 실행"""
+    test_expression_semantics()
+    test_inputs_recompute_only_dependents()
+    test_pmt_matches_numpy_financial()
+    test_mg_quote_scenarios_match_calculator()
+    test_compile_errors()
+    print("\n✅ 모든 수식 평가기 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,101 @@
+"""
+tests/test_load_test.py
+동시 부하 테스트 도구 테스트 (시드 요청 목록, 동시성 모델/캐시 설정별 측정, 포화 지점)
+"""
+
+import json
+import sys
+from collections import Counter
+from pathlib import Path
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.load_test import (
+    CACHE_CONFIGS, MIXES, build_pool, execute, find_saturation, make_workload, run_load_test
+)
+
+
+def test_workload_is_seeded_and_follows_mix():
+    """같은 시드 = 같은 요청 목록, 요청 종류 비중은 구성대로, 모든 요청 실행 가능"""
+    print("=" * 80)
+    print("부하 테스트 도구 테스트")
+    print("=" * 80)
+
+    pool = build_pool(per_capital=10)
+    assert pool and all(len(entries) <= 10 for entries in pool.values())
+
+    jobs = make_workload('session', 2000, seed=5, pool=pool)
+    assert jobs == make_workload('session', 2000, seed=5, pool=pool)
+    assert jobs != make_workload('session', 2000, seed=6, pool=pool)
+
+    counts = Counter(op for op, _ in jobs)
+    for op, weight in MIXES['session'].items():
+        assert abs(counts[op] / len(jobs) - weight) < 0.05, (op, counts)
+    assert set(Counter(op for op, _ in make_workload('browse', 500, pool=pool))) <= set(MIXES['browse'])
+
+    for job in jobs[:150]:
+        assert execute(job) == job[0]
+
+    try:
+        make_workload('없는 구성', 10, pool=pool)
+        assert False, "알 수 없는 구성은 ValueError"
+    except ValueError:
+        pass
+    print(f"✓ 요청 {len(jobs):,}건: {dict(counts)}")
+
+
+def test_run_load_test_models_and_configs():
+    """모델 3종 × 캐시 설정, 단계별 처리량/지연시간, 오류 없음"""
+    report = run_load_test(models=['thread', 'process', 'asyncio'], configs=['nocache', 'memory', 'cube'],
+                           levels=[2, 1], requests=40, warmup=10, pool_size=10)
+    json.dumps(report)
+
+    runs = {(run['model'], run['config']): run for run in report['runs']}
+    assert len(runs) == 9
+    for (model, config), run in runs.items():
+        if 'skipped' in run:
+            assert config == 'cube'
+            continue
+        assert [level['concurrency'] for level in run['levels']] == [1, 2]
+        for level in run['levels']:
+            assert level['requests'] == 40 and level['errors'] == 0, (model, config, level)
+            assert level['throughput'] > 0 and level['p50_ms'] <= level['p95_ms'] <= level['p99_ms'] <= level['max_ms']
+            assert sum(op['count'] for op in level['ops'].values()) == 40
+        assert run['saturation']['peak_throughput'] == max(level['throughput'] for level in run['levels'])
+        print(f"✓ {model}/{config}: {run['levels'][-1]['throughput']:,.1f} req/s (동시 2)")
+
+    for kwargs in ({'models': ['greenlet']}, {'configs': ['redis']}, {'levels': [0]}):
+        try:
+            run_load_test(requests=1, **kwargs)
+            assert False, f"잘못된 설정은 ValueError: {kwargs}"
+        except ValueError:
+            pass
+    assert set(CACHE_CONFIGS) == {'nocache', 'memory', 'disk', 'cube'}
+
+
+def test_find_saturation():
+    """처리량 증가가 10% 미만이 되는 첫 단계가 포화 지점"""
+    def level(concurrency, throughput, p95):
+        return {'concurrency': concurrency, 'throughput': throughput, 'p95_ms': p95}
+
+    levels = [level(1, 100, 10), level(2, 190, 11), level(4, 200, 20), level(8, 205, 40)]
+    sat = find_saturation(levels)
+    assert sat['saturated'] and sat['concurrency'] == 2 and sat['next_p95_growth'] == 1.82
+    assert sat['peak_concurrency'] == 8 and sat['peak_throughput'] == 205
+
+    sat = find_saturation([level(1, 100, 10), level(2, 200, 10), level(4, 400, 10)])
+    assert not sat['saturated'] and sat['concurrency'] == 4 and sat['next_p95_growth'] is None
+    print("✓ 포화 지점")
+
+
+def main():
+    """메인 테스트 실행"""
+    test_workload_is_seeded_and_follows_mix()
+    test_run_load_test_models_and_configs()
+    test_find_saturation()
+    print("\n✅ 모든 부하 테스트 도구 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
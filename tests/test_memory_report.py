@@ -0,0 +1,99 @@
+"""
+tests/test_memory_report.py
+데이터 구조 메모리 보고 테스트 (deep size 중복 제외, 구조별/캐피탈별 합계, N개 캐피탈 예상, 저장 방식 비교)
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from tools.memory_report import build_report, deep_size, project
+
+
+def test_deep_size_counts_shared_objects_once():
+    """같은 객체는 한 번, 배열 뷰는 원본 버퍼까지, seen 공유 시 두 번째 구조는 새 객체만"""
+    print("=" * 80)
+    print("메모리 보고 테스트")
+    print("=" * 80)
+
+    repeat = 100
+    text = "잔존율" * repeat
+    shared = {'a': text, 'b': text, 'c': [text, text]}
+    separate = {'a': text, 'b': "잔존율" * repeat, 'c': [text, text]}  # 같은 내용, 다른 객체
+    assert deep_size(separate)['bytes'] - deep_size(shared)['bytes'] == sys.getsizeof(text)
+    assert deep_size(shared)['types']['str']['count'] == 4  # 'a', 'b', 'c', text
+
+    array = np.zeros(100_000)
+    assert deep_size({'view': array[10:20]})['bytes'] >= array.nbytes
+    assert deep_size([None, True, 5, 1000])['objects'] == 2  # list + 1000
+
+    seen = set()
+    first = deep_size(shared, seen)
+    again = deep_size({'same': shared}, seen)
+    assert again['objects'] == 2 and first['objects'] == deep_size(shared)['objects']
+    print("✓ 공유 객체 1회, 배열 버퍼 포함, 공용 상수 제외")
+
+
+def test_build_report():
+    """구조별/캐피탈별 크기, 공용 + N × 캐피탈당 예상, 저장 방식 비교"""
+    report = build_report(counts=[1, 10], backends=['artifact', 'encoded'])
+    json.dumps(report)
+
+    structures = report['structures']
+    for name in ("vehicle_master", "residual_rates", "master_carinfo"):
+        assert structures[name]['bytes'] > 0 and structures[name]['entries'], name
+    capitals = list(report['capitals'])
+    assert set(structures['residual_rates']['entries']) == set(capitals)
+    assert set(structures['master_carinfo']['entries']) == {'master_carinfo', 'master_index'}
+
+    for capital, entry in report['capitals'].items():
+        residual = structures['residual_rates']['entries'][capital]['bytes']
+        assert entry['parts'][f"residual_rates:{capital}"] == residual
+        assert entry['bytes'] == sum(entry['parts'].values())
+    assert report['shared']['bytes'] == sum(report['shared']['parts'].values())
+    assert {'master_carinfo:master_carinfo', 'master_carinfo:master_index'} <= set(report['shared']['parts'])
+    assert 0 < report['total']['bytes'] <= sum(s['bytes'] for s in structures.values())
+
+    projection = report['projection']
+    assert projection['capitals']['1'] == projection['fixed_bytes'] + projection['per_capital_bytes']
+    assert projection['capitals']['10'] > projection['capitals']['1']
+
+    backends = report['backends']
+    assert set(backends['projection']) == {'artifact', 'encoded'}
+    # 현재 로더가 아티팩트를 dict 로 풀어 두므로 artifact 방식 예상 = 현재 예상
+    for n in ('1', '10'):
+        assert abs(backends['projection']['artifact'][n] - projection['capitals'][n]) <= projection['capitals'][n] * 0.01
+    for name, results in backends['files'].items():
+        assert results['encoded']['bytes'] < results['artifact']['bytes'], name
+
+    try:
+        build_report(backends=['없는 방식'])
+        assert False, "알 수 없는 저장 방식은 ValueError"
+    except ValueError:
+        pass
+    print(f"✓ 캐피탈 {len(capitals)}곳: 공용 {projection['fixed_bytes']:,} + 캐피탈당 "
+          f"{projection['per_capital_bytes']:,} bytes → 10곳 {projection['capitals']['10']:,} bytes")
+
+
+def test_project():
+    """예상 = 공용 + N × 평균"""
+    assert project(100, [10, 30], [0, 1, 5]) == {'0': 100, '1': 120, '5': 200}
+    assert project(100, [], [3]) == {'3': 100}
+    print("✓ N개 캐피탈 예상")
+
+
+def main():
+    """메인 테스트 실행"""
+    test_deep_size_counts_shared_objects_once()
+    test_build_report()
+    test_project()
+    print("\n✅ 모든 메모리 보고 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""
+tests/test_parity_runner.py
+저장 견적 일괄 패리티 검증 테스트 (탐색/매니페스트, 병렬 검증, 차이 분포/오차 상위 보고)
+"""
+
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from excel_reverse_engineering.formula_engine import FormulaBook
+from excel_reverse_engineering.synthetic_workbooks import write_mg_quote_workbook, write_mg_saved_quote
+from tools.mg_validator import QUOTE_CELLS, SCENARIO_INPUTS, generate_scenarios, read_mg_quote
+from tools.parity_runner import collect_quotes, run_parity
+
+QUOTES = 12
+
+
+def _saved_quote_cells(tmp: Path):
+    """합성 견적 시트 수식으로 계산한 '엑셀 저장 값' (시나리오별 셀 → 값)"""
+    with FormulaBook(write_mg_quote_workbook(tmp / "template.xlsx"), default_sheet='운용리스') as book:
+        model = book.compile(list(QUOTE_CELLS.values()), inputs=list(SCENARIO_INPUTS.values()))
+    for scenario in generate_scenarios(QUOTES, seed=3):
+        yield model.evaluate({SCENARIO_INPUTS[field]: value for field, value in scenario.items()})
+
+
+def _write_corpus(tmp: Path) -> Path:
+    """
+    quotes/ 아래 MG 견적 12개 + 판별 불가 1개 + 엑셀 임시 파일 1개
+
+    - mg_quote_03: 월 납입금 +3,000원 (실패)
+    - mg_quote_07: 월 납입금 -500원 (허용오차 안)
+    - 2510/mg_quote_10: 계산 값 없이 저장 (오류)
+    """
+    quotes = tmp / "quotes"
+    (quotes / "2510").mkdir(parents=True)
+    for idx, cells in enumerate(_saved_quote_cells(tmp)):
+        if idx == 3:
+            cells['AG14'] += 3000
+        elif idx == 7:
+            cells['AG14'] -= 500
+        elif idx == 10:
+            cells['AG14'] = None
+        folder = quotes / "2510" if idx >= 10 else quotes
+        write_mg_saved_quote(folder / f"mg_quote_{idx:02d}.xlsx", cells, vehicle_rows=50 if idx == 0 else 0)
+
+    write_mg_saved_quote(quotes / "견적_unknown.xlsx", {'K14': 1})
+    write_mg_saved_quote(quotes / "~$mg_quote_00.xlsx", {'K14': 1})
+    return quotes
+
+
+def test_directory_parity_report():
+    """디렉토리 탐색 → 병렬 검증 → 통과율/분포/오차 상위/오류"""
+    print("=" * 80)
+    print("견적 패리티 검증 테스트")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        quotes = _write_corpus(Path(tmp))
+        quote = read_mg_quote(str(quotes / "mg_quote_00.xlsx"))
+        assert quote['vehicle_name'] == 'BMW X5 30d xLine' and quote['total_down_payment'] == 0
+
+        jobs, skipped = collect_quotes(quotes)
+        assert len(jobs) == QUOTES and all(capital_id == 'mg_capital' for _, capital_id in jobs)
+        assert [Path(path).name for path in skipped] == ["견적_unknown.xlsx"]
+
+        report = run_parity(jobs, tolerance=2000, workers=2, worst=5, skipped=skipped)
+
+    summary = report['summary']
+    assert summary['files'] == QUOTES
+    assert (summary['passed'], summary['failed'], summary['errors']) == (QUOTES - 2, 1, 1)
+    assert summary['pass_rate'] == round((QUOTES - 2) / QUOTES, 4)
+    assert summary['max'] == 3000 and summary['mean'] == round(3500 / (QUOTES - 1), 1)
+    assert summary['bias'] == round((-3000 + 500) / (QUOTES - 1), 1), "계산기 - 엑셀"
+    assert report['capitals']['mg_capital'] == summary
+
+    worst = report['worst']
+    assert [Path(item['path']).name for item in worst] == ["mg_quote_03.xlsx", "mg_quote_07.xlsx"]
+    assert worst[0]['status'] == 'fail' and worst[1]['status'] == 'pass'
+    assert Path(report['errors'][0]['path']).name == "mg_quote_10.xlsx"
+    assert "AG14" in report['errors'][0]['error']
+
+    fields = next(r for r in report['results'] if r['path'].endswith("mg_quote_00.xlsx"))['fields']
+    assert all(item['diff'] == 0 for item in fields.values())
+    json.dumps(report, ensure_ascii=False)
+    print(f"✓ 견적 {summary['files']}개: 통과율 {summary['pass_rate']:.1%}, "
+          f"평균 {summary['mean']}원, p95 {summary['p95']}원, 최대 {summary['max']}원")
+
+
+def test_manifest_inputs():
+    """JSON/CSV 매니페스트 (상대 경로, 캐피탈 지정), 없는 파일은 오류 항목"""
+    with tempfile.TemporaryDirectory() as tmp:
+        quotes = _write_corpus(Path(tmp))
+
+        manifest = quotes / "manifest.json"
+        manifest.write_text(json.dumps([
+            "mg_quote_00.xlsx",
+            {"path": "견적_unknown.xlsx"},
+            {"path": "missing.xlsx", "capital_id": "mg_capital"},
+        ], ensure_ascii=False), encoding='utf-8')
+        jobs, skipped = collect_quotes(manifest=manifest)
+        assert len(jobs) == 2 and len(skipped) == 1
+
+        report = run_parity(jobs, workers=1)
+        assert report['summary']['passed'] == 1 and report['summary']['errors'] == 1
+        assert "FileNotFoundError" in report['errors'][0]['error']
+
+        csv_manifest = quotes / "manifest.csv"
+        csv_manifest.write_text("path,capital_id\nmg_quote_01.xlsx,\n견적_unknown.xlsx,mg_capital\n",
+                                encoding='utf-8')
+        jobs, skipped = collect_quotes(manifest=csv_manifest)
+        assert [capital_id for _, capital_id in jobs] == ['mg_capital', 'mg_capital'] and not skipped
+
+        try:
+            collect_quotes(quotes, capital_id='unknown_capital')
+            assert False, "어댑터 없는 캐피탈은 ValueError"
+        except ValueError:
+            pass
+    print("✓ JSON/CSV 매니페스트, 없는 파일/캐피탈 처리")
+
+
+def main():
+    """메인 테스트 실행"""
+    test_directory_parity_report()
+    test_manifest_inputs()
+    print("\n✅ 모든 패리티 검증 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,129 @@
+"""
+tests/test_quote_cache.py
+견적 키 정규화 + LRU/TTL 견적 캐시 테스트
+"""
+
+import sys
+import time
+import tempfile
+import multiprocessing
+from pathlib import Path
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.quote_cache import QuoteCache, make_quote_key, data_version, get_quote_cache
+from core.quote import quote_for_capital
+from core.comparison import compare_all
+from data import vehicle_master
+
+VEHICLE_ID = "AUDI_A3_A3_40_TFSI"
+
+
+def _key(**overrides):
+    params = dict(capital_id="meritz_capital", vehicle_id=VEHICLE_ID, vehicle_price=41_600_000,
+                  contract_months=36, annual_mileage=20000)
+    params.update(overrides)
+    return make_quote_key(**params)
+
+
+def test_quote_key_canonical():
+    """같은 견적은 같은 키 (타입/표기/플래그 순서 무관)"""
+    assert _key() == _key(vehicle_price=41_600_000.0, contract_months="36", annual_mileage=20000.0)
+    assert _key(flags=["hybrid", "ev", "ev"]) == _key(flags=("ev", "hybrid"))
+    assert _key(down_payment_percent=10) == _key(down_payment_percent=10.00001)
+    assert _key() != _key(grade_options=["west_normal"])
+    assert _key() != _key(region="부산")
+    assert _key().data_version == data_version()
+    assert _key().digest() == _key().digest() and len({_key().digest(), _key(contract_months=48).digest()}) == 2
+
+
+def test_lru_eviction_and_ttl():
+    """최대 항목 초과 시 LRU 제거, TTL 지나면 만료"""
+    cache = QuoteCache(max_entries=2, ttl=0.2)
+    k1, k2, k3 = _key(contract_months=24), _key(contract_months=36), _key(contract_months=48)
+
+    cache.put(k1, {'v': 1})
+    cache.put(k2, {'v': 2})
+    assert cache.get(k1) == {'v': 1}  # k1 최근 사용 → k2가 제거 대상
+    cache.put(k3, {'v': 3})
+
+    assert cache.get(k2) is None
+    assert cache.get(k1) == {'v': 1} and cache.get(k3) == {'v': 3}
+
+    time.sleep(0.25)
+    assert cache.get(k1) is None
+
+    stats = cache.stats()
+    assert stats['evictions'] == 1 and stats['expirations'] == 1
+    assert stats['hits'] == 3 and stats['misses'] == 2
+    print(f"✓ LRU/TTL: {stats}")
+
+
+def test_returned_values_are_copies():
+    """반환 값을 수정해도 캐시된 값은 그대로"""
+    cache = QuoteCache()
+    cache.put(_key(), {'details': {'monthly_payment': 1000}})
+    cache.get(_key())['details']['monthly_payment'] = 0
+    assert cache.get(_key())['details']['monthly_payment'] == 1000
+
+
+def _disk_writer(disk_path, value):
+    """다른 프로세스에서 디스크 캐시에 기록"""
+    QuoteCache(disk_path=disk_path).put(_key(), value)
+
+
+def test_disk_tier_shared_between_processes():
+    """디스크 계층: 다른 프로세스가 저장한 견적을 읽음"""
+    with tempfile.TemporaryDirectory() as tmp:
+        disk_path = str(Path(tmp) / "quotes.db")
+
+        process = multiprocessing.get_context("spawn").Process(
+            target=_disk_writer, args=(disk_path, {'monthly_payment': 813000})
+        )
+        process.start()
+        process.join(30)
+        assert process.exitcode == 0
+
+        reader = QuoteCache(disk_path=disk_path)
+        assert reader.get(_key()) == {'monthly_payment': 813000}
+        assert reader.stats()['disk_hits'] == 1
+        assert len(reader) == 1  # 메모리로 승격
+
+        reader.clear()
+        assert QuoteCache(disk_path=disk_path).get(_key()) is None
+
+
+def test_quote_and_compare_paths_use_cache():
+    """quote_for_capital / compare_all 캐시 적중, 결과는 미사용 시와 동일"""
+    vehicle = {**vehicle_master.get_vehicle(VEHICLE_ID), 'id': VEHICLE_ID}
+    cache = get_quote_cache()
+    cache.clear()
+    cache.reset_stats()
+
+    uncached = quote_for_capital('meritz_capital', vehicle, vehicle['price'], 48, 15000, use_cache=False)
+    first = quote_for_capital('meritz_capital', vehicle, vehicle['price'], 48, 15000)
+    second = quote_for_capital('meritz_capital', vehicle, vehicle['price'], 48, 15000)
+    assert uncached == first == second
+    assert cache.stats()['hits'] == 1
+
+    expected = compare_all(vehicle, 48, 15000, executor=None, use_cache=False)
+    assert compare_all(vehicle, 48, 15000, executor=None) == expected
+    hits_before = cache.stats()['hits']
+    assert compare_all(vehicle, 48, 15000, executor=None) == expected
+    assert cache.stats()['hits'] == hits_before + 1
+    print(f"✓ 견적/비교 캐시: {cache.stats()}")
+
+
+def main():
+    """메인 테스트 실행"""
+    test_quote_key_canonical()
+    test_lru_eviction_and_ttl()
+    test_returned_values_are_copies()
+    test_disk_tier_shared_between_processes()
+    test_quote_and_compare_paths_use_cache()
+    print("\n✅ 모든 견적 캐시 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
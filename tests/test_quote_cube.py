@@ -0,0 +1,104 @@
+"""
+tests/test_quote_cube.py
+표준 견적 큐브 테스트 (빌드 → 조회 = 실시간 계산, 비표준 입력은 폴백)
+"""
+
+import os
+import sys
+import random
+import tempfile
+from pathlib import Path
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.handlers import handle_quote
+from core.quote import quote_for_capital
+from core.quote_cube import build_quote_cube, cube_quote, reload_quote_cube
+from data import vehicle_master
+
+VEHICLES = {"meritz_capital": "AUDI_A3_A3_40_TFSI", "mg_capital": "AUDI_A3_40_TFSI"}
+
+
+def test_cube_matches_live_quotes():
+    """큐브 조회 = quote_for_capital (무작위 표본, 금액 타입 포함)"""
+    print("=" * 80)
+    print("표준 견적 큐브 테스트")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        summary = build_quote_cube(Path(tmp) / "cube.npz")
+        cube = reload_quote_cube(Path(tmp) / "cube.npz")
+        assert cube is not None and cube.is_current
+        print(f"✓ 빌드 {summary['elapsed']:.2f}초, {summary['bytes'] / 1024:,.0f}KB: {summary['capitals']}")
+
+        rng = random.Random(7)
+        for capital_id, arrays in cube.capitals.items():
+            vehicle_ids = arrays['vehicle_ids'].tolist()
+            for _ in range(300):
+                vehicle_id = rng.choice(vehicle_ids)
+                months = int(rng.choice(arrays['terms']))
+                mileage = int(rng.choice(arrays['mileages']))
+                percent = float(rng.choice(arrays['down_payment_percents']))
+
+                got = cube.lookup(capital_id, vehicle_id, months, mileage, percent)
+                vehicle = {**vehicle_master.get_vehicle(vehicle_id, capital_id=capital_id), 'id': vehicle_id}
+                try:
+                    expected = quote_for_capital(capital_id, vehicle, vehicle['price'], months, mileage,
+                                                 percent, use_cache=False)
+                except (ValueError, TypeError):
+                    assert got is None
+                    continue
+
+                assert got['monthly_payment'] == expected['monthly_payment']
+                assert type(got['monthly_payment']) is type(expected['monthly_payment'])
+                assert got['grade_option'] == expected['grade_option']
+                assert got['residual_rate'] == expected['residual_rate']
+                for key in ('down_payment', 'total_payment', 'residual_value'):
+                    assert got['details'][key] == expected['details'][key], key
+            print(f"✓ {capital_id}: 300건 실시간 계산과 일치")
+
+
+def test_non_standard_inputs_fall_back():
+    """큐브가 없거나 비표준 입력이면 None → API는 실시간 계산"""
+    with tempfile.TemporaryDirectory() as tmp:
+        previous = os.environ.get("QUOTE_CUBE_PATH")
+        os.environ["QUOTE_CUBE_PATH"] = str(Path(tmp) / "cube.npz")
+        try:
+            params = {'capital_id': 'meritz_capital', 'vehicle_id': VEHICLES['meritz_capital'],
+                      'contract_months': 36, 'annual_mileage': 20000}
+            assert handle_quote(params)['source'] == 'live'
+
+            build_quote_cube(capital_ids=list(VEHICLES))
+            reload_quote_cube()
+
+            cubed = handle_quote(params)
+            live = handle_quote({**params, 'source': 'live'})
+            assert cubed['source'] == 'cube' and live['source'] == 'live'
+            assert cubed['monthly_payment'] == live['monthly_payment']
+
+            assert handle_quote({**params, 'down_payment_percent': 12})['source'] == 'live'
+            assert handle_quote({**params, 'vehicle_price': 40_000_000})['source'] == 'live'
+
+            for capital_id, vehicle_id in VEHICLES.items():
+                vehicle = {**vehicle_master.get_vehicle(vehicle_id, capital_id=capital_id), 'id': vehicle_id}
+                assert cube_quote(capital_id, vehicle, vehicle['price'], 36, 20000, 10) is not None
+                assert cube_quote(capital_id, vehicle, vehicle['price'] + 1, 36, 20000, 10) is None
+                assert cube_quote(capital_id, vehicle, vehicle['price'], 30, 20000, 10) is None
+            print("✓ 비표준 입력 실시간 계산 폴백")
+        finally:
+            if previous is None:
+                os.environ.pop("QUOTE_CUBE_PATH", None)
+            else:
+                os.environ["QUOTE_CUBE_PATH"] = previous
+
+
+def main():
+    """메인 테스트 실행"""
+    test_cube_matches_live_quotes()
+    test_non_standard_inputs_fall_back()
+    print("\n✅ 모든 큐브 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
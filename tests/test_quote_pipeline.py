@@ -0,0 +1,123 @@
+"""
+tests/test_quote_pipeline.py
+견적 데이터플로 테스트 (변경된 입력의 하위 노드만 재실행, 계산 결과 동일)
+"""
+
+import sys
+from pathlib import Path
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.mg_calculator import MGLeaseCalculator
+from core.quote import calculate_capital_quote
+from core.quote_pipeline import build_quote_flow
+from data import residual_rates, interest_rates
+from utils.dataflow import Dataflow
+
+TARGETS = ["payment", "acquisition", "period_rows", "mileage_rows"]
+
+INPUTS = {
+    "meritz_capital": dict(capital_id="meritz_capital", vehicle_id="AUDI_A3_A3_40_TFSI",
+                           vehicle_capital_id="meritz_capital", grade_option="aps_premium",
+                           contract_months=36, annual_mileage=20000, down_payment_percent=0),
+    "mg_capital": dict(capital_id="mg_capital", vehicle_id="AUDI_A3_40_TFSI",
+                       vehicle_capital_id="mg_capital", grade_option="snk_premium",
+                       contract_months=36, annual_mileage=20000, down_payment_percent=0),
+}
+
+
+def test_widget_change_reruns_only_downstream():
+    """선납금/주행거리 변경 시 의존 노드만 재실행"""
+    print("=" * 80)
+    print("견적 데이터플로 테스트")
+    print("=" * 80)
+
+    flow = build_quote_flow()
+    inputs = dict(INPUTS["meritz_capital"])
+    flow.run(TARGETS, **inputs)
+    assert "vehicle" in flow.last_executed
+
+    flow.run(TARGETS, **inputs)
+    assert flow.last_executed == []
+
+    inputs["down_payment_percent"] = 20
+    flow.run(TARGETS, **inputs)
+    assert set(flow.last_executed) == {"down_payment", "payment", "scenario_grid", "grid_option",
+                                       "period_rows", "mileage_rows"}
+    print(f"✓ 선납금 변경: {', '.join(flow.last_executed)}")
+
+    inputs["annual_mileage"] = 30000
+    flow.run(TARGETS, **inputs)
+    assert set(flow.last_executed) == {"residual", "payment", "period_rows"}
+    print(f"✓ 주행거리 변경: {', '.join(flow.last_executed)}")
+
+    # 다른 계약기간이지만 금리가 같으면 금리 하위는 재사용 (36 → 24개월: 장기 우대 없음)
+    inputs["contract_months"] = 24
+    flow.run(["rate"], **inputs)
+    assert flow.last_executed == ["rate"]
+    assert flow.stats()["rate"]["computes"] == 2
+
+
+def test_pipeline_matches_calculator():
+    """파이프라인 월 납입료 = calculate_capital_quote (메리츠/MG, 선납 0/20%)"""
+    for capital_id, base in INPUTS.items():
+        flow = build_quote_flow()
+        for percent in (0, 20):
+            inputs = {**base, "down_payment_percent": percent}
+            values = flow.run(["vehicle", "price", "residual", "rate", "payment", "acquisition"], **inputs)
+            vehicle = values["vehicle"]
+
+            assert values["residual"] == residual_rates.get_residual_rate(
+                capital_id, inputs["vehicle_id"], 36, 20000, grade_option=inputs["grade_option"])
+            assert values["rate"] == interest_rates.get_interest_rate(
+                capital_id=capital_id, vehicle_price=vehicle['price'], brand=vehicle['brand'],
+                is_import=vehicle['is_import'], is_ev=(vehicle['engine_cc'] == 0), contract_months=36)
+
+            expected = calculate_capital_quote(
+                capital_id, vehicle, vehicle['price'], 36, 20000,
+                values["residual"], values["rate"], down_payment=vehicle['price'] * percent / 100
+            )
+            assert values["payment"]["monthly_total"] == expected['monthly_payment']
+            assert values["acquisition"]["total"] == expected['acquisition_cost']
+
+            if capital_id == "mg_capital":
+                mg_result = MGLeaseCalculator().calculate(
+                    vehicle_price=vehicle['price'], residual_rate=values["residual"], contract_months=36,
+                    annual_mileage=20000, annual_interest_rate=values["rate"],
+                    down_payment_rate=expected['down_payment'] / expected['acquisition_cost'] if percent else 0.0,
+                )
+                assert values["acquisition"]["acquisition_tax"] == mg_result['breakdown']['acquisition_tax']
+            print(f"✓ {capital_id} 선납 {percent}%: {values['payment']['monthly_total']:,}원")
+
+
+def test_dataflow_early_cutoff():
+    """재실행 결과가 같으면 하위 노드는 재사용"""
+    calls = []
+    flow = Dataflow("test")
+    flow.add("parity", lambda n: n % 2, inputs=("n",))
+    flow.add("label", lambda parity: calls.append(parity) or ("짝수" if parity == 0 else "홀수"), deps=("parity",))
+
+    assert flow.evaluate("label", n=2) == "짝수"
+    assert flow.evaluate("label", n=4) == "짝수"
+    assert flow.last_executed == ["parity"]
+    assert flow.evaluate("label", n=5) == "홀수"
+    assert calls == [0, 1]
+
+    try:
+        flow.evaluate("label")
+        assert False, "입력 누락은 KeyError"
+    except KeyError:
+        pass
+
+
+def main():
+    """메인 테스트 실행"""
+    test_widget_change_reruns_only_downstream()
+    test_pipeline_matches_calculator()
+    test_dataflow_early_cutoff()
+    print("\n✅ 모든 데이터플로 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
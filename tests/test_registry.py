@@ -0,0 +1,128 @@
+"""
+tests/test_registry.py
+캐피탈 플러그인 레지스트리 테스트 (선언 일관성, 미등록 캐피탈 기본 정책, 지연 import/적재, 새 캐피탈 등록)
+"""
+
+import subprocess
+import sys
+import textwrap
+from pathlib import Path
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core import registry
+from core.quote import calculate_capital_quote, get_preferred_grade_options
+from core.registry import CAPITALS, CapitalSpec, DEFAULT_SPEC, get_capital, register_capital
+from data import interest_rates, residual_rates, vehicle_master
+
+ROOT = Path(__file__).parent.parent
+
+
+def test_declarations_are_consistent():
+    """선언마다 계산 방식, 차량 마스터, 금리표, 잔가 옵션이 실제로 존재"""
+    print("=" * 80)
+    print("캐피탈 레지스트리 테스트")
+    print("=" * 80)
+
+    for capital_id, spec in CAPITALS.items():
+        assert spec.capital_id == capital_id
+        assert spec.pricing in (registry.PRICING_SIMPLE, registry.PRICING_PMT)
+        assert set(spec.fallback_grade_options) <= set(spec.grade_options)
+        assert spec.rate_table in interest_rates.INTEREST_RATES
+        assert vehicle_master.vehicle_master_path(capital_id).name == f"{spec.vehicle_master}.npz"
+
+    for capital_id in residual_rates.get_available_capitals():
+        assert capital_id in CAPITALS, f"데이터만 있고 선언이 없는 캐피탈: {capital_id}"
+        assert vehicle_master.vehicle_master_path(capital_id).exists()
+        assert get_preferred_grade_options(capital_id) == CAPITALS[capital_id].fallback_grade_options
+
+    assert registry.uses_pmt("mg_capital") and not registry.uses_pmt("meritz_capital")
+    print(f"✓ 선언 {len(CAPITALS)}개: {', '.join(CAPITALS)}")
+
+
+def test_unregistered_capital_falls_back_to_default():
+    """선언이 없는 캐피탈은 메리츠 방식 + 기본 차량 마스터, 금리표는 자기 ID"""
+    spec = get_capital("new_capital")
+    assert spec == DEFAULT_SPEC._replace(capital_id="new_capital", display_name="new_capital",
+                                         rate_table="new_capital")
+    assert vehicle_master.vehicle_master_path("new_capital") == vehicle_master.vehicle_master_path(None)
+    # MG 계열 ID 는 선언이 없어도 MG 차량 마스터 (ID 접두사 규칙)
+    assert get_capital("mg_new_capital").vehicle_master == "mg_vehicle_master"
+    assert vehicle_master.vehicle_master_path("mg_new_capital").name == "mg_vehicle_master.npz"
+    try:
+        interest_rates.get_interest_rate("new_capital", vehicle_price=50_000_000)
+        assert False, "금리표가 없으면 ValueError"
+    except ValueError:
+        pass
+
+    for bad in (DEFAULT_SPEC._replace(capital_id="x", pricing="balloon"),
+                DEFAULT_SPEC._replace(capital_id="x", fallback_grade_options=[])):
+        try:
+            register_capital(bad)
+            assert False, "잘못된 선언은 ValueError"
+        except ValueError:
+            pass
+    assert "x" not in CAPITALS
+    print("✓ 미등록 캐피탈 기본 정책")
+
+
+def test_register_new_capital():
+    """기존 계산기/데이터를 재사용하는 새 캐피탈은 선언 1줄로 견적 가능"""
+    vehicle_id = residual_rates.get_all_vehicle_ids("mg_capital")[0]
+    vehicle = {**vehicle_master.get_vehicle(vehicle_id, capital_id="mg_capital"), 'id': vehicle_id}
+
+    register_capital(CapitalSpec(
+        capital_id="partner_capital", display_name="MG 제휴", plugin="core.capitals.mg",
+        pricing=registry.PRICING_PMT, vehicle_master="mg_vehicle_master",
+        grade_options={'snk_normal': 'SNK 일반잔가'}, fallback_grade_options=['snk_normal'],
+        rate_table="mg_capital",
+    ))
+    try:
+        args = (vehicle, vehicle['price'], 36, 20000, 0.5, 0.06, 5_000_000)
+        assert calculate_capital_quote("partner_capital", *args) == calculate_capital_quote("mg_capital", *args)
+        # 선언의 차량 마스터/금리표가 데이터 로더에 전달됨
+        assert vehicle_master.vehicle_master_path("partner_capital").name == "mg_vehicle_master.npz"
+        assert (interest_rates.get_interest_rate("partner_capital", vehicle_price=50_000_000)
+                == interest_rates.get_interest_rate("mg_capital", vehicle_price=50_000_000))
+        assert registry.display_name("partner_capital") == "MG 제휴"
+    finally:
+        CAPITALS.pop("partner_capital")
+        vehicle_master.VEHICLE_MASTER_FILES.pop("partner_capital")
+        interest_rates.RATE_TABLES.pop("partner_capital")
+    print("✓ 새 캐피탈 등록")
+
+
+def test_plugins_and_data_load_on_first_use():
+    """시작 시 계산기 모듈/캐피탈 데이터를 읽지 않고, 쓰는 캐피탈만 import/적재"""
+    script = textwrap.dedent("""
+        import sys
+        from api import handlers
+        from core.registry import loaded_plugins
+        from data.residual_rates import _RESIDUAL_CACHE
+        from data.vehicle_master import _VEHICLE_CACHE
+
+        print(loaded_plugins(), 'core.mg_calculator' in sys.modules, len(_RESIDUAL_CACHE.snapshot()))
+        handlers.handle_quote({'capital_id': 'meritz_capital', 'vehicle_id': 'AUDI_A3_A3_40_TFSI',
+                               'contract_months': 36, 'annual_mileage': 20000, 'source': 'live'})
+        print(loaded_plugins(), 'core.mg_calculator' in sys.modules, sorted(_RESIDUAL_CACHE.snapshot()),
+              sorted(_VEHICLE_CACHE.snapshot()))
+    """)
+    result = subprocess.run([sys.executable, "-c", script], cwd=ROOT, capture_output=True, text=True, check=True)
+    before, after = result.stdout.strip().splitlines()
+    assert before == "[] False 0"
+    assert after == "['core.capitals.meritz'] False ['meritz_capital'] ['vehicle_master.npz']"
+    print(f"✓ 지연 로드: {after}")
+
+
+def main():
+    """메인 테스트 실행"""
+    test_declarations_are_consistent()
+    test_unregistered_capital_falls_back_to_default()
+    test_register_new_capital()
+    test_plugins_and_data_load_on_first_use()
+    print("\n✅ 모든 캐피탈 레지스트리 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,158 @@
+"""
+tests/test_scenario_grid.py
+시나리오 그리드(배열 계산) 테스트 - 스칼라 계산과 원 단위 일치 확인
+"""
+
+import sys
+import random
+from pathlib import Path
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from core.batch_pricing import round_half_even, batch_operating_lease
+from core.calculator import calculate_operating_lease
+from core.registry import get_capital
+from core.quote import calculate_capital_quote, get_preferred_grade_options, resolve_residual_rate
+from core.scenario_grid import build_scenario_grid, slice_grid
+from data import vehicle_master, interest_rates, residual_rates
+
+VEHICLE_IDS = {
+    "meritz_capital": "AUDI_A3_A3_40_TFSI",
+    "mg_capital": "AUDI_A3_40_TFSI",
+}
+
+
+def test_round_half_even_matches_builtin():
+    """배열 반올림이 파이썬 round(x, -3)와 동일"""
+    rng = random.Random(42)
+    values = [500.0, 1500.0, 2500.0, -1500.0, 813499.9999, 813500.0]
+    values += [rng.uniform(0, 5_000_000) for _ in range(2000)]
+
+    expected = [round(v, -3) for v in values]
+    assert round_half_even(values).tolist() == expected
+
+
+def test_batch_operating_lease_matches_scalar():
+    """정액법 배열 계산 = calculate_operating_lease (무작위 입력)"""
+    rng = random.Random(7)
+    for _ in range(300):
+        price = rng.randrange(20_000_000, 200_000_000, 10_000)
+        months = rng.choice([24, 36, 48, 60])
+        down = rng.choice([0, price * 0.1, price * 0.3])
+        residual = rng.uniform(0.2, 0.7)
+        rate = rng.uniform(0.03, 0.09)
+        acq = price + price / 1.1 * 0.07 + 100_000
+
+        scalar = calculate_operating_lease(
+            vehicle_price=price, contract_months=months, down_payment=down,
+            residual_rate=residual, annual_rate=rate, acquisition_tax_rate=0.0,
+            registration_fee=100_000, annual_car_tax=520_000, method='simple',
+            acquisition_cost=acq
+        )
+        batch = batch_operating_lease(
+            price, months, down, residual, rate, 0.0, 100_000, 520_000,
+            'simple', acq
+        )
+        for key in ('monthly_total', 'total_payment', 'total_interest', 'residual_value'):
+            assert float(batch[key]) == scalar[key], key
+
+
+def test_grid_matches_scalar_quotes():
+    """그리드 각 셀 = 캐피탈별 스칼라 견적 (메리츠/MG)"""
+    print("=" * 80)
+    print("시나리오 그리드 테스트")
+    print("=" * 80)
+
+    for capital_id, vehicle_id in VEHICLE_IDS.items():
+        vehicle = vehicle_master.get_vehicle(vehicle_id, capital_id=capital_id)
+        down_payment = vehicle['price'] * 0.1
+        grid = build_scenario_grid(capital_id, vehicle_id, down_payment=down_payment)
+
+        checked = 0
+        for g, grade_option in enumerate(grid['grade_options']):
+            for t, term in enumerate(grid['terms']):
+                annual_rate = interest_rates.get_interest_rate(
+                    capital_id=capital_id,
+                    vehicle_price=vehicle['price'],
+                    brand=vehicle['brand'],
+                    is_import=vehicle['is_import'],
+                    is_ev=(vehicle['engine_cc'] == 0),
+                    contract_months=term
+                )
+                for m, mileage in enumerate(grid['mileages']):
+                    if not grid['available'][t, m, g]:
+                        continue
+                    details = calculate_capital_quote(
+                        capital_id, vehicle, vehicle['price'], term, mileage,
+                        float(grid['residual_rate'][t, m, g]), annual_rate,
+                        down_payment=down_payment
+                    )
+                    assert grid['monthly_payment'][t, m, g] == details['monthly_payment']
+                    checked += 1
+
+        assert checked > 0
+        print(f"✓ {capital_id}: {checked}개 셀 일치 ({len(grid['grade_options'])}개 잔가옵션)")
+
+
+def test_grid_applies_single_quote_fallback():
+    """셀 단위 잔가옵션 폴백 = 단건 견적 경로 (resolve_residual_rate), 적용 옵션 기록"""
+    total_filled = 0
+    for capital_id in residual_rates.get_available_capitals():
+        data = residual_rates._load_residual_rates(capital_id)
+        filled = 0
+        # 선언된 잔가 옵션 전체로 요청 (차량에 없는 옵션은 다른 옵션으로 채워짐)
+        declared = list(get_capital(capital_id).grade_options)
+        for vehicle_id in residual_rates.get_all_vehicle_ids(capital_id)[::25]:
+            try:
+                grid = build_scenario_grid(capital_id, vehicle_id, grade_options=declared)
+            except ValueError:
+                continue  # 가격 없는 차량
+            for g, grade_option in enumerate(grid['grade_options']):
+                options = [grade_option] + get_preferred_grade_options(capital_id)
+                for t, term in enumerate(grid['terms']):
+                    for m, mileage in enumerate(grid['mileages']):
+                        try:
+                            rate, _ = resolve_residual_rate(capital_id, vehicle_id, term, mileage, options)
+                        except ValueError:
+                            assert not grid['available'][t, m, g]
+                            assert grid['applied_grade_option'][t, m, g] is None
+                            continue
+                        applied = grid['applied_grade_option'][t, m, g]
+                        assert grid['residual_rate'][t, m, g] == rate
+                        assert data[vehicle_id][applied][str(term)][str(mileage)] == rate
+                        filled += applied != grade_option
+        total_filled += filled
+        print(f"✓ {capital_id}: 다른 옵션으로 채운 셀 {filled}개")
+    assert total_filled > 0
+
+
+def test_slice_grid():
+    """단면 조회: 기간별/주행거리별 행, 데이터 없는 셀 제외"""
+    grid = build_scenario_grid("meritz_capital", VEHICLE_IDS["meritz_capital"])
+    option = grid['grade_options'][0]
+
+    by_term = slice_grid(grid, option, annual_mileage=20000)
+    by_mileage = slice_grid(grid, option, contract_months=36)
+
+    assert [row['contract_months'] for row in by_term] == sorted(row['contract_months'] for row in by_term)
+    assert all(row['annual_mileage'] == 20000 for row in by_term)
+    assert all(row['contract_months'] == 36 for row in by_mileage)
+    assert all(not np.isnan(row['monthly_payment']) for row in by_term + by_mileage)
+    assert all(row['grade_option'] for row in by_term + by_mileage)
+
+
+def main():
+    """메인 테스트 실행"""
+    test_round_half_even_matches_builtin()
+    test_batch_operating_lease_matches_scalar()
+    test_grid_matches_scalar_quotes()
+    test_grid_applies_single_quote_fallback()
+    test_slice_grid()
+    print("\n✅ 모든 시나리오 그리드 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
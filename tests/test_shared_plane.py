@@ -0,0 +1,310 @@
+"""
+tests/test_shared_plane.py
+공유 메모리 데이터 평면 테스트 (게시/매핑 일치, 읽기 전용, 버전 교체, 워커 프로세스,
+데이터 버전 변경, data → core import 없음, API 서버 평면 모드)
+"""
+
+import json
+import os
+import subprocess
+import sys
+import textwrap
+import time
+import urllib.request
+from contextlib import contextmanager
+from pathlib import Path
+
+import numpy as np
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from api.server import BackgroundServer, QuoteServer
+from core.deal_search import _CATALOG_CACHE, _build_catalog, search_deals
+from core.quote_cache import refresh_data_version
+from api.handlers import handle_deals, handle_grid, handle_quote
+from data import residual_rates, shared_plane, vehicle_master
+from core.shared_plane_publisher import PlanePublisher
+from data.shared_plane import _map_readonly
+
+ROOT = Path(__file__).parent.parent
+PLANE_NAME = f"lease_plane_test_{os.getpid()}"
+WORKER_QUOTES = [('meritz_capital', 'AUDI_A3_A3_40_TFSI'), ('mg_capital', 'AUDI_A3_40_TFSI')]
+
+
+@contextmanager
+def _data_file_touched():
+    """잔존율 파일 수정 시각만 바꿔 데이터 버전 변경 (끝나면 원래 시각과 데이터 버전으로 복원)"""
+    path = ROOT / "data" / "residual_rates" / "mg_capital.npz"
+    stat = path.stat()
+    os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+    try:
+        yield
+    finally:
+        os.utime(path, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+        refresh_data_version()
+
+
+def test_publish_and_attach():
+    """매핑한 배열 = 로컬 컴파일 결과, 쓰기 불가, 예산 검색/잔존율/잔가 옵션/차량 조회 결과 동일"""
+    print("=" * 80)
+    print("공유 메모리 데이터 평면 테스트")
+    print("=" * 80)
+
+    expected_deals = search_deals(800_000, top_k=30, terms=[36, 48])
+    expected_vehicles = {c: dict(vehicle_master._load_vehicles(c)) for c in (None, 'mg_capital')}
+    expected_fallback = {}  # 없는 옵션 → 차량의 첫 번째 옵션 (없으면 ValueError)
+    for capital_id in residual_rates.get_available_capitals():
+        for vehicle_id in _build_catalog(capital_id)['vehicle_ids'][::25]:
+            try:
+                rate = residual_rates.get_residual_rate(capital_id, vehicle_id, 36, 20000, 'no_such_option')
+            except ValueError:
+                rate = ValueError
+            expected_fallback[capital_id, vehicle_id] = rate
+    with PlanePublisher(PLANE_NAME) as publisher:
+        info = publisher.publish()
+        shared_plane.enable(PLANE_NAME)
+        try:
+            plane = shared_plane.get_plane()
+            assert plane is not None and plane.version == 1 and plane.segment == info['segment']
+
+            for capital_id in residual_rates.get_available_capitals():
+                local = _build_catalog(capital_id)
+                shared = plane.catalog(capital_id)
+                assert set(shared) == set(local)
+                for key, value in local.items():
+                    if isinstance(value, np.ndarray):
+                        assert np.array_equal(shared[key], value.astype(str) if value.dtype == object else value,
+                                              equal_nan=value.dtype.kind == 'f'), key
+                        assert not shared[key].flags.writeable and not shared[key].flags.owndata
+                    else:
+                        assert shared[key] == value, key
+
+                residual = shared['residual_rate']
+                try:
+                    residual[0, 0, 0, 0] = 0.0
+                    assert False, "공유 배열은 읽기 전용"
+                except ValueError:
+                    pass
+
+                data = residual_rates._load_residual_rates(capital_id)
+                for vehicle_id in shared['vehicle_ids'][::50]:
+                    for grade_option, table in data[vehicle_id].items():
+                        for months, by_mileage in (table or {}).items():
+                            for mileage, rate in (by_mileage or {}).items():
+                                found = plane.residual_rate(capital_id, vehicle_id, int(months), int(mileage), grade_option)
+                                assert found == rate, (capital_id, vehicle_id, grade_option, months, mileage)
+                assert plane.residual_rate(capital_id, "없는 차량", 36, 20000, shared['grade_options'][0]) is None
+
+                for vehicle_id in shared['vehicle_ids']:
+                    options = [option for option, table in data[vehicle_id].items() if table]
+                    assert residual_rates.get_grade_options(capital_id, vehicle_id) == options, vehicle_id
+
+            for (capital_id, vehicle_id), expected in expected_fallback.items():
+                try:
+                    rate = residual_rates.get_residual_rate(capital_id, vehicle_id, 36, 20000, 'no_such_option')
+                except ValueError:
+                    rate = ValueError
+                assert rate == expected, (capital_id, vehicle_id)
+
+            for capital_id, expected in expected_vehicles.items():
+                vehicles = vehicle_master._load_vehicles(capital_id)
+                assert isinstance(vehicles, shared_plane.PlaneVehicles)
+                assert dict(vehicles.items()) == expected and len(vehicles) == len(expected)
+                vehicle_id = next(iter(expected))
+                assert vehicle_master.get_vehicle(vehicle_id, capital_id) == expected[vehicle_id]
+
+            _CATALOG_CACHE.clear()
+            assert search_deals(800_000, top_k=30, terms=[36, 48])['results'] == expected_deals['results']
+            assert len(_CATALOG_CACHE.snapshot()) == 0, "평면 모드에서는 카탈로그를 직접 컴파일하지 않음"
+        finally:
+            shared_plane.disable()
+    print(f"✓ 게시 {info['bytes']:,} bytes ({info['elapsed']:.2f}초), 매핑 결과 일치")
+
+
+def test_version_swap():
+    """새 버전 게시 → 워커는 다음 조회에서 교체, 이전 배열은 계속 읽힘, 이전 세그먼트는 unlink"""
+    with PlanePublisher(PLANE_NAME) as publisher:
+        publisher.publish()
+        shared_plane.enable(PLANE_NAME)
+        try:
+            old_plane = shared_plane.get_plane()
+            old_residual = old_plane.catalog("meritz_capital")['residual_rate']
+            checksum = float(np.nansum(old_residual))
+
+            assert publisher.refresh() is False  # 데이터 변경 없음
+            info = publisher.publish()
+            plane = shared_plane.get_plane()
+            assert plane.version == 2 and plane.segment == info['segment'] != old_plane.segment
+            assert float(np.nansum(old_residual)) == checksum
+            try:
+                _map_readonly(old_plane.segment)
+                assert False, "교체된 세그먼트는 unlink"
+            except FileNotFoundError:
+                pass
+
+            try:
+                PlanePublisher(PLANE_NAME)
+                assert False, "같은 이름의 게시자는 ValueError"
+            except ValueError:
+                pass
+        finally:
+            publisher.close()
+            assert shared_plane.get_plane() is None  # 게시자 종료 → 자체 로더
+            shared_plane.disable()
+    print("✓ 버전 교체")
+
+
+def test_worker_processes_attach_without_loading():
+    """워커 프로세스는 환경 변수로 평면을 매핑하고 차량/잔존율/카탈로그를 직접 적재하지 않음"""
+    script = textwrap.dedent("""
+        import json
+        from api.handlers import handle_deals, handle_grid, handle_quote
+        from core.deal_search import _CATALOG_CACHE, compile_catalog, search_deals
+        from data import residual_rates
+        from data.residual_rates import _RESIDUAL_CACHE
+        from data.vehicle_master import _VEHICLE_CACHE
+
+        deals = search_deals(800000, top_k=10)
+        rate = residual_rates.get_residual_rate('meritz_capital', 'AUDI_A3_A3_40_TFSI', 36, 20000, 'aps_premium')
+        residual = compile_catalog('mg_capital')['residual_rate']
+        quotes = [handle_quote({'capital_id': c, 'vehicle_id': v, 'contract_months': 36, 'annual_mileage': 20000,
+                                'source': 'live'})['monthly_payment'] for c, v in QUOTES]
+        grids = [handle_grid({'capital_id': c, 'vehicle_id': v})['monthly_payment'] for c, v in QUOTES]
+        handle_deals({'max_monthly_payment': 700000, 'top_k': 5})
+        print(json.dumps({'deals': [r['vehicle_id'] for r in deals['results']], 'rate': rate,
+                          'quotes': quotes, 'grids': grids,
+                          'compiled': len(_CATALOG_CACHE.snapshot()), 'loaded': len(_RESIDUAL_CACHE.snapshot()),
+                          'vehicles': len(_VEHICLE_CACHE.snapshot()), 'writeable': residual.flags.writeable}))
+    """).replace("QUOTES", repr(WORKER_QUOTES))
+    expected = [r['vehicle_id'] for r in search_deals(800_000, top_k=10)['results']]
+    expected_quotes = [handle_quote({'capital_id': c, 'vehicle_id': v, 'contract_months': 36, 'annual_mileage': 20000,
+                                     'source': 'live'})['monthly_payment'] for c, v in WORKER_QUOTES]
+    expected_grids = [json.loads(json.dumps(handle_grid({'capital_id': c, 'vehicle_id': v})['monthly_payment']))
+                      for c, v in WORKER_QUOTES]
+
+    with PlanePublisher(PLANE_NAME) as publisher:
+        publisher.publish()
+        env = {**os.environ, shared_plane.PLANE_ENV: PLANE_NAME}
+        workers = [subprocess.Popen([sys.executable, "-c", script], cwd=ROOT, env=env,
+                                    stdout=subprocess.PIPE, text=True) for _ in range(2)]
+        outputs = [json.loads(worker.communicate(timeout=60)[0]) for worker in workers]
+
+    expected_rate = residual_rates.get_residual_rate('meritz_capital', 'AUDI_A3_A3_40_TFSI', 36, 20000, 'aps_premium')
+    for output in outputs:
+        assert output == {'deals': expected, 'rate': expected_rate, 'quotes': expected_quotes, 'grids': expected_grids,
+                          'compiled': 0, 'loaded': 0, 'vehicles': 0, 'writeable': False}
+    print(f"✓ 워커 {len(outputs)}개: 견적/그리드/예산 검색 결과 동일, 카탈로그 컴파일 0, 잔존율/차량 마스터 적재 0")
+
+
+def test_worker_adopts_new_data_version():
+    """데이터 버전이 바뀐 새 평면 게시 → 이미 떠 있는 워커 프로세스도 버전을 다시 계산해 계속 매핑"""
+    script = textwrap.dedent("""
+        import json, sys
+        from core.quote_cache import data_version
+        from data import shared_plane
+        from data.residual_rates import _RESIDUAL_CACHE
+
+        def report():
+            plane = shared_plane.get_plane()
+            print(json.dumps({'version': plane.version if plane else None, 'data_version': data_version(),
+                              'loaded': len(_RESIDUAL_CACHE.snapshot())}), flush=True)
+
+        report()
+        sys.stdin.readline()
+        report()
+    """)
+
+    with PlanePublisher(PLANE_NAME) as publisher:
+        first = dict(publisher.publish())
+        env = {**os.environ, shared_plane.PLANE_ENV: PLANE_NAME}
+        worker = subprocess.Popen([sys.executable, "-c", script], cwd=ROOT, env=env,
+                                  stdin=subprocess.PIPE, stdout=subprocess.PIPE, text=True)
+        try:
+            before = json.loads(worker.stdout.readline())
+            with _data_file_touched():
+                assert publisher.refresh() is True
+                second = publisher.info
+                worker.stdin.write("\n")
+                worker.stdin.flush()
+                after = json.loads(worker.stdout.readline())
+        finally:
+            worker.communicate(timeout=60)
+
+    assert second['data_version'] != first['data_version']
+    assert before == {'version': 1, 'data_version': first['data_version'], 'loaded': 0}
+    assert after == {'version': 2, 'data_version': second['data_version'], 'loaded': 0}
+    print(f"✓ 데이터 버전 변경 {first['data_version']} → {second['data_version']}: 워커가 새 평면 매핑")
+
+
+def test_data_layer_does_not_import_core():
+    """데이터 로더/평면만 import 해도 core 는 적재되지 않음 (평면은 core 가 버전 함수를 등록하기 전에는 꺼짐)"""
+    script = textwrap.dedent("""
+        import json, sys
+        from data import interest_rates, residual_rates, shared_plane, tax_policies, vehicle_master, warmup
+
+        shared_plane.enable('lease_plane_unused')
+        print(json.dumps({'core': sorted(m for m in sys.modules if m == 'core' or m.startswith('core.')),
+                          'plane': shared_plane.get_plane() is not None}))
+    """)
+    output = subprocess.run([sys.executable, "-c", script], cwd=ROOT, stdout=subprocess.PIPE,
+                            text=True, check=True, timeout=60).stdout
+    assert json.loads(output) == {'core': [], 'plane': False}
+    print("✓ data 레이어는 core 를 import 하지 않음")
+
+
+def test_api_server_shared_mode():
+    """--shared-plane: 서버가 게시하고 프로세스 워커가 매핑해 응답"""
+    try:
+        QuoteServer(executor="thread", shared=True)
+        assert False, "스레드 워커는 평면 모드 불가"
+    except ValueError:
+        pass
+
+    expected = [r['vehicle_id'] for r in search_deals(800_000, top_k=10)['results']]
+    with BackgroundServer(executor="process", workers=2, shared=True) as server:
+        request = urllib.request.Request(server.url + "/deals", data=json.dumps({'max_monthly_payment': 800000, 'top_k': 10}).encode())
+        with urllib.request.urlopen(request, timeout=30) as response:
+            deals = json.loads(response.read())
+        with urllib.request.urlopen(server.url + "/health", timeout=10) as response:
+            health = json.loads(response.read())
+        segment = health['shared_plane']['segment']
+    assert [r['vehicle_id'] for r in deals['results']] == expected
+    assert health['shared_plane']['version'] == 1
+    try:
+        _map_readonly(segment)
+        assert False, "서버 종료 시 세그먼트 정리"
+    except FileNotFoundError:
+        pass
+    print(f"✓ API 서버 평면 모드 ({segment})")
+
+
+def test_api_server_refreshes_plane():
+    """평면 모드 서버는 데이터 파일이 바뀌면 주기적으로 새 버전을 게시"""
+    with BackgroundServer(executor="process", workers=1, shared=True, plane_refresh=0.1) as server:
+        first = dict(server.server._publisher.info)
+        with _data_file_touched():
+            deadline = time.monotonic() + 30
+            while server.server._publisher.info['version'] == first['version']:
+                assert time.monotonic() < deadline, "데이터 변경 후 새 버전이 게시되지 않음"
+                time.sleep(0.05)
+            with urllib.request.urlopen(server.url + "/health", timeout=10) as response:
+                plane = json.loads(response.read())['shared_plane']
+    assert plane['version'] == 2 and plane['data_version'] != first['data_version']
+    print(f"✓ API 서버 평면 갱신 ({first['data_version']} → {plane['data_version']})")
+
+
+def main():
+    """메인 테스트 실행"""
+    test_publish_and_attach()
+    test_version_swap()
+    test_worker_processes_attach_without_loading()
+    test_worker_adopts_new_data_version()
+    test_data_layer_does_not_import_core()
+    test_api_server_shared_mode()
+    test_api_server_refreshes_plane()
+    print("\n✅ 모든 공유 메모리 데이터 평면 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,163 @@
+"""
+tests/test_sheet_spec.py
+선언형 시트 스펙 리더 테스트 (고정/앵커 영역, 헤더 탐색, 헤더 이름 열, 스펙 검증)
+"""
+
+import sys
+import tempfile
+from pathlib import Path
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import openpyxl
+
+from excel_reverse_engineering.sheet_spec import SheetReader, load_spec
+from excel_reverse_engineering.synthetic_workbooks import MG_GRADES, write_meritz_workbook, write_mg_workbook
+
+# 새 캐피탈 예시: 표 위치가 바뀌어도 앵커로 찾고, 열은 헤더 이름으로 지정
+NEW_CAPITAL_SPEC = {
+    "capital_id": "new_capital",
+    "sheets": {"cars": {"title": "차량"}, "rates": {"contains": "잔가"}},
+    "regions": {
+        "grades": {"sheet": "rates", "anchor": {"contains": "등급표", "within": "A1:C30"},
+                   "offset": [1, 0], "size": [3, 4]},
+        "fixed": {"sheet": "rates", "range": "E2:F3"},
+    },
+    "records": {
+        "vehicles": {"sheet": "cars", "header": {"labels": ["제조사", "모델"], "within": "A1:J5"},
+                     "columns": {"brand": {"header": "제조사"}, "model": {"header": "모델"},
+                                 "price": {"header": "가격"}, "memo": "F"}},
+    },
+}
+
+
+def _write_new_capital(path: Path, table_row: int) -> Path:
+    wb = openpyxl.Workbook()
+    cars = wb.active
+    cars.title = "차량"
+    cars.append(["차량 목록"])
+    cars.append([])
+    cars.append([None, "가격", "제조사", "모델"])
+    cars.append([None, 30_000_000, "현대", "아반떼"])
+    cars.append([None, 50_000_000, "BMW", "320i", None, "메모"])
+
+    rates = wb.create_sheet("잔가표")
+    rates["E2"], rates["F3"] = "x", "y"
+    rates.cell(table_row, 2).value = "■ 등급표"
+    rates.cell(table_row + 1, 2).value = "기간"
+    for idx, grade in enumerate(["A", "B", "C"]):
+        rates.cell(table_row + 1, 3 + idx).value = grade
+        rates.cell(table_row + 2, 3 + idx).value = 0.7 - idx * 0.1
+    rates.cell(table_row + 2, 2).value = 36
+    wb.save(path)
+    return path
+
+
+def test_capital_specs_resolve():
+    """메리츠/MG 스펙: 고정 좌표, 앵커 영역, 헤더 탐색"""
+    print("=" * 80)
+    print("시트 스펙 리더 테스트")
+    print("=" * 80)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        reader = SheetReader(write_mg_workbook(Path(tmp) / "mg.xlsx", 20), "mg_capital")
+        try:
+            snk = reader.region("snk")
+            assert snk.anchor == "■ 에스앤케이모터스" and snk.ref == "B2:AD7"
+            assert snk.values[0][1:len(MG_GRADES) + 1] == MG_GRADES
+            assert [row[0] for row in snk.values[1:]] == [12, 24, 36, 48, 60]
+            assert reader.region("aps").ref == "B13:AD18"
+            assert reader.header_row("vehicles") == 3
+
+            records = list(reader.records("vehicles"))
+            assert len(records) == 20 and records[0][0] == 4
+            assert records[0][1]["brand"] == records[0][2][4]
+        finally:
+            reader.close()
+        print(f"✓ MG: snk {snk.ref}, 헤더 3행, 레코드 {len(records)}건")
+
+        reader = SheetReader(write_meritz_workbook(Path(tmp) / "meritz.xlsx", 20), "meritz_capital")
+        try:
+            assert reader.region("west").values[0][0] == "기간"
+            assert [row[0] for row in reader.region("mileage_adjustments").values] == [10000, 15000, 20000, 30000]
+            assert sum(1 for _ in reader.records("vehicles")) == 20
+        finally:
+            reader.close()
+        print("✓ 메리츠: 고정 좌표 영역, 7행부터 레코드")
+
+
+def test_anchor_and_header_columns():
+    """앵커 위치가 바뀌어도 같은 영역, 헤더 이름으로 열 지정"""
+    with tempfile.TemporaryDirectory() as tmp:
+        for table_row in (4, 17):
+            reader = SheetReader(_write_new_capital(Path(tmp) / f"new_{table_row}.xlsx", table_row),
+                                 NEW_CAPITAL_SPEC)
+            try:
+                grades = reader.region("grades")
+                assert grades.top == table_row + 1
+                assert grades.anchor == "■ 등급표" and grades.values[0] == ["기간", "A", "B", "C"]
+                assert grades.values[1][0] == 36 and grades.values[1][1] == 0.7
+                assert reader.region("fixed").values == [["x", None], [None, "y"]]
+
+                records = [fields for _, fields, _ in reader.records("vehicles")]
+                assert records == [
+                    {"brand": "현대", "model": "아반떼", "price": 30_000_000, "memo": None},
+                    {"brand": "BMW", "model": "320i", "price": 50_000_000, "memo": "메모"},
+                ]
+            finally:
+                reader.close()
+        print("✓ 앵커 영역 (4행/17행 표), 헤더 이름 열")
+
+
+def test_spec_errors():
+    """스펙 오류/앵커 없음/시트 없음은 ValueError, 스펙 파일 없음은 FileNotFoundError"""
+    bad_specs = [
+        {"sheets": {}},
+        {"sheets": {"a": {"title": "A"}}, "regions": {"r": {"sheet": "b", "range": "A1:B2"}}},
+        {"sheets": {"a": {"title": "A"}}, "regions": {"r": {"sheet": "a"}}},
+        {"sheets": {"a": {"title": "A"}}, "records": {"v": {"sheet": "a", "start_row": 2,
+                                                            "columns": {"x": {"header": "X"}}}}},
+    ]
+    for spec in bad_specs:
+        try:
+            load_spec(spec)
+            assert False, f"스펙 오류는 ValueError: {spec}"
+        except ValueError:
+            pass
+
+    try:
+        load_spec("unknown_capital")
+        assert False, "스펙 파일 없음은 FileNotFoundError"
+    except FileNotFoundError:
+        pass
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = _write_new_capital(Path(tmp) / "new.xlsx", 40)
+        reader = SheetReader(path, NEW_CAPITAL_SPEC)
+        try:
+            reader.region("grades")
+            assert False, "탐색 범위 밖 앵커는 ValueError"
+        except ValueError:
+            pass
+        finally:
+            reader.close()
+
+        try:
+            SheetReader(path, "mg_capital")
+            assert False, "시트 없음은 ValueError"
+        except ValueError as e:
+            assert "차량DB" in str(e)
+    print("✓ 스펙/앵커/시트 오류")
+
+
+def main():
+    """메인 테스트 실행"""
+    test_capital_specs_resolve()
+    test_anchor_and_header_columns()
+    test_spec_errors()
+    print("\n✅ 모든 시트 스펙 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
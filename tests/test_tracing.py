@@ -0,0 +1,162 @@
+"""
+tests/test_tracing.py
+구간 계측 테스트 (중첩 구간/자체 시간, trace 밖 무동작, 스레드 전달, JSON 로그, Chrome trace 형식, 비교 파이프라인 계측)
+"""
+
+import json
+import logging
+import sys
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils import tracing
+from utils.tracing import count, span, trace, traced
+
+VEHICLE_ID = "AUDI_A3_A3_40_TFSI"
+
+
+@traced("test.leaf")
+def _leaf(delay: float) -> float:
+    time.sleep(delay)
+    return delay
+
+
+def test_nested_spans_and_self_time():
+    """중첩 구간의 전체/자체 시간, 호출 수, 카운터"""
+    print("=" * 80)
+    print("구간 계측 테스트")
+    print("=" * 80)
+
+    with trace("request", user="tester") as t:
+        with span("outer"):
+            _leaf(0.01)
+            _leaf(0.01)
+            count("hits")
+            count("hits", 2)
+
+    summary = t.summary()
+    assert summary['test.leaf']['count'] == 2
+    assert summary['outer']['total_ms'] >= summary['test.leaf']['total_ms'] >= 20
+    assert summary['outer']['self_ms'] < summary['test.leaf']['total_ms']
+    assert summary['request']['total_ms'] == round(t.duration_ms, 3)
+    assert t.counters == {'hits': 3}
+    assert t.attrs == {'user': 'tester'}
+    print(f"✓ 중첩 구간: outer {summary['outer']['total_ms']:.1f}ms (자체 {summary['outer']['self_ms']:.1f}ms)")
+
+
+def test_noop_without_trace():
+    """trace 밖에서는 기록하지 않고 원래 함수 결과 그대로"""
+    assert tracing.current_trace() is None
+    assert _leaf(0) == 0
+    with span("ignored") as s:
+        s.set(key="value")
+    count("ignored")
+    assert tracing.wrap(_leaf) is _leaf
+
+    try:
+        with trace("failing") as t:
+            with span("boom"):
+                raise KeyError("x")
+    except KeyError:
+        pass
+    assert tracing.current_trace() is None
+    assert t.spans[1]['attrs'] == {'error': 'KeyError'}
+    print("✓ trace 밖 무동작, 예외 시 구간 종료 + error 속성")
+
+
+def test_wrap_records_thread_work():
+    """wrap() 으로 넘긴 스레드 작업이 제출한 구간 아래에 기록 (자체 시간에서는 빼지 않음)"""
+    with trace("parallel") as t:
+        with span("fan_out"):
+            task = tracing.wrap(_leaf)
+            with ThreadPoolExecutor(max_workers=2) as pool:
+                assert list(pool.map(task, [0.01, 0.01, 0.01])) == [0.01] * 3
+
+    fan_out = next(s for s in t.spans if s['name'] == 'fan_out')
+    leaves = [s for s in t.spans if s['name'] == 'test.leaf']
+    assert len(leaves) == 3 and all(s['parent'] == fan_out['id'] for s in leaves)
+    assert all(s['thread'] != fan_out['thread'] for s in leaves)
+    summary = t.summary()
+    assert summary['fan_out']['self_ms'] == summary['fan_out']['total_ms']
+    print("✓ 스레드 작업 3건이 제출 구간 아래에 기록")
+
+
+def test_log_line_and_chrome_trace():
+    """JSON 로그 한 줄 (logger 'lease.trace') + Chrome trace 이벤트 형식"""
+    records = []
+    handler = logging.Handler()
+    handler.emit = records.append
+    logger = logging.getLogger("lease.trace")
+    logger.addHandler(handler)
+    logger.setLevel(logging.INFO)
+    try:
+        with trace("logged", log=True) as t:
+            _leaf(0.001)
+            count("quote_cache.misses")
+    finally:
+        logger.removeHandler(handler)
+
+    assert len(records) == 1
+    line = json.loads(records[0].getMessage())
+    assert line['event'] == 'trace' and line['name'] == 'logged'
+    assert line['spans']['test.leaf']['count'] == 1
+    assert line['counters'] == {'quote_cache.misses': 1}
+
+    chrome = t.to_chrome_trace()
+    complete = [e for e in chrome['traceEvents'] if e['ph'] == 'X']
+    assert [e['name'] for e in complete] == ['logged', 'test.leaf']
+    assert complete[0]['ts'] == 0 and complete[1]['dur'] > 0
+    assert [e for e in chrome['traceEvents'] if e['ph'] == 'C'][0]['args'] == {'quote_cache.misses': 1}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "trace.json"
+        tracing.write_chrome_trace(str(path), [t, t])
+        events = json.loads(path.read_text(encoding='utf-8'))['traceEvents']
+        assert {e['pid'] for e in events} == {0, 1}
+    print("✓ JSON 로그 한 줄, Chrome trace 이벤트")
+
+
+def test_compare_pipeline_breakdown():
+    """비교 1회: 캐피탈별 구간 아래 차량 매칭/잔존율/금리/계산 구간, 캐시 카운터"""
+    from core.comparison import compare_all
+    from data import vehicle_master
+
+    vehicle = vehicle_master.get_vehicle(VEHICLE_ID)
+
+    with trace("compare") as t:
+        results = compare_all(vehicle, contract_months=36, annual_mileage=20000, use_cache=False)
+
+    summary = t.summary()
+    capitals = [s for s in t.spans if s['name'] == 'compare.capital']
+    assert len(capitals) == len(results)
+    assert {s['attrs']['capital_id'] for s in capitals} == {r['capital_id'] for r in results}
+    compare_span = next(s for s in t.spans if s['name'] == 'compare.compare_all')
+    assert all(s['parent'] == compare_span['id'] for s in capitals)
+    for name in ("vehicle_master.get_price_from_master", "vehicle_master.find_vehicle_by_name",
+                 "quote.quote_for_capital", "quote.interest_rate"):
+        assert name in summary, name
+
+    with trace("cached") as cached:
+        compare_all(vehicle, contract_months=36, annual_mileage=20000)
+        compare_all(vehicle, contract_months=36, annual_mileage=20000)
+    assert cached.counters.get('quote_cache.hits', 0) >= 1
+    print(f"✓ 비교 {len(results)}개 캐피탈: " + ", ".join(f"{k} {v['total_ms']:.1f}ms" for k, v in summary.items()))
+
+
+def main():
+    """메인 테스트 실행"""
+    test_nested_spans_and_self_time()
+    test_noop_without_trace()
+    test_wrap_records_thread_work()
+    test_log_line_and_chrome_trace()
+    test_compare_pipeline_breakdown()
+    print("\n✅ 모든 구간 계측 테스트 통과!")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+tools/batch_quote.py
+대량 견적 CLI (CSV/Parquet 입력 → 결과 파일)
+
+입력 컬럼:
+    capital_id (없으면 --capital), vehicle_id 또는 brand/model/trim,
+    contract_months, annual_mileage, down_payment_percent(선택), vehicle_price(선택)
+
+출력: 입력 컬럼 + monthly_payment, total_payment, residual_rate, grade_option, annual_rate, error
+
+사용법:
+    python tools/batch_quote.py fleet.csv quotes.csv --capital meritz_capital
+    python tools/batch_quote.py fleet.parquet quotes.parquet --workers 4 --chunk-size 2000
+    python tools/batch_quote.py fleet.csv quotes.csv --resume     # 중단된 작업 이어서
+"""
+
+import argparse
+import sys
+from pathlib import Path
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.batch_quote import DEFAULT_CHUNK_SIZE, run_batch
+
+
+def print_summary(summary: dict) -> None:
+    """단계별 처리량 요약"""
+    print("=" * 80)
+    status = "완료" if summary['completed'] else "중단 (--resume 으로 이어서 실행)"
+    print(f"배치 견적 {status}: {summary['rows']:,}행 "
+          f"(오류 {summary['errors']:,}행, 건너뜀 {summary['skipped_rows']:,}행) · "
+          f"{summary['chunks']}개 청크 · {summary['elapsed']:.2f}초")
+    if summary['elapsed']:
+        print(f"전체 처리량: {summary['rows'] / summary['elapsed']:,.0f}행/초")
+    print("=" * 80)
+    print(f"{'단계':<10}{'시간(초)':>12}{'처리량(행/초)':>18}")
+    for stage, s in summary['stages'].items():
+        print(f"{stage:<10}{s['seconds']:>12.3f}{s['rows_per_sec']:>18,.0f}")
+    print("(resolve/price 는 워커 합계 시간)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="대량 견적 배치 계산")
+    parser.add_argument("input", help="입력 CSV 또는 Parquet")
+    parser.add_argument("output", help="결과 .csv 파일 또는 .parquet 디렉터리")
+    parser.add_argument("--capital", default=None, help="capital_id 컬럼이 없을 때 사용할 캐피탈")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    parser.add_argument("--workers", type=int, default=None, help="워커 프로세스 수 (기본 CPU 수)")
+    parser.add_argument("--resume", action="store_true", help="체크포인트부터 이어서 실행")
+    parser.add_argument("--max-chunks", type=int, default=None, help="이번 실행에서 처리할 최대 청크 수")
+    args = parser.parse_args()
+
+    def progress(rows_done):
+        print(f"\r  {rows_done:,}행 처리", end="", flush=True)
+
+    try:
+        summary = run_batch(
+            args.input, args.output,
+            default_capital=args.capital,
+            chunk_size=args.chunk_size,
+            workers=args.workers,
+            resume=args.resume,
+            max_chunks=args.max_chunks,
+            progress=progress
+        )
+    except (FileNotFoundError, ValueError) as e:
+        print(f"\n❌ {e}")
+        sys.exit(1)
+
+    print()
+    print_summary(summary)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,169 @@
+"""
+tools/bench_api.py
+견적 API 지연시간/처리량 벤치마크
+
+동시 연결 N개(keep-alive)로 요청을 보내고 엔드포인트별 p50/p95/p99, 초당 처리량을 출력한다.
+--url 을 주지 않으면 같은 프로세스에서 서버를 띄워 측정한다.
+
+사용법:
+    python tools/bench_api.py --requests 2000 --concurrency 32
+    python tools/bench_api.py --url http://127.0.0.1:8765 --endpoints quote,compare
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Tuple
+from urllib.parse import urlsplit
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.cache_stats import percentile
+
+# 엔드포인트별 요청 본문 (무작위 조건 조합)
+MERITZ_VEHICLE_ID = "AUDI_A3_A3_40_TFSI"
+TERMS = [24, 36, 48, 60]
+MILEAGES = [10000, 15000, 20000, 30000]
+
+
+def make_payload(endpoint: str, rng: random.Random) -> Dict:
+    months = rng.choice(TERMS)
+    mileage = rng.choice(MILEAGES)
+    down = rng.choice([0, 10, 20, 30])
+
+    if endpoint == "quote":
+        return {'capital_id': 'meritz_capital', 'vehicle_id': MERITZ_VEHICLE_ID,
+                'contract_months': months, 'annual_mileage': mileage,
+                'down_payment_percent': down}
+    if endpoint == "compare":
+        return {'vehicle_id': MERITZ_VEHICLE_ID, 'contract_months': months,
+                'annual_mileage': mileage, 'down_payment_percent': down}
+    if endpoint == "grid":
+        return {'capital_id': 'meritz_capital', 'vehicle_id': MERITZ_VEHICLE_ID,
+                'down_payment_percent': down}
+    raise ValueError(f"알 수 없는 엔드포인트: {endpoint}")
+
+
+async def _request(reader, writer, host: str, path: str, payload: Dict) -> Tuple[int, bytes]:
+    body = json.dumps(payload).encode("utf-8")
+    writer.write(
+        f"POST {path} HTTP/1.1\r\nHost: {host}\r\n"
+        f"Content-Type: application/json\r\nContent-Length: {len(body)}\r\n\r\n".encode("latin-1")
+        + body
+    )
+    await writer.drain()
+
+    head = await reader.readuntil(b"\r\n\r\n")
+    lines = head.decode("latin-1").split("\r\n")
+    status = int(lines[0].split(" ")[1])
+    length = 0
+    for line in lines[1:]:
+        if line.lower().startswith("content-length:"):
+            length = int(line.split(":", 1)[1])
+    return status, await reader.readexactly(length)
+
+
+async def run_benchmark(url: str, endpoints: List[str], total: int, concurrency: int, seed: int = 0) -> Dict:
+    """
+    벤치마크 실행
+
+    Returns:
+        Dict: {'total', 'elapsed', 'rps', 'endpoints': {name: {count, errors, p50_ms, p95_ms, p99_ms, max_ms}}}
+    """
+    parts = urlsplit(url)
+    host, port = parts.hostname, parts.port or 80
+
+    jobs: asyncio.Queue = asyncio.Queue()
+    rng = random.Random(seed)
+    for i in range(total):
+        endpoint = endpoints[i % len(endpoints)]
+        jobs.put_nowait((endpoint, make_payload(endpoint, rng)))
+
+    latencies: Dict[str, List[float]] = {name: [] for name in endpoints}
+    errors: Dict[str, int] = {name: 0 for name in endpoints}
+
+    async def client():
+        reader, writer = await asyncio.open_connection(host, port)
+        try:
+            while True:
+                try:
+                    endpoint, payload = jobs.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                start = time.perf_counter()
+                status, _ = await _request(reader, writer, host, f"/{endpoint}", payload)
+                latencies[endpoint].append(time.perf_counter() - start)
+                if status != 200:
+                    errors[endpoint] += 1
+        finally:
+            writer.close()
+
+    started = time.perf_counter()
+    await asyncio.gather(*[client() for _ in range(concurrency)])
+    elapsed = time.perf_counter() - started
+
+    summary = {}
+    for name, samples in latencies.items():
+        ordered = sorted(samples)
+        summary[name] = {
+            'count': len(samples),
+            'errors': errors[name],
+            'p50_ms': round(percentile(ordered, 0.50) * 1000, 2),
+            'p95_ms': round(percentile(ordered, 0.95) * 1000, 2),
+            'p99_ms': round(percentile(ordered, 0.99) * 1000, 2),
+            'max_ms': round(ordered[-1] * 1000, 2) if ordered else 0.0,
+        }
+
+    return {
+        'total': total,
+        'concurrency': concurrency,
+        'elapsed': round(elapsed, 3),
+        'rps': round(total / elapsed, 1) if elapsed else 0.0,
+        'endpoints': summary,
+    }
+
+
+def print_report(report: Dict) -> None:
+    print("=" * 80)
+    print(f"요청 {report['total']:,}건 · 동시 {report['concurrency']} · "
+          f"{report['elapsed']:.2f}초 · {report['rps']:,.1f} req/s")
+    print("=" * 80)
+    print(f"{'엔드포인트':<12}{'건수':>8}{'오류':>6}{'p50':>10}{'p95':>10}{'p99':>10}{'max':>10}")
+    for name, s in report['endpoints'].items():
+        print(f"{name:<12}{s['count']:>8}{s['errors']:>6}"
+              f"{s['p50_ms']:>8.1f}ms{s['p95_ms']:>8.1f}ms{s['p99_ms']:>8.1f}ms{s['max_ms']:>8.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="견적 API 벤치마크")
+    parser.add_argument("--url", default=None, help="대상 서버 (없으면 내장 서버 실행)")
+    parser.add_argument("--endpoints", default="quote,compare,grid")
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--executor", choices=["thread", "process"], default="thread")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--json", action="store_true", help="결과를 JSON으로 출력")
+    args = parser.parse_args()
+
+    endpoints = [e.strip() for e in args.endpoints.split(",") if e.strip()]
+
+    if args.url:
+        report = asyncio.run(run_benchmark(args.url, endpoints, args.requests, args.concurrency))
+    else:
+        from api.server import BackgroundServer
+        with BackgroundServer(executor=args.executor, workers=args.workers) as server:
+            report = asyncio.run(run_benchmark(server.url, endpoints, args.requests, args.concurrency))
+
+    if args.json:
+        print(json.dumps(report, ensure_ascii=False, indent=2))
+    else:
+        print_report(report)
+
+
+if __name__ == "__main__":
+    main()
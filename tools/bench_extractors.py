@@ -0,0 +1,143 @@
+"""
+tools/bench_extractors.py
+엑셀 추출기 벤치마크 (합성 워크북, 추출기별 벽시계 시간 / 최대 메모리)
+
+추출기마다 별도 프로세스에서 실행해 최대 RSS(ru_maxrss)를 깨끗하게 잰다.
+--extractor-dir 로 다른 버전의 추출기 디렉토리를 지정하면 결과를 비교한다.
+(예: git show <커밋>:excel_reverse_engineering/meritz_extractor.py > /tmp/old/meritz_extractor.py)
+
+사용법:
+    python tools/bench_extractors.py                              # 50,000행
+    python tools/bench_extractors.py --rows 5000 --repeat 3
+    python tools/bench_extractors.py --extractor-dir /tmp/old     # 이전 버전과 비교 (결과 동일 여부 포함)
+"""
+
+import argparse
+import contextlib
+import hashlib
+import importlib.util
+import io
+import json
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from excel_reverse_engineering.synthetic_workbooks import write_meritz_workbook, write_mg_workbook
+
+EXTRACTOR_DIR = Path(__file__).parent.parent / "excel_reverse_engineering"
+
+# 이름: (합성 워크북 생성 함수, 모듈 파일, 추출기 클래스, 추출 메서드)
+EXTRACTORS = {
+    'meritz': (write_meritz_workbook, 'meritz_extractor.py', 'MeritzResidualExtractor', 'extract_all_vehicles'),
+    'mg': (write_mg_workbook, 'mg_extractor.py', 'MGCapitalExtractor', 'extract_all_data'),
+}
+
+
+def _digest(result) -> str:
+    """추출 결과 해시 (버전 간 결과 동일 여부 확인용)"""
+    payload = json.dumps(result, ensure_ascii=False, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def run_worker(name: str, workbook: str, extractor_dir: str) -> None:
+    """(자식 프로세스) 추출 1회 실행 후 측정값을 JSON 한 줄로 출력"""
+    _, filename, class_name, method = EXTRACTORS[name]
+    spec = importlib.util.spec_from_file_location(f"bench_{name}", Path(extractor_dir) / filename)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        extractor = getattr(module, class_name)(workbook)
+        vehicle_master, residual_rates = getattr(extractor, method)()
+    elapsed = time.perf_counter() - start
+    rss_peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    print(json.dumps({
+        'seconds': elapsed,
+        'peak_rss_mb': rss_peak / 1024,
+        'extra_rss_mb': (rss_peak - rss_before) / 1024,
+        'vehicles': len(vehicle_master),
+        'digest': _digest([vehicle_master, residual_rates]),
+    }))
+
+
+def measure(name: str, workbook: Path, extractor_dir: Path, repeat: int) -> dict:
+    """자식 프로세스로 repeat회 실행, 가장 빠른 시간과 가장 큰 메모리 사용량"""
+    runs = []
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, __file__, "--worker", name, str(workbook), "--extractor-dir", str(extractor_dir)],
+            capture_output=True, text=True, check=True
+        )
+        runs.append(json.loads(completed.stdout.strip().splitlines()[-1]))
+
+    return {
+        'seconds': min(r['seconds'] for r in runs),
+        'peak_rss_mb': max(r['peak_rss_mb'] for r in runs),
+        'extra_rss_mb': max(r['extra_rss_mb'] for r in runs),
+        'vehicles': runs[0]['vehicles'],
+        'digest': runs[0]['digest'],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="엑셀 추출기 벤치마크")
+    parser.add_argument("--rows", type=int, default=50_000, help="합성 워크북 차량 행 수")
+    parser.add_argument("--repeat", type=int, default=1, help="추출기별 반복 횟수 (가장 빠른 값)")
+    parser.add_argument("--extractors", default=",".join(EXTRACTORS), help="쉼표 구분 추출기 이름")
+    parser.add_argument("--extractor-dir", default=None, help="비교할 다른 버전의 추출기 디렉토리")
+    parser.add_argument("--worker", nargs=2, metavar=("NAME", "WORKBOOK"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        run_worker(args.worker[0], args.worker[1], args.extractor_dir or str(EXTRACTOR_DIR))
+        return
+
+    versions = {'current': EXTRACTOR_DIR}
+    if args.extractor_dir:
+        versions = {'compare': Path(args.extractor_dir), **versions}
+
+    print("=" * 80)
+    print(f"엑셀 추출기 벤치마크 ({args.rows:,}행)")
+    print("=" * 80)
+    print(f"{'추출기':<8}{'버전':<10}{'시간(초)':>10}{'최대 RSS(MB)':>14}{'추가 RSS(MB)':>14}{'차량':>10}  결과 해시")
+
+    failed = False
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in args.extractors.split(","):
+            write_workbook = EXTRACTORS[name][0]
+            start = time.perf_counter()
+            workbook = write_workbook(Path(tmp) / f"{name}.xlsx", args.rows)
+            print(f"  ({name} 합성 워크북 {workbook.stat().st_size / 1024 / 1024:.1f}MB, "
+                  f"생성 {time.perf_counter() - start:.1f}초)")
+
+            results = {}
+            for version, extractor_dir in versions.items():
+                result = measure(name, workbook, extractor_dir, args.repeat)
+                results[version] = result
+                print(f"{name:<8}{version:<10}{result['seconds']:>10.2f}{result['peak_rss_mb']:>14.1f}"
+                      f"{result['extra_rss_mb']:>14.1f}{result['vehicles']:>10,}  {result['digest']}")
+
+            if len(results) > 1:
+                before, after = results['compare'], results['current']
+                same = before['digest'] == after['digest']
+                failed |= not same
+                print(f"  → {before['seconds'] / after['seconds']:.1f}배 빠름, "
+                      f"추가 메모리 {before['extra_rss_mb']:.0f}MB → {after['extra_rss_mb']:.0f}MB, "
+                      f"결과 {'동일' if same else '❌ 다름'}")
+
+    print("=" * 80)
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,374 @@
+"""
+tools/bench_pricing.py
+견적 계산 스택 벤치마크 (계산 함수 / 데이터 로더 / 차량 조회 / 비교 흐름) + 기준선 회귀 검사
+
+- micro:  calculate_operating_lease, MGLeaseCalculator.calculate, calculate_irr
+- lookup: get_price_from_master, find_vehicle_by_name, search_vehicles
+- load:   데이터 로더별 cold(캐시 비우고 파일 읽기) / warm(캐시 적중)
+- macro:  compare_all 전체 흐름 (캐시 미사용 / 캐시 적중)
+
+항목마다 호출 1회가 min-time 이상 걸리도록 반복 횟수를 맞춘 뒤 repeat 번 측정해
+호출당 최소/중앙값/p95 를 기록한다 (cold 는 매 호출 전 캐시를 비우고 1회씩 측정).
+결과는 환경 정보(Python, CPU, 패키지 버전, 커밋, 데이터 버전)와 함께 JSON 으로 저장하고,
+기준선 파일이 있으면 최소값(best of repeat, 다른 부하의 영향이 가장 적은 값)이
+기준선보다 threshold 이상 느려진 항목을 회귀로 보고한다 (종료 코드 1).
+전 항목이 같은 비율로 느려진 부분(기계 속도 drift)은 덜어내고 판정한다 (compare_to_baseline).
+측정은 라운드마다 전 항목을 한 번씩 도는 순서로 해서, 기계가 잠시 느려지는 구간
+(CPU 클럭, 같은 호스트의 다른 부하)이 특정 항목에만 몰리지 않게 한다.
+
+사용법:
+    python tools/bench_pricing.py                          # 측정 + 기준선 비교 (data/bench_pricing.json)
+    python tools/bench_pricing.py --filter load.,compare   # 이름에 포함된 문자열로 선택
+    python tools/bench_pricing.py --threshold 0.3          # 30% 이상 느려지면 실패 (기본 50%)
+    python tools/bench_pricing.py --save-baseline          # 현재 결과를 기준선으로 저장
+"""
+
+import argparse
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.calculator import calculate_irr, calculate_operating_lease
+from core.comparison import compare_all
+from core.mg_calculator import MGLeaseCalculator
+from core.quote_cache import configure_quote_cache, data_version
+from data import residual_rates, vehicle_master
+from excel_reverse_engineering.extract_all import write_json_atomic
+from utils.cache_stats import percentile
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_BASELINE = Path(__file__).parent / "bench_pricing_baseline.json"
+DEFAULT_OUTPUT = ROOT / "data" / "bench_pricing.json"
+# 같은 기계에서도 항목별 최소값이 drift 보정 후 ±30% 정도 흔들려 그보다 넉넉하게
+DEFAULT_THRESHOLD = 0.5
+# 기계 속도 변화(drift) 보정에 필요한 최소 비교 항목 수
+DRIFT_MIN_ITEMS = 5
+
+# 벤치마크 입력 차량 (메리츠/MG 모두 있는 차량)
+VEHICLE_ID = "AUDI_A3_A3_40_TFSI"
+
+
+class Benchmark(NamedTuple):
+    """벤치마크 항목"""
+    name: str
+    group: str                          # micro / lookup / load / macro
+    func: Callable[[], object]
+    reset: Optional[Callable[[], None]] = None   # 지정하면 cold 측정 (매 호출 전 실행, 측정 제외)
+
+
+def build_benchmarks() -> List[Benchmark]:
+    """측정 항목 목록 (입력 차량/요율은 실제 데이터에서 준비)"""
+    vehicle = vehicle_master.get_vehicle(VEHICLE_ID)
+    brand, model, trim = vehicle['brand'], vehicle['model'], vehicle['trim']
+    mg = MGLeaseCalculator()
+    lease = calculate_operating_lease(vehicle['price'], 60, 0, 0.45, 0.0515, method='annuity')
+
+    benchmarks = [
+        Benchmark("calculator.simple", "micro",
+                  lambda: calculate_operating_lease(vehicle['price'], 36, 0, 0.55, 0.0515)),
+        Benchmark("calculator.annuity", "micro",
+                  lambda: calculate_operating_lease(vehicle['price'], 60, 10_000_000, 0.45, 0.0515,
+                                                    acquisition_tax_rate=0.07, method='annuity')),
+        Benchmark("mg_calculator.calculate", "micro",
+                  lambda: mg.calculate(vehicle['price'], 0.55, 36, 20000, 0.0515, down_payment_rate=0.1)),
+        Benchmark("calculator.calculate_irr", "micro",
+                  lambda: calculate_irr(vehicle['price'], 60, lease['monthly_total'], 0, lease['residual_value'])),
+        Benchmark("lookup.get_price_from_master", "lookup",
+                  lambda: vehicle_master.get_price_from_master(brand, model, trim)),
+        Benchmark("lookup.find_vehicle_by_name", "lookup",
+                  lambda: vehicle_master.find_vehicle_by_name(brand, model, trim)),
+        Benchmark("lookup.find_vehicle_by_name.mg", "lookup",
+                  lambda: vehicle_master.find_vehicle_by_name(brand, model, trim, capital_id="mg_capital")),
+        Benchmark("lookup.search_vehicles", "lookup",
+                  lambda: vehicle_master.search_vehicles("bmw")),
+    ]
+
+    loaders = [
+        ("vehicle_master", lambda: vehicle_master._load_vehicles(),
+         lambda: vehicle_master._VEHICLE_CACHE.clear("vehicle_master.npz")),
+        ("mg_vehicle_master", lambda: vehicle_master._load_vehicles("mg_capital"),
+         lambda: vehicle_master._VEHICLE_CACHE.clear("mg_vehicle_master.npz")),
+        ("master_carinfo", vehicle_master._load_master_carinfo,
+         lambda: vehicle_master._MASTER_CARINFO_CACHE.clear("master_carinfo")),
+        ("master_index", vehicle_master._load_master_index,
+         lambda: vehicle_master._MASTER_CARINFO_CACHE.clear("master_index")),
+    ]
+    for capital_id in sorted(residual_rates.get_available_capitals()):
+        loaders.append((f"residual_rates.{capital_id}",
+                        lambda c=capital_id: residual_rates._load_residual_rates(c),
+                        lambda c=capital_id: residual_rates._RESIDUAL_CACHE.clear(c)))
+    for name, load, clear in loaders:
+        benchmarks.append(Benchmark(f"load.{name}.cold", "load", load, clear))
+        benchmarks.append(Benchmark(f"load.{name}.warm", "load", load))
+
+    benchmarks += [
+        Benchmark("compare_all.uncached", "macro",
+                  lambda: compare_all(vehicle, 36, 20000, executor=None, use_cache=False)),
+        Benchmark("compare_all.cached", "macro",
+                  lambda: compare_all(vehicle, 36, 20000, executor=None)),
+    ]
+    return benchmarks
+
+
+def _loops_for(bench: Benchmark, min_time: float) -> int:
+    """측정 1회가 min_time 이상 걸리는 반복 횟수 (cold 항목은 1)"""
+    if bench.reset is not None:
+        return 1
+    bench.func()    # 캐시/지연 초기화
+    loops = 1
+    while loops < 1 << 20:
+        start = time.perf_counter()
+        for _ in range(loops):
+            bench.func()
+        elapsed = time.perf_counter() - start
+        if elapsed >= min_time:
+            break
+        loops *= 2 if elapsed <= 0 else max(2, min(10, int(min_time / elapsed) + 1))
+    return loops
+
+
+def _sample(bench: Benchmark, loops: int) -> float:
+    """측정 1회 (호출당 초). cold 항목은 캐시를 비우고 1회 호출 (호출이 캐시를 다시 채움)"""
+    if bench.reset is not None:
+        bench.reset()
+        start = time.perf_counter()
+        bench.func()
+        return time.perf_counter() - start
+    start = time.perf_counter()
+    for _ in range(loops):
+        bench.func()
+    return (time.perf_counter() - start) / loops
+
+
+def summarize(bench: Benchmark, loops: int, samples: List[float]) -> Dict:
+    """
+    측정값 요약
+
+    Returns:
+        Dict: {group, cold, loops, repeat, min_us, median_us, p95_us, ops_per_sec}
+    """
+    samples = sorted(samples)
+    median = statistics.median(samples)
+    return {
+        'group': bench.group,
+        'cold': bench.reset is not None,
+        'loops': loops,
+        'repeat': len(samples),
+        'min_us': round(samples[0] * 1e6, 3),
+        'median_us': round(median * 1e6, 3),
+        'p95_us': round(percentile(samples, 0.95) * 1e6, 3),
+        'ops_per_sec': round(1 / median, 1) if median > 0 else None,
+    }
+
+
+def _package_version(name: str) -> Optional[str]:
+    try:
+        return __import__(name).__version__
+    except Exception:
+        return None
+
+
+def environment() -> Dict:
+    """측정 환경 정보 (기준선과 환경이 다르면 비교 결과에 경고)"""
+    try:
+        commit = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=ROOT,
+                                capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        commit = None
+    return {
+        'python': platform.python_version(),
+        'implementation': platform.python_implementation(),
+        'platform': platform.platform(),
+        'machine': platform.machine(),
+        'processor': platform.processor() or None,
+        'cpu_count': os.cpu_count(),
+        'packages': {name: _package_version(name) for name in ('numpy', 'numpy_financial', 'openpyxl')},
+        'commit': commit,
+        'data_version': data_version(),
+    }
+
+
+def run_benchmarks(names: Optional[List[str]] = None, repeat: int = 7, min_time: float = 0.05) -> Dict:
+    """
+    벤치마크 실행
+
+    Args:
+        names: 이름에 이 문자열 중 하나가 포함된 항목만 (None이면 전체)
+
+    Returns:
+        Dict: {generated_at, environment, settings, benchmarks: {name: 측정값}}
+    """
+    selected = [b for b in build_benchmarks() if not names or any(n in b.name for n in names)]
+    if not selected:
+        raise ValueError(f"선택된 벤치마크가 없습니다: {names}")
+
+    # 빈 메모리 전용 견적 캐시로 측정 (QUOTE_CACHE_DISK 설정이 있어도 디스크 캐시는 건드리지 않음)
+    configure_quote_cache()
+    loops = {bench.name: _loops_for(bench, min_time) for bench in selected}
+
+    # 라운드마다 전 항목을 한 번씩 측정 (기계가 느려지는 구간이 특정 항목에만 몰리지 않도록)
+    # timeit 과 같이 측정 중에는 GC 를 끄고, 앞 항목의 쓰레기는 측정 전에 수거
+    samples: Dict[str, List[float]] = {bench.name: [] for bench in selected}
+    gc_enabled = gc.isenabled()
+    try:
+        for _ in range(repeat):
+            for bench in selected:
+                gc.collect()
+                gc.disable()
+                samples[bench.name].append(_sample(bench, loops[bench.name]))
+                gc.enable()
+    finally:
+        if not gc_enabled:
+            gc.disable()
+
+    results = {bench.name: summarize(bench, loops[bench.name], samples[bench.name]) for bench in selected}
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'environment': environment(),
+        'settings': {'repeat': repeat, 'min_time': min_time},
+        'benchmarks': results,
+    }
+
+
+def compare_to_baseline(report: Dict, baseline: Dict, threshold: float = DEFAULT_THRESHOLD) -> Dict:
+    """
+    기준선 대비 비교
+
+    최소값 기준 (중앙값은 같은 기계에서도 다른 부하에 따라 크게 흔들림).
+    기계 속도 변화는 모든 항목을 같이 느리게 만들므로, 비교 항목이 DRIFT_MIN_ITEMS 개 이상이면
+    항목별 비율의 중앙값(machine_drift)으로 나눈 상대 비율로 판정한다.
+    전체가 함께 느려진 경우는 회귀가 아니라 drift 경고로 보고한다.
+
+    Args:
+        report: run_benchmarks() 결과
+        baseline: 이전에 저장한 결과
+        threshold: 허용 둔화율 (0.5 = 50% 느려지면 회귀)
+
+    Returns:
+        Dict: {threshold, machine_drift, environment_mismatch: [필드], regressions: [이름],
+               items: {name: {baseline_us, min_us, raw_ratio, ratio, status}}}
+              status: ok / regression / improved / new
+    """
+    raw = {}
+    for name, result in report['benchmarks'].items():
+        base = baseline.get('benchmarks', {}).get(name)
+        if base and base.get('min_us'):
+            raw[name] = result['min_us'] / base['min_us']
+    drift = statistics.median(raw.values()) if len(raw) >= DRIFT_MIN_ITEMS else 1.0
+
+    items = {}
+    for name, result in report['benchmarks'].items():
+        if name not in raw:
+            items[name] = {'baseline_us': None, 'min_us': result['min_us'],
+                           'raw_ratio': None, 'ratio': None, 'status': 'new'}
+            continue
+        ratio = raw[name] / drift
+        if ratio > 1 + threshold:
+            status = 'regression'
+        elif ratio < 1 / (1 + threshold):
+            status = 'improved'
+        else:
+            status = 'ok'
+        items[name] = {'baseline_us': baseline['benchmarks'][name]['min_us'], 'min_us': result['min_us'],
+                       'raw_ratio': round(raw[name], 3), 'ratio': round(ratio, 3), 'status': status}
+
+    env, base_env = report.get('environment', {}), baseline.get('environment', {})
+    mismatch = [key for key in ('python', 'implementation', 'machine', 'processor', 'cpu_count')
+                if key in base_env and env.get(key) != base_env.get(key)]
+    return {
+        'threshold': threshold,
+        'machine_drift': round(drift, 3),
+        'environment_mismatch': mismatch,
+        'regressions': [name for name, item in items.items() if item['status'] == 'regression'],
+        'items': items,
+    }
+
+
+def _format_us(value: Optional[float]) -> str:
+    if value is None:
+        return "-"
+    if value >= 1000:
+        return f"{value / 1000:,.2f}ms"
+    return f"{value:,.2f}µs"
+
+
+def print_report(report: Dict, comparison: Optional[Dict] = None) -> None:
+    env = report['environment']
+    print("=" * 80)
+    print(f"견적 계산 벤치마크 · Python {env['python']} · {env['machine']} · CPU {env['cpu_count']} · "
+          f"커밋 {env['commit']} · 데이터 {env['data_version']}")
+    print("=" * 80)
+    items = comparison['items'] if comparison else {}
+    print(f"{'항목':<40}{'최소':>12}{'중앙값':>12}{'p95':>12}{'기준선':>12}{'비율':>8}  상태")
+    for name, result in report['benchmarks'].items():
+        item = items.get(name, {})
+        ratio = f"{item['ratio']:.2f}x" if item.get('ratio') else "-"
+        print(f"{name:<40}{_format_us(result['min_us']):>12}{_format_us(result['median_us']):>12}"
+              f"{_format_us(result['p95_us']):>12}"
+              f"{_format_us(item.get('baseline_us')):>12}{ratio:>8}  {item.get('status', '')}")
+
+    if comparison:
+        drift = comparison['machine_drift']
+        print(f"\n기계 속도 drift: 기준선 대비 전체 {drift:.2f}x (비율 = drift 보정 후 값)")
+        if not 1 / (1 + comparison['threshold']) <= drift <= 1 + comparison['threshold']:
+            print("⚠️  전체 항목이 함께 빨라지거나 느려졌습니다 (기계 부하/환경 변화 또는 공통 경로 변경)")
+        if comparison['environment_mismatch']:
+            print(f"\n⚠️  기준선과 측정 환경이 다릅니다: {', '.join(comparison['environment_mismatch'])}")
+        if comparison['regressions']:
+            print(f"\n❌ 회귀 {len(comparison['regressions'])}건 (기준선 대비 "
+                  f"+{comparison['threshold']:.0%} 초과): {', '.join(comparison['regressions'])}")
+        else:
+            print(f"\n✅ 회귀 없음 (허용 +{comparison['threshold']:.0%})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="견적 계산 스택 벤치마크")
+    parser.add_argument("--filter", default=None, help="쉼표 구분, 이름에 포함된 항목만")
+    parser.add_argument("--repeat", type=int, default=7, help="항목별 측정 횟수")
+    parser.add_argument("--min-time", type=float, default=0.05, help="측정 1회 목표 시간 (초)")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="기준선 JSON")
+    parser.add_argument("--threshold", type=float, default=None,
+                        help=f"허용 둔화율 (기본: 기준선의 threshold, 없으면 {DEFAULT_THRESHOLD})")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="결과 JSON")
+    parser.add_argument("--save-baseline", action="store_true", help="현재 결과를 기준선으로 저장")
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.filter.split(",") if n.strip()] if args.filter else None
+    try:
+        report = run_benchmarks(names, args.repeat, args.min_time)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    baseline_path = Path(args.baseline)
+    comparison = None
+    if baseline_path.exists() and not args.save_baseline:
+        baseline = json.loads(baseline_path.read_text(encoding='utf-8'))
+        threshold = args.threshold if args.threshold is not None else baseline.get('threshold', DEFAULT_THRESHOLD)
+        comparison = compare_to_baseline(report, baseline, threshold)
+        report['comparison'] = comparison
+
+    write_json_atomic(Path(args.output), report)
+    print_report(report, comparison)
+    print(f"결과: {args.output}")
+
+    if args.save_baseline:
+        write_json_atomic(baseline_path, dict(report, threshold=args.threshold or DEFAULT_THRESHOLD))
+        print(f"기준선 저장: {baseline_path}")
+    elif comparison and comparison['regressions']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""
+tools/build_quote_cube.py
+표준 견적 큐브 빌드 (데이터 갱신 후 실행)
+
+전체 캐피탈 × 차량 × 계약기간 × 주행거리 × 선납 비율을 미리 계산해 .npz 로 저장한다.
+API /quote 와 배치 견적은 큐브가 현재 데이터 버전과 같을 때만 사용한다.
+
+사용법:
+    python tools/build_quote_cube.py                          # data/quote_cube.npz
+    python tools/build_quote_cube.py --output /srv/cube.npz   # QUOTE_CUBE_PATH 로 지정해 사용
+    python tools/build_quote_cube.py --verify 2000            # 실시간 계산과 표본 대조
+"""
+
+import argparse
+import random
+import sys
+from pathlib import Path
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from core.quote import quote_for_capital
+from core.quote_cube import (
+    DEFAULT_DOWN_PAYMENT_PERCENTS,
+    build_quote_cube,
+    get_cube_path,
+    reload_quote_cube,
+)
+from data import vehicle_master
+
+
+def verify(path: Path, samples: int, seed: int = 0) -> int:
+    """무작위 표본을 실시간 계산과 대조, 불일치 건수 반환"""
+    cube = reload_quote_cube(path)
+    rng = random.Random(seed)
+    mismatches = 0
+
+    for capital_id, arrays in cube.capitals.items():
+        vehicle_ids = arrays['vehicle_ids'].tolist()
+        for _ in range(samples):
+            vehicle_id = rng.choice(vehicle_ids)
+            months = int(rng.choice(arrays['terms']))
+            mileage = int(rng.choice(arrays['mileages']))
+            percent = float(rng.choice(arrays['down_payment_percents']))
+
+            got = cube.lookup(capital_id, vehicle_id, months, mileage, percent)
+            vehicle = {**vehicle_master.get_vehicle(vehicle_id, capital_id=capital_id), 'id': vehicle_id}
+            try:
+                expected = quote_for_capital(capital_id, vehicle, vehicle['price'], months, mileage,
+                                             percent, use_cache=False)
+            except (ValueError, TypeError):
+                expected = None
+
+            if got is None or expected is None:
+                ok = got is None and expected is None
+            else:
+                ok = (got['monthly_payment'] == expected['monthly_payment']
+                      and got['grade_option'] == expected['grade_option']
+                      and got['details']['total_payment'] == expected['details']['total_payment'])
+            if not ok:
+                mismatches += 1
+                print(f"  ❌ {capital_id}/{vehicle_id}/{months}/{mileage}/{percent}%: "
+                      f"큐브 {got and got['monthly_payment']} ≠ 실시간 {expected and expected['monthly_payment']}")
+
+    return mismatches
+
+
+def main():
+    parser = argparse.ArgumentParser(description="표준 견적 큐브 빌드")
+    parser.add_argument("--output", default=None, help=f"출력 경로 (기본 {get_cube_path()})")
+    parser.add_argument("--capitals", default=None, help="쉼표 구분 캐피탈 ID (기본 전체)")
+    parser.add_argument("--down-percents", default=None,
+                        help=f"쉼표 구분 선납 비율 (기본 {','.join(map(str, DEFAULT_DOWN_PAYMENT_PERCENTS))})")
+    parser.add_argument("--verify", type=int, default=0, help="캐피탈별 대조 표본 수 (0이면 생략)")
+    args = parser.parse_args()
+
+    summary = build_quote_cube(
+        output_path=Path(args.output) if args.output else None,
+        capital_ids=args.capitals.split(",") if args.capitals else None,
+        down_payment_percents=[int(p) for p in args.down_percents.split(",")] if args.down_percents else None
+    )
+
+    print("=" * 80)
+    print(f"큐브 저장: {summary['path']} ({summary['bytes'] / 1024:,.0f}KB, {summary['elapsed']:.2f}초)")
+    print(f"데이터 버전: {summary['data_version']}")
+    for capital_id, cells in summary['capitals'].items():
+        print(f"  {capital_id:<20}{cells:>12,}셀")
+    print("=" * 80)
+
+    if args.verify:
+        mismatches = verify(Path(summary['path']), args.verify)
+        if mismatches:
+            print(f"❌ 불일치 {mismatches}건")
+            sys.exit(1)
+        print(f"✓ 캐피탈별 {args.verify}건 실시간 계산과 일치")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,529 @@
+"""
+tools/fuzz_pricing.py
+스칼라 ↔ 배열 계산 엔진 차분 퍼징 (시드 고정, 불일치 최소 재현 입력으로 축소)
+
+배열 엔진(core.batch_pricing)은 시나리오 그리드, 예산 검색, 견적 큐브가 쓰는 빠른 경로다.
+같은 무작위 입력(validate_lease_input 을 통과하는 범위)을 두 엔진에 넣어 결과를 원 단위까지 비교한다.
+
+대상:
+- operating_lease.simple / operating_lease.annuity: calculate_operating_lease ↔ batch_operating_lease
+- mg_lease: MGLeaseCalculator.calculate ↔ batch_mg_lease
+- mg_acquisition_tax: MGLeaseCalculator._calculate_acquisition_tax ↔ batch_mg_acquisition_tax
+- auto_tax: calculate_auto_tax ↔ batch_auto_tax
+
+입력은 (시드, 대상, 묶음 번호)로 정해지므로 같은 시드는 같은 입력을 만든다.
+배열 엔진은 묶음 전체를 한 번에, 스칼라 엔진은 입력마다 호출하고, 묶음은 프로세스 풀로 나눈다.
+불일치가 나오면 필드를 하나씩 더 단순한 값(0, 경계값, 큰 단위 반올림, 앞쪽 선택지)으로 바꿔 보며
+불일치가 유지되는 가장 단순한 입력으로 줄여 보고한다 (종료 코드 1).
+
+사용법:
+    python tools/fuzz_pricing.py                             # 대상별 1,000,000건 (data/fuzz_pricing.json)
+    python tools/fuzz_pricing.py --cases 5000000 --workers 8
+    python tools/fuzz_pricing.py --target mg_lease,auto_tax --seed 7
+"""
+
+import argparse
+import os
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from core.batch_pricing import batch_auto_tax, batch_mg_acquisition_tax, batch_mg_lease, batch_operating_lease
+from core.calculator import calculate_auto_tax, calculate_operating_lease
+from core.mg_calculator import MGLeaseCalculator
+from core.validator import ValidationError, validate_lease_input
+from excel_reverse_engineering.extract_all import write_json_atomic
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_OUTPUT = ROOT / "data" / "fuzz_pricing.json"
+DEFAULT_CASES = 1_000_000
+DEFAULT_SEED = 20251019
+# 묶음 1개 입력 수 (배열 엔진 1회 호출 / 프로세스 풀 작업 단위)
+CHUNK_SIZE = 50_000
+# 대상별 축소해서 보고할 불일치 수
+MAX_REPRODUCERS = 3
+
+# validate_lease_input 의 허용 범위
+TERMS = [24, 36, 48, 60]
+MAX_PRICE = 500_000_000
+# 금리 생성 범위 (연 0~15%)
+MAX_RATE = 0.15
+
+_MG = MGLeaseCalculator()
+
+# 필드 종류: ('money',) 원 단위 금액, ('rate',) 0~1 비율, ('choice', [...]) 앞쪽이 더 단순, ('bool',)
+FieldSpec = Tuple
+
+
+class Target(NamedTuple):
+    """차분 검사 대상 (같은 입력 → 스칼라 결과 Dict / 배열 결과 Dict 의 같은 키 비교)"""
+    name: str
+    fields: Dict[str, FieldSpec]                                        # 입력 필드 → 종류 (축소 규칙)
+    generate: Callable[[np.random.Generator, int], Dict[str, np.ndarray]]  # (rng, 건수) → 입력 열
+    scalar: Callable[[Dict], Dict[str, float]]                          # 입력 1건 → 비교 값
+    batch: Callable[[Dict[str, np.ndarray]], Dict[str, np.ndarray]]     # 입력 열 → 비교 값 열
+    valid: Callable[[Dict], bool]                                       # 축소 후보가 유효한 입력인지
+
+
+# ========================================
+# 입력 생성
+# ========================================
+
+def _pick(rng: np.random.Generator, n: int, *options: Tuple[float, np.ndarray]) -> np.ndarray:
+    """확률별로 여러 분포 중 하나를 원소마다 선택"""
+    weights = np.array([w for w, _ in options], dtype=np.float64)
+    which = rng.choice(len(options), size=n, p=weights / weights.sum())
+    out = np.empty(n, dtype=np.result_type(*[values for _, values in options]))
+    for idx, (_, values) in enumerate(options):
+        mask = which == idx
+        out[mask] = values[mask]
+    return out
+
+
+def _gen_prices(rng: np.random.Generator, n: int) -> np.ndarray:
+    """차량가: 만원 단위 일반 가격대, 원 단위 전체 범위, 검증 경계값"""
+    return _pick(
+        rng, n,
+        (0.5, rng.integers(1_000, 30_000, n) * 10_000),
+        (0.4, rng.integers(1, MAX_PRICE + 1, n)),
+        (0.1, rng.choice(np.array([1, 1_000_000, 10_000_000, 100_000_000, MAX_PRICE]), n)),
+    ).astype(np.int64)
+
+
+def _gen_fraction(rng: np.random.Generator, n: int, zero: float, low: float = 0.0, high: float = 1.0) -> np.ndarray:
+    """비율: 0, 소수 셋째 자리(데이터 표 형식), 임의 실수, 양 끝"""
+    uniform = rng.uniform(low, high, n)
+    return _pick(
+        rng, n,
+        (zero, np.zeros(n)),
+        (0.3, np.round(uniform, 3)),
+        (0.55, uniform),
+        (0.05, rng.choice(np.array([low, high]), n)),
+    )
+
+
+def _gen_rates(rng: np.random.Generator, n: int) -> np.ndarray:
+    """연 금리 (0 포함: 원리금균등 r == 0 분기)"""
+    return _gen_fraction(rng, n, zero=0.05, high=MAX_RATE)
+
+
+def _gen_engine_cc(rng: np.random.Generator, n: int) -> np.ndarray:
+    """배기량: 구간 경계 ±1, 일반 배기량, 임의 값"""
+    edges = np.array([0, 1, 999, 1000, 1001, 1599, 1600, 1601, 1999, 2000, 2001, 998, 1598, 1998, 2497, 2998, 3982])
+    return _pick(
+        rng, n,
+        (0.4, rng.choice(edges, n)),
+        (0.6, rng.integers(0, 8_000, n)),
+    ).astype(np.int64)
+
+
+def _gen_operating_lease(rng: np.random.Generator, n: int) -> Dict[str, np.ndarray]:
+    price = _gen_prices(rng, n).astype(np.float64)
+    down = np.floor(price * _gen_fraction(rng, n, zero=0.5))
+    # 취득원가 0 = 미제공 (차량가 기준 계산)
+    acquisition_cost = np.where(rng.random(n) < 0.5, 0.0, price + np.floor(price / 1.1 * 0.07) + 100_000)
+    return {
+        'vehicle_price': price,
+        'contract_months': rng.choice(TERMS, n),
+        'down_payment': down,
+        'residual_rate': _gen_fraction(rng, n, zero=0.02),
+        'annual_rate': _gen_rates(rng, n),
+        'acquisition_tax_rate': rng.choice(np.array([0.0, 0.07]), n),
+        'registration_fee': rng.choice(np.array([0.0, 100_000.0, 200_000.0]), n),
+        'annual_car_tax': batch_auto_tax(_gen_engine_cc(rng, n), is_commercial=rng.random(n) < 0.5),
+        'acquisition_cost': acquisition_cost,
+    }
+
+
+def _gen_mg_lease(rng: np.random.Generator, n: int) -> Dict[str, np.ndarray]:
+    is_ev = rng.random(n) < 0.2
+    return {
+        'vehicle_price': _gen_prices(rng, n),
+        'residual_rate': _gen_fraction(rng, n, zero=0.02),
+        'contract_months': rng.choice(TERMS, n),
+        'annual_interest_rate': _gen_rates(rng, n),
+        # 선납금(취득원가 × 비율)이 차량가를 넘지 않도록 (취득원가 ≤ 차량가 × 1.064)
+        'down_payment_rate': _gen_fraction(rng, n, zero=0.5, high=0.9),
+        'is_ev': is_ev,
+        'is_hybrid': ~is_ev & (rng.random(n) < 0.2),
+    }
+
+
+def _gen_mg_acquisition_tax(rng: np.random.Generator, n: int) -> Dict[str, np.ndarray]:
+    is_ev = rng.random(n) < 0.4
+    return {
+        'vehicle_price': _gen_prices(rng, n),
+        'is_ev': is_ev,
+        'is_hybrid': rng.random(n) < 0.3,
+    }
+
+
+def _gen_auto_tax(rng: np.random.Generator, n: int) -> Dict[str, np.ndarray]:
+    return {
+        'engine_cc': _gen_engine_cc(rng, n),
+        'is_commercial': rng.random(n) < 0.5,
+    }
+
+
+# ========================================
+# 엔진 호출
+# ========================================
+
+_LEASE_KEYS = ('monthly_total', 'monthly_base', 'monthly_depreciation', 'monthly_finance', 'monthly_tax',
+               'monthly_registration', 'monthly_car_tax', 'applied_rate', 'residual_value', 'residual_rate',
+               'total_payment', 'total_interest', 'effective_vehicle_cost')
+
+_MG_KEYS = ('monthly_payment', 'down_payment', 'total_payment', 'residual_value', 'net_vehicle_cost',
+            'acquisition_cost', 'financed_amount', 'monthly_car_tax', 'annual_car_tax')
+
+
+def _operating_lease_target(method: str) -> Target:
+    def scalar(case: Dict) -> Dict[str, float]:
+        result = calculate_operating_lease(method=method, **case)
+        return {key: result[key] for key in _LEASE_KEYS}
+
+    def batch(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+        result = batch_operating_lease(method=method, **columns)
+        return {key: result[key] for key in _LEASE_KEYS}
+
+    def valid(case: Dict) -> bool:
+        return (_lease_input_ok(case['vehicle_price'], case['contract_months'], case['down_payment'],
+                                case['residual_rate'])
+                and 0 <= case['annual_rate'] <= 1
+                and (case['acquisition_cost'] == 0 or case['acquisition_cost'] >= case['down_payment']))
+
+    return Target(
+        f"operating_lease.{method}",
+        {
+            'vehicle_price': ('money',), 'contract_months': ('choice', TERMS), 'down_payment': ('money',),
+            'residual_rate': ('rate',), 'annual_rate': ('rate',), 'acquisition_tax_rate': ('choice', [0.0, 0.07]),
+            'registration_fee': ('money',), 'annual_car_tax': ('money',), 'acquisition_cost': ('money',),
+        },
+        _gen_operating_lease, scalar, batch, valid
+    )
+
+
+def _mg_lease_scalar(case: Dict) -> Dict[str, float]:
+    result = _MG.calculate(annual_mileage=20000, **case)
+    values = {key: result[key] for key in _MG_KEYS}
+    values['acquisition_tax'] = result['breakdown']['acquisition_tax']
+    return values
+
+
+def _mg_lease_batch(columns: Dict[str, np.ndarray]) -> Dict[str, np.ndarray]:
+    result = batch_mg_lease(**columns)
+    return {key: result[key] for key in _MG_KEYS + ('acquisition_tax',)}
+
+
+def _mg_lease_valid(case: Dict) -> bool:
+    price = case['vehicle_price']
+    if price <= 0:
+        return False
+    acquisition_tax = _MG._calculate_acquisition_tax(price, case['is_ev'], case['is_hybrid'], False)
+    down_payment = int((price + acquisition_tax) * case['down_payment_rate'])
+    return (_lease_input_ok(price, case['contract_months'], down_payment, case['residual_rate'])
+            and 0 <= case['annual_interest_rate'] <= 1)
+
+
+def _lease_input_ok(vehicle_price: float, contract_months: int, down_payment: float, residual_rate: float) -> bool:
+    """validate_lease_input 오류 없음 (경고는 허용)"""
+    try:
+        validate_lease_input(vehicle_price, contract_months, down_payment=down_payment, residual_rate=residual_rate)
+    except ValidationError:
+        return False
+    return vehicle_price <= MAX_PRICE
+
+
+TARGETS: Dict[str, Target] = {
+    target.name: target for target in (
+        _operating_lease_target('simple'),
+        _operating_lease_target('annuity'),
+        Target(
+            'mg_lease',
+            {
+                'vehicle_price': ('money',), 'residual_rate': ('rate',), 'contract_months': ('choice', TERMS),
+                'annual_interest_rate': ('rate',), 'down_payment_rate': ('rate',),
+                'is_ev': ('bool',), 'is_hybrid': ('bool',),
+            },
+            _gen_mg_lease, _mg_lease_scalar, _mg_lease_batch, _mg_lease_valid
+        ),
+        Target(
+            'mg_acquisition_tax',
+            {'vehicle_price': ('money',), 'is_ev': ('bool',), 'is_hybrid': ('bool',)},
+            _gen_mg_acquisition_tax,
+            lambda case: {'acquisition_tax': _MG._calculate_acquisition_tax(
+                case['vehicle_price'], case['is_ev'], case['is_hybrid'], False)},
+            lambda columns: {'acquisition_tax': batch_mg_acquisition_tax(**columns)},
+            lambda case: 0 < case['vehicle_price'] <= MAX_PRICE
+        ),
+        Target(
+            'auto_tax',
+            {'engine_cc': ('money',), 'is_commercial': ('bool',)},
+            _gen_auto_tax,
+            lambda case: {'annual_car_tax': calculate_auto_tax(**case)},
+            lambda columns: {'annual_car_tax': batch_auto_tax(**columns)},
+            lambda case: case['engine_cc'] >= 0
+        ),
+    )
+}
+
+
+# ========================================
+# 비교 / 축소
+# ========================================
+
+def _same(a: float, b: float) -> bool:
+    return a == b or (a != a and b != b)  # NaN 끼리는 같음
+
+
+def check_case(target: Target, case: Dict) -> Dict[str, Dict[str, float]]:
+    """
+    입력 1건을 두 엔진으로 계산해 다른 필드만 반환
+
+    Returns:
+        Dict: {필드: {'scalar': 값, 'batch': 값}} (일치하면 빈 Dict)
+    """
+    expected = target.scalar(dict(case))
+    columns = {key: np.asarray([value]) for key, value in case.items()}
+    actual = {key: float(np.asarray(values).reshape(-1)[0]) for key, values in target.batch(columns).items()}
+    return {
+        key: {'scalar': expected[key], 'batch': actual[key]}
+        for key in expected if not _same(float(expected[key]), actual[key])
+    }
+
+
+def _complexity(spec: FieldSpec, value) -> Tuple:
+    """값의 복잡도 (작을수록 단순): 선택지 순서, 유효 숫자/소수 자릿수, 크기"""
+    kind = spec[0]
+    if kind == 'bool':
+        return (int(bool(value)),)
+    if kind == 'choice':
+        options = list(spec[1])
+        return (options.index(value) if value in options else len(options),)
+    if kind == 'money':
+        if value != int(value):
+            return (20, abs(value))
+        return (len(str(abs(int(value))).rstrip('0')), abs(value))
+    decimals = next((d for d in range(10) if round(value, d) == value), 10)
+    return (decimals, abs(value))
+
+
+def _candidates(spec: FieldSpec, value) -> Iterable:
+    """더 단순할 수 있는 값 후보 (단순한 것부터)"""
+    kind = spec[0]
+    if kind == 'bool':
+        yield False
+    elif kind == 'choice':
+        yield from spec[1]
+    elif kind == 'money':
+        yield from (0, 1_000_000, 10_000_000)
+        for digits in range(9, -1, -1):
+            unit = 10 ** digits
+            yield type(value)(round(value / unit) * unit)
+        yield type(value)(value // 2)
+    elif kind == 'rate':
+        yield from (0.0, 1.0, 0.5)
+        for digits in range(1, 9):
+            yield round(value, digits)
+
+
+def shrink(target: Target, case: Dict) -> Dict:
+    """
+    불일치가 유지되는 범위에서 필드를 하나씩 단순한 값으로 바꿔 최소 재현 입력을 찾음
+
+    후보는 현재 값보다 단순하고(_complexity), 유효한 입력(target.valid)이며,
+    바꾼 뒤에도 불일치해야 채택한다. 더 바꿀 필드가 없을 때까지 반복한다.
+    """
+    current = dict(case)
+    improved = True
+    while improved:
+        improved = False
+        for field, spec in target.fields.items():
+            for candidate in _candidates(spec, current[field]):
+                if _complexity(spec, candidate) >= _complexity(spec, current[field]):
+                    continue
+                trial = dict(current, **{field: candidate})
+                if target.valid(trial) and check_case(target, trial):
+                    current = trial
+                    improved = True
+                    break
+    return current
+
+
+def run_chunk(target: Target, seed: int, chunk: int, size: int, keep: int = MAX_REPRODUCERS) -> Dict:
+    """
+    묶음 1개 실행 (입력 생성 → 배열 엔진 1회 → 스칼라 엔진 건별 → 필드별 일괄 비교)
+
+    Returns:
+        Dict: {'target', 'chunk', 'cases', 'mismatches', 'fields': {필드: 불일치 수}, 'examples': [입력, ...]}
+    """
+    rng = np.random.default_rng([seed, zlib.crc32(target.name.encode()), chunk])
+    columns = target.generate(rng, size)
+    batch = target.batch(columns)
+
+    rows = {key: values.tolist() for key, values in columns.items()}
+    scalar = {key: np.empty(size, dtype=np.float64) for key in batch}
+    names = list(rows)
+    for i, values in enumerate(zip(*(rows[key] for key in names))):
+        for key, value in target.scalar(dict(zip(names, values))).items():
+            scalar[key][i] = value
+
+    bad = np.zeros(size, dtype=bool)
+    fields = {}
+    for key, expected in scalar.items():
+        actual = np.broadcast_to(np.asarray(batch[key], dtype=np.float64), (size,))
+        differs = (expected != actual) & ~(np.isnan(expected) & np.isnan(actual))
+        if differs.any():
+            fields[key] = int(differs.sum())
+            bad |= differs
+
+    return {
+        'target': target.name,
+        'chunk': chunk,
+        'cases': size,
+        'mismatches': int(bad.sum()),
+        'fields': fields,
+        'examples': [{key: rows[key][i] for key in names} for i in np.flatnonzero(bad)[:keep]],
+    }
+
+
+def _run_chunk_job(args: Tuple[str, int, int, int]) -> Dict:
+    name, seed, chunk, size = args
+    return run_chunk(TARGETS[name], seed, chunk, size)
+
+
+def run_fuzz(
+    targets: Optional[List[Target]] = None,
+    cases: int = DEFAULT_CASES,
+    seed: int = DEFAULT_SEED,
+    workers: Optional[int] = None,
+    chunk_size: int = CHUNK_SIZE
+) -> Dict:
+    """
+    대상별 차분 퍼징 + 불일치 축소
+
+    Args:
+        targets: 검사 대상 (None이면 TARGETS 전체). TARGETS 에 없는 대상은 현재 프로세스에서 실행
+        cases: 대상별 입력 수
+        seed: 난수 시드 (같은 시드 → 같은 입력)
+        workers: 프로세스 수 (None이면 CPU 수, 1이면 현재 프로세스)
+        chunk_size: 묶음 1개 입력 수
+
+    Returns:
+        Dict: {generated_at, seed, cases, workers, seconds, mismatches, targets: {이름: {...}}}
+    """
+    targets = list(TARGETS.values()) if targets is None else targets
+    if not targets:
+        raise ValueError("검사할 대상이 없습니다")
+    if cases <= 0:
+        raise ValueError(f"입력 수는 1 이상이어야 합니다: {cases}")
+
+    chunks = [(idx, min(chunk_size, cases - start)) for idx, start in enumerate(range(0, cases, chunk_size))]
+    workers = max(1, min(workers or os.cpu_count() or 1, len(chunks) * len(targets)))
+    start = time.perf_counter()
+
+    report_targets = {}
+    pool = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+    try:
+        for target in targets:
+            target_start = time.perf_counter()
+            if pool is not None and TARGETS.get(target.name) is target:
+                results = list(pool.map(_run_chunk_job, [(target.name, seed, idx, size) for idx, size in chunks]))
+            else:
+                results = [run_chunk(target, seed, idx, size) for idx, size in chunks]
+            seconds = time.perf_counter() - target_start
+
+            fields: Dict[str, int] = {}
+            for result in results:
+                for key, value in result['fields'].items():
+                    fields[key] = fields.get(key, 0) + value
+            examples = [
+                (result['chunk'], example) for result in results for example in result['examples']
+            ][:MAX_REPRODUCERS]
+
+            report_targets[target.name] = {
+                'cases': sum(r['cases'] for r in results),
+                'mismatches': sum(r['mismatches'] for r in results),
+                'fields': fields,
+                'seconds': round(seconds, 3),
+                'cases_per_second': round(sum(r['cases'] for r in results) / seconds) if seconds else None,
+                'reproducers': [
+                    {'chunk': chunk, 'original': example, 'case': (minimal := shrink(target, example)),
+                     'diff': check_case(target, minimal)}
+                    for chunk, example in examples
+                ],
+            }
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'seed': seed,
+        'cases': cases,
+        'workers': workers,
+        'seconds': round(time.perf_counter() - start, 3),
+        'mismatches': sum(t['mismatches'] for t in report_targets.values()),
+        'targets': report_targets,
+    }
+
+
+def print_report(report: Dict) -> None:
+    """보고서 요약 출력"""
+    print("=" * 80)
+    print(f"스칼라 ↔ 배열 엔진 차분 퍼징 (시드 {report['seed']}, 대상별 {report['cases']:,}건, "
+          f"{report['workers']}개 프로세스, {report['seconds']:.1f}초)")
+    print("=" * 80)
+    print(f"{'대상':<28}{'입력':>12}{'불일치':>10}{'초당':>12}  필드")
+    for name, t in report['targets'].items():
+        fields = ", ".join(f"{k} {v:,}" for k, v in t['fields'].items())
+        print(f"{name:<28}{t['cases']:>12,}{t['mismatches']:>10,}{t['cases_per_second'] or 0:>12,}  {fields}")
+
+    for name, t in report['targets'].items():
+        for reproducer in t['reproducers']:
+            print(f"\n❌ {name} 최소 재현 입력 (묶음 {reproducer['chunk']}):")
+            print(f"   {reproducer['case']}")
+            for key, values in reproducer['diff'].items():
+                print(f"   {key}: 스칼라 {values['scalar']!r} / 배열 {values['batch']!r}")
+
+    if report['mismatches']:
+        print(f"\n❌ 불일치 {report['mismatches']:,}건")
+    else:
+        print("\n✅ 모든 입력에서 원 단위 일치")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="스칼라 ↔ 배열 계산 엔진 차분 퍼징")
+    parser.add_argument("--cases", type=int, default=DEFAULT_CASES, help="대상별 입력 수")
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED, help="난수 시드")
+    parser.add_argument("--target", default=None, help=f"쉼표 구분 대상 ({', '.join(TARGETS)})")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수 (기본: CPU 수)")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="결과 JSON")
+    args = parser.parse_args()
+
+    names = [n.strip() for n in args.target.split(",") if n.strip()] if args.target else list(TARGETS)
+    unknown = [n for n in names if n not in TARGETS]
+    if unknown:
+        print(f"❌ 알 수 없는 대상: {', '.join(unknown)}")
+        sys.exit(1)
+
+    report = run_fuzz([TARGETS[n] for n in names], args.cases, args.seed, args.workers)
+    write_json_atomic(Path(args.output), report)
+    print_report(report)
+    print(f"결과: {args.output}")
+
+    if report['mismatches']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,555 @@
+"""
+tools/load_test.py
+견적 세션 동시 부하 테스트
+
+실제 사용 흐름(단일 견적, 전체 비교, 시나리오 그리드, 차량 검색, 예산 검색)을 섞은 요청을
+계산 API(core/*)에 같은 프로세스 안에서 직접 보내고, 동시성 모델(thread / process / asyncio)과
+캐시 설정(nocache / memory / disk / cube)마다 동시 세션 수를 늘려 가며
+처리량, 지연시간 p50/p95/p99, 포화 지점(처리량이 더 늘지 않는 동시성)을 측정한다.
+외부 서버나 네트워크는 쓰지 않는다. (HTTP 계층까지 재려면 tools/bench_api.py)
+
+요청 목록은 시드로 정해지므로 모델/설정/동시성이 달라도 같은 요청을 같은 순서로 보낸다.
+차량 인기도는 순위에 반비례(Zipf)라서 같은 견적이 반복되어 캐시 적중이 자연히 생긴다.
+
+사용법:
+    python tools/load_test.py
+    python tools/load_test.py --models thread,process --configs nocache,memory,disk --levels 1,2,4,8
+    python tools/load_test.py --mix browse --requests 2000 --output data/load_test_browse.json
+"""
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from core.comparison import compare_all
+from core.deal_search import compile_catalog, search_deals
+from core.quote import quote_for_capital
+from core.quote_cache import configure_quote_cache
+from core.quote_cube import cube_quote, load_quote_cube
+from core.scenario_grid import build_scenario_grid
+from data import residual_rates, vehicle_master
+from data.warmup import warm_all
+from excel_reverse_engineering.extract_all import write_json_atomic
+from utils.cache_stats import percentile
+
+DEFAULT_OUTPUT = Path(__file__).parent.parent / "data" / "load_test.json"
+
+MODELS = ("thread", "process", "asyncio")
+DEFAULT_LEVELS = [1, 2, 4, 8, 16]
+
+# 동시성을 한 단계 올렸을 때 처리량이 이 비율 이상 늘지 않으면 포화
+SATURATION_GAIN = 0.10
+
+DOWN_PAYMENT_PERCENTS = [0, 0, 0, 10, 20, 30]
+DEAL_BUDGETS = [400_000, 600_000, 800_000, 1_000_000, 1_500_000]
+
+
+class CacheConfig(NamedTuple):
+    """캐시 설정 (워커마다 같은 설정으로 적용)"""
+    name: str
+    use_cache: bool  # 공유 견적 캐시 (quote_for_capital / compare_all)
+    disk: bool       # sqlite 디스크 계층 (프로세스 워커 간 공유)
+    cube: bool       # 표준 견적은 사전 계산 큐브에서 조회
+
+
+CACHE_CONFIGS: Dict[str, CacheConfig] = {
+    'nocache': CacheConfig('nocache', use_cache=False, disk=False, cube=False),
+    'memory': CacheConfig('memory', use_cache=True, disk=False, cube=False),
+    'disk': CacheConfig('disk', use_cache=True, disk=True, cube=False),
+    'cube': CacheConfig('cube', use_cache=True, disk=False, cube=True),
+}
+
+# 요청 종류별 비중
+MIXES: Dict[str, Dict[str, float]] = {
+    'session': {'quote': 0.45, 'compare': 0.20, 'grid': 0.10, 'search': 0.15, 'deals': 0.10},
+    'browse': {'search': 0.45, 'deals': 0.30, 'quote': 0.20, 'grid': 0.05},
+    'compare': {'compare': 0.60, 'quote': 0.30, 'grid': 0.10},
+}
+
+
+# ========================================
+# 요청 생성
+# ========================================
+
+def build_pool(per_capital: int = 40) -> Dict[str, List[Dict]]:
+    """
+    캐피탈별 견적 대상 차량 (잔존율 데이터가 있는 조건만)
+
+    Args:
+        per_capital: 캐피탈당 차량 수 (카탈로그 순서로 고르게 추출)
+
+    Returns:
+        Dict: {capital_id: [{'vehicle_id', 'brand', 'model', 'conditions': [(months, mileage), ...]}]}
+    """
+    pool = {}
+    for capital_id in residual_rates.get_available_capitals():
+        catalog = compile_catalog(capital_id)
+        vehicle_ids = catalog['vehicle_ids']
+        step = max(1, len(vehicle_ids) // per_capital)
+
+        entries = []
+        for v in range(0, len(vehicle_ids), step)[:per_capital]:
+            available = ~np.isnan(catalog['residual_rate'][v]).all(axis=2)  # (T, M)
+            conditions = [
+                (catalog['terms'][t], catalog['mileages'][m])
+                for t, m in zip(*np.nonzero(available))
+            ]
+            if not conditions:
+                continue
+            vehicle = vehicle_master.get_vehicle(vehicle_ids[v], capital_id=capital_id)
+            entries.append({
+                'vehicle_id': vehicle_ids[v],
+                'brand': vehicle['brand'],
+                'model': vehicle['model'],
+                'conditions': conditions,
+            })
+        if entries:
+            pool[capital_id] = entries
+    return pool
+
+
+def make_workload(mix: str, count: int, seed: int = 0, pool: Optional[Dict[str, List[Dict]]] = None) -> List[Tuple[str, Dict]]:
+    """
+    시드로 정해지는 요청 목록
+
+    Args:
+        mix: MIXES 이름
+        count: 요청 수
+        seed: 난수 시드
+        pool: build_pool 결과 (None이면 생성)
+
+    Returns:
+        List[Tuple[str, Dict]]: [(요청 종류, 파라미터), ...] (프로세스 워커로 보낼 수 있는 값만)
+
+    Raises:
+        ValueError: 알 수 없는 mix
+    """
+    if mix not in MIXES:
+        raise ValueError(f"알 수 없는 요청 구성: {mix} (가능: {', '.join(MIXES)})")
+    pool = pool if pool is not None else build_pool()
+    if not pool:
+        raise ValueError("견적 가능한 차량이 없습니다 (잔존율 데이터 확인)")
+
+    rng = random.Random(seed)
+    ops = list(MIXES[mix])
+    op_weights = list(MIXES[mix].values())
+    capitals = sorted(pool)
+    popularity = {c: [1 / (rank + 1) for rank in range(len(pool[c]))] for c in capitals}
+
+    jobs = []
+    for _ in range(count):
+        op = rng.choices(ops, op_weights)[0]
+        capital_id = rng.choice(capitals)
+        entry = rng.choices(pool[capital_id], popularity[capital_id])[0]
+        months, mileage = rng.choice(entry['conditions'])
+        down = rng.choice(DOWN_PAYMENT_PERCENTS)
+
+        if op in ('quote', 'compare'):
+            params = {'capital_id': capital_id, 'vehicle_id': entry['vehicle_id'],
+                      'contract_months': int(months), 'annual_mileage': int(mileage),
+                      'down_payment_percent': down}
+        elif op == 'grid':
+            params = {'capital_id': capital_id, 'vehicle_id': entry['vehicle_id'],
+                      'down_payment_percent': down}
+        elif op == 'search':
+            keyword = rng.choice([entry['brand'], entry['model'], entry['model'][:3]])
+            params = {'keyword': keyword.lower()}
+        else:
+            params = {'max_monthly_payment': rng.choice(DEAL_BUDGETS),
+                      'terms': sorted(rng.sample([24, 36, 48, 60], rng.randint(1, 4))),
+                      'down_payment_percent': down}
+        jobs.append((op, params))
+    return jobs
+
+
+# ========================================
+# 요청 실행 (워커 안)
+# ========================================
+
+_CONFIG = CACHE_CONFIGS['memory']
+
+
+def apply_config(config: CacheConfig, disk_path: Optional[str] = None) -> None:
+    """현재 프로세스에 캐시 설정 적용 (견적 캐시는 비운 새 인스턴스)"""
+    global _CONFIG
+    _CONFIG = config
+    configure_quote_cache(disk_path=disk_path if config.disk else None)
+
+
+def _init_worker(config: CacheConfig, disk_path: Optional[str]) -> None:
+    """프로세스 워커 초기화 (공유 데이터 적재 + 캐시 설정)"""
+    warm_all()
+    apply_config(config, disk_path)
+
+
+def _vehicle(params: Dict) -> Dict:
+    vehicle = vehicle_master.get_vehicle(params['vehicle_id'], capital_id=params['capital_id'])
+    return {**vehicle, 'id': params['vehicle_id']}
+
+
+def execute(job: Tuple[str, Dict]) -> str:
+    """
+    요청 1건 실행
+
+    Returns:
+        str: 요청 종류
+
+    Raises:
+        ValueError: 계산 실패 (잔존율 없음 등)
+    """
+    op, params = job
+
+    if op == 'quote':
+        vehicle = _vehicle(params)
+        args = (params['capital_id'], vehicle, vehicle['price'], params['contract_months'],
+                params['annual_mileage'], params['down_payment_percent'])
+        if not (_CONFIG.cube and cube_quote(*args) is not None):
+            quote_for_capital(*args, use_cache=_CONFIG.use_cache)
+    elif op == 'compare':
+        vehicle = _vehicle(params)
+        compare_all(
+            vehicle={'brand': vehicle['brand'], 'model': vehicle['model'], 'trim': vehicle['trim']},
+            contract_months=params['contract_months'],
+            annual_mileage=params['annual_mileage'],
+            down_payment_percent=params['down_payment_percent'],
+            vehicle_price=vehicle['price'],  # master_carinfo 에 없는 트림도 비교
+            executor=None,
+            use_cache=_CONFIG.use_cache
+        )
+    elif op == 'grid':
+        vehicle = _vehicle(params)
+        build_scenario_grid(params['capital_id'], params['vehicle_id'], vehicle=vehicle,
+                            down_payment=vehicle['price'] * params['down_payment_percent'] / 100)
+    elif op == 'search':
+        vehicle_master.search_vehicles(params['keyword'])
+    elif op == 'deals':
+        search_deals(max_monthly_payment=params['max_monthly_payment'], top_k=20,
+                     terms=params['terms'], down_payment_percent=params['down_payment_percent'])
+    else:
+        raise ValueError(f"알 수 없는 요청 종류: {op}")
+    return op
+
+
+# ========================================
+# 동시성 모델 (폐쇄 루프: 세션 N개가 응답을 받으면 다음 요청)
+# ========================================
+
+Sample = Tuple[str, float, bool]  # (요청 종류, 지연시간 초, 성공 여부)
+
+
+def _timed(call: Callable[[Tuple[str, Dict]], str], job: Tuple[str, Dict]) -> Sample:
+    start = time.perf_counter()
+    try:
+        call(job)
+        ok = True
+    except Exception:
+        ok = False
+    return job[0], time.perf_counter() - start, ok
+
+
+def _thread_clients(call: Callable, jobs: List[Tuple[str, Dict]], concurrency: int) -> List[Sample]:
+    """세션마다 스레드 1개가 공유 요청 목록에서 다음 요청을 가져와 실행"""
+    samples: List[Sample] = []
+    jobs_iter = iter(jobs)
+    lock = threading.Lock()
+
+    def client():
+        while True:
+            with lock:
+                job = next(jobs_iter, None)
+            if job is None:
+                return
+            sample = _timed(call, job)
+            with lock:
+                samples.append(sample)
+
+    clients = [threading.Thread(target=client, daemon=True) for _ in range(concurrency)]
+    for t in clients:
+        t.start()
+    for t in clients:
+        t.join()
+    return samples
+
+
+async def _async_clients(jobs: List[Tuple[str, Dict]], concurrency: int) -> List[Sample]:
+    """세션마다 코루틴 1개, 계산은 이벤트 루프의 스레드 풀에서 (API 서버와 같은 구조)"""
+    loop = asyncio.get_running_loop()
+    samples: List[Sample] = []
+    jobs_iter = iter(jobs)
+
+    async def client():
+        for job in jobs_iter:  # 단일 이벤트 루프라 공유 반복자에 락이 필요 없음
+            start = time.perf_counter()
+            try:
+                await loop.run_in_executor(None, execute, job)
+                ok = True
+            except Exception:
+                ok = False
+            samples.append((job[0], time.perf_counter() - start, ok))
+
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        loop.set_default_executor(pool)
+        await asyncio.gather(*[client() for _ in range(concurrency)])
+    return samples
+
+
+def run_level(
+    model: str,
+    config: CacheConfig,
+    jobs: List[Tuple[str, Dict]],
+    concurrency: int,
+    warmup: int = 0
+) -> Dict:
+    """
+    동시성 1단계 측정 (캐시는 비운 상태에서 warmup 건을 먼저 보내고 나머지를 측정)
+
+    Args:
+        model: "thread", "process", "asyncio"
+        config: 캐시 설정
+        jobs: 요청 목록 (앞 warmup 건은 측정하지 않음)
+        concurrency: 동시 세션 수
+        warmup: 측정 전 요청 수
+
+    Returns:
+        Dict: {'concurrency', 'requests', 'errors', 'elapsed', 'throughput',
+               'p50_ms', 'p95_ms', 'p99_ms', 'max_ms', 'ops': {종류: {...}}}
+    """
+    if model not in MODELS:
+        raise ValueError(f"알 수 없는 동시성 모델: {model} (가능: {', '.join(MODELS)})")
+    warm_jobs, measured = jobs[:warmup], jobs[warmup:]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        disk_path = os.path.join(tmp, "quote_cache.sqlite") if config.disk else None
+
+        if model == "process":
+            with ProcessPoolExecutor(max_workers=concurrency, initializer=_init_worker,
+                                     initargs=(config, disk_path)) as pool:
+                def call(job):
+                    return pool.submit(execute, job).result()
+
+                _thread_clients(call, warm_jobs, concurrency)
+                started = time.perf_counter()
+                samples = _thread_clients(call, measured, concurrency)
+                elapsed = time.perf_counter() - started
+        else:
+            apply_config(config, disk_path)
+            if model == "thread":
+                _thread_clients(execute, warm_jobs, concurrency)
+                started = time.perf_counter()
+                samples = _thread_clients(execute, measured, concurrency)
+            else:
+                asyncio.run(_async_clients(warm_jobs, concurrency))
+                started = time.perf_counter()
+                samples = asyncio.run(_async_clients(measured, concurrency))
+            elapsed = time.perf_counter() - started
+            apply_config(CACHE_CONFIGS['memory'])  # 임시 디스크 캐시를 놓아 둠
+
+    return summarize(samples, concurrency, elapsed)
+
+
+def _latency_summary(latencies: List[float]) -> Dict:
+    ordered = sorted(latencies)
+    return {
+        'p50_ms': round(percentile(ordered, 0.50) * 1000, 2),
+        'p95_ms': round(percentile(ordered, 0.95) * 1000, 2),
+        'p99_ms': round(percentile(ordered, 0.99) * 1000, 2),
+        'max_ms': round(ordered[-1] * 1000, 2) if ordered else 0.0,
+    }
+
+
+def summarize(samples: List[Sample], concurrency: int, elapsed: float) -> Dict:
+    """측정 표본 → 처리량/지연시간 요약 (전체 + 요청 종류별)"""
+    ops = {}
+    for op in sorted({s[0] for s in samples}):
+        own = [s for s in samples if s[0] == op]
+        ops[op] = {
+            'count': len(own),
+            'errors': sum(1 for s in own if not s[2]),
+            **_latency_summary([s[1] for s in own]),
+        }
+
+    return {
+        'concurrency': concurrency,
+        'requests': len(samples),
+        'errors': sum(1 for s in samples if not s[2]),
+        'elapsed': round(elapsed, 3),
+        'throughput': round(len(samples) / elapsed, 1) if elapsed else 0.0,
+        **_latency_summary([s[1] for s in samples]),
+        'ops': ops,
+    }
+
+
+def find_saturation(levels: List[Dict], gain: float = SATURATION_GAIN) -> Dict:
+    """
+    포화 지점: 다음 단계에서 처리량이 gain 이상 늘지 않는 첫 동시성
+
+    그 이상 세션을 늘리면 처리량은 그대로이고 대기(지연시간)만 늘어난다.
+
+    Args:
+        levels: run_level 결과 (동시성 오름차순)
+        gain: 의미 있는 처리량 증가 비율
+
+    Returns:
+        Dict: {'concurrency', 'throughput', 'p95_ms', 'saturated' (측정 범위 안에서 포화했는지),
+               'next_p95_growth' (다음 단계 p95 / 포화 지점 p95), 'peak_throughput', 'peak_concurrency'}
+    """
+    peak = max(levels, key=lambda level: level['throughput'])
+    result = {'saturated': False, 'next_p95_growth': None}
+    point = levels[-1]
+    for current, following in zip(levels, levels[1:]):
+        if following['throughput'] < current['throughput'] * (1 + gain):
+            point = current
+            result['saturated'] = True
+            if current['p95_ms']:
+                result['next_p95_growth'] = round(following['p95_ms'] / current['p95_ms'], 2)
+            break
+
+    return {
+        'concurrency': point['concurrency'],
+        'throughput': point['throughput'],
+        'p95_ms': point['p95_ms'],
+        **result,
+        'peak_throughput': peak['throughput'],
+        'peak_concurrency': peak['concurrency'],
+    }
+
+
+def run_load_test(
+    models: Optional[List[str]] = None,
+    configs: Optional[List[str]] = None,
+    mix: str = 'session',
+    levels: Optional[List[int]] = None,
+    requests: int = 400,
+    warmup: int = 100,
+    seed: int = 0,
+    pool_size: int = 40,
+    progress: Optional[Callable[[str], None]] = None
+) -> Dict:
+    """
+    동시성 모델 × 캐시 설정 × 동시성 단계 부하 테스트
+
+    Args:
+        models: 동시성 모델 (None이면 thread, process, asyncio)
+        configs: CACHE_CONFIGS 이름 (None이면 nocache, memory)
+        mix: MIXES 이름
+        levels: 동시 세션 수 단계 (None이면 1, 2, 4, 8, 16)
+        requests: 단계마다 측정할 요청 수
+        warmup: 단계마다 측정 전에 보낼 요청 수
+        seed: 요청 목록 시드
+        pool_size: 캐피탈당 대상 차량 수
+        progress: 단계별 진행 메시지를 받을 함수
+
+    Returns:
+        Dict: {'mix', 'requests', 'warmup', 'seed', 'cpu_count',
+               'runs': [{'model', 'config', 'levels': [...], 'saturation': {...}} 또는 {'model', 'config', 'skipped'}]}
+
+    Raises:
+        ValueError: 알 수 없는 모델/설정/구성, 잘못된 단계
+    """
+    models = models or ['thread', 'process', 'asyncio']
+    configs = configs or ['nocache', 'memory']
+    levels = sorted(set(levels or DEFAULT_LEVELS))
+    for model in models:
+        if model not in MODELS:
+            raise ValueError(f"알 수 없는 동시성 모델: {model} (가능: {', '.join(MODELS)})")
+    for name in configs:
+        if name not in CACHE_CONFIGS:
+            raise ValueError(f"알 수 없는 캐시 설정: {name} (가능: {', '.join(CACHE_CONFIGS)})")
+    if levels[0] < 1 or requests < 1:
+        raise ValueError("동시성과 요청 수는 1 이상이어야 합니다")
+
+    warm_all()
+    jobs = make_workload(mix, warmup + requests, seed=seed, pool=build_pool(pool_size))
+
+    runs = []
+    for model in models:
+        for name in configs:
+            config = CACHE_CONFIGS[name]
+            if config.cube and load_quote_cube() is None:
+                runs.append({'model': model, 'config': name,
+                             'skipped': "큐브 파일이 없습니다 (python tools/build_quote_cube.py)"})
+                continue
+
+            results = []
+            for concurrency in levels:
+                result = run_level(model, config, jobs, concurrency, warmup=warmup)
+                results.append(result)
+                if progress:
+                    progress(f"{model:<8}{name:<9}동시 {concurrency:>3}: {result['throughput']:>8,.1f} req/s "
+                             f"p95 {result['p95_ms']:.1f}ms 오류 {result['errors']}")
+            runs.append({'model': model, 'config': name, 'levels': results,
+                         'saturation': find_saturation(results)})
+
+    return {
+        'mix': mix,
+        'weights': MIXES[mix],
+        'requests': requests,
+        'warmup': warmup,
+        'seed': seed,
+        'cpu_count': os.cpu_count(),
+        'runs': runs,
+    }
+
+
+def print_report(report: Dict) -> None:
+    print("=" * 80)
+    print(f"부하 테스트: 구성 {report['mix']} · 단계마다 {report['requests']:,}건 "
+          f"(예열 {report['warmup']:,}건) · CPU {report['cpu_count']}개")
+    print("=" * 80)
+    print(f"{'모델':<9}{'캐시':<9}{'동시':>5}{'req/s':>10}{'p50':>10}{'p95':>10}{'p99':>10}{'오류':>6}")
+    for run in report['runs']:
+        if 'skipped' in run:
+            print(f"{run['model']:<9}{run['config']:<9}  건너뜀: {run['skipped']}")
+            continue
+        for level in run['levels']:
+            print(f"{run['model']:<9}{run['config']:<9}{level['concurrency']:>5}{level['throughput']:>10,.1f}"
+                  f"{level['p50_ms']:>8.1f}ms{level['p95_ms']:>8.1f}ms{level['p99_ms']:>8.1f}ms{level['errors']:>6}")
+        sat = run['saturation']
+        state = f"포화 동시 {sat['concurrency']}" if sat['saturated'] else f"동시 {sat['concurrency']}까지 포화 없음"
+        print(f"{'':<18}→ {state}, 최대 {sat['peak_throughput']:,.1f} req/s (동시 {sat['peak_concurrency']})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="견적 세션 동시 부하 테스트")
+    parser.add_argument("--models", default="thread,process,asyncio", help=f"동시성 모델 ({', '.join(MODELS)})")
+    parser.add_argument("--configs", default="nocache,memory", help=f"캐시 설정 ({', '.join(CACHE_CONFIGS)})")
+    parser.add_argument("--mix", default="session", choices=list(MIXES))
+    parser.add_argument("--levels", default="1,2,4,8,16", help="동시 세션 수 단계")
+    parser.add_argument("--requests", type=int, default=400, help="단계마다 측정할 요청 수")
+    parser.add_argument("--warmup", type=int, default=100, help="단계마다 측정 전에 보낼 요청 수")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--pool", type=int, default=40, help="캐피탈당 대상 차량 수")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT))
+    args = parser.parse_args()
+
+    report = run_load_test(
+        models=[m.strip() for m in args.models.split(",") if m.strip()],
+        configs=[c.strip() for c in args.configs.split(",") if c.strip()],
+        mix=args.mix,
+        levels=[int(v) for v in args.levels.split(",") if v.strip()],
+        requests=args.requests,
+        warmup=args.warmup,
+        seed=args.seed,
+        pool_size=args.pool,
+        progress=print
+    )
+    print_report(report)
+    write_json_atomic(Path(args.output), report)
+    print(f"\n결과 저장: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,472 @@
+"""
+tools/memory_report.py
+적재된 데이터 구조 메모리 사용량 보고 (구조별/캐피탈별 deep size, 객체 수, N개 캐피탈 예상, 저장 방식 비교)
+
+Streamlit 워커 1개가 공유 캐시(_VEHICLE_CACHE, _RESIDUAL_CACHE, _MASTER_CARINFO_CACHE 등)에
+쓰는 메모리를 객체 그래프를 따라가며 잰다. 한 객체는 한 번만 센다 (키 사전/값 공유 반영).
+인터프리터가 공유하는 None/True/False/작은 정수와 타입/모듈/함수 객체는 세지 않는다.
+
+- 구조별: 캐시 키마다 바이트/객체 수/형식별 분포
+- 캐피탈별: 잔존율 + 그 캐피탈이 쓰는 차량 마스터 (다른 캐피탈과 같이 쓰면 shared 표시)
+- 예상: 공용(master_carinfo, 정규화 인덱스) + N × 캐피탈당 평균 (캐피탈마다 차량 마스터를 따로 둔다고 가정)
+- 저장 방식 비교: 같은 데이터 파일을 json / artifact / encoded / dense(잔존율) 로 적재했을 때
+  바이트, 객체 수, 적재 시간과 방식별 N개 캐피탈 예상
+
+사용법:
+    python tools/memory_report.py                           # data/memory_report.json
+    python tools/memory_report.py --capitals 1,5,10,30      # 예상 캐피탈 수
+    python tools/memory_report.py --derived                 # 예산 검색 카탈로그/카탈로그 통계도 적재 후 측정
+    python tools/memory_report.py --no-backends             # 저장 방식 비교 생략
+"""
+
+import argparse
+import gc
+import importlib
+import json
+import os
+import sys
+import time
+import types
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Callable, Dict, Hashable, List, NamedTuple, Optional
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from core.quote_cache import data_version
+from data import residual_rates, vehicle_master
+from data.artifact_format import (KIND_RESIDUAL_RATES, KIND_VEHICLE_MASTER, json_path, read_artifact,
+                                  read_encoded)
+from data.warmup import warm_all
+from excel_reverse_engineering.extract_all import write_json_atomic
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_OUTPUT = ROOT / "data" / "memory_report.json"
+DEFAULT_PROJECTION = [1, 2, 5, 10, 20]
+
+# 세지 않는 객체 (데이터가 아닌 코드/타입)
+_SKIP_TYPES = (type, types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+               types.MethodType, types.CodeType)
+
+
+class Structure(NamedTuple):
+    """측정 대상 공유 캐시 (모듈 전역 SingleFlightCache)"""
+    name: str
+    module: str
+    attr: str
+    derived: bool = False   # 요청 처리 중 만들어지는 파생 캐시 (warm_all 로 적재되지 않음)
+
+
+STRUCTURES: List[Structure] = [
+    Structure("vehicle_master", "data.vehicle_master", "_VEHICLE_CACHE"),
+    Structure("residual_rates", "data.residual_rates", "_RESIDUAL_CACHE"),
+    Structure("master_carinfo", "data.vehicle_master", "_MASTER_CARINFO_CACHE"),
+    Structure("deal_catalog", "core.deal_search", "_CATALOG_CACHE", derived=True),
+    Structure("catalog_stats", "core.catalog_stats", "_STATS_CACHE", derived=True),
+    Structure("quote_cube", "core.quote_cube", "_CUBE_CACHE", derived=True),
+]
+
+
+# ========================================
+# deep size
+# ========================================
+
+def _is_shared_constant(obj: Any) -> bool:
+    """인터프리터 전체가 공유하는 값 (데이터 크기에 넣지 않음)"""
+    if obj is None or obj is True or obj is False:
+        return True
+    return type(obj) is int and -5 <= obj <= 256
+
+
+def deep_size(obj: Any, seen: Optional[set] = None) -> Dict:
+    """
+    객체 그래프 전체 크기 (sys.getsizeof 합, 같은 객체는 한 번)
+
+    Args:
+        obj: 측정할 객체
+        seen: 이미 센 객체 id (여러 구조를 합칠 때 공유해 중복 제외)
+
+    Returns:
+        Dict: {'bytes', 'objects', 'types': {형식: {'count', 'bytes'}}}
+    """
+    seen = set() if seen is None else seen
+    total = count = 0
+    by_type: Dict[str, Dict[str, int]] = {}
+    stack = [obj]
+    while stack:
+        current = stack.pop()
+        if id(current) in seen or _is_shared_constant(current) or isinstance(current, _SKIP_TYPES):
+            continue
+        seen.add(id(current))
+
+        size = sys.getsizeof(current)
+        total += size
+        count += 1
+        item = by_type.setdefault(type(current).__name__, {'count': 0, 'bytes': 0})
+        item['count'] += 1
+        item['bytes'] += size
+
+        if isinstance(current, np.ndarray):
+            # 뷰는 getsizeof 에 버퍼가 빠지므로 원본을 따라감
+            if current.base is not None:
+                stack.append(current.base)
+            continue
+        if isinstance(current, (str, bytes, int, float)):
+            continue
+        if type(current) is dict:
+            # dict 의 gc 순회는 문자열 키를 건너뛰므로 키/값을 직접 따라감
+            stack.extend(current.keys())
+            stack.extend(current.values())
+            continue
+        stack.extend(gc.get_referents(current))
+
+    return {
+        'bytes': total,
+        'objects': count,
+        'types': dict(sorted(by_type.items(), key=lambda kv: -kv[1]['bytes'])),
+    }
+
+
+# ========================================
+# 구조별 / 캐피탈별
+# ========================================
+
+def _cache(structure: Structure):
+    return getattr(importlib.import_module(structure.module), structure.attr)
+
+
+def _key_label(key: Hashable) -> str:
+    return key if isinstance(key, str) else json.dumps(key, ensure_ascii=False, default=str)
+
+
+def _capitals_for(structure: Structure, key: Hashable, capitals: List[str]) -> List[str]:
+    """캐시 키를 쓰는 캐피탈 (빈 목록 = 공용)"""
+    if structure.name == "vehicle_master":
+        return [c for c in capitals if vehicle_master.vehicle_master_path(c).name == key]
+    first = key[0] if isinstance(key, tuple) and key else key
+    return [first] if first in capitals else []
+
+
+def measure_structures(capitals: List[str], structures: Optional[List[Structure]] = None) -> Dict:
+    """
+    공유 캐시별 키 단위 크기 + 캐피탈별 합계 + 공용 크기
+
+    Returns:
+        Dict: {'structures', 'capitals', 'shared', 'total'}
+    """
+    structures = STRUCTURES if structures is None else structures
+    report_structures: Dict[str, Dict] = {}
+    per_capital: Dict[str, Dict] = {c: {'bytes': 0, 'objects': 0, 'parts': {}, 'shared_parts': []} for c in capitals}
+    shared = {'bytes': 0, 'objects': 0, 'parts': {}}
+    seen_all: set = set()
+    total = {'bytes': 0, 'objects': 0}
+
+    for structure in structures:
+        cache = _cache(structure)
+        entries = {}
+        for key, value in cache.snapshot().items():
+            size = deep_size(value)
+            users = _capitals_for(structure, key, capitals)
+            entries[_key_label(key)] = dict(size, capitals=users)
+
+            part = f"{structure.name}:{_key_label(key)}"
+            if users:
+                for capital in users:
+                    per_capital[capital]['bytes'] += size['bytes']
+                    per_capital[capital]['objects'] += size['objects']
+                    per_capital[capital]['parts'][part] = size['bytes']
+                    if len(users) > 1:
+                        per_capital[capital]['shared_parts'].append(part)
+            else:
+                shared['bytes'] += size['bytes']
+                shared['objects'] += size['objects']
+                shared['parts'][part] = size['bytes']
+
+            unique = deep_size(value, seen_all)
+            total['bytes'] += unique['bytes']
+            total['objects'] += unique['objects']
+
+        report_structures[structure.name] = {
+            'cache': f"{structure.module}.{structure.attr}",
+            'derived': structure.derived,
+            'bytes': sum(e['bytes'] for e in entries.values()),
+            'objects': sum(e['objects'] for e in entries.values()),
+            'entries': entries,
+        }
+
+    return {'structures': report_structures, 'capitals': per_capital, 'shared': shared, 'total': total}
+
+
+def project(fixed_bytes: int, per_capital_bytes: List[int], counts: List[int]) -> Dict[str, int]:
+    """공용 + N × 캐피탈당 평균"""
+    mean = sum(per_capital_bytes) / len(per_capital_bytes) if per_capital_bytes else 0
+    return {str(n): int(fixed_bytes + n * mean) for n in counts}
+
+
+# ========================================
+# 저장 방식 비교
+# ========================================
+
+class Backend(NamedTuple):
+    """데이터 파일 1개를 메모리에 올리는 방식"""
+    name: str
+    description: str
+    load: Callable[[Path, str], Any]     # (아티팩트 경로, 종류) → 메모리 객체
+    kinds: tuple = (KIND_VEHICLE_MASTER, KIND_RESIDUAL_RATES)
+
+
+def _load_json(path: Path, kind: str) -> Any:
+    export = json_path(path)
+    if not export.exists():
+        raise FileNotFoundError(f"JSON 내보내기가 없습니다: {export}")
+    with open(export, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+
+def _load_dense_residuals(path: Path, kind: str) -> Dict:
+    """차량 × 잔가옵션 × 기간 × 주행거리 float32 텐서 + 축 (없는 칸은 NaN)"""
+    data = read_artifact(path, kind)
+    grade_options, terms, mileages = set(), set(), set()
+    for by_grade in data.values():
+        for grade_option, table in (by_grade or {}).items():
+            grade_options.add(grade_option)
+            for months, by_mileage in (table or {}).items():
+                terms.add(months)
+                mileages.update(by_mileage or {})
+    axes = {name: sorted(values, key=lambda v: (len(v), v)) if name != 'grade_options' else sorted(values)
+            for name, values in (('grade_options', grade_options), ('terms', terms), ('mileages', mileages))}
+    index = {name: {value: i for i, value in enumerate(values)} for name, values in axes.items()}
+
+    tensor = np.full((len(data), len(axes['grade_options']), len(axes['terms']), len(axes['mileages'])),
+                     np.nan, dtype=np.float32)
+    for v, by_grade in enumerate(data.values()):
+        for grade_option, table in (by_grade or {}).items():
+            g = index['grade_options'][grade_option]
+            for months, by_mileage in (table or {}).items():
+                t = index['terms'][months]
+                for mileage, rate in (by_mileage or {}).items():
+                    if rate is not None:
+                        tensor[v, g, t, index['mileages'][mileage]] = rate
+    return {'vehicle_index': {vid: i for i, vid in enumerate(data)}, 'axes': axes, 'rates': tensor}
+
+
+BACKENDS: Dict[str, Backend] = {
+    backend.name: backend for backend in (
+        Backend("json", "JSON 내보내기를 json.load (이전 방식)", _load_json),
+        Backend("artifact", "아티팩트를 dict 로 풀어 적재 (현재 방식, 키/값 공유)",
+                lambda path, kind: read_artifact(path, kind)),
+        Backend("encoded", "아티팩트 번호 배열 그대로 (조회 시 풀어야 함)",
+                lambda path, kind: read_encoded(path, kind)),
+        Backend("dense", "잔존율 float32 텐서 + 축 (조회는 배열 인덱싱)", _load_dense_residuals,
+                kinds=(KIND_RESIDUAL_RATES,)),
+    )
+}
+
+
+def data_files(capitals: List[str]) -> Dict[str, Dict]:
+    """캐피탈이 쓰는 데이터 파일 {이름: {'path', 'kind', 'capitals'}}"""
+    files: Dict[str, Dict] = {}
+    for capital in capitals:
+        master = vehicle_master.vehicle_master_path(capital)
+        entry = files.setdefault(master.stem, {'path': master, 'kind': KIND_VEHICLE_MASTER, 'capitals': []})
+        entry['capitals'].append(capital)
+        residual = ROOT / "data" / "residual_rates" / f"{capital}.npz"
+        files[f"residual_rates/{capital}"] = {'path': residual, 'kind': KIND_RESIDUAL_RATES, 'capitals': [capital]}
+    return files
+
+
+def compare_backends(capitals: List[str], backends: List[Backend], counts: List[int], fixed_bytes: int) -> Dict:
+    """
+    데이터 파일별 저장 방식 비교 + 방식별 N개 캐피탈 예상
+
+    dense 처럼 일부 종류만 지원하는 방식은 나머지 파일을 현재 방식(artifact) 크기로 채워 예상한다.
+
+    Returns:
+        Dict: {'files': {파일: {방식: {'bytes', 'objects', 'load_ms'}}}, 'projection': {방식: {N: 바이트}}}
+    """
+    files = data_files(capitals)
+    results: Dict[str, Dict] = {}
+    for name, info in files.items():
+        results[name] = {}
+        for backend in backends:
+            if info['kind'] not in backend.kinds:
+                continue
+            start = time.perf_counter()
+            try:
+                value = backend.load(info['path'], info['kind'])
+            except FileNotFoundError as e:
+                results[name][backend.name] = {'error': str(e)}
+                continue
+            load_ms = (time.perf_counter() - start) * 1000
+            size = deep_size(value)
+            results[name][backend.name] = {'bytes': size['bytes'], 'objects': size['objects'],
+                                           'load_ms': round(load_ms, 2)}
+            del value
+
+    projection = {}
+    for backend in backends:
+        per_capital = []
+        for capital in capitals:
+            sizes = [(results[name].get(backend.name) or results[name].get('artifact') or {}).get('bytes')
+                     for name, info in files.items() if capital in info['capitals']]
+            if None in sizes:
+                break
+            per_capital.append(sum(sizes))
+        else:
+            projection[backend.name] = project(fixed_bytes, per_capital, counts)
+
+    return {'files': results, 'projection': projection}
+
+
+# ========================================
+# 보고서
+# ========================================
+
+def process_rss() -> Optional[int]:
+    """현재 프로세스 RSS (바이트, Linux /proc 만)"""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def build_report(
+    counts: Optional[List[int]] = None,
+    backends: Optional[List[str]] = None,
+    derived: bool = False
+) -> Dict:
+    """
+    데이터 적재(warm_all) 후 메모리 보고서
+
+    Args:
+        counts: 예상할 캐피탈 수 목록
+        backends: 비교할 저장 방식 이름 (None이면 전체, 빈 목록이면 생략)
+        derived: True면 예산 검색 카탈로그/카탈로그 통계도 만든 뒤 측정
+
+    Returns:
+        Dict: {generated_at, python, data_version, process, structures, capitals, shared, total,
+               projection, backends}
+
+    Raises:
+        ValueError: 알 수 없는 저장 방식
+    """
+    counts = counts or DEFAULT_PROJECTION
+    names = list(BACKENDS) if backends is None else backends
+    unknown = [n for n in names if n not in BACKENDS]
+    if unknown:
+        raise ValueError(f"알 수 없는 저장 방식: {', '.join(unknown)} (지원: {', '.join(BACKENDS)})")
+
+    rss_before = process_rss()
+    warm_all()
+    capitals = residual_rates.get_available_capitals()
+    if derived:
+        from core.catalog_stats import get_catalog_stats
+        from core.deal_search import compile_catalog
+        for capital in capitals:
+            compile_catalog(capital)
+        get_catalog_stats()
+    gc.collect()
+    rss_after = process_rss()
+
+    measured = measure_structures(capitals)
+    # 예상은 warm_all 로 적재되는 기본 구조만 (파생 캐시는 요청 패턴에 따라 달라짐)
+    base = measure_structures(capitals, [s for s in STRUCTURES if not s.derived])
+    per_capital = [base['capitals'][c]['bytes'] for c in capitals]
+
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'python': sys.version.split()[0],
+        'data_version': data_version(),
+        'process': {'rss_before_load': rss_before, 'rss_after_load': rss_after},
+        **measured,
+        'projection': {
+            'fixed_bytes': base['shared']['bytes'],
+            'per_capital_bytes': int(sum(per_capital) / len(per_capital)) if per_capital else 0,
+            'capitals': project(base['shared']['bytes'], per_capital, counts),
+        },
+        'backends': compare_backends(capitals, [BACKENDS[n] for n in names], counts, base['shared']['bytes'])
+        if names else None,
+    }
+
+
+def _mb(value: Optional[float]) -> str:
+    return "-" if value is None else f"{value / 1024 / 1024:,.1f}MB"
+
+
+def print_report(report: Dict) -> None:
+    """보고서 요약 출력"""
+    print("=" * 80)
+    print(f"데이터 구조 메모리 · Python {report['python']} · 데이터 {report['data_version']} · "
+          f"RSS {_mb(report['process']['rss_before_load'])} → {_mb(report['process']['rss_after_load'])}")
+    print("=" * 80)
+
+    print(f"{'구조 / 키':<48}{'크기':>12}{'객체':>12}  캐피탈")
+    for name, structure in report['structures'].items():
+        if not structure['entries']:
+            continue
+        print(f"{name:<48}{_mb(structure['bytes']):>12}{structure['objects']:>12,}")
+        for key, entry in structure['entries'].items():
+            print(f"  {key[:46]:<46}{_mb(entry['bytes']):>12}{entry['objects']:>12,}  "
+                  f"{', '.join(entry['capitals']) or '공용'}")
+    print(f"{'합계 (공유 객체 1회)':<48}{_mb(report['total']['bytes']):>12}{report['total']['objects']:>12,}")
+
+    print(f"\n{'캐피탈':<48}{'크기':>12}{'객체':>12}")
+    for capital, entry in report['capitals'].items():
+        note = f"  (같이 씀: {', '.join(entry['shared_parts'])})" if entry['shared_parts'] else ""
+        print(f"{capital:<48}{_mb(entry['bytes']):>12}{entry['objects']:>12,}{note}")
+    print(f"{'공용':<48}{_mb(report['shared']['bytes']):>12}{report['shared']['objects']:>12,}")
+
+    projection = report['projection']
+    counts = list(projection['capitals'])
+    print(f"\n예상 (공용 {_mb(projection['fixed_bytes'])} + 캐피탈당 {_mb(projection['per_capital_bytes'])})")
+    print(f"{'방식':<20}" + "".join(f"{n + '개':>12}" for n in counts))
+    print(f"{'현재':<20}" + "".join(f"{_mb(projection['capitals'][n]):>12}" for n in counts))
+
+    if report['backends']:
+        for backend, values in report['backends']['projection'].items():
+            print(f"{backend:<20}" + "".join(f"{_mb(values[n]):>12}" for n in counts))
+
+        print(f"\n{'파일 / 방식':<48}{'크기':>12}{'객체':>12}{'적재':>12}")
+        for name, results in report['backends']['files'].items():
+            print(name)
+            for backend, result in results.items():
+                if 'error' in result:
+                    print(f"  {backend:<46}{result['error']}")
+                    continue
+                print(f"  {backend:<46}{_mb(result['bytes']):>12}{result['objects']:>12,}"
+                      f"{result['load_ms']:>10,.1f}ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="적재된 데이터 구조 메모리 사용량 보고")
+    parser.add_argument("--capitals", default=",".join(map(str, DEFAULT_PROJECTION)),
+                        help="쉼표 구분, 예상할 캐피탈 수")
+    parser.add_argument("--backends", default=None, help=f"쉼표 구분 저장 방식 ({', '.join(BACKENDS)})")
+    parser.add_argument("--no-backends", action="store_true", help="저장 방식 비교 생략")
+    parser.add_argument("--derived", action="store_true", help="예산 검색 카탈로그/카탈로그 통계도 측정")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="결과 JSON")
+    args = parser.parse_args()
+
+    counts = [int(n) for n in args.capitals.split(",") if n.strip()]
+    if args.no_backends:
+        backends: Optional[List[str]] = []
+    else:
+        backends = [n.strip() for n in args.backends.split(",") if n.strip()] if args.backends else None
+
+    try:
+        report = build_report(counts, backends, args.derived)
+    except ValueError as e:
+        print(f"❌ {e}")
+        sys.exit(1)
+
+    write_json_atomic(Path(args.output), report)
+    print_report(report)
+    print(f"\n결과: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
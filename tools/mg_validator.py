@@ -3,11 +3,151 @@ tools/mg_validator.py
 MG 엑셀 견적서 검증 도구
 
 MG 엑셀과 우리 계산기 결과를 비교
+- 기본: 엑셀에 저장된 계산 값(마지막 한 시나리오)과 비교
+- --scenarios N: 견적 시트 수식을 컴파일해 입력(차량가/기간/주행거리)을 바꾼 N개 시나리오를
+  엑셀 없이 다시 계산하고 계산기와 비교 (excel_reverse_engineering/formula_engine.py)
+
+사용법:
+    python tools/mg_validator.py xlsx/mg_capital_2510_vol3.xlsx 2000
+    python tools/mg_validator.py xlsx/mg_capital_2510_vol3.xlsx --scenarios 5000
 """
 
+import argparse
+import random
+import sys
+from pathlib import Path
+from typing import Any, Dict, List
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
 import openpyxl
+from openpyxl.utils.cell import coordinate_to_tuple
 from core.mg_calculator import MGLeaseCalculator
-import sys
+from excel_reverse_engineering.formula_engine import ExcelError, FormulaBook
+
+QUOTE_SHEET = "운용리스"
+
+# 견적 시트 셀 좌표 (필드 → 셀)
+QUOTE_CELLS = {
+    'vehicle_name': 'D8',
+    'vehicle_price': 'K14',             # 차량가격
+    'contract_months': 'AG9',
+    'annual_mileage': 'AG15',
+    'residual_rate': 'AG16',            # 잔존율
+    'annual_interest_rate': 'BD37',
+    'down_payment_guarantee': 'AG17',   # 보증금
+    'down_payment_advance': 'AG18',     # 장기선수금
+    'down_payment_lease': 'AG11',       # 선납리스료
+    'monthly_payment': 'AG14',          # 月납입금
+    'acquisition_cost': 'K19',          # 취득원가
+    'residual_value': 'AJ16',           # 잔존가치
+}
+
+# 비어 있으면 0 으로 보는 셀 (MG는 선납금을 보증금/장기선수금/선납리스료로 나눔, 보통 0)
+OPTIONAL_FIELDS = ('down_payment_guarantee', 'down_payment_advance', 'down_payment_lease')
+
+# 엑셀 결과와 비교하는 필드 (첫 필드로 통과 여부 판정, 나머지는 참고)
+COMPARED_FIELDS = ('monthly_payment', 'acquisition_cost', 'residual_value')
+
+# 시나리오 입력 셀 (계산기 인수 → 셀)
+SCENARIO_INPUTS = {field: QUOTE_CELLS[field] for field in ('vehicle_price', 'contract_months', 'annual_mileage')}
+
+# 시나리오마다 다시 계산할 셀 (잔존율/금리/선납금은 시트 수식 결과를 계산기 입력으로 사용)
+SCENARIO_OUTPUTS = {field: cell for field, cell in QUOTE_CELLS.items()
+                    if field not in SCENARIO_INPUTS and field != 'vehicle_name'}
+
+SCENARIO_MONTHS = [12, 24, 36, 48, 60]
+SCENARIO_MILEAGES = [10000, 15000, 20000, 30000]
+
+
+def _parse_won(value) -> int:
+    """엑셀 금액 셀 값 (숫자 또는 '1,234원' 문자열) → int"""
+    if isinstance(value, str):
+        return int(value.replace(',', '').replace('원', ''))
+    return int(value)
+
+
+def build_quote(values: Dict[str, Any]) -> Dict:
+    """
+    견적 시트 필드 값 → 계산기 입력 + 엑셀 결과
+
+    Args:
+        values: {필드: 셀 값} (QUOTE_CELLS 필드, vehicle_name 제외 가능)
+
+    Returns:
+        Dict: {'inputs': 계산기 인수, 'expected': {COMPARED_FIELDS: 원}, 'total_down_payment'}
+    """
+    total_down_payment = int(sum(values.get(field) or 0 for field in OPTIONAL_FIELDS))
+    acquisition_cost = _parse_won(values['acquisition_cost'])
+
+    return {
+        'inputs': {
+            'vehicle_price': _parse_won(values['vehicle_price']),
+            'residual_rate': float(values['residual_rate']),
+            'contract_months': int(values['contract_months']),
+            'annual_mileage': int(values['annual_mileage']),
+            'annual_interest_rate': float(values['annual_interest_rate']),
+            # 선납금 비율 (취득원가 기준)
+            'down_payment_rate': total_down_payment / acquisition_cost if total_down_payment > 0 else 0.0,
+        },
+        'expected': {
+            'monthly_payment': _parse_won(values['monthly_payment']),
+            'acquisition_cost': acquisition_cost,
+            'residual_value': _parse_won(values['residual_value']),
+        },
+        'total_down_payment': total_down_payment,
+    }
+
+
+def read_mg_quote(excel_path: str) -> Dict:
+    """
+    저장된 MG 견적서에서 계산기 입력과 엑셀 계산 결과 추출
+
+    읽기 전용 모드로 '운용리스' 시트의 필요한 범위만 한 번 읽는다 (차량DB 등 다른 시트는 읽지 않음).
+
+    Returns:
+        Dict: build_quote() 결과 + 'vehicle_name'
+
+    Raises:
+        ValueError: 시트 없음 또는 계산 값이 저장되지 않은 셀
+    """
+    positions = {field: coordinate_to_tuple(cell) for field, cell in QUOTE_CELLS.items()}
+    max_row = max(row for row, _ in positions.values())
+    max_col = max(col for _, col in positions.values())
+
+    wb = openpyxl.load_workbook(excel_path, read_only=True, data_only=True)
+    try:
+        if QUOTE_SHEET not in wb.sheetnames:
+            raise ValueError(f"'{QUOTE_SHEET}' 시트를 찾을 수 없습니다")
+        rows = list(wb[QUOTE_SHEET].iter_rows(min_row=1, max_row=max_row, min_col=1, max_col=max_col,
+                                              values_only=True))
+    finally:
+        wb.close()
+
+    values = {}
+    for field, (row, col) in positions.items():
+        cells = rows[row - 1] if row <= len(rows) else ()
+        values[field] = cells[col - 1] if col <= len(cells) else None
+
+    missing = [QUOTE_CELLS[field] for field, value in values.items()
+               if value is None and field not in OPTIONAL_FIELDS and field != 'vehicle_name']
+    if missing:
+        raise ValueError(f"계산 값이 저장되지 않은 셀: {', '.join(missing)} (엑셀에서 다시 계산 후 저장 필요)")
+
+    quote = build_quote(values)
+    quote['vehicle_name'] = values['vehicle_name']
+    return quote
+
+
+def calculate_mg_quote(inputs: Dict) -> Dict:
+    """계산기 입력 (build_quote()['inputs']) → MG 계산기 결과"""
+    return MGLeaseCalculator().calculate(
+        **inputs,
+        region="서울",
+        is_ev=False,  # TODO: 전기차 판별 로직
+        is_hybrid=False
+    )
 
 
 def validate_mg_excel(excel_path: str, tolerance: int = 2000):
@@ -25,95 +165,42 @@ def validate_mg_excel(excel_path: str, tolerance: int = 2000):
     print("MG캐피탈 엑셀 검증")
     print("=" * 100)
 
-    # 엑셀 로드
-    wb = openpyxl.load_workbook(excel_path, data_only=True)
-    ws = wb["운용리스"]
-
-    # 1. 차량 정보 추출
+    # 1. 엑셀에서 입력/계산 결과 추출
     print("\n[1] 엑셀에서 데이터 추출 중...")
     print("-" * 100)
 
-    vehicle_name = ws.cell(8, 4).value  # D8
-    vehicle_price_str = ws.cell(14, 11).value  # K14 (차량가격)
-
-    # 문자열에서 숫자 추출
-    if isinstance(vehicle_price_str, str):
-        vehicle_price = int(vehicle_price_str.replace(',', '').replace('원', ''))
-    else:
-        vehicle_price = int(vehicle_price_str)
+    quote = read_mg_quote(excel_path)
+    inputs = quote['inputs']
+    excel_monthly_payment = quote['expected']['monthly_payment']
+    acquisition_cost_excel = quote['expected']['acquisition_cost']
+    residual_value_excel = quote['expected']['residual_value']
 
-    print(f"차량: {vehicle_name}")
-    print(f"차량가: {vehicle_price:,}원")
-
-    # 2. 계약 조건 추출
-    contract_months = int(ws.cell(9, 33).value)  # AG9
-    annual_mileage = int(ws.cell(15, 33).value)  # AG15
-    residual_rate = float(ws.cell(16, 33).value)  # AG16 (잔존율)
+    print(f"차량: {quote['vehicle_name']}")
+    print(f"차량가: {inputs['vehicle_price']:,}원")
 
     print(f"\n계약 조건:")
-    print(f"  계약 기간: {contract_months}개월")
-    print(f"  주행거리: {annual_mileage:,}km/년")
-    print(f"  잔존율: {residual_rate:.4f} ({residual_rate*100:.2f}%)")
-
-    # 3. 금리 추출 (BD37)
-    annual_interest_rate = float(ws.cell(37, 56).value)  # BD37 (col 56)
-    print(f"  금리: {annual_interest_rate:.6f} ({annual_interest_rate*100:.4f}%)")
-
-    # 4. 선납금 추출 (AG17, AG18, AG11)
-    # MG는 보증금/장기선수금/선납리스료로 나뉨
-    # 현재 엑셀에서는 모두 0
-    down_payment_guarantee = ws.cell(17, 33).value or 0  # AG17: 보증금
-    down_payment_advance = ws.cell(18, 33).value or 0    # AG18: 장기선수금
-    down_payment_lease = ws.cell(11, 33).value or 0      # AG11: 선납리스료
-    total_down_payment = int(down_payment_guarantee + down_payment_advance + down_payment_lease)
-
-    print(f"  선납금: {total_down_payment:,}원")
-
-    # 5. 엑셀 계산 결과
-    excel_monthly_payment = ws.cell(14, 33).value  # AG14 (月납입금)
-    if isinstance(excel_monthly_payment, str):
-        excel_monthly_payment = int(excel_monthly_payment.replace(',', '').replace('원', ''))
-    else:
-        excel_monthly_payment = int(excel_monthly_payment)
+    print(f"  계약 기간: {inputs['contract_months']}개월")
+    print(f"  주행거리: {inputs['annual_mileage']:,}km/년")
+    print(f"  잔존율: {inputs['residual_rate']:.4f} ({inputs['residual_rate']*100:.2f}%)")
+    print(f"  금리: {inputs['annual_interest_rate']:.6f} ({inputs['annual_interest_rate']*100:.4f}%)")
+    print(f"  선납금: {quote['total_down_payment']:,}원")
 
     print(f"\n엑셀 계산 결과:")
     print(f"  월 납입금: {excel_monthly_payment:,}원")
 
-    # 6. 우리 계산기로 계산
+    # 2. 우리 계산기로 계산
     print("\n" + "-" * 100)
     print("[2] 우리 계산기로 계산 중...")
     print("-" * 100)
 
-    calc = MGLeaseCalculator()
-
-    # 취득원가 추출 (검증용)
-    acquisition_cost_excel = ws.cell(19, 11).value  # K19
-    if isinstance(acquisition_cost_excel, str):
-        acquisition_cost_excel = int(acquisition_cost_excel.replace(',', '').replace('원', ''))
-    else:
-        acquisition_cost_excel = int(acquisition_cost_excel)
-
-    # 선납금 비율 계산
-    down_payment_rate = total_down_payment / acquisition_cost_excel if total_down_payment > 0 else 0.0
-
-    result = calc.calculate(
-        vehicle_price=vehicle_price,
-        residual_rate=residual_rate,
-        contract_months=contract_months,
-        annual_mileage=annual_mileage,
-        annual_interest_rate=annual_interest_rate,
-        down_payment_rate=down_payment_rate,
-        region="서울",
-        is_ev=False,  # TODO: 전기차 판별 로직
-        is_hybrid=False
-    )
+    result = calculate_mg_quote(inputs)
 
     print(f"우리 계산 결과:")
     print(f"  월 납입금: {result['monthly_payment']:,}원")
     print(f"  취득원가: {result['acquisition_cost']:,}원")
     print(f"  잔존가치: {result['residual_value']:,}원")
 
-    # 7. 비교
+    # 3. 비교
     print("\n" + "=" * 100)
     print("[3] 검증 결과")
     print("=" * 100)
@@ -135,7 +222,6 @@ def validate_mg_excel(excel_path: str, tolerance: int = 2000):
     print(f"  차이:     {acquisition_diff:,}원")
 
     # 잔존가치 비교 (참고)
-    residual_value_excel = int(ws.cell(16, 36).value)  # AJ16
     residual_diff = abs(result['residual_value'] - residual_value_excel)
     print(f"\n잔존가치 비교 (참고):")
     print(f"  엑셀:     {residual_value_excel:,}원")
@@ -154,17 +240,135 @@ def validate_mg_excel(excel_path: str, tolerance: int = 2000):
         return False
 
 
-def main():
-    if len(sys.argv) < 2:
-        print("사용법: python mg_validator.py <엑셀파일경로> [허용오차]")
-        print("예시: python mg_validator.py xlsx/mg_capital_2510_vol3.xlsx 2000")
-        sys.exit(1)
+def generate_scenarios(count: int, seed: int = 0) -> List[Dict[str, Any]]:
+    """
+    검증 시나리오 생성 (차량가 2천만~1억5천만 만원 단위, 기간/주행거리는 표준 값)
+
+    Returns:
+        List[Dict]: [{'vehicle_price', 'contract_months', 'annual_mileage'}, ...]
+    """
+    rng = random.Random(seed)
+    return [
+        {
+            'vehicle_price': rng.randrange(20_000_000, 150_000_000, 10_000),
+            'contract_months': rng.choice(SCENARIO_MONTHS),
+            'annual_mileage': rng.choice(SCENARIO_MILEAGES),
+        }
+        for _ in range(count)
+    ]
+
+
+def validate_mg_scenarios(
+    excel_path: str,
+    scenarios: int = 1000,
+    tolerance: int = 2000,
+    seed: int = 0,
+    worst: int = 10
+) -> Dict:
+    """
+    MG 견적 시트 수식으로 여러 시나리오를 다시 계산해 계산기와 비교
+
+    수식 의존 그래프는 한 번만 컴파일하고, 시나리오마다 입력 셀(SCENARIO_INPUTS)만 바꿔 계산한다.
+    잔존율/금리/선납금은 시트가 계산한 값을 계산기에 그대로 넘기므로 월 납입금 차이는
+    취득원가/PMT/절사 로직 차이만 반영한다.
 
-    excel_path = sys.argv[1]
-    tolerance = int(sys.argv[2]) if len(sys.argv) > 2 else 2000
+    Args:
+        excel_path: MG 엑셀 파일 경로
+        scenarios: 시나리오 수
+        tolerance: 허용 오차 (원)
+        seed: 시나리오 난수 시드
+        worst: 보고할 최대 오차 시나리오 수
+
+    Returns:
+        Dict: {'scenarios', 'passed', 'failed', 'errors', 'max_diff', 'mean_diff',
+               'formula_cells', 'live_cells', 'worst': [...]}
+    """
+    with FormulaBook(excel_path, default_sheet=QUOTE_SHEET) as book:
+        model = book.compile(list(SCENARIO_OUTPUTS.values()), inputs=list(SCENARIO_INPUTS.values()))
+
+    diffs = []
+    errors = []
+    for scenario in generate_scenarios(scenarios, seed):
+        excel = model.evaluate({SCENARIO_INPUTS[field]: value for field, value in scenario.items()})
+        excel = {field: excel[cell] for field, cell in SCENARIO_OUTPUTS.items()}
+        failed_cells = {field: value.code for field, value in excel.items() if isinstance(value, ExcelError)}
+        if failed_cells:
+            errors.append({**scenario, 'errors': failed_cells})
+            continue
+
+        quote = build_quote({**excel, **scenario})
+        result = calculate_mg_quote(quote['inputs'])
+        expected = quote['expected']
+        diffs.append({
+            **scenario,
+            'excel': expected['monthly_payment'],
+            'calculator': result['monthly_payment'],
+            'diff': abs(result['monthly_payment'] - expected['monthly_payment']),
+            'acquisition_diff': abs(result['acquisition_cost'] - expected['acquisition_cost']),
+        })
+
+    passed = sum(1 for row in diffs if row['diff'] <= tolerance)
+    return {
+        'scenarios': scenarios,
+        'passed': passed,
+        'failed': len(diffs) - passed,
+        'errors': len(errors),
+        'max_diff': max((row['diff'] for row in diffs), default=0),
+        'mean_diff': sum(row['diff'] for row in diffs) / len(diffs) if diffs else 0.0,
+        'formula_cells': model.formula_cells,
+        'live_cells': model.live_cells,
+        'worst': sorted(diffs, key=lambda row: row['diff'], reverse=True)[:worst],
+        'error_samples': errors[:worst],
+    }
+
+
+def print_scenario_report(report: Dict, tolerance: int) -> None:
+    """시나리오 검증 결과 출력"""
+    print("=" * 100)
+    print("MG캐피탈 시나리오 검증 (수식 재계산 vs 계산기)")
+    print("=" * 100)
+    print(f"수식 셀: {report['formula_cells']}개 (시나리오마다 재계산 {report['live_cells']}개)")
+    print(f"시나리오: {report['scenarios']:,}개")
+    print(f"  통과: {report['passed']:,}  실패: {report['failed']:,}  엑셀 오류: {report['errors']:,}")
+    print(f"  월 납입금 차이: 평균 {report['mean_diff']:,.1f}원, 최대 {report['max_diff']:,}원 "
+          f"(허용오차 ±{tolerance:,}원)")
+
+    if report['worst'] and report['max_diff'] > 0:
+        print("\n오차 상위 시나리오:")
+        for row in report['worst']:
+            if row['diff'] == 0:
+                break
+            print(f"  {row['vehicle_price']:>13,}원 {row['contract_months']:>2}개월 "
+                  f"{row['annual_mileage']:>6,}km: 엑셀 {row['excel']:,} / 계산기 {row['calculator']:,} "
+                  f"(차이 {row['diff']:,})")
+    for row in report['error_samples']:
+        print(f"  엑셀 오류: {row['vehicle_price']:,}원 {row['contract_months']}개월 "
+              f"{row['annual_mileage']:,}km → {row['errors']}")
+
+    print("=" * 100)
+    if report['failed'] == 0 and report['errors'] == 0:
+        print("✅ 시나리오 검증 성공!")
+    else:
+        print("❌ 시나리오 검증 실패!")
+    print("=" * 100)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="MG 엑셀 견적서 검증")
+    parser.add_argument("excel_path", help="MG 엑셀 파일 경로")
+    parser.add_argument("tolerance", nargs="?", type=int, default=2000, help="허용 오차 (원, 기본 2000)")
+    parser.add_argument("--scenarios", type=int, default=0,
+                        help="수식 재계산 시나리오 수 (0이면 저장된 값 한 건만 비교)")
+    parser.add_argument("--seed", type=int, default=0, help="시나리오 난수 시드")
+    args = parser.parse_args()
 
     try:
-        success = validate_mg_excel(excel_path, tolerance)
+        if args.scenarios > 0:
+            report = validate_mg_scenarios(args.excel_path, args.scenarios, args.tolerance, args.seed)
+            print_scenario_report(report, args.tolerance)
+            success = report['failed'] == 0 and report['errors'] == 0
+        else:
+            success = validate_mg_excel(args.excel_path, args.tolerance)
         sys.exit(0 if success else 1)
     except Exception as e:
         print(f"\n❌ 오류 발생: {e}")
@@ -0,0 +1,343 @@
+"""
+tools/parity_runner.py
+저장된 견적 엑셀 일괄 패리티 검증 (디렉토리/매니페스트 → 프로세스 풀)
+
+캐피탈별 견적 어댑터가 엑셀에 저장된 계산 값에서 계산기 입력과 엑셀 결과를 읽고,
+우리 계산기로 다시 계산해 원 단위 차이를 비교한다.
+- 파일마다 통과/실패/오류, 필드별 차이
+- 캐피탈별/전체 통과율, 차이 분포 (평균, p95, 최대), 오차 상위 파일
+- 결과는 JSON 보고서 1개 (기본 data/parity_report.json)
+
+입력:
+- 디렉토리: 하위 디렉토리까지 *.xlsx (파일명 패턴으로 캐피탈 판별, --capital 로 지정 가능)
+- 매니페스트: JSON [경로, ...] 또는 [{"path", "capital_id"}, ...], CSV (path[,capital_id] 헤더)
+  상대 경로는 매니페스트 파일 기준
+
+새 캐피탈은 QUOTE_ADAPTERS 에 등록한다 (견적 시트 좌표를 아는 캐피탈만).
+
+사용법:
+    python tools/parity_runner.py xlsx/quotes --workers 4
+    python tools/parity_runner.py xlsx/quotes/2510 --capital mg_capital --tolerance 1000
+    python tools/parity_runner.py --manifest quotes.json --output /tmp/parity.json --worst 20
+"""
+
+import argparse
+import csv
+import fnmatch
+import importlib
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+# 상위 디렉토리를 path에 추가
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import numpy as np
+
+from excel_reverse_engineering.extract_all import CAPITAL_EXTRACTORS, write_json_atomic
+
+ROOT = Path(__file__).parent.parent
+DEFAULT_OUTPUT = ROOT / "data" / "parity_report.json"
+
+
+class QuoteAdapter(NamedTuple):
+    """캐피탈별 저장 견적 어댑터 등록 정보"""
+    capital_id: str
+    patterns: Tuple[str, ...]       # 견적 파일명 패턴 (소문자 비교)
+    module: str                     # 어댑터 모듈
+    reader: str                     # (엑셀 경로) → {'inputs': 계산기 인수, 'expected': {필드: 원}}
+    calculator: str                 # (inputs) → 계산기 결과 Dict
+    fields: Tuple[str, ...]         # 비교 필드 (첫 필드로 통과 판정, 나머지는 참고)
+
+
+QUOTE_ADAPTERS: Dict[str, QuoteAdapter] = {
+    'mg_capital': QuoteAdapter(
+        'mg_capital', CAPITAL_EXTRACTORS['mg_capital'].patterns,
+        'tools.mg_validator', 'read_mg_quote', 'calculate_mg_quote',
+        ('monthly_payment', 'acquisition_cost', 'residual_value')
+    ),
+}
+
+Job = Tuple[str, Optional[str]]  # (견적 파일 경로, 캐피탈 ID)
+
+
+def detect_capital(path: Path) -> Optional[str]:
+    """파일명 패턴으로 캐피탈 판별 (없으면 None)"""
+    name = Path(path).name.lower()
+    for capital_id, adapter in QUOTE_ADAPTERS.items():
+        if any(fnmatch.fnmatch(name, pattern) for pattern in adapter.patterns):
+            return capital_id
+    return None
+
+
+def load_manifest(manifest: Path) -> List[Job]:
+    """
+    매니페스트 로드
+
+    Returns:
+        List[Job]: [(경로, 캐피탈 ID 또는 None), ...]
+
+    Raises:
+        FileNotFoundError: 매니페스트 없음
+        ValueError: 형식 오류
+    """
+    manifest = Path(manifest)
+    if not manifest.exists():
+        raise FileNotFoundError(f"매니페스트를 찾을 수 없습니다: {manifest}")
+
+    if manifest.suffix.lower() == '.csv':
+        with open(manifest, 'r', encoding='utf-8-sig', newline='') as f:
+            rows = list(csv.DictReader(f))
+        if rows and 'path' not in rows[0]:
+            raise ValueError(f"CSV 매니페스트에 path 열이 없습니다: {manifest}")
+        entries = [{'path': row['path'], 'capital_id': row.get('capital_id') or None} for row in rows]
+    else:
+        with open(manifest, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        if not isinstance(data, list):
+            raise ValueError(f"JSON 매니페스트는 목록이어야 합니다: {manifest}")
+        entries = [{'path': item} if isinstance(item, str) else item for item in data]
+        if any(not isinstance(entry, dict) or 'path' not in entry for entry in entries):
+            raise ValueError(f"매니페스트 항목에 path 가 없습니다: {manifest}")
+
+    jobs = []
+    for entry in entries:
+        path = Path(entry['path'])
+        if not path.is_absolute():
+            path = manifest.parent / path
+        jobs.append((str(path), entry.get('capital_id')))
+    return jobs
+
+
+def collect_quotes(
+    input_dir: Optional[Path] = None,
+    manifest: Optional[Path] = None,
+    capital_id: Optional[str] = None
+) -> Tuple[List[Job], List[str]]:
+    """
+    검증할 견적 파일 목록
+
+    Args:
+        input_dir: 견적 디렉토리 (하위 디렉토리 포함, 엑셀 임시 파일 ~$ 제외)
+        manifest: 매니페스트 파일 (input_dir 대신)
+        capital_id: 모든 파일에 적용할 캐피탈 (없으면 매니페스트 값 → 파일명 패턴)
+
+    Returns:
+        Tuple[List[Job], List[str]]: (작업 목록, 캐피탈을 판별하지 못해 건너뛴 경로)
+
+    Raises:
+        ValueError: 등록되지 않은 캐피탈
+    """
+    if capital_id is not None and capital_id not in QUOTE_ADAPTERS:
+        raise ValueError(f"견적 어댑터가 없는 캐피탈: {capital_id} (등록: {', '.join(QUOTE_ADAPTERS)})")
+
+    if manifest is not None:
+        candidates = load_manifest(manifest)
+    else:
+        paths = sorted(p for p in Path(input_dir).rglob('*.xlsx') if not p.name.startswith('~$'))
+        candidates = [(str(p), None) for p in paths]
+
+    jobs, skipped = [], []
+    for path, listed in candidates:
+        resolved = capital_id or listed or detect_capital(Path(path))
+        if resolved is None:
+            skipped.append(path)
+        else:
+            jobs.append((path, resolved))
+    return jobs, skipped
+
+
+def validate_quote(path: str, capital_id: str, tolerance: int) -> Dict:
+    """
+    (작업 프로세스) 견적 파일 1개 검증
+
+    예외는 결과의 'error' 로 돌려준다 (다른 파일 검증은 계속).
+
+    Returns:
+        Dict: {path, capital_id, status: pass|fail|error, diff, signed_diff, excel, calculator,
+               fields: {필드: {excel, calculator, diff}}, seconds}
+    """
+    result = {'path': path, 'capital_id': capital_id}
+    start = time.perf_counter()
+    try:
+        adapter = QUOTE_ADAPTERS.get(capital_id)
+        if adapter is None:
+            raise ValueError(f"견적 어댑터가 없는 캐피탈: {capital_id}")
+        if not Path(path).exists():
+            raise FileNotFoundError(f"견적 파일을 찾을 수 없습니다: {path}")
+
+        module = importlib.import_module(adapter.module)
+        quote = getattr(module, adapter.reader)(path)
+        calculated = getattr(module, adapter.calculator)(quote['inputs'])
+
+        fields = {}
+        for field in adapter.fields:
+            excel, ours = quote['expected'][field], calculated[field]
+            fields[field] = {'excel': excel, 'calculator': ours, 'diff': abs(ours - excel)}
+
+        primary = fields[adapter.fields[0]]
+        result.update({
+            'status': 'pass' if primary['diff'] <= tolerance else 'fail',
+            'diff': primary['diff'],
+            'signed_diff': primary['calculator'] - primary['excel'],
+            'excel': primary['excel'],
+            'calculator': primary['calculator'],
+            'inputs': quote['inputs'],
+            'fields': fields,
+        })
+    except Exception as e:
+        result.update({'status': 'error', 'error': f"{type(e).__name__}: {e}"})
+
+    result['seconds'] = round(time.perf_counter() - start, 4)
+    return result
+
+
+def _validate_job(args: Tuple[str, str, int]) -> Dict:
+    return validate_quote(*args)
+
+
+def deviation_stats(results: List[Dict]) -> Dict:
+    """
+    통과율과 원 단위 차이 분포 (오류 파일은 분포에서 제외)
+
+    Returns:
+        Dict: {files, passed, failed, errors, pass_rate, mean, p95, max, bias}
+              bias: 계산기 - 엑셀 평균 (양수면 계산기가 비싸게 계산)
+    """
+    compared = [r for r in results if r['status'] != 'error']
+    passed = sum(1 for r in compared if r['status'] == 'pass')
+    diffs = np.array([r['diff'] for r in compared], dtype=float)
+    signed = np.array([r['signed_diff'] for r in compared], dtype=float)
+    return {
+        'files': len(results),
+        'passed': passed,
+        'failed': len(compared) - passed,
+        'errors': len(results) - len(compared),
+        # 오류 파일은 통과하지 못한 것으로 본다
+        'pass_rate': round(passed / len(results), 4) if results else 0.0,
+        'mean': round(float(diffs.mean()), 1) if len(diffs) else 0.0,
+        'p95': round(float(np.percentile(diffs, 95)), 1) if len(diffs) else 0.0,
+        'max': int(diffs.max()) if len(diffs) else 0,
+        'bias': round(float(signed.mean()), 1) if len(signed) else 0.0,
+    }
+
+
+def run_parity(
+    jobs: List[Job],
+    tolerance: int = 2000,
+    workers: Optional[int] = None,
+    worst: int = 10,
+    skipped: Optional[List[str]] = None
+) -> Dict:
+    """
+    견적 파일 병렬 검증 + 보고서
+
+    Args:
+        jobs: [(경로, 캐피탈 ID), ...]
+        tolerance: 허용 오차 (원)
+        workers: 프로세스 수 (None이면 min(파일 수, CPU 수))
+        worst: 보고할 오차 상위 파일 수
+        skipped: 캐피탈을 판별하지 못한 경로 (보고서에 그대로 기록)
+
+    Returns:
+        Dict: {generated_at, seconds, workers, tolerance, summary, capitals, worst, errors, skipped, results}
+    """
+    workers = max(1, min(workers or os.cpu_count() or 1, len(jobs) or 1))
+    start = time.perf_counter()
+
+    results: List[Dict] = []
+    if jobs:
+        # 파일당 작업이 짧아 프로세스 간 전달 비용을 묶음 단위로 나눈다
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(_validate_job, [(path, capital_id, tolerance) for path, capital_id in jobs],
+                                    chunksize=chunksize))
+
+    by_capital: Dict[str, List[Dict]] = {}
+    for result in results:
+        by_capital.setdefault(result['capital_id'], []).append(result)
+
+    compared = [r for r in results if r['status'] != 'error']
+    return {
+        'generated_at': datetime.now().isoformat(timespec='seconds'),
+        'seconds': round(time.perf_counter() - start, 3),
+        'workers': workers,
+        'tolerance': tolerance,
+        'summary': deviation_stats(results),
+        'capitals': {capital_id: deviation_stats(items) for capital_id, items in sorted(by_capital.items())},
+        'worst': [
+            {key: r[key] for key in ('path', 'capital_id', 'status', 'diff', 'excel', 'calculator', 'inputs')}
+            for r in sorted(compared, key=lambda r: r['diff'], reverse=True)[:worst] if r['diff'] > 0
+        ],
+        'errors': [{'path': r['path'], 'capital_id': r['capital_id'], 'error': r['error']}
+                   for r in results if r['status'] == 'error'],
+        'skipped': skipped or [],
+        'results': results,
+    }
+
+
+def print_report(report: Dict) -> None:
+    """보고서 요약 출력"""
+    print("=" * 100)
+    print(f"견적 패리티 검증 ({report['workers']}개 프로세스, {report['seconds']:.1f}초, "
+          f"허용오차 ±{report['tolerance']:,}원)")
+    print("=" * 100)
+    print(f"{'캐피탈':<18}{'파일':>8}{'통과':>8}{'실패':>8}{'오류':>8}{'통과율':>10}"
+          f"{'평균':>10}{'p95':>10}{'최대':>10}{'편향':>10}")
+    rows = list(report['capitals'].items()) + [('전체', report['summary'])]
+    for name, stats in rows:
+        print(f"{name:<18}{stats['files']:>8,}{stats['passed']:>8,}{stats['failed']:>8,}{stats['errors']:>8,}"
+              f"{stats['pass_rate']:>10.1%}{stats['mean']:>10,.1f}{stats['p95']:>10,.1f}{stats['max']:>10,}"
+              f"{stats['bias']:>+10,.1f}")
+
+    if report['worst']:
+        print("\n오차 상위 파일:")
+        for item in report['worst']:
+            print(f"  {item['diff']:>8,}원  엑셀 {item['excel']:>10,} / 계산기 {item['calculator']:>10,}  "
+                  f"{item['path']}")
+    if report['errors']:
+        print(f"\n오류 {len(report['errors'])}건:")
+        for item in report['errors'][:10]:
+            print(f"  {item['path']}: {item['error']}")
+    if report['skipped']:
+        print(f"\n캐피탈을 판별하지 못해 건너뜀 {len(report['skipped'])}건 (--capital 또는 매니페스트 지정)")
+    print("=" * 100)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="저장된 견적 엑셀 일괄 패리티 검증")
+    parser.add_argument("input_dir", nargs="?", default=None, help="견적 엑셀 디렉토리")
+    parser.add_argument("--manifest", default=None, help="견적 파일 목록 (JSON/CSV)")
+    parser.add_argument("--capital", default=None, help=f"캐피탈 ID 지정 ({', '.join(QUOTE_ADAPTERS)})")
+    parser.add_argument("--tolerance", type=int, default=2000, help="허용 오차 (원, 기본 2000)")
+    parser.add_argument("--workers", type=int, default=None, help="프로세스 수")
+    parser.add_argument("--worst", type=int, default=10, help="보고할 오차 상위 파일 수")
+    parser.add_argument("--output", default=str(DEFAULT_OUTPUT), help="보고서 JSON 경로")
+    args = parser.parse_args()
+
+    if (args.input_dir is None) == (args.manifest is None):
+        parser.error("견적 디렉토리 또는 --manifest 중 하나를 지정하세요")
+
+    jobs, skipped = collect_quotes(
+        Path(args.input_dir) if args.input_dir else None,
+        Path(args.manifest) if args.manifest else None,
+        args.capital
+    )
+    report = run_parity(jobs, args.tolerance, args.workers, args.worst, skipped)
+    write_json_atomic(Path(args.output), report)
+
+    print_report(report)
+    print(f"보고서: {args.output}")
+
+    summary = report['summary']
+    if summary['failed'] or summary['errors'] or not summary['files']:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+utils/cache_stats.py
+캐시 적중률 및 재실행 지연시간 계측
+
+Streamlit 캐시(st.cache_data)는 적중 여부를 노출하지 않으므로,
+호출 횟수는 래퍼에서, 미스 횟수는 캐시된 함수 본문에서 기록한다.
+(적중 = 호출 - 미스)
+"""
+
+import threading
+from collections import deque
+from typing import Deque, Dict
+
+
+def percentile(sorted_values: list, q: float) -> float:
+    """정렬된 값 목록의 백분위수 (최근접 순위법)"""
+    if not sorted_values:
+        return 0.0
+    idx = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[idx]
+
+
+class CacheStats:
+    """캐시별 호출/미스 카운터와 재실행 지연시간 기록 (스레드 안전)"""
+
+    def __init__(self, max_samples: int = 200):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, int] = {}
+        self._misses: Dict[str, int] = {}
+        self._reruns: Dict[str, Deque[float]] = {}
+        self._max_samples = max_samples
+
+    def record_call(self, name: str) -> None:
+        with self._lock:
+            self._calls[name] = self._calls.get(name, 0) + 1
+
+    def record_miss(self, name: str) -> None:
+        with self._lock:
+            self._misses[name] = self._misses.get(name, 0) + 1
+
+    def record_rerun(self, seconds: float, label: str = "cached") -> None:
+        """
+        스크립트 1회 실행 시간 기록
+
+        Args:
+            seconds: 실행 시간 (초)
+            label: 구분 (예: "cached", "uncached") - 캐시 전후 비교용
+        """
+        with self._lock:
+            samples = self._reruns.setdefault(label, deque(maxlen=self._max_samples))
+            samples.append(seconds)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._calls.clear()
+            self._misses.clear()
+            self._reruns.clear()
+
+    def snapshot(self) -> Dict:
+        """
+        현재 통계
+
+        Returns:
+            Dict: {
+                'caches': {name: {'calls', 'hits', 'misses', 'hit_rate'}},
+                'reruns': {label: {'count', 'last', 'mean', 'p50', 'p95'}}  # 초 단위
+            }
+        """
+        with self._lock:
+            calls = dict(self._calls)
+            misses = dict(self._misses)
+            reruns = {label: list(samples) for label, samples in self._reruns.items()}
+
+        caches = {}
+        for name in sorted(set(calls) | set(misses)):
+            n_calls = calls.get(name, 0)
+            n_misses = min(misses.get(name, 0), n_calls) if n_calls else misses.get(name, 0)
+            hits = max(0, n_calls - n_misses)
+            caches[name] = {
+                'calls': n_calls,
+                'hits': hits,
+                'misses': n_misses,
+                'hit_rate': hits / n_calls if n_calls else 0.0,
+            }
+
+        rerun_stats = {}
+        for label, samples in reruns.items():
+            ordered = sorted(samples)
+            rerun_stats[label] = {
+                'count': len(samples),
+                'last': samples[-1] if samples else 0.0,
+                'mean': sum(samples) / len(samples) if samples else 0.0,
+                'p50': percentile(ordered, 0.50),
+                'p95': percentile(ordered, 0.95),
+            }
+
+        return {'caches': caches, 'reruns': rerun_stats}
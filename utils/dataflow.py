@@ -0,0 +1,158 @@
+"""
+utils/dataflow.py
+입력 기반 메모이제이션 데이터플로 그래프
+
+노드마다 (자신이 읽는 입력 값 + 의존 노드 버전)을 키로 마지막 결과를 기억한다.
+입력 하나가 바뀌면 그 입력을 (직접/간접으로) 읽는 노드만 다시 실행되고,
+다시 실행한 결과가 이전과 같으면 버전을 올리지 않아 그 아래 노드도 재사용된다.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Tuple
+
+
+class _Node(NamedTuple):
+    name: str
+    fn: Callable[..., Any]
+    deps: Tuple[str, ...]
+    inputs: Tuple[str, ...]
+
+
+class _Memo:
+    """노드별 마지막 결과 (키, 값, 버전)"""
+
+    __slots__ = ("key", "value", "version")
+
+    def __init__(self):
+        self.key = None
+        self.value = None
+        self.version = 0
+
+
+def _same(a: Any, b: Any) -> bool:
+    """값 비교 (배열처럼 비교 결과가 bool이 아닌 값은 다르다고 본다)"""
+    if a is b:
+        return True
+    if type(a) is not type(b):
+        return False
+    try:
+        return bool(a == b)
+    except (TypeError, ValueError):
+        return False
+
+
+class Dataflow:
+    """
+    이름 있는 노드의 방향성 비순환 그래프
+
+    사용 예:
+        flow = Dataflow("quote")
+        flow.add("price", lambda vehicle: vehicle['price'], deps=("vehicle",))
+        flow.run(["payment"], capital_id=..., down_payment_percent=...)
+    """
+
+    def __init__(self, name: str = "dataflow"):
+        self.name = name
+        self._nodes: Dict[str, _Node] = {}
+        self._memo: Dict[str, _Memo] = {}
+        self._computes: Dict[str, int] = {}
+        self._hits: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.last_executed: List[str] = []
+
+    def add(
+        self,
+        name: str,
+        fn: Callable[..., Any],
+        deps: Iterable[str] = (),
+        inputs: Iterable[str] = ()
+    ) -> None:
+        """
+        노드 추가 (fn은 의존 노드 값과 입력 값을 같은 이름의 키워드 인자로 받는다)
+
+        Raises:
+            ValueError: 이름 중복 또는 등록되지 않은 의존 노드
+        """
+        deps = tuple(deps)
+        if name in self._nodes:
+            raise ValueError(f"이미 등록된 노드입니다: {name}")
+        missing = [d for d in deps if d not in self._nodes]
+        if missing:
+            raise ValueError(f"등록되지 않은 의존 노드입니다: {', '.join(missing)}")
+
+        self._nodes[name] = _Node(name, fn, deps, tuple(inputs))
+        self._memo[name] = _Memo()
+        self._computes[name] = 0
+        self._hits[name] = 0
+
+    def run(self, targets: Iterable[str], **inputs) -> Dict[str, Any]:
+        """
+        대상 노드 평가 (필요한 노드만, 키가 바뀐 노드만 실행)
+
+        노드에서 발생한 예외는 그대로 전달되며, 실패한 노드의 이전 결과는 유지된다.
+
+        Args:
+            targets: 평가할 노드 이름
+            **inputs: 입력 값 (해시 가능해야 함)
+
+        Returns:
+            Dict[str, Any]: {노드 이름: 값}
+        """
+        with self._lock:
+            self.last_executed = []
+            visited: Dict[str, int] = {}
+            return {target: self._evaluate(target, inputs, visited) for target in targets}
+
+    def evaluate(self, target: str, **inputs) -> Any:
+        """노드 1개 평가"""
+        return self.run([target], **inputs)[target]
+
+    def _evaluate(self, name: str, inputs: Dict[str, Any], visited: Dict[str, int]) -> Any:
+        """노드 값 (이번 실행에서 이미 확인한 노드는 다시 확인하지 않음)"""
+        node = self._nodes.get(name)
+        if node is None:
+            raise KeyError(f"등록되지 않은 노드입니다: {name}")
+
+        memo = self._memo[name]
+        if name in visited:
+            return memo.value
+
+        dep_values = {dep: self._evaluate(dep, inputs, visited) for dep in node.deps}
+        try:
+            input_values = {key: inputs[key] for key in node.inputs}
+        except KeyError as e:
+            raise KeyError(f"노드 {name}의 입력이 없습니다: {e.args[0]}") from None
+
+        key = (
+            tuple(input_values[k] for k in node.inputs),
+            tuple(self._memo[dep].version for dep in node.deps),
+        )
+
+        if memo.version and memo.key == key:
+            self._hits[name] += 1
+        else:
+            value = node.fn(**dep_values, **input_values)
+            self._computes[name] += 1
+            self.last_executed.append(name)
+            if not memo.version or not _same(value, memo.value):
+                memo.version += 1
+            memo.key = key
+            memo.value = value
+
+        visited[name] = memo.version
+        return memo.value
+
+    def invalidate(self) -> None:
+        """기억한 결과 전부 삭제 (데이터 갱신 시)"""
+        with self._lock:
+            for memo in self._memo.values():
+                memo.key = None
+                memo.value = None
+                memo.version = 0
+
+    def stats(self) -> Dict[str, Dict[str, int]]:
+        """노드별 실행/재사용 횟수"""
+        return {
+            name: {'computes': self._computes[name], 'hits': self._hits[name]}
+            for name in self._nodes
+        }
@@ -0,0 +1,146 @@
+"""
+utils/single_flight.py
+키별 1회 로드(single-flight) 캐시
+
+Streamlit은 한 프로세스에서 여러 세션을 스레드로 처리하므로,
+최초 요청이 몰리면 같은 JSON 파일을 여러 스레드가 동시에 파싱할 수 있다.
+이 캐시는 키마다 로더를 정확히 한 번만 실행하고, 결과를 불변 스냅샷으로
+게시(publish)하여 워밍업 이후 읽기 경로에서 락을 잡지 않는다.
+"""
+
+import threading
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Hashable, Iterator, Mapping, Optional
+
+
+class _Flight:
+    """진행 중인 로드 1건 (대기 스레드들이 공유)"""
+
+    __slots__ = ("event", "value", "error")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlightCache:
+    """
+    키별 single-flight 로드 + 불변 스냅샷 게시 캐시
+
+    - 읽기: 현재 스냅샷(MappingProxyType)을 락 없이 조회
+    - 쓰기: 락 안에서 새 dict를 만들어 스냅샷 참조를 통째로 교체 (copy-on-write)
+    - 같은 키를 동시에 요청하면 첫 스레드만 로더를 실행하고 나머지는 결과를 기다림
+    - 로더가 실패하면 대기 중인 스레드 모두 같은 예외를 받고, 다음 요청에서 재시도
+    - clear() 이전에 시작된 로드는 끝나도 게시하지 않음 (무효화 이전 데이터가 다시 들어가지 않도록)
+
+    게시된 값은 여러 세션이 공유하므로 호출자는 수정하면 안 된다.
+    """
+
+    def __init__(self, name: str = "cache"):
+        self.name = name
+        self._snapshot: Mapping[Hashable, Any] = MappingProxyType({})
+        self._flights: Dict[Hashable, _Flight] = {}
+        self._lock = threading.Lock()
+        self._generation = 0  # clear() 마다 증가
+        self.load_count = 0
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any]) -> Any:
+        """
+        캐시된 값 조회, 없으면 키당 1회만 로드
+
+        Args:
+            key: 캐시 키
+            loader: 값을 만드는 함수 (인자 없음)
+
+        Returns:
+            게시된 값 (모든 호출자가 같은 객체를 받음)
+        """
+        # 빠른 경로: 락 없이 현재 스냅샷 조회
+        snapshot = self._snapshot
+        if key in snapshot:
+            return snapshot[key]
+
+        with self._lock:
+            snapshot = self._snapshot
+            if key in snapshot:
+                return snapshot[key]
+
+            flight = self._flights.get(key)
+            is_leader = flight is None
+            if is_leader:
+                flight = _Flight()
+                self._flights[key] = flight
+                generation = self._generation
+
+        if not is_leader:
+            flight.event.wait()
+            if flight.error is not None:
+                raise flight.error
+            return flight.value
+
+        try:
+            value = loader()
+        except BaseException as e:
+            flight.error = e
+            with self._lock:
+                if self._flights.get(key) is flight:
+                    del self._flights[key]
+            flight.event.set()
+            raise
+
+        with self._lock:
+            # 로드 중에 clear() 되었으면 값은 돌려주되 캐시에는 넣지 않음
+            if self._generation == generation and self._flights.get(key) is flight:
+                published = dict(self._snapshot)
+                published[key] = value
+                self._snapshot = MappingProxyType(published)
+                del self._flights[key]
+                self.load_count += 1
+
+        flight.value = value
+        flight.event.set()
+        return value
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """로드 없이 게시된 값만 조회"""
+        return self._snapshot.get(key, default)
+
+    def publish(self, key: Hashable, value: Any) -> None:
+        """값을 직접 게시 (데이터 갱신 시 새 스냅샷으로 교체)"""
+        with self._lock:
+            published = dict(self._snapshot)
+            published[key] = value
+            self._snapshot = MappingProxyType(published)
+
+    def clear(self, key: Optional[Hashable] = None) -> None:
+        """
+        캐시 무효화 (진행 중인 로드의 결과도 게시하지 않음)
+
+        Args:
+            key: 지정하면 해당 키만, None이면 전체 삭제
+        """
+        with self._lock:
+            self._generation += 1
+            if key is None:
+                self._snapshot = MappingProxyType({})
+                self._flights.clear()
+                return
+            self._flights.pop(key, None)
+            if key in self._snapshot:
+                published = dict(self._snapshot)
+                del published[key]
+                self._snapshot = MappingProxyType(published)
+
+    def snapshot(self) -> Mapping[Hashable, Any]:
+        """현재 게시된 스냅샷 (읽기 전용)"""
+        return self._snapshot
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._snapshot
+
+    def __iter__(self) -> Iterator[Hashable]:
+        return iter(self._snapshot)
+
+    def __len__(self) -> int:
+        return len(self._snapshot)
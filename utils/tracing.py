@@ -0,0 +1,331 @@
+"""
+utils/tracing.py
+핫패스 구간(span) 계측과 요청별 시간 분해
+
+비교 클릭 한 번이 어디에 시간을 썼는지(가격 조회, 차량 매칭, 잔존율 조회, 계산, 렌더링)
+중첩 구간 시간과 카운터로 기록한다.
+
+    with tracing.trace("compare") as t:         # 기록 시작 (이 안에서만 기록)
+        compare_all(...)
+    t.summary()          # 이름별 {count, total_ms, self_ms, max_ms}
+    t.to_log_line()      # 구조화 JSON 로그 한 줄
+    t.to_chrome_trace()  # chrome://tracing, Perfetto 에서 여는 JSON
+
+계측 지점은 @traced("이름") 데코레이터, with span("이름"), count("이름") 로 표시한다.
+진행 중인 trace 가 없으면 전역 정수 하나를 확인하고 바로 원래 함수를 호출한다
+(기록 객체 생성/시각 측정 없음).
+
+스레드 풀로 넘기는 작업은 wrap() 으로 감싸면 제출한 구간 아래에 기록된다.
+프로세스 풀 작업 내부는 기록하지 않는다 (제출한 쪽 구간이 대기 시간을 포함).
+"""
+
+import contextvars
+import functools
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger("lease.trace")
+
+# 진행 중인 trace 수 (0이면 계측 지점은 바로 통과)
+_ACTIVE_TRACES = 0
+_ACTIVE_LOCK = threading.Lock()
+
+# 현재 (trace, 부모 구간 번호)
+_CURRENT: contextvars.ContextVar = contextvars.ContextVar("lease_trace", default=None)
+
+
+class Trace:
+    """
+    요청 1건의 구간/카운터 기록 (trace() 로 생성)
+
+    spans: [{'id', 'parent', 'name', 'start', 'end', 'thread', 'attrs'}]  (시각은 perf_counter 초)
+    """
+
+    def __init__(self, name: str, attrs: Optional[Dict[str, Any]] = None, log: bool = False):
+        self.name = name
+        self.attrs = dict(attrs or {})
+        self.log = log
+        self.spans: List[Dict[str, Any]] = []
+        self.counters: Dict[str, float] = {}
+        self.started_at = time.time()
+        self._lock = threading.Lock()
+        self._token = None
+        self._root: Optional[int] = None
+
+    # ---- 기록 ----
+    def _open(self, name: str, parent: Optional[int], attrs: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        record = {'parent': parent, 'name': name, 'start': time.perf_counter(), 'end': None,
+                  'thread': threading.get_ident(), 'attrs': attrs or {}}
+        with self._lock:
+            record['id'] = len(self.spans)
+            self.spans.append(record)
+        return record
+
+    def _count(self, name: str, value: float) -> None:
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def start(self) -> "Trace":
+        """기록 시작 (with 블록을 쓸 수 없는 곳, 예: Streamlit 스크립트 전체)"""
+        global _ACTIVE_TRACES
+        if self._token is not None:
+            raise ValueError(f"이미 시작된 trace 입니다: {self.name}")
+        root = self._open(self.name, None, self.attrs)
+        self._root = root['id']
+        self._token = _CURRENT.set((self, root['id']))
+        with _ACTIVE_LOCK:
+            _ACTIVE_TRACES += 1
+        return self
+
+    def finish(self) -> "Trace":
+        """기록 종료 (log=True 로 만든 trace 는 구조화 JSON 로그 한 줄 기록: logger "lease.trace", INFO)"""
+        global _ACTIVE_TRACES
+        if self._token is None:
+            return self
+        self.spans[self._root]['end'] = time.perf_counter()
+        try:
+            _CURRENT.reset(self._token)
+        except ValueError:
+            # 다른 컨텍스트에서 종료 (예: 중단된 이전 실행의 trace 정리) - 현재 컨텍스트는 건드리지 않음
+            pass
+        self._token = None
+        with _ACTIVE_LOCK:
+            _ACTIVE_TRACES -= 1
+        if self.log:
+            logger.info(self.to_log_line())
+        return self
+
+    # ---- 결과 ----
+    @property
+    def duration_ms(self) -> float:
+        root = self.spans[self._root] if self._root is not None else None
+        if root is None:
+            return 0.0
+        end = root['end'] if root['end'] is not None else time.perf_counter()
+        return (end - root['start']) * 1000
+
+    def _closed_spans(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [s for s in self.spans if s['end'] is not None]
+
+    def summary(self) -> Dict[str, Dict[str, float]]:
+        """
+        이름별 집계 (전체 시간 큰 순)
+
+        self_ms = 구간 시간 - 같은 스레드의 직속 하위 구간 시간
+        (다른 스레드로 넘긴 하위 구간은 병렬로 돌 수 있어 빼지 않음)
+
+        Returns:
+            Dict: {name: {'count', 'total_ms', 'self_ms', 'max_ms'}}
+        """
+        spans = self._closed_spans()
+        child_time: Dict[int, float] = {}
+        for s in spans:
+            parent = s['parent']
+            if parent is not None and self.spans[parent]['thread'] == s['thread']:
+                child_time[parent] = child_time.get(parent, 0.0) + (s['end'] - s['start'])
+
+        totals: Dict[str, Dict[str, float]] = {}
+        for s in spans:
+            elapsed = s['end'] - s['start']
+            item = totals.setdefault(s['name'], {'count': 0, 'total_ms': 0.0, 'self_ms': 0.0, 'max_ms': 0.0})
+            item['count'] += 1
+            item['total_ms'] += elapsed * 1000
+            item['self_ms'] += (elapsed - child_time.get(s['id'], 0.0)) * 1000
+            item['max_ms'] = max(item['max_ms'], elapsed * 1000)
+
+        for item in totals.values():
+            for key in ('total_ms', 'self_ms', 'max_ms'):
+                item[key] = round(item[key], 3)
+        return dict(sorted(totals.items(), key=lambda kv: -kv[1]['total_ms']))
+
+    def to_dict(self) -> Dict[str, Any]:
+        """구조화 기록 (trace 이름/속성, 전체 시간, 이름별 집계, 카운터)"""
+        return {
+            'event': 'trace',
+            'name': self.name,
+            'started_at': round(self.started_at, 3),
+            'duration_ms': round(self.duration_ms, 3),
+            'attrs': self.attrs,
+            'spans': self.summary(),
+            'counters': dict(self.counters),
+        }
+
+    def to_log_line(self) -> str:
+        """JSON 로그 한 줄"""
+        return json.dumps(self.to_dict(), ensure_ascii=False, default=str, separators=(',', ':'))
+
+    def to_chrome_trace(self) -> Dict[str, Any]:
+        """
+        Chrome trace event 형식 (완료 이벤트 'X' + 카운터 이벤트 'C', 마이크로초)
+
+        chrome://tracing 또는 https://ui.perfetto.dev 에서 연다.
+        """
+        spans = self._closed_spans()
+        origin = spans[0]['start'] if spans else 0.0
+        threads = {ident: idx for idx, ident in enumerate(dict.fromkeys(s['thread'] for s in spans))}
+        pid = os.getpid()
+        events = [
+            {'name': s['name'], 'cat': self.name, 'ph': 'X', 'pid': pid, 'tid': threads[s['thread']],
+             'ts': round((s['start'] - origin) * 1e6, 3), 'dur': round((s['end'] - s['start']) * 1e6, 3),
+             'args': {k: v if isinstance(v, (int, float, str, bool)) or v is None else str(v)
+                      for k, v in s['attrs'].items()}}
+            for s in spans
+        ]
+        if self.counters and spans:
+            end = max(s['end'] for s in spans)
+            events.append({'name': 'counters', 'ph': 'C', 'pid': pid, 'tid': 0,
+                           'ts': round((end - origin) * 1e6, 3), 'args': dict(self.counters)})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms',
+                'otherData': {'trace': self.name, 'started_at': self.started_at}}
+
+    def __enter__(self) -> "Trace":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc_type is not None:
+            self.spans[self._root]['attrs']['error'] = exc_type.__name__
+        self.finish()
+
+
+def trace(name: str, log: bool = False, **attrs) -> Trace:
+    """
+    trace 생성 (with 블록 안의 계측 지점이 기록됨)
+
+    Args:
+        name: trace 이름 (예: "compare")
+        log: True면 종료 시 JSON 로그 한 줄 기록
+        **attrs: 최상위 구간 속성
+    """
+    return Trace(name, attrs, log=log)
+
+
+class _Span:
+    """구간 1개 (with 블록)"""
+
+    __slots__ = ("_trace", "_parent", "_name", "_attrs", "_record", "_token")
+
+    def __init__(self, current, name: str, attrs: Optional[Dict[str, Any]]):
+        self._trace, self._parent = current
+        self._name = name
+        self._attrs = attrs
+        self._record = None
+        self._token = None
+
+    def __enter__(self) -> "_Span":
+        self._record = self._trace._open(self._name, self._parent, self._attrs)
+        self._token = _CURRENT.set((self._trace, self._record['id']))
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._record['end'] = time.perf_counter()
+        if exc_type is not None:
+            self._record['attrs'] = dict(self._record['attrs'], error=exc_type.__name__)
+        _CURRENT.reset(self._token)
+
+    def set(self, **attrs) -> None:
+        """구간 속성 추가 (예: 적중 여부)"""
+        self._record['attrs'] = dict(self._record['attrs'], **attrs)
+
+
+class _NoopSpan:
+    """trace 가 없을 때의 구간 (아무것도 하지 않음)"""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+    def set(self, **attrs) -> None:
+        return None
+
+
+_NOOP = _NoopSpan()
+
+
+def span(name: str, **attrs):
+    """
+    구간 기록 (with span("이름", key=값): ...). trace 밖에서는 아무것도 하지 않음
+    """
+    if not _ACTIVE_TRACES:
+        return _NOOP
+    current = _CURRENT.get()
+    if current is None:
+        return _NOOP
+    return _Span(current, name, attrs)
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """
+    함수 호출 1회를 구간으로 기록하는 데코레이터
+
+    Args:
+        name: 구간 이름 (기본: 모듈.함수 이름)
+    """
+    def decorate(fn: Callable) -> Callable:
+        label = name or f"{fn.__module__}.{fn.__qualname__}"
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _ACTIVE_TRACES:
+                return fn(*args, **kwargs)
+            current = _CURRENT.get()
+            if current is None:
+                return fn(*args, **kwargs)
+            with _Span(current, label, None):
+                return fn(*args, **kwargs)
+
+        return wrapper
+    return decorate
+
+
+def count(name: str, value: float = 1) -> None:
+    """카운터 증가 (trace 밖에서는 아무것도 하지 않음)"""
+    if not _ACTIVE_TRACES:
+        return
+    current = _CURRENT.get()
+    if current is not None:
+        current[0]._count(name, value)
+
+
+def current_trace() -> Optional[Trace]:
+    """현재 컨텍스트의 trace (없으면 None)"""
+    if not _ACTIVE_TRACES:
+        return None
+    current = _CURRENT.get()
+    return current[0] if current else None
+
+
+def wrap(fn: Callable) -> Callable:
+    """
+    다른 스레드에서 실행할 함수가 현재 구간 아래에 기록되도록 컨텍스트를 묶음
+    (trace 밖에서는 fn 그대로)
+    """
+    if not _ACTIVE_TRACES or _CURRENT.get() is None:
+        return fn
+    context = contextvars.copy_context()
+
+    @functools.wraps(fn)
+    def run(*args, **kwargs):
+        # 같은 컨텍스트를 여러 스레드가 동시에 쓸 수 없으므로 실행마다 복사
+        return context.copy().run(fn, *args, **kwargs)
+
+    return run
+
+
+def write_chrome_trace(path: str, traces: List[Trace]) -> None:
+    """여러 trace 를 하나의 Chrome trace 파일로 저장 (trace 마다 프로세스 행을 나눔)"""
+    events = []
+    for idx, t in enumerate(traces):
+        for event in t.to_chrome_trace()['traceEvents']:
+            events.append(dict(event, pid=idx))
+        events.append({'name': 'process_name', 'ph': 'M', 'pid': idx, 'args': {'name': t.name}})
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f, ensure_ascii=False)